@@ -0,0 +1,135 @@
+import argparse
+import os
+import sys
+import threading
+import time
+
+from PyQt6.QtCore import QCoreApplication
+
+from core.ai_backend import OPENAI_BACKEND
+from core.batch_runner import DEFAULT_CONCURRENCY, MAX_CONCURRENCY, BatchItem, BatchResult, BatchRunner, find_items
+from core.config import load_config
+from core.metrics_store import PERCENTILES, percentile
+
+
+def print_summary(results: list[BatchResult], elapsed: float, concurrency: int) -> None:
+    """Print throughput and latency percentiles of a finished run.
+
+    Args:
+        results (list[BatchResult]): The results of every request sent.
+        elapsed (float): Wall time of the run in seconds.
+        concurrency (int): Requests that were allowed in flight at once.
+    """
+    succeeded = [result for result in results if result.error is None]
+    print(
+        f"\n{len(succeeded)}/{len(results)} request(s) succeeded in {elapsed:.1f} s with concurrency {concurrency}: "
+        f"{len(results) / elapsed * 60:.1f} requests/min, "
+        f"{sum(len(result.response) for result in succeeded) / elapsed:.0f} response chars/s, "
+        f"{sum(result.upload_bytes for result in results) / 1024 / elapsed:.0f} KB/s uploaded",
+        file=sys.stderr,
+    )
+    for label, values in (
+        ("time to first token", sorted(result.ttft_ms for result in succeeded if result.ttft_ms is not None)),
+        ("total time", sorted(result.total_ms for result in succeeded)),
+    ):
+        if values:
+            print(f"{label}: {' '.join(f'p{p} {percentile(values, p):.0f} ms' for p in PERCENTILES)}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    # Headless batch mode: send every screenshot set in a directory with one preset's prompt
+    parser = argparse.ArgumentParser(
+        description="Send each image (or subfolder of images) in a directory with a preset's prompt and print or save the responses.",
+    )
+    parser.add_argument("screenshots", help="Directory of screenshots; each image, or each subfolder of images, is one request")
+    parser.add_argument("preset", help="Name of the preset whose prompt is sent (e.g. solve or fix)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help=f"Requests in flight at once (1-{MAX_CONCURRENCY})")
+    parser.add_argument("--out", help="Write each response to <out>/<name>.md instead of printing it")
+    parser.add_argument("--repeat", type=int, default=1, help="Send every set this many times (load testing)")
+    parser.add_argument("--base-url", help="Use the OpenAI-compatible backend at this URL (e.g. test/openai_stand_in.py)")
+    parser.add_argument("--model", help="Override the model from the \"ai\" config section")
+    args = parser.parse_args()
+
+    app = QCoreApplication(sys.argv)  # Image format plugins; no window is shown
+    config = load_config()
+    presets = {preset["name"]: preset for preset in config["presets"]}
+    if args.preset not in presets:
+        parser.error(f"unknown preset \"{args.preset}\" (configured: {', '.join(presets)})")
+    if not 1 <= args.concurrency <= MAX_CONCURRENCY:
+        parser.error(f"--concurrency must be between 1 and {MAX_CONCURRENCY}")
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    if not os.path.isdir(args.screenshots):
+        parser.error(f"{args.screenshots} is not a directory")
+    items = find_items(args.screenshots)
+    if not items:
+        parser.error(f"no images found in {args.screenshots}")
+
+    ai_config = dict(config["ai"])
+    if args.base_url:
+        ai_config["backend"] = OPENAI_BACKEND
+        ai_config["base_url"] = args.base_url.rstrip("/")
+    if args.model is not None:
+        ai_config["model"] = args.model
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+
+    output_lock = threading.Lock()
+    stream = args.concurrency == 1 and not args.out  # Responses can only be streamed live one at a time
+    streaming: list[BatchItem] = []
+
+    def on_chunk(item: BatchItem, text: str) -> None:
+        """Print a chunk as it arrives, with a heading before the first one of each set.
+
+        Args:
+            item (BatchItem): The set the chunk belongs to.
+            text (str): The chunk.
+        """
+        if not streaming or streaming[-1] is not item:
+            streaming.append(item)
+            print(f"\n## {item.name}\n", flush=True)
+        print(text, end="", flush=True)
+
+    def on_result(result: BatchResult) -> None:
+        """Print or save a finished response, and log its timings.
+
+        Args:
+            result (BatchResult): The finished request.
+        """
+        name = result.item.name
+        ttft = f"{result.ttft_ms:.0f} ms" if result.ttft_ms is not None else "-"
+        with output_lock:
+            if result.error is not None:
+                print(f"{name}: error: {result.error}", file=sys.stderr)
+                return
+            if args.out:
+                with open(os.path.join(args.out, f"{name}.md"), "w", encoding="utf-8") as f:
+                    f.write(f"# {name}\n\n{result.response}\n")
+            elif stream:
+                print()
+            else:
+                print(f"\n## {name}\n\n{result.response}", flush=True)
+            print(
+                f"{name}: {result.screenshots} image(s), {result.upload_bytes / 1024:.0f} KB, "
+                f"first token {ttft}, total {result.total_ms:.0f} ms",
+                file=sys.stderr,
+            )
+
+    runner = BatchRunner(
+        ai_config,
+        presets[args.preset]["prompt"],
+        args.concurrency,
+        config["capture"]["stitch"],
+        on_chunk if stream else None,
+        on_result,
+    )
+    print(f"Sending {len(items) * args.repeat} request(s) with the \"{args.preset}\" preset, {args.concurrency} at a time", file=sys.stderr)
+    start = time.perf_counter()
+    try:
+        results = runner.run(items, args.repeat)
+    except KeyboardInterrupt:
+        runner.cancel()
+        results = list(runner.results)
+        print("\nCancelled", file=sys.stderr)
+    print_summary(results, time.perf_counter() - start, args.concurrency)
+    sys.exit(0 if results and all(result.error is None for result in results) else 1)
@@ -0,0 +1,105 @@
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Callable
+
+
+GEMINI_BACKEND = "gemini"
+OPENAI_BACKEND = "openai"  # Any server speaking the OpenAI /chat/completions API (llama.cpp, vLLM, Ollama, ...)
+
+AI_BACKENDS = (GEMINI_BACKEND, OPENAI_BACKEND)
+GEMINI_MODEL = "gemini-3-flash-preview"  # Used when the "ai" config section names no model
+
+
+class AIBackend(ABC):
+    """Interface shared by the AI senders.
+
+    AIReceiver, the worker process and the UI only use these methods, so a
+    backend can be swapped without touching them. Implementations initialize
+    in the background, stream each response through on_chunk, and keep the
+    name of the model they send to in model ("" if the server picks it).
+    """
+
+    model = ""
+    echo = True  # Print streamed text to the console; batch mode turns this off to keep stdout for results
+
+    @abstractmethod
+    def is_ready(self) -> bool:
+        """Check whether client initialization has finished (successfully or not).
+
+        Returns:
+            bool: True once initialization is done.
+        """
+
+    @abstractmethod
+    def wait_until_ready(self, timeout: float | None = None) -> None:
+        """Block until the client is ready.
+
+        Raises TimeoutError if initialization does not finish in time and
+        RuntimeError if it failed.
+
+        Args:
+            timeout (float | None, optional): Maximum seconds to wait; None waits forever.
+        """
+
+    def prewarm(self) -> None:
+        """Open or refresh the pooled connection in the background if it may have gone idle; by default does nothing, for backends without a pool."""
+
+    def close(self) -> None:
+        """Release the backend's resources when the app quits (e.g. stop a worker process); by default does nothing, for backends that hold none."""
+
+    @abstractmethod
+    def reset_chat(self) -> None:
+        """Reset the chat session, clearing all conversation history."""
+
+    @abstractmethod
+    def send_message(
+        self,
+        user_input: str,
+        attachments: list[Any] | None = None,
+        on_chunk: Callable[[str], None] | None = None,
+        cancel: threading.Event | None = None
+    ) -> str:
+        """Send a message and stream the response.
+
+        Args:
+            user_input (str): The user's input text to send to the model.
+            attachments (list[str | tuple[bytes, str] | CaptureBuffer], optional): File paths, (data, mime_type) tuples or screenshots to attach.
+            on_chunk (callable, optional): Callback invoked with each text chunk as it streams.
+            cancel (threading.Event, optional): When set, the stream is closed at the next chunk.
+
+        Returns:
+            str: The full generated response text, or the part received before cancellation.
+        """
+
+
+def model_name(ai_config: dict[str, Any]) -> str:
+    """Return the model the "ai" config section sends requests to.
+
+    Args:
+        ai_config (dict[str, Any]): The validated "ai" section from core.config.
+
+    Returns:
+        str: The model name, or "" if an OpenAI-compatible server picks its loaded model.
+    """
+    if ai_config["model"] or ai_config["backend"] == OPENAI_BACKEND:
+        return ai_config["model"]
+    return GEMINI_MODEL
+
+
+def create_backend(ai_config: dict[str, Any]) -> AIBackend:
+    """Create the sender selected by the "ai" config section, in this process.
+
+    Args:
+        ai_config (dict[str, Any]): The validated "ai" section from core.config.
+
+    Returns:
+        AIBackend: An AISender or OpenAISender, initializing in the background.
+    """
+    if ai_config["backend"] == OPENAI_BACKEND:
+        from .openai_sender import OpenAISender
+
+        return OpenAISender(ai_config["base_url"], ai_config["model"])
+
+    from .ai_sender import AISender
+
+    return AISender(ai_config["model"])
@@ -1,114 +1,293 @@
-import threading
+import time
 
 from PyQt6.QtCore import QObject, pyqtSignal
 
+from .capture_buffer import CaptureBuffer
+from .metrics import QUEUE_DEPTH, REQUESTS_DROPPED, TOKENS_PER_S, TTFT_MS, UPLOAD_BYTES, metrics
+from .metrics_store import MetricsStore, RequestRecord
+from .request_scheduler import PRIORITY_TYPED, TYPED, GenerationRequest, RequestScheduler
+from .tracing import tracer
+
 
 class AIReceiver(QObject):
-    """Handles AI response streaming and chat area updates."""
+    """Handles AI response streaming and chat area updates.
+
+    Generation is owned by a RequestScheduler: a typed message interrupts the
+    response being streamed, a preset waits behind a typed message, and
+    repeated or identical requests are dropped. The user's message is added to
+    the chat when its generation starts, so a preset queued behind a reply
+    does not land in the middle of it.
+
+    If a ScreenshotManager is given, each request's screenshot hashes are
+    marked sent once its response is complete, and unsent if it is dropped,
+    interrupted or fails, so deduplication never skips a screen the model has
+    not seen. If a MetricsStore is given, each request that ran is recorded in
+    it with its latency and upload size.
+    """
 
     # Signals for cross-thread communication
     # Using threading instead of QThread due to compilation issues with Nuitka
-    finished = pyqtSignal(str)
-    error = pyqtSignal(str)
-    progress = pyqtSignal(str)
+    started = pyqtSignal(object)
+    finished = pyqtSignal(object, str)
+    error = pyqtSignal(object, str)
+    progress = pyqtSignal(object, str)
 
-    def __init__(self, ai_sender, chat_area) -> None:
+    def __init__(self, ai_sender, chat_area, chat_history, metrics_store: MetricsStore | None = None, screenshot_manager=None) -> None:
         super().__init__()
         self.ai_sender = ai_sender
         self.chat_area = chat_area
-        self.ai_thread = None
-        self.stop_flag = threading.Event()  # Stop flag in case a new user message is sent while a bot message is being streamed
-        self.message = None
-        self.attachments: list[str] | None = None
+        self.chat_history = chat_history
+        self.metrics_store = metrics_store
+        self.screenshot_manager = screenshot_manager
+        self.scheduler = RequestScheduler(self._run, self._discard)
+        self.current: GenerationRequest | None = None  # Request whose response is being shown (UI thread only)
+        metrics.register_source(QUEUE_DEPTH, self.scheduler.depth)
+        metrics.register_source(REQUESTS_DROPPED, self._dropped)
 
         # Connect signals to response handlers once
+        self.started.connect(self._on_request_started)
         self.progress.connect(self._on_response_chunk)
         self.finished.connect(self._on_response_ready)
         self.error.connect(self._on_response_error)
 
-    def handle_message(self, message: str, attachments: list[str] | None = None) -> None:
-        """Handle a user message by displaying it and starting AI generation.
+    def handle_message(
+        self,
+        message: str,
+        attachments: list[CaptureBuffer] | None = None,
+        priority: int = PRIORITY_TYPED,
+        preset: str = TYPED,
+        captures: list[tuple[tuple[int, int], int]] | None = None
+    ) -> None:
+        """Queue a user message for AI generation.
+
+        Takes over one reference to each attachment; the generation thread
+        releases them once the upload no longer needs them, or the scheduler
+        does if the request never runs.
 
         Args:
             message (str): The user's message text.
-            attachments (list[str], optional): List of file paths to attach to the request.
+            attachments (list[CaptureBuffer], optional): Screenshots to attach to the request.
+            priority (int, optional): PRIORITY_TYPED or PRIORITY_PRESET.
+            preset (str, optional): Name of the preset sending the message, or TYPED.
+            captures (list[tuple[tuple[int, int], int]], optional): Hashes of the screenshots captured for the message (see ScreenshotManager.get_and_clear_pending).
         """
-        # If there's an active thread, stop it
-        if self.ai_thread is not None and self.ai_thread.is_alive():
-            self.stop_flag.set()
+        # Join the request a preset hotkey started, so its capture spans line up with this send
+        request_id = tracer.start_or_join_request("message")
+        with tracer.span("handle message", "ai", request=request_id, attachments=len(attachments or []), priority=priority):
+            self.scheduler.submit(GenerationRequest(message, attachments or [], priority, request_id, preset, captures))
 
-            # Finalize the interrupted stream
-            if self.chat_area.streaming_bubble is not None:
-                self.chat_area.finalize_assistant_stream()
+    def debounce(self, prompt: str, preset: str) -> bool:
+        """Check whether a preset hotkey was pressed again too soon and should be ignored (see RequestScheduler.debounce).
 
-        # Reset stop flag for new message
-        self.stop_flag = threading.Event()
-        self.message = message
-        self.attachments = attachments
+        Args:
+            prompt (str): The preset's prompt.
+            preset (str): The preset's name.
 
-        # Immediately add user's message to the chat area
-        self.chat_area.add_message(message, is_user=True)
+        Returns:
+            bool: True if the press should be dropped before it captures anything.
+        """
+        return self.scheduler.debounce((preset, prompt))
 
-        # Start new thread
-        self.ai_thread = threading.Thread(target=self._run, daemon=True)
-        self.ai_thread.start()
+    def interrupt(self) -> None:
+        """Stop the active generation and drop queued ones, keeping the part of the response streamed so far."""
+        self.scheduler.cancel_all()
+        self._finalize_partial()
+        self.current = None
 
     def stop(self) -> None:
-        """Signal the thread to stop."""
-        self.stop_flag.set()
-
-    def _is_stopped(self) -> bool:
-        """Check if stop has been requested.
+        """Stop all generation and wait for the generation threads to finish (when the app quits).
 
-        Returns:
-            bool: True if the thread has been signaled to stop.
+        After this, the threads no longer write to the chat history or metrics
+        store, so both can be closed. A stream that does not close in time (see
+        RequestScheduler.shutdown) is left behind; its writes fail and are reported.
         """
-        return self.stop_flag.is_set()
+        if not self.scheduler.shutdown():
+            print("Error stopping AI generation: a response stream did not close in time")
 
-    def _run(self) -> None:
-        """Execute AI content generation and emit progress and completion signals."""
+    def _run(self, request: GenerationRequest) -> None:
+        """Execute AI content generation and emit progress and completion signals (runs on a scheduler worker).
+
+        Args:
+            request (GenerationRequest): The request; its attachments are released when it ends.
+        """
+        tracer.bind_request(request.request_id)
+        created = time.time()
+        start = time.perf_counter()
+        outcome = "error"
         try:
-            response = self.ai_sender.send_message(self.message, self.attachments, self._on_chunk)
+            self.started.emit(request)
+            with tracer.span("generate", "ai"):
+                try:
+                    response = self.ai_sender.send_message(
+                        request.message,
+                        request.attachments or None,
+                        lambda text: self._on_chunk(request, text),
+                        cancel=request.cancel,
+                    )
+                finally:
+                    for attachment in request.attachments:
+                        attachment.release()
             # Only emit finished if we weren't stopped
-            if not self._is_stopped():
-                self.finished.emit(response)
+            if not request.cancel.is_set():
+                outcome = "done"
+                self._settle_captures(request, True)  # Before finished, so the next capture of the same screen is deduplicated
+                self.finished.emit(request, response)
+            else:
+                outcome = "interrupted"
+                tracer.end_request(request.request_id, "interrupted")
 
         except Exception as e:
             # Only emit error if we weren't stopped
-            if not self._is_stopped():
-                self.error.emit(str(e))
+            if not request.cancel.is_set():
+                self.error.emit(request, str(e))
+            else:
+                outcome = "interrupted"
+                tracer.end_request(request.request_id, "interrupted")
+        finally:
+            if outcome != "done":
+                self._settle_captures(request, False)
+            self._record(request, created, (time.perf_counter() - start) * 1000, outcome)
+
+    def _settle_captures(self, request: GenerationRequest, sent: bool) -> None:
+        """Tell the screenshot manager whether the model received a request's screenshots.
+
+        Args:
+            request (GenerationRequest): The request that ended or was discarded.
+            sent (bool): Whether its response completed, so the model has the screenshots in its chat.
+        """
+        if self.screenshot_manager is None or not request.captures:
+            return
+        if sent:
+            self.screenshot_manager.mark_sent(request.captures)
+        else:
+            self.screenshot_manager.mark_unsent(request.captures)
+
+    def _record(self, request: GenerationRequest, created: float, total_ms: float, outcome: str) -> None:
+        """Persist a request's measurements in the metrics store, if there is one.
+
+        Args:
+            request (GenerationRequest): The request that ran.
+            created (float): Unix time it started.
+            total_ms (float): Time until the response was complete, failed or was interrupted.
+            outcome (str): "done", "error" or "interrupted".
+        """
+        if self.metrics_store is None:
+            return
+        # A later request resets the request metrics, so an interrupted request only keeps its total time
+        values = metrics.snapshot() if outcome != "interrupted" else {}
+        try:
+            self.metrics_store.record(RequestRecord(
+                created, self.ai_sender.model, request.preset, len(request.attachments), outcome,
+                values.get(UPLOAD_BYTES), values.get(TTFT_MS), total_ms, values.get(TOKENS_PER_S),
+            ))
+        except Exception as e:
+            print(f"Error saving request metrics: {str(e)}")
+
+    def _discard(self, request: GenerationRequest, reason: str) -> None:
+        """Release a request that will never run.
 
-    def _on_chunk(self, text: str) -> None:
+        Args:
+            request (GenerationRequest): The request.
+            reason (str): Why it was discarded (e.g. "debounced", "coalesced", "preempted").
+        """
+        for attachment in request.attachments:
+            attachment.release()
+        self._settle_captures(request, False)
+        tracer.end_request(request.request_id, reason)
+
+    def _dropped(self) -> int:
+        """Count the requests that never ran (read only by the perf HUD).
+
+        Returns:
+            int: Debounced, coalesced, preempted-while-queued and overflowed requests.
+        """
+        stats = self.scheduler.stats()
+        return stats["debounced"] + stats["coalesced"] + stats["preempted"] + stats["dropped"]
+
+    def _on_chunk(self, request: GenerationRequest, text: str) -> None:
         """Handle a streamed text chunk by emitting it to the UI thread.
 
         Args:
+            request (GenerationRequest): The request the chunk belongs to.
             text (str): The text chunk received from the AI stream.
         """
         # Emit chunk text to UI thread only if not stopped
-        if text and not self._is_stopped():
-            self.progress.emit(text)
+        if text and not request.cancel.is_set():
+            self.progress.emit(request, text)
+
+    def _save(self, role: str, content: str) -> int | None:
+        """Save a message to the chat history.
+
+        Args:
+            role (str): "user" or "assistant".
+            content (str): The message text.
 
-    def _on_response_ready(self) -> None:
-        """Handle successful AI response."""
+        Returns:
+            int | None: The message ID, or None if saving failed (the chat carries on without it).
+        """
+        try:
+            return self.chat_history.add_message(role, content)
+        except Exception as e:
+            print(f"Error saving chat history: {str(e)}")
+            return None
+
+    def _finalize_partial(self) -> None:
+        """Finalize an interrupted stream, saving the part of the response received."""
+        if self.chat_area.streaming_bubble is not None:
+            partial = self.chat_area.streaming_text
+            self.chat_area.finalize_assistant_stream(self._save("assistant", partial) if partial else None)
+
+    def _on_request_started(self, request: GenerationRequest) -> None:
+        """Show the user's message once its generation starts.
+
+        Args:
+            request (GenerationRequest): The request that started.
+        """
+        if request.cancel.is_set():
+            return
+        self._finalize_partial()
+        self.current = request
+        self.chat_area.add_message(request.message, is_user=True, message_id=self._save("user", request.message))
+
+    def _on_response_ready(self, request: GenerationRequest, response: str) -> None:
+        """Handle successful AI response.
+
+        Args:
+            request (GenerationRequest): The request that finished.
+            response (str): The full response text.
+        """
+        if request is not self.current:
+            return
         # Finalize streaming bubble
-        self.chat_area.finalize_assistant_stream()
+        self.chat_area.finalize_assistant_stream(self._save("assistant", response))
+        self.current = None
+        tracer.end_request(request.request_id, "done")
 
-    def _on_response_error(self, error: str) -> None:
+    def _on_response_error(self, request: GenerationRequest, error: str) -> None:
         """Handle AI response error.
 
         Args:
+            request (GenerationRequest): The request that failed.
             error (str): The error message from the AI response.
         """
+        if request is not self.current:
+            return
         error_msg = f"Error generating response: {error}"
         self.chat_area.show_stream_error(error_msg)
+        self.current = None
+        tracer.end_request(request.request_id, "error")
 
-    def _on_response_chunk(self, chunk: str) -> None:
+    def _on_response_chunk(self, request: GenerationRequest, chunk: str) -> None:
         """Stream chunk text into the current assistant bubble.
 
         Args:
+            request (GenerationRequest): The request the chunk belongs to.
             chunk (str): Text chunk from the AI response stream.
         """
-        # Lazily create the assistant bubble only when first chunk arrives
-        if self.chat_area.streaming_bubble is None:
-            self.chat_area.start_assistant_stream()
-        self.chat_area.append_to_stream(chunk)
+        if request is not self.current or request.cancel.is_set():
+            return  # Queued before the request was interrupted
+        with tracer.span("render chunk", "ui", request=request.request_id, chars=len(chunk)):
+            # Lazily create the assistant bubble only when first chunk arrives
+            if self.chat_area.streaming_bubble is None:
+                self.chat_area.start_assistant_stream()
+            self.chat_area.append_to_stream(chunk)
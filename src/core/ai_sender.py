@@ -1,79 +1,274 @@
+import importlib.util
 import mimetypes
 import os
+import threading
+import time
 from pathlib import Path
-from typing import Callable
+from typing import TYPE_CHECKING, Any, Callable
 
 from dotenv import load_dotenv
-from google import genai
-from google.genai import types
-from google.genai.chats import Chat
 
+from .ai_backend import GEMINI_MODEL, AIBackend
+from .capture_buffer import PNG_MIME_TYPE, CaptureBuffer
+from .metrics import TOKENS_PER_S, TTFT_MS, UPLOAD_BYTES, metrics
+from .startup_profiler import startup_profiler
+from .tracing import tracer
 
-MODEL = "gemini-3-flash-preview"
-CONFIG = types.GenerateContentConfig(
-    thinking_config=types.ThinkingConfig(thinking_budget=0)  # Disable thinking mode for faster responses
-)
+if TYPE_CHECKING:
+    from google.genai.chats import Chat
 
 
-class AISender():
-    """Handles sending user input to Gemini via a persistent chat session."""
+READY_TIMEOUT = 60  # Seconds a send waits for the client before giving up
+KEEPALIVE_EXPIRY = 120  # Seconds an idle connection stays pooled (httpx defaults to 5)
+MAX_KEEPALIVE_CONNECTIONS = 4
+PREWARM_INTERVAL = 30  # Skip pre-warming if the connection was used this recently (seconds)
 
-    def __init__(self) -> None:
+
+def http_client_args() -> dict[str, Any]:
+    """Build the httpx.Client arguments for the shared Gemini connection pool.
+
+    Idle connections are kept long enough to survive the gap between
+    showing the overlay and sending. HTTP/2 is used when the optional h2
+    package is installed, multiplexing concurrent requests on one connection.
+
+    Returns:
+        dict[str, Any]: Keyword arguments for httpx.Client.
+    """
+    import httpx
+
+    return {
+        "http2": importlib.util.find_spec("h2") is not None,
+        "limits": httpx.Limits(max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS, keepalive_expiry=KEEPALIVE_EXPIRY),
+    }
+
+
+def read_attachment(attachment: str | tuple[bytes, str] | CaptureBuffer) -> tuple[bytes, str]:
+    """Load an attachment's bytes and MIME type.
+
+    Args:
+        attachment (str | tuple[bytes, str] | CaptureBuffer): A file path, data already in memory with its MIME type, or a screenshot.
+
+    Returns:
+        tuple[bytes, str]: The data and MIME type.
+    """
+    if isinstance(attachment, CaptureBuffer):
+        return attachment.read_png(), PNG_MIME_TYPE
+    if not isinstance(attachment, str):
+        return attachment
+    mime_type = mimetypes.guess_type(attachment)[0] or "application/octet-stream"
+    with open(attachment, "rb") as f:
+        return f.read(), mime_type
+
+
+class AISender(AIBackend):
+    """Handles sending user input to Gemini via a persistent chat session.
+
+    The google-genai SDK is large and slow to import, so it is imported and
+    the client constructed on a background thread while the UI starts. The
+    first send waits for that to finish.
+
+    All requests share one keep-alive connection pool. prewarm() opens (or
+    refreshes) the connection in the background when a request is likely,
+    so the send itself skips DNS, TCP and TLS setup.
+    """
+
+    def __init__(self, model: str = "") -> None:
         # Load environment variables from the .env file
         base_dir = Path(__file__).resolve().parent.parent.parent
         load_dotenv(base_dir / ".env")
+        self.model = model or GEMINI_MODEL
 
-        # Initialize Gemini client and start a chat session
-        self.client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
-        self.chat = self._create_chat()
+        # Gemini client and chat sessions, set by the init thread
+        self.client = None
+        self.chat: Chat | None = None
+        self.next_chat: Chat | None = None  # Prepared in the background so reset_chat only swaps it in
+        self.types: Any = None  # The google.genai.types module
+        self.config = None
+        self.ready = threading.Event()
+        self.init_error: Exception | None = None
 
-    def _create_chat(self) -> Chat:
-        """Create a new Gemini chat session.
+        # Connection warm-up state
+        self.last_used = 0.0  # time.monotonic() of the last request on the pool
+        self.warming = False
+
+        self.init_thread = threading.Thread(target=self._initialize_client, name="gemini-init", daemon=True)
+        self.init_thread.start()
+
+    def is_ready(self) -> bool:
+        """Check whether client initialization has finished (successfully or not).
 
         Returns:
-            Chat: A new chat session instance.
+            bool: True once the init thread is done.
         """
-        return self.client.chats.create(model=MODEL, config=CONFIG)
+        return self.ready.is_set()
+
+    def wait_until_ready(self, timeout: float | None = READY_TIMEOUT) -> None:
+        """Block until the client is ready.
+
+        Raises TimeoutError if initialization does not finish in time and
+        RuntimeError if it failed, so the caller's error path reports it.
+
+        Args:
+            timeout (float | None, optional): Maximum seconds to wait; None waits forever.
+        """
+        if not self.ready.wait(timeout):
+            raise TimeoutError("Gemini client is still initializing")
+        if self.init_error is not None:
+            raise RuntimeError(f"Gemini client failed to initialize: {str(self.init_error)}")
+
+    def prewarm(self) -> None:
+        """Open or refresh the pooled connection in the background if it may have gone idle.
+
+        Cheap to call often (e.g. on every overlay show or screenshot): it
+        does nothing while the client is initializing, while a warm-up is
+        running, or if the pool was used within PREWARM_INTERVAL seconds.
+        """
+        if not self.is_ready() or self.init_error is not None or self.warming:
+            return
+        if time.monotonic() - self.last_used < PREWARM_INTERVAL:
+            return
+        self.warming = True
+        threading.Thread(target=self._warm_connection, name="gemini-prewarm", daemon=True).start()
 
     def reset_chat(self) -> None:
         """Reset the chat session, clearing all conversation history."""
-        self.chat = self._create_chat()
+        # Before the client is ready there is no history to clear; the init thread creates a fresh chat
+        if self.client is None:
+            return
+        self.chat = self.next_chat or self._create_chat()
+        self.next_chat = None
+        threading.Thread(target=self._prepare_next_chat, name="gemini-prepare", daemon=True).start()
 
     def send_message(
         self,
         user_input: str,
-        attachments: list[str] | None = None,
-        on_chunk: Callable[[str], None] | None = None
+        attachments: list[str | tuple[bytes, str] | CaptureBuffer] | None = None,
+        on_chunk: Callable[[str], None] | None = None,
+        cancel: threading.Event | None = None
     ) -> str:
         """Send a message and stream the response from the Gemini model.
 
         Args:
             user_input (str): The user's input text to send to the model.
-            attachments (list[str], optional): List of file paths to attach to the request.
+            attachments (list[str | tuple[bytes, str] | CaptureBuffer], optional): File paths, (data, mime_type) tuples or screenshots to attach.
             on_chunk (callable, optional): Callback invoked with each text chunk as it streams.
+            cancel (threading.Event, optional): When set, the stream is closed at the next chunk.
 
         Returns:
-            str: The full generated response text.
+            str: The full generated response text, or the part received before cancellation.
         """
+        start = time.perf_counter()
+        metrics.begin_request()
+        with tracer.span("wait for client", "ai"):
+            self.wait_until_ready()
+        types = self.types
+
         # Build message parts from attachments
         message: list[types.Part | str] = []
-        for filepath in attachments or []:
-            mime_type = mimetypes.guess_type(filepath)[0] or "application/octet-stream"
-            with open(filepath, "rb") as f:
+        upload_bytes = len(user_input.encode("utf-8"))
+        with tracer.span("read attachments", "ai", files=len(attachments or [])) as span:
+            for attachment in attachments or []:
+                data, mime_type = read_attachment(attachment)
+                upload_bytes += len(data)
                 message.append(
-                    types.Part.from_bytes(data=f.read(), mime_type=mime_type)
+                    types.Part.from_bytes(data=data, mime_type=mime_type)
                 )
-        message.append(user_input)
+            message.append(user_input)
+            span.args["bytes"] = upload_bytes
+        metrics.set(UPLOAD_BYTES, upload_bytes)
 
+        self.last_used = time.monotonic()
         full_response = ""
-        for chunk in self.chat.send_message_stream(message):
-            if chunk.text:
-                full_response += chunk.text
-                print(chunk.text, end="", flush=True)
-                if on_chunk is not None:
-                    try:
-                        on_chunk(chunk.text)
-                    except Exception:
-                        pass
-
-        return full_response
\ No newline at end of file
+        first_chunk_time = None
+        output_tokens = None
+        request_start = time.perf_counter_ns()
+        stream = self.chat.send_message_stream(message)
+        try:
+            for chunk in stream:
+                if cancel is not None and cancel.is_set():
+                    break  # Closing the stream below drops the connection instead of draining the rest
+                if chunk.usage_metadata is not None and chunk.usage_metadata.candidates_token_count:
+                    output_tokens = chunk.usage_metadata.candidates_token_count
+                if chunk.text:
+                    if first_chunk_time is None:
+                        first_chunk_time = time.perf_counter()
+                        metrics.set(TTFT_MS, (first_chunk_time - start) * 1000)
+                        first_chunk_ns = time.perf_counter_ns()
+                        tracer.complete("upload + time to first token", "ai", request_start, first_chunk_ns, bytes=upload_bytes)
+                    full_response += chunk.text
+                    if self.echo:
+                        print(chunk.text, end="", flush=True)
+                    if on_chunk is not None:
+                        try:
+                            on_chunk(chunk.text)
+                        except Exception:
+                            pass
+        finally:
+            stream.close()
+            self.last_used = time.monotonic()
+            if first_chunk_time is not None:
+                tracer.complete("stream", "ai", first_chunk_ns, chars=len(full_response))
+
+        # Generation speed after the first token; estimate ~4 characters per token if usage is missing
+        if first_chunk_time is not None:
+            elapsed = time.perf_counter() - first_chunk_time
+            tokens = output_tokens or len(full_response) / 4
+            if elapsed > 0:
+                metrics.set(TOKENS_PER_S, tokens / elapsed)
+
+        return full_response
+
+    def _initialize_client(self) -> None:
+        """Import the SDK, create the client and start a chat session (runs on the init thread)."""
+        try:
+            startup_profiler.mark("client init started")
+            from google import genai
+            from google.genai import types
+            startup_profiler.mark("google.genai imported")
+
+            self.types = types
+            self.config = types.GenerateContentConfig(
+                thinking_config=types.ThinkingConfig(thinking_budget=0)  # Disable thinking mode for faster responses
+            )
+            self.client = genai.Client(
+                api_key=os.getenv("GEMINI_API_KEY"),
+                http_options=types.HttpOptions(client_args=http_client_args()),
+            )
+            self.chat = self._create_chat()
+            self.next_chat = self._create_chat()
+            startup_profiler.mark("client ready")
+        except Exception as e:
+            self.init_error = e
+            print(f"Error initializing Gemini client: {str(e)}")
+            self.ready.set()
+            return
+
+        self.ready.set()
+        self.warming = True
+        self._warm_connection()  # Connect while the user is still looking at the screen
+
+    def _create_chat(self) -> "Chat":
+        """Create a new Gemini chat session.
+
+        Returns:
+            Chat: A new chat session instance.
+        """
+        return self.client.chats.create(model=self.model, config=self.config)
+
+    def _prepare_next_chat(self) -> None:
+        """Create the spare chat session and warm the connection for the next conversation."""
+        try:
+            self.next_chat = self._create_chat()
+        except Exception as e:
+            print(f"Error preparing Gemini chat: {str(e)}")
+        self.prewarm()
+
+    def _warm_connection(self) -> None:
+        """Make a lightweight request so the pooled connection is open and TLS is negotiated."""
+        try:
+            self.client.models.get(model=self.model)
+        except Exception as e:
+            print(f"Error pre-warming Gemini connection: {str(e)}")
+        finally:
+            self.last_used = time.monotonic()
+            self.warming = False
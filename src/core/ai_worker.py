@@ -0,0 +1,374 @@
+import itertools
+import multiprocessing
+import threading
+from multiprocessing import shared_memory
+from typing import Any, Callable
+
+from .ai_backend import AIBackend, create_backend, model_name
+from .ai_sender import READY_TIMEOUT
+from .capture_buffer import PNG_MIME_TYPE, CaptureBuffer
+from .metrics import REQUEST_METRICS, metrics
+from .startup_profiler import startup_profiler
+from .tracing import tracer
+
+
+SHARED_MEMORY_THRESHOLD = 64 * 1024  # In-memory attachments at least this large skip the pipe
+CLOSE_TIMEOUT = 2.0  # Seconds to wait for the worker to exit on close before terminating it
+
+
+class PendingRequest():
+    """State of one send_message call waiting on the worker process."""
+
+    def __init__(self, on_chunk: Callable[[str], None] | None, cancel: threading.Event | None) -> None:
+        self.on_chunk = on_chunk
+        self.cancel = cancel
+        self.cancel_sent = False
+        self.done = threading.Event()
+        self.response = ""
+        self.error: str | None = None
+        self.metrics: dict[str, float] = {}
+
+
+class AIWorkerClient(AIBackend):
+    """Drop-in replacement for AISender that runs the configured backend in a separate worker process.
+
+    The Gemini SDK's JSON and SSE parsing and the encoding of attachments hold
+    the GIL for long stretches. In a worker process they no longer delay the
+    keyboard hook or the UI thread. Requests, chunks and results travel over a
+    multiprocessing pipe, read by one reader thread here. Chunks are passed to
+    on_chunk on that thread, so AIReceiver can emit its signals from there just
+    as it does from its own generation thread. The worker's trace spans for a
+    request come back with its result and are merged into this process's tracer.
+
+    Attachments given as file paths are read by the worker itself. Screenshots
+    (CaptureBuffer) already keep their PNG in shared memory, so the worker maps
+    that block by name and no image bytes cross the pipe. Other in-memory
+    attachments ((data, mime_type) tuples) of SHARED_MEMORY_THRESHOLD bytes or
+    more are copied once into shared memory instead of being pickled.
+    """
+
+    def __init__(self, ai_config: dict[str, Any]) -> None:
+        self.ai_config = ai_config  # The "ai" config section; the worker creates the backend it selects
+        self.model = model_name(ai_config)
+        self.send_lock = threading.Lock()  # Pipe writes come from the UI and AIReceiver threads
+        self.start_lock = threading.Lock()
+        self.requests: dict[int, PendingRequest] = {}
+        self.request_ids = itertools.count(1)
+        self._start_worker()
+
+    def is_ready(self) -> bool:
+        """Check whether the worker has finished initializing its client (successfully or not).
+
+        Returns:
+            bool: True once the worker has reported in.
+        """
+        return self.ready.is_set()
+
+    def wait_until_ready(self, timeout: float | None = READY_TIMEOUT) -> None:
+        """Block until the worker's client is ready.
+
+        Raises TimeoutError if the worker does not report in time and
+        RuntimeError if its initialization failed or it exited.
+
+        Args:
+            timeout (float | None, optional): Maximum seconds to wait; None waits forever.
+        """
+        if not self.ready.wait(timeout):
+            raise TimeoutError("AI worker process is still initializing")
+        if self.init_error is not None:
+            raise RuntimeError(self.init_error)
+
+    def prewarm(self) -> None:
+        """Ask the worker to open or refresh its pooled connection (see AISender.prewarm)."""
+        if self.is_ready() and self.init_error is None:
+            try:
+                self._send(("prewarm",))
+            except OSError:
+                pass  # The worker exited; the next send restarts it
+
+    def reset_chat(self) -> None:
+        """Reset the worker's chat session; requests sent afterwards start a new conversation."""
+        try:
+            self._send(("reset",))
+        except OSError:
+            pass  # The worker exited; a restarted worker starts with a fresh chat
+
+    def send_message(
+        self,
+        user_input: str,
+        attachments: list[str | tuple[bytes, str] | CaptureBuffer] | None = None,
+        on_chunk: Callable[[str], None] | None = None,
+        cancel: threading.Event | None = None
+    ) -> str:
+        """Send a message through the worker process and stream the response.
+
+        Blocks the calling thread until the response is complete, like AISender.send_message.
+
+        Args:
+            user_input (str): The user's input text to send to the model.
+            attachments (list[str | tuple[bytes, str] | CaptureBuffer], optional): File paths, (data, mime_type) tuples or screenshots; screenshots must stay retained until this returns.
+            on_chunk (callable, optional): Callback invoked with each text chunk as it streams.
+            cancel (threading.Event, optional): When set, the worker closes the stream at the next chunk.
+
+        Returns:
+            str: The full generated response text, or the part received before cancellation.
+        """
+        metrics.begin_request()
+        with self.start_lock:
+            if not self.process.is_alive():
+                print("AI worker process exited; restarting it")
+                self._start_worker()
+        with tracer.span("wait for worker", "ai"):
+            self.wait_until_ready()
+
+        request_id = next(self.request_ids)
+        pending = PendingRequest(on_chunk, cancel)
+        self.requests[request_id] = pending
+        blocks = []
+        try:
+            specs = []
+            for attachment in attachments or []:
+                if isinstance(attachment, str):
+                    specs.append(("path", attachment))
+                    continue
+                if isinstance(attachment, CaptureBuffer):
+                    specs.append(("shared", attachment.shared_name, attachment.png_size, PNG_MIME_TYPE))
+                    continue
+                data, mime_type = attachment
+                if len(data) < SHARED_MEMORY_THRESHOLD:
+                    specs.append(("bytes", bytes(data), mime_type))
+                    continue
+                block = shared_memory.SharedMemory(create=True, size=len(data))
+                block.buf[:len(data)] = data
+                blocks.append(block)  # Kept open until the worker is done; on Windows the block dies with its last handle
+                specs.append(("shared", block.name, len(data), mime_type))
+
+            with tracer.span("worker request", "ai", attachments=len(specs)):
+                self._send(("send", request_id, user_input, specs, tracer.request_id()))
+                pending.done.wait()
+        finally:
+            self.requests.pop(request_id, None)
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+        for name, value in pending.metrics.items():
+            metrics.set(name, value)
+        if pending.error is not None:
+            raise RuntimeError(pending.error)
+        return pending.response
+
+    def close(self) -> None:
+        """Ask the worker process to exit, wait briefly for it, and close the pipe."""
+        try:
+            self._send(None)
+        except OSError:
+            pass
+        self.process.join(CLOSE_TIMEOUT)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.connection.close()
+
+    def _start_worker(self) -> None:
+        """Start the worker process and the thread reading its messages."""
+        context = multiprocessing.get_context("spawn")
+        self.connection, worker_connection = context.Pipe()
+        self.ready = threading.Event()
+        self.init_error: str | None = None
+        self.process = context.Process(target=_worker_main, args=(worker_connection, self.ai_config), name="ai-worker", daemon=True)
+        self.process.start()
+        worker_connection.close()  # Only the worker holds its end, so the reader sees EOF if the worker dies
+        threading.Thread(target=self._read_loop, args=(self.connection, self.ready), name="ai-worker-reader", daemon=True).start()
+
+    def _send(self, message: Any) -> None:
+        """Write one message to the worker.
+
+        Args:
+            message (Any): A picklable command tuple, or None to stop the worker.
+        """
+        with self.send_lock:
+            self.connection.send(message)
+
+    def _read_loop(self, connection: Any, ready: threading.Event) -> None:
+        """Dispatch messages from one worker process until its end of the pipe closes (runs on the reader thread).
+
+        Args:
+            connection (Any): The client's end of that worker's pipe.
+            ready (threading.Event): That worker's ready event.
+        """
+        while True:
+            try:
+                message = connection.recv()
+            except (EOFError, OSError):
+                break
+
+            kind = message[0]
+            if kind == "ready":
+                self.init_error = message[1]
+                ready.set()
+                startup_profiler.mark("client ready")
+                continue
+
+            pending = self.requests.get(message[1])
+            if pending is None:
+                continue  # The caller gave up on this request
+            if kind == "chunk":
+                if pending.cancel is not None and pending.cancel.is_set() and not pending.cancel_sent:
+                    pending.cancel_sent = True
+                    try:
+                        self._send(("cancel", message[1]))
+                    except OSError:
+                        pass
+                if pending.on_chunk is not None:
+                    try:
+                        pending.on_chunk(message[2])
+                    except Exception:
+                        pass
+            elif kind == "done":
+                pending.response, pending.metrics = message[2], message[3]
+                tracer.merge(message[4], message[5], "ai-worker")
+                pending.done.set()
+            elif kind == "error":
+                pending.error = message[2]
+                tracer.merge(message[3], message[4], "ai-worker")
+                pending.done.set()
+
+        # The worker exited: fail the waiting requests; the next send restarts it
+        if not ready.is_set():
+            self.init_error = "AI worker process exited"
+            ready.set()
+        for pending in list(self.requests.values()):
+            pending.error = "AI worker process exited"
+            pending.done.set()
+
+
+def _load_attachment(spec: tuple) -> str | tuple[bytes, str]:
+    """Turn an attachment spec from the pipe into an AISender attachment.
+
+    Args:
+        spec (tuple): ("path", path), ("bytes", data, mime_type) or ("shared", name, size, mime_type).
+
+    Returns:
+        str | tuple[bytes, str]: A file path or (data, mime_type).
+    """
+    kind = spec[0]
+    if kind == "path":
+        return spec[1]
+    if kind == "bytes":
+        return spec[1], spec[2]
+    _, name, size, mime_type = spec
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        return bytes(block.buf[:size]), mime_type  # The SDK needs its own bytes object
+    finally:
+        block.close()
+
+
+def _serve_request(
+    sender: AIBackend,
+    connection: Any,
+    send_lock: threading.Lock,
+    request_id: int,
+    user_input: str,
+    specs: list[tuple],
+    trace_request: int,
+    cancel: threading.Event
+) -> None:
+    """Run one request in the worker process and stream its chunks back.
+
+    The request's spans are recorded under the client's trace request ID and
+    sent back with the result, so they appear in the client's trace.
+
+    Args:
+        sender (AIBackend): The worker's backend.
+        connection (Any): The worker's end of the pipe.
+        send_lock (threading.Lock): Serializes writes to the pipe.
+        request_id (int): The client's request ID.
+        user_input (str): The user's input text.
+        specs (list[tuple]): Attachment specs (see _load_attachment).
+        trace_request (int): The client's trace request ID.
+        cancel (threading.Event): Set when the client cancels the request.
+    """
+    def send(message: tuple) -> None:
+        """Write one message to the client.
+
+        Args:
+            message (tuple): The message.
+        """
+        with send_lock:
+            connection.send(message)
+
+    tracer.bind_request(trace_request)
+    try:
+        attachments = [_load_attachment(spec) for spec in specs]
+        response = sender.send_message(user_input, attachments, lambda text: send(("chunk", request_id, text)), cancel)
+        snapshot = metrics.snapshot()
+        send((
+            "done", request_id, response, {name: snapshot[name] for name in REQUEST_METRICS if name in snapshot},
+            *tracer.request_events(trace_request),
+        ))
+    except Exception as e:
+        send(("error", request_id, str(e), *tracer.request_events(trace_request)))
+
+
+def _worker_main(connection: Any, ai_config: dict[str, Any]) -> None:
+    """AI worker process entry point: serve requests from the client until told to stop.
+
+    Each request runs on its own thread, as in-process requests do, so a new
+    message never waits for an interrupted stream to finish.
+
+    Args:
+        connection (Any): The worker's end of the pipe.
+        ai_config (dict[str, Any]): The validated "ai" config section selecting the backend.
+    """
+    sender = create_backend(ai_config)
+    send_lock = threading.Lock()
+    cancels: dict[int, threading.Event] = {}  # Request ID -> cancel event of requests still running
+
+    def report_ready() -> None:
+        """Tell the client once the SDK and client are initialized."""
+        error = None
+        try:
+            sender.wait_until_ready(None)
+        except Exception as e:
+            error = str(e)
+        with send_lock:
+            connection.send(("ready", error))
+
+    def serve(request_id: int, user_input: str, specs: list[tuple], trace_request: int) -> None:
+        """Run one request and forget its cancel event afterwards.
+
+        Args:
+            request_id (int): The client's request ID.
+            user_input (str): The user's input text.
+            specs (list[tuple]): Attachment specs (see _load_attachment).
+            trace_request (int): The client's trace request ID.
+        """
+        try:
+            _serve_request(sender, connection, send_lock, request_id, user_input, specs, trace_request, cancels[request_id])
+        finally:
+            cancels.pop(request_id, None)
+
+    threading.Thread(target=report_ready, daemon=True).start()
+
+    while True:
+        try:
+            message = connection.recv()
+        except (EOFError, OSError):
+            break  # The client exited
+        if message is None:
+            break
+
+        kind = message[0]
+        if kind == "send":
+            _, request_id, user_input, specs, trace_request = message
+            cancels[request_id] = threading.Event()
+            threading.Thread(target=serve, args=(request_id, user_input, specs, trace_request), daemon=True).start()
+        elif kind == "cancel":
+            cancel = cancels.get(message[1])
+            if cancel is not None:
+                cancel.set()
+        elif kind == "reset":
+            sender.reset_chat()
+        elif kind == "prewarm":
+            sender.prewarm()
@@ -0,0 +1,241 @@
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, NamedTuple
+
+from PyQt6.QtGui import QImage
+
+from .ai_backend import AIBackend, create_backend
+from .capture_buffer import CaptureBuffer
+from .screenshot_manager import encode_png, stitch_screenshots
+from .tracing import tracer
+
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".webp")
+DEFAULT_CONCURRENCY = 4
+MAX_CONCURRENCY = 32  # Each slot holds its own chat session and pooled connection
+
+
+class BatchItem(NamedTuple):
+    """One set of screenshots sent as a single request."""
+
+    name: str  # File or folder name without extension; also names the Markdown output
+    paths: tuple[str, ...]
+
+
+class BatchResult(NamedTuple):
+    """The outcome of one batch request."""
+
+    item: BatchItem
+    response: str
+    error: str | None
+    screenshots: int  # Images sent, after stitching
+    upload_bytes: int
+    ttft_ms: float | None  # From sending to the first chunk
+    total_ms: float  # Including loading and encoding the screenshots
+
+
+def find_items(directory: str) -> list[BatchItem]:
+    """List the screenshot sets in a directory.
+
+    Each image file is a set of its own, and each subfolder is one set made
+    of the images directly inside it (in name order, e.g. the captures of a
+    problem that needed scrolling).
+
+    Args:
+        directory (str): The directory to scan.
+
+    Returns:
+        list[BatchItem]: The sets in name order; subfolders without images are skipped.
+    """
+    items = []
+    for entry in sorted(os.scandir(directory), key=lambda entry: entry.name):
+        name, extension = os.path.splitext(entry.name)
+        if entry.is_dir():
+            paths = tuple(
+                os.path.join(entry.path, file)
+                for file in sorted(os.listdir(entry.path))
+                if file.lower().endswith(IMAGE_EXTENSIONS)
+            )
+            if paths:
+                items.append(BatchItem(entry.name, paths))
+        elif extension.lower() in IMAGE_EXTENSIONS:
+            items.append(BatchItem(name, (entry.path,)))
+    return items
+
+
+def load_screenshot(path: str) -> CaptureBuffer:
+    """Load an image file into a CaptureBuffer and encode it like a fresh capture.
+
+    The image is converted to the frame layout mss produces and re-encoded
+    with encode_png, so a batch uploads exactly what the overlay would for
+    the same screen. Raises ValueError if the file cannot be read.
+
+    Args:
+        path (str): The image file.
+
+    Returns:
+        CaptureBuffer: The encoded screenshot, holding one reference for the caller.
+    """
+    image = QImage(path)
+    if image.isNull():
+        raise ValueError(f"cannot read image {path}")
+    image = image.convertToFormat(QImage.Format.Format_RGB32)
+    pixels = bytearray(image.constBits().asstring(image.sizeInBytes()))  # 32-bit rows are never padded
+    buffer = CaptureBuffer(os.path.basename(path), pixels, image.width(), image.height())
+    try:
+        encode_png(buffer)
+    except Exception:
+        buffer.release()
+        raise
+    return buffer
+
+
+class BatchRunner():
+    """Sends screenshot sets with one prompt through a pool of AI backends, a bounded number at a time.
+
+    Each of the concurrency worker threads creates its own backend from the
+    "ai" config section, exactly as the overlay does, and keeps it (with its
+    pooled keep-alive connection) for every set it handles. The chat is reset
+    before each set, so sets never see each other's screenshots or answers.
+    Screenshots are loaded into CaptureBuffers, encoded and optionally
+    stitched with the same code the overlay uses at send time.
+
+    Raises ValueError if concurrency is out of range.
+
+    Args:
+        ai_config (dict[str, Any]): The validated "ai" config section.
+        prompt (str): The message sent with every set.
+        concurrency (int, optional): Requests in flight at once (1 to MAX_CONCURRENCY).
+        stitch (bool, optional): Merge overlapping scroll captures within a set (see capture.stitch).
+        on_chunk (Callable[[BatchItem, str], None] | None, optional): Called with each streamed chunk, from a worker thread.
+        on_result (Callable[[BatchResult], None] | None, optional): Called as each set finishes, from a worker thread.
+    """
+
+    def __init__(
+        self,
+        ai_config: dict[str, Any],
+        prompt: str,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        stitch: bool = False,
+        on_chunk: Callable[[BatchItem, str], None] | None = None,
+        on_result: Callable[[BatchResult], None] | None = None
+    ) -> None:
+        if not 1 <= concurrency <= MAX_CONCURRENCY:
+            raise ValueError(f"concurrency must be between 1 and {MAX_CONCURRENCY}")
+        self.ai_config = ai_config
+        self.prompt = prompt
+        self.concurrency = concurrency
+        self.stitch = stitch
+        self.on_chunk = on_chunk
+        self.on_result = on_result
+        self.cancel_event = threading.Event()
+        self.lock = threading.Lock()
+        self.results: list[BatchResult] = []
+
+    def run(self, items: list[BatchItem], repeat: int = 1) -> list[BatchResult]:
+        """Process every set and wait until all are done or the run is cancelled.
+
+        Args:
+            items (list[BatchItem]): The sets to send.
+            repeat (int, optional): Send each set this many times (for load tests).
+
+        Returns:
+            list[BatchResult]: One result per request sent, in completion order.
+        """
+        jobs: queue.Queue[BatchItem] = queue.Queue()
+        for round_index in range(repeat):
+            for item in items:
+                jobs.put(item if repeat == 1 else item._replace(name=f"{item.name}-{round_index + 1}"))
+
+        # Using threading instead of QThread due to compilation issues with Nuitka
+        workers = [
+            threading.Thread(target=self._worker_loop, args=(jobs,), name=f"batch-worker-{index}", daemon=True)
+            for index in range(min(self.concurrency, jobs.qsize()))
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            while worker.is_alive():
+                worker.join(0.2)  # Short waits keep Ctrl+C responsive in the calling thread
+        return list(self.results)
+
+    def cancel(self) -> None:
+        """Close the streams in flight and skip the sets not started yet."""
+        self.cancel_event.set()
+
+    def _worker_loop(self, jobs: queue.Queue) -> None:
+        """Create a backend and process sets until none are left (runs on a batch worker).
+
+        Args:
+            jobs (queue.Queue): The sets waiting to be sent.
+        """
+        init_error = None
+        backend = create_backend(self.ai_config)
+        backend.echo = False  # Responses are reported through on_chunk and on_result only
+        try:
+            backend.wait_until_ready()
+        except Exception as e:
+            init_error = f"Error initializing AI client: {str(e)}"
+
+        while not self.cancel_event.is_set():
+            try:
+                item = jobs.get_nowait()
+            except queue.Empty:
+                return
+            if init_error is not None:
+                result = BatchResult(item, "", init_error, 0, 0, None, 0.0)
+            else:
+                result = self._process(backend, item)
+            with self.lock:
+                self.results.append(result)
+            if self.on_result is not None:
+                self.on_result(result)
+
+    def _process(self, backend: AIBackend, item: BatchItem) -> BatchResult:
+        """Send one set in a fresh chat and measure it.
+
+        Args:
+            backend (AIBackend): This worker's backend.
+            item (BatchItem): The set to send.
+
+        Returns:
+            BatchResult: The response or error with its timings.
+        """
+        buffers: list[CaptureBuffer] = []
+        start = time.perf_counter()
+        sent = start
+        first_chunk: float | None = None
+
+        def on_chunk(text: str) -> None:
+            """Note the time to first token and pass the chunk on.
+
+            Args:
+                text (str): The chunk.
+            """
+            nonlocal first_chunk
+            if first_chunk is None:
+                first_chunk = time.perf_counter()
+            if self.on_chunk is not None:
+                self.on_chunk(item, text)
+
+        try:
+            with tracer.span("batch item", "batch", item=item.name, screenshots=len(item.paths)):
+                for path in item.paths:
+                    buffers.append(load_screenshot(path))
+                if self.stitch and len(buffers) > 1:
+                    buffers = stitch_screenshots(buffers)
+                upload_bytes = sum(buffer.png_size for buffer in buffers) + len(self.prompt.encode("utf-8"))
+                backend.reset_chat()  # Each set is its own conversation
+                sent = time.perf_counter()
+                response = backend.send_message(self.prompt, buffers or None, on_chunk, self.cancel_event)
+            error = "cancelled" if self.cancel_event.is_set() else None
+        except Exception as e:
+            response, error, upload_bytes = "", str(e), 0
+        finally:
+            for buffer in buffers:
+                buffer.release()
+
+        ttft_ms = (first_chunk - sent) * 1000 if first_chunk is not None else None
+        return BatchResult(item, response, error, len(buffers), upload_bytes, ttft_ms, (time.perf_counter() - start) * 1000)
@@ -0,0 +1,93 @@
+import threading
+from multiprocessing import shared_memory
+
+
+PNG_MIME_TYPE = "image/png"
+
+
+class CaptureBuffer():
+    """One captured frame, shared by the encoder, the thumbnail and the upload without copying.
+
+    pixels is the BGRA frame exactly as grabbed (Format_RGB32 when wrapped in a
+    QImage); the PNG encoder, the dedup hash and the thumbnail scaler all wrap
+    it instead of taking their own copy. The encoded PNG is written once into a
+    SharedMemory block, which the AI worker process maps by name instead of
+    receiving the bytes through its pipe.
+
+    The buffer is reference counted. Whoever creates it holds the first
+    reference; a consumer that may outlive its current holder calls retain()
+    first and release() when done. The last release() frees the pixels and the
+    shared block at once rather than whenever the garbage collector gets to them.
+    """
+
+    def __init__(self, name: str, pixels: bytearray, width: int, height: int) -> None:
+        self.name = name  # Identifies the screenshot in the pending list and the tray
+        self.pixels: bytearray | None = pixels
+        self.width = width
+        self.height = height
+        self.block: shared_memory.SharedMemory | None = None
+        self.png_size = 0
+        self.refs = 1
+        self.lock = threading.Lock()
+
+    @property
+    def shared_name(self) -> str:
+        """Name of the shared memory block holding the encoded PNG."""
+        if self.block is None:
+            raise ValueError(f"{self.name} has no encoded image")
+        return self.block.name
+
+    def set_png(self, data: bytes) -> None:
+        """Store the encoded image in a new shared memory block.
+
+        Args:
+            data (bytes): The PNG-encoded frame.
+        """
+        block = shared_memory.SharedMemory(create=True, size=max(1, len(data)))
+        block.buf[:len(data)] = data
+        self.block = block
+        self.png_size = len(data)
+
+    def read_png(self) -> bytes:
+        """Copy the encoded image out of shared memory (the Gemini SDK needs its own bytes object).
+
+        Returns:
+            bytes: The PNG-encoded frame.
+        """
+        with self.lock:
+            if self.block is None:
+                raise ValueError(f"{self.name} has no encoded image or was already released")
+            with self.block.buf[:self.png_size] as view:
+                return bytes(view)
+
+    def retain(self) -> "CaptureBuffer":
+        """Take another reference to the buffer.
+
+        Raises ValueError if the buffer has already been freed.
+
+        Returns:
+            CaptureBuffer: This buffer, for chaining.
+        """
+        with self.lock:
+            if self.refs <= 0:
+                raise ValueError(f"{self.name} was already released")
+            self.refs += 1
+        return self
+
+    def release(self) -> None:
+        """Drop one reference, freeing the pixels and the shared block with the last one."""
+        with self.lock:
+            if self.refs <= 0:
+                return
+            self.refs -= 1
+            if self.refs > 0:
+                return
+            self.pixels = None
+            block, self.block = self.block, None
+
+        if block is not None:
+            try:
+                block.close()
+                block.unlink()
+            except Exception as e:
+                print(f"Error releasing capture buffer: {str(e)}")
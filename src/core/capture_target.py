@@ -0,0 +1,132 @@
+CURSOR_MONITOR = "cursor_monitor"
+OVERLAY_MONITOR = "overlay_monitor"
+PRIMARY_MONITOR = "primary_monitor"
+FIXED_REGION = "fixed_region"
+PICKED_REGION = "picked_region"
+
+CAPTURE_TARGETS = (CURSOR_MONITOR, OVERLAY_MONITOR, PRIMARY_MONITOR, FIXED_REGION, PICKED_REGION)
+
+# All areas use the mss monitor format: {"left": int, "top": int, "width": int, "height": int}
+# Monitor lists follow mss as well: index 0 is the virtual screen spanning all monitors, 1 is the primary monitor
+
+
+def resolve_capture_area(
+    target: str,
+    monitors: list[dict[str, int]],
+    cursor_pos: tuple[int, int] | None = None,
+    overlay_rect: dict[str, int] | None = None,
+    region: dict[str, int] | None = None
+) -> dict[str, int]:
+    """Resolve a capture target to the screen area that should be grabbed.
+
+    Falls back to the primary monitor whenever the target cannot be resolved
+    (e.g. no region saved yet, or the cursor position is unknown).
+
+    Args:
+        target (str): One of CAPTURE_TARGETS.
+        monitors (list[dict[str, int]]): Monitor list in mss format.
+        cursor_pos (tuple[int, int], optional): Cursor position in physical pixels.
+        overlay_rect (dict[str, int], optional): Overlay window area in physical pixels.
+        region (dict[str, int], optional): Fixed or picked region in physical pixels.
+
+    Returns:
+        dict[str, int]: The area to capture.
+    """
+    area = None
+    if target == CURSOR_MONITOR and cursor_pos is not None:
+        area = monitor_at_point(monitors, *cursor_pos)
+    elif target == OVERLAY_MONITOR and overlay_rect is not None:
+        area = monitor_for_rect(monitors, overlay_rect)
+    elif target in (FIXED_REGION, PICKED_REGION) and region is not None:
+        area = clamp_region(monitors, region)
+
+    if area is None:
+        area = primary_monitor(monitors)
+    return dict(area)
+
+
+def primary_monitor(monitors: list[dict[str, int]]) -> dict[str, int]:
+    """Return the primary monitor, or the virtual screen if only it is listed.
+
+    Args:
+        monitors (list[dict[str, int]]): Monitor list in mss format.
+
+    Returns:
+        dict[str, int]: The primary monitor area.
+    """
+    return monitors[1] if len(monitors) > 1 else monitors[0]
+
+
+def monitor_at_point(monitors: list[dict[str, int]], x: int, y: int) -> dict[str, int] | None:
+    """Return the physical monitor containing a point.
+
+    Args:
+        monitors (list[dict[str, int]]): Monitor list in mss format.
+        x (int): Point x-coordinate in physical pixels.
+        y (int): Point y-coordinate in physical pixels.
+
+    Returns:
+        dict[str, int] | None: The monitor containing the point, or None if the point is off-screen.
+    """
+    for monitor in monitors[1:]:
+        if (
+            monitor["left"] <= x < monitor["left"] + monitor["width"] and
+            monitor["top"] <= y < monitor["top"] + monitor["height"]
+        ):
+            return monitor
+    return None
+
+
+def monitor_for_rect(monitors: list[dict[str, int]], rect: dict[str, int]) -> dict[str, int] | None:
+    """Return the physical monitor that holds the largest part of a rectangle.
+
+    Args:
+        monitors (list[dict[str, int]]): Monitor list in mss format.
+        rect (dict[str, int]): The rectangle to locate in physical pixels.
+
+    Returns:
+        dict[str, int] | None: The best matching monitor, or None if the rectangle is entirely off-screen.
+    """
+    best_monitor = None
+    best_overlap = 0
+    for monitor in monitors[1:]:
+        overlap = _intersection(monitor, rect)
+        area = overlap["width"] * overlap["height"] if overlap is not None else 0
+        if area > best_overlap:
+            best_monitor = monitor
+            best_overlap = area
+    return best_monitor
+
+
+def clamp_region(monitors: list[dict[str, int]], region: dict[str, int]) -> dict[str, int] | None:
+    """Clip a region to the virtual screen so mss never grabs off-screen pixels.
+
+    Args:
+        monitors (list[dict[str, int]]): Monitor list in mss format.
+        region (dict[str, int]): The requested region in physical pixels.
+
+    Returns:
+        dict[str, int] | None: The clipped region, or None if nothing of it is on-screen.
+    """
+    if region["width"] <= 0 or region["height"] <= 0:
+        return None
+    return _intersection(monitors[0], region)
+
+
+def _intersection(a: dict[str, int], b: dict[str, int]) -> dict[str, int] | None:
+    """Compute the intersection of two areas.
+
+    Args:
+        a (dict[str, int]): The first area.
+        b (dict[str, int]): The second area.
+
+    Returns:
+        dict[str, int] | None: The overlapping area, or None if the areas do not overlap.
+    """
+    left = max(a["left"], b["left"])
+    top = max(a["top"], b["top"])
+    right = min(a["left"] + a["width"], b["left"] + b["width"])
+    bottom = min(a["top"] + a["height"], b["top"] + b["height"])
+    if right <= left or bottom <= top:
+        return None
+    return {"left": left, "top": top, "width": right - left, "height": bottom - top}
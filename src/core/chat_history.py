@@ -0,0 +1,200 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import NamedTuple
+
+
+HISTORY_PATH = os.path.join(os.getcwd(), "src", "data", "history.db")
+MAX_RESULTS = 20
+SNIPPET_TOKENS = 12  # Words of context around each match in result snippets
+MATCH_START = "\x02"  # Wrap matched words in snippets; the search box renders them highlighted
+MATCH_END = "\x03"
+
+CODE_BLOCK_PATTERN = re.compile(r"```[^\n]*\n?(.*?)(?:```|$)", re.DOTALL)
+INLINE_CODE_PATTERN = re.compile(r"`([^`\n]+)`")
+QUERY_TERM_PATTERN = re.compile(r'(code:|text:)?("[^"]*"?|\S+)')
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS messages (
+        id INTEGER PRIMARY KEY,
+        conversation INTEGER NOT NULL,
+        role TEXT NOT NULL,
+        content TEXT NOT NULL,
+        created REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS messages_conversation ON messages (conversation, id);
+    CREATE VIRTUAL TABLE IF NOT EXISTS message_index USING fts5(
+        text,
+        code,
+        tokenize = "unicode61 remove_diacritics 2 tokenchars '_'",
+        prefix = '2 3'
+    );
+"""
+
+
+class StoredMessage(NamedTuple):
+    """A persisted chat message."""
+
+    id: int
+    conversation: int
+    role: str  # "user" or "assistant"
+    content: str
+    created: float  # Unix time
+
+
+class SearchHit(NamedTuple):
+    """A message matching a search query."""
+
+    message: StoredMessage
+    snippet: str  # Matched words wrapped in MATCH_START / MATCH_END
+
+
+def split_code(content: str) -> tuple[str, str]:
+    """Separate fenced and inline code from prose so each can be indexed on its own.
+
+    Args:
+        content (str): The raw markdown message.
+
+    Returns:
+        tuple[str, str]: The prose with code removed, and the code joined by newlines.
+    """
+    code = [match.group(1) for match in CODE_BLOCK_PATTERN.finditer(content)]
+    prose = CODE_BLOCK_PATTERN.sub("\n", content)
+    code += [match.group(1) for match in INLINE_CODE_PATTERN.finditer(prose)]
+    prose = INLINE_CODE_PATTERN.sub(" ", prose)
+    return prose, "\n".join(code)
+
+
+def build_match_query(query: str, prefix_last: bool = False) -> str:
+    """Translate a search box query into an FTS5 MATCH expression.
+
+    Words must all match (in any order), "quoted words" match as a phrase,
+    a trailing * matches any word starting with the prefix, and a code: or
+    text: prefix restricts a term to code blocks or prose. Everything else
+    is quoted, so user input never produces an FTS5 syntax error.
+
+    Args:
+        query (str): The query typed by the user.
+        prefix_last (bool, optional): Treat the last word as a prefix (for search as you type).
+
+    Returns:
+        str: The MATCH expression, or "" if the query has no searchable terms.
+    """
+    terms = []
+    matches = list(QUERY_TERM_PATTERN.finditer(query))
+    for index, match in enumerate(matches):
+        column, term = match.group(1), match.group(2)
+        is_phrase = term.startswith('"')
+        is_prefix = term.endswith("*") and not is_phrase
+        words = term.strip('"*').replace('"', " ").strip()
+        if not re.search(r"\w", words):
+            continue
+        if prefix_last and index == len(matches) - 1 and not is_phrase and not query.endswith(" "):
+            is_prefix = True
+        expression = f'"{words}"' + ("*" if is_prefix else "")
+        if column is not None:
+            expression = f"{column[:-1]} : {expression}"
+        terms.append(expression)
+    return " ".join(terms)
+
+
+class ChatHistory():
+    """Persists chat messages in SQLite and keeps a full-text index of them up to date.
+
+    Each message is added to an FTS5 inverted index in the same transaction
+    that stores it, so the index never needs rebuilding. Prose and code are
+    indexed as separate columns. Queries support words, "phrases", prefix*
+    and code: / text: column filters (see build_match_query) and take a few
+    milliseconds over tens of thousands of messages.
+
+    A conversation is the run of messages between chat clears.
+
+    Args:
+        path (str, optional): The database file; created if missing.
+    """
+
+    def __init__(self, path: str = HISTORY_PATH) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()  # One connection shared by the UI and any background readers
+        with self.lock:
+            self.connection.execute("PRAGMA journal_mode = WAL")
+            self.connection.execute("PRAGMA synchronous = NORMAL")  # WAL stays consistent; skips an fsync per message
+            self.connection.executescript(SCHEMA)
+            row = self.connection.execute("SELECT MAX(conversation) FROM messages").fetchone()
+        self.conversation = (row[0] or 0) + 1
+
+    def add_message(self, role: str, content: str) -> int:
+        """Store a message in the current conversation and index it.
+
+        Args:
+            role (str): "user" or "assistant".
+            content (str): The raw message text.
+
+        Returns:
+            int: The new message ID.
+        """
+        text, code = split_code(content)
+        with self.lock, self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO messages (conversation, role, content, created) VALUES (?, ?, ?, ?)",
+                (self.conversation, role, content, time.time()),
+            )
+            message_id = cursor.lastrowid
+            self.connection.execute("INSERT INTO message_index (rowid, text, code) VALUES (?, ?, ?)", (message_id, text, code))
+        return message_id
+
+    def start_conversation(self) -> None:
+        """Put the following messages in a new conversation (called when the chat is cleared)."""
+        self.conversation += 1
+
+    def search(self, query: str, limit: int = MAX_RESULTS, prefix_last: bool = False) -> list[SearchHit]:
+        """Find the most recent messages matching a query.
+
+        Args:
+            query (str): The query typed by the user (see build_match_query).
+            limit (int, optional): Maximum number of hits.
+            prefix_last (bool, optional): Treat the last word as a prefix (for search as you type).
+
+        Returns:
+            list[SearchHit]: Hits, newest first.
+        """
+        expression = build_match_query(query, prefix_last)
+        if not expression:
+            return []
+        with self.lock:
+            rows = self.connection.execute(
+                f"""
+                SELECT m.id, m.conversation, m.role, m.content, m.created,
+                       snippet(message_index, -1, ?, ?, '…', {SNIPPET_TOKENS})
+                FROM message_index JOIN messages AS m ON m.id = message_index.rowid
+                WHERE message_index MATCH ?
+                ORDER BY message_index.rowid DESC
+                LIMIT ?
+                """,
+                (MATCH_START, MATCH_END, expression, limit),
+            ).fetchall()
+        return [SearchHit(StoredMessage(*row[:5]), row[5]) for row in rows]
+
+    def get_conversation(self, conversation: int) -> list[StoredMessage]:
+        """Load all messages of a conversation in order.
+
+        Args:
+            conversation (int): The conversation ID.
+
+        Returns:
+            list[StoredMessage]: The messages, oldest first.
+        """
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT id, conversation, role, content, created FROM messages WHERE conversation = ? ORDER BY id",
+                (conversation,),
+            ).fetchall()
+        return [StoredMessage(*row) for row in rows]
+
+    def close(self) -> None:
+        """Close the database."""
+        with self.lock:
+            self.connection.close()
@@ -0,0 +1,461 @@
+import copy
+import json
+import os
+from typing import Any
+
+from PyQt6.QtCore import QFileSystemWatcher, QObject, QTimer, pyqtSignal
+
+from core.ai_backend import AI_BACKENDS, GEMINI_BACKEND
+from core.capture_target import CAPTURE_TARGETS, CURSOR_MONITOR
+from core.keyboard_hook import parse_hotkey
+
+
+CONFIG_PATH = os.path.join(os.getcwd(), "src", "data", "config.json")
+
+# Built-in actions and their default hotkeys; set a hotkey to null or "" in config.json to disable it
+DEFAULT_HOTKEYS = {
+    "toggle_window": "Ctrl+E",
+    "quit": "Ctrl+Shift+Q",
+    "move_left": "Ctrl+Alt+Left",
+    "move_right": "Ctrl+Alt+Right",
+    "move_up": "Ctrl+Alt+Up",
+    "move_down": "Ctrl+Alt+Down",
+    "scroll_up": "Ctrl+Shift+Up",
+    "scroll_down": "Ctrl+Shift+Down",
+    "screenshot": "Ctrl+Shift+S",
+    "pick_region": "Ctrl+Shift+R",
+    "dictation": "Ctrl+Shift+M",
+    "minimize": "Ctrl+Q",
+    "clear_chat": "Ctrl+N",
+    "search": "Ctrl+Shift+F",
+    "watch": "Ctrl+Shift+W",
+    "perf_hud": "Ctrl+Shift+P",
+    "export_trace": "Ctrl+Shift+T",
+}
+
+# Presets send a fixed prompt on a hotkey, optionally taking a screenshot first
+DEFAULT_PRESETS = [
+    {
+        "name": "solve",
+        "hotkey": "Ctrl+D",
+        "screenshot": True,
+        "prompt": """Help me solve this programming problem. Be concise.
+1. Give me 5 clarification questions to ask about the problem.
+2. State the type of problem (ex. Arrays & Hashing, Two Pointers, Sliding Window, Stack, Binary Search, Linked List, Trees, Heap / Priority Queue, Backtracking, Tries, Graphs, Advanced Graphs, 1-D Dynamic Programming, 2-D Dynamic Programming, Greedy, Intervals, Math & Geometry, and/or Bit Manipulation), data structure(s), what each element in the data structure means, and algorithm(s) used to solve this problem.
+3. Give me a high-level, point-form plan to approach and solve this problem (including edge cases).
+4. Give me a short example walkthrough using your solution.
+5. Give me a code block with the solution in Python, supplied with comments.
+6. Give me a concise explanation of the solution.
+7. Give me the time and space complexity for the solution.""",
+    },
+    {
+        "name": "fix",
+        "hotkey": "Ctrl+G",
+        "screenshot": True,
+        "prompt": "Fix or improve the code based on the new instructions. Then, state the changes you made.",
+    },
+]
+
+DEFAULT_CONFIG = {
+    "hotkeys": DEFAULT_HOTKEYS,
+    "presets": DEFAULT_PRESETS,
+    "capture": {
+        "target": CURSOR_MONITOR,
+        "region": None,
+        "dedup_threshold": 6,
+        "watch": False,
+        "watch_interval": 2.0,
+        "stitch": False,
+    },
+    "transcriber": {
+        "model": "base.en",
+    },
+    "ai": {
+        "worker_process": True,
+        "backend": GEMINI_BACKEND,
+        "model": "",
+        "base_url": "http://127.0.0.1:8080/v1",
+    },
+    "metrics": {
+        "store": True,
+        "retention_days": 90,
+    },
+}
+
+REGION_KEYS = ("left", "top", "width", "height")
+MIN_WATCH_INTERVAL = 0.25  # Seconds; faster screen watch sampling would no longer be low-CPU
+
+
+def load_config() -> dict[str, Any]:
+    """Load and validate the user configuration from config.json.
+
+    An empty or missing file yields the defaults. Invalid entries are
+    reported and replaced by their defaults, so a typo never stops the app
+    from starting.
+
+    Returns:
+        dict[str, Any]: The complete, validated configuration.
+    """
+    config, errors = validate_config(_read_config_file())
+    for error in errors:
+        print(f"config.json: {error}")
+    return config
+
+
+def validate_config(raw: Any) -> tuple[dict[str, Any], list[str]]:
+    """Validate a raw configuration against the schema and fill in defaults.
+
+    Args:
+        raw (Any): The parsed contents of config.json.
+
+    Returns:
+        tuple[dict[str, Any], list[str]]: The validated configuration and a list of human-readable errors.
+    """
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    errors: list[str] = []
+    if not isinstance(raw, dict):
+        if raw is not None:
+            errors.append("top level must be an object")
+        return config, errors
+
+    for key in raw:
+        if key not in DEFAULT_CONFIG:
+            errors.append(f"unknown section \"{key}\"")
+
+    bound: dict[tuple[int, int], str] = {}  # Detects two actions or presets sharing one hotkey
+    config["hotkeys"] = _validate_hotkeys(raw.get("hotkeys", {}), bound, errors)
+    config["presets"] = _validate_presets(raw.get("presets", config["presets"]), bound, errors)
+    config["capture"] = _validate_capture(raw.get("capture", {}), errors)
+    config["transcriber"] = _validate_transcriber(raw.get("transcriber", {}), errors)
+    config["ai"] = _validate_ai(raw.get("ai", {}), errors)
+    config["metrics"] = _validate_metrics(raw.get("metrics", {}), errors)
+    return config, errors
+
+
+class ConfigWatcher(QObject):
+    """Watches config.json and emits the re-validated configuration whenever it changes."""
+
+    config_changed = pyqtSignal(dict)
+
+    DEBOUNCE_MS = 200  # Editors often write a file in several steps
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.watcher = QFileSystemWatcher()
+        self.watcher.fileChanged.connect(self._on_file_changed)
+        self.watcher.directoryChanged.connect(self._on_file_changed)
+        self.watcher.addPath(os.path.dirname(CONFIG_PATH))  # Catches editors that save by replacing the file
+        if os.path.exists(CONFIG_PATH):
+            self.watcher.addPath(CONFIG_PATH)
+
+        self.reload_timer = QTimer(self)
+        self.reload_timer.setSingleShot(True)
+        self.reload_timer.setInterval(self.DEBOUNCE_MS)
+        self.reload_timer.timeout.connect(self._reload)
+        self.last_text = self._read_text()
+
+    def _on_file_changed(self, _path: str) -> None:
+        """Schedule a debounced reload."""
+        self.reload_timer.start()
+
+    def _reload(self) -> None:
+        """Reload config.json and emit it if its contents changed."""
+        # A replaced file drops out of the watch list; add it back
+        if os.path.exists(CONFIG_PATH) and CONFIG_PATH not in self.watcher.files():
+            self.watcher.addPath(CONFIG_PATH)
+
+        text = self._read_text()
+        if text == self.last_text:
+            return
+        self.last_text = text
+
+        # Keep the current bindings while the file is mid-edit and not valid JSON yet
+        if text and text.strip():
+            try:
+                json.loads(text)
+            except json.JSONDecodeError as e:
+                print(f"config.json changed but is not valid JSON; keeping the current config ({str(e)})")
+                return
+
+        print("config.json changed; reloading")
+        self.config_changed.emit(load_config())
+
+    def _read_text(self) -> str | None:
+        """Read the raw text of config.json.
+
+        Returns:
+            str | None: The file contents, or None if the file does not exist.
+        """
+        try:
+            with open(CONFIG_PATH, "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+
+def _read_config_file() -> Any:
+    """Read and parse config.json.
+
+    Returns:
+        Any: The parsed JSON, or None if the file is missing, empty or malformed.
+    """
+    try:
+        with open(CONFIG_PATH, "r", encoding="utf-8") as f:
+            text = f.read()
+    except FileNotFoundError:
+        return None
+
+    if not text.strip():
+        return None
+
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError as e:
+        print(f"Error reading config.json: {str(e)}")
+        return None
+
+
+def _validate_hotkeys(raw: Any, bound: dict[tuple[int, int], str], errors: list[str]) -> dict[str, str | None]:
+    """Validate the "hotkeys" section.
+
+    Args:
+        raw (Any): The raw section.
+        bound (dict[tuple[int, int], str]): Hotkeys claimed so far, updated in place.
+        errors (list[str]): Error list, appended to in place.
+
+    Returns:
+        dict[str, str | None]: Action name -> hotkey string (None if disabled).
+    """
+    hotkeys: dict[str, str | None] = dict(DEFAULT_HOTKEYS)
+    if not isinstance(raw, dict):
+        errors.append("\"hotkeys\" must be an object")
+        raw = {}
+
+    for action, value in raw.items():
+        if action not in DEFAULT_HOTKEYS:
+            errors.append(f"unknown hotkey action \"{action}\"")
+            continue
+        hotkeys[action] = value or None
+
+    for action, value in hotkeys.items():
+        if value is not None and not _claim_hotkey(value, f"hotkey \"{action}\"", bound, errors):
+            hotkeys[action] = None
+    return hotkeys
+
+
+def _validate_presets(raw: Any, bound: dict[tuple[int, int], str], errors: list[str]) -> list[dict[str, Any]]:
+    """Validate the "presets" section.
+
+    Args:
+        raw (Any): The raw section.
+        bound (dict[tuple[int, int], str]): Hotkeys claimed so far, updated in place.
+        errors (list[str]): Error list, appended to in place.
+
+    Returns:
+        list[dict[str, Any]]: Presets with "name", "hotkey", "prompt" and "screenshot" keys.
+    """
+    if not isinstance(raw, list):
+        errors.append("\"presets\" must be a list")
+        return []
+
+    presets = []
+    names = set()
+    for i, item in enumerate(raw):
+        label = f"preset #{i + 1}"
+        if not isinstance(item, dict):
+            errors.append(f"{label} must be an object")
+            continue
+
+        name = item.get("name", label)
+        prompt = item.get("prompt")
+        hotkey = item.get("hotkey")
+        screenshot = item.get("screenshot", True)
+        if not isinstance(name, str) or name in names:
+            errors.append(f"{label} needs a unique string \"name\"")
+            continue
+        if not isinstance(prompt, str) or not prompt.strip():
+            errors.append(f"preset \"{name}\" needs a non-empty \"prompt\"")
+            continue
+        if not isinstance(screenshot, bool):
+            errors.append(f"preset \"{name}\": \"screenshot\" must be true or false")
+            screenshot = True
+        if hotkey is not None and not _claim_hotkey(hotkey, f"preset \"{name}\"", bound, errors):
+            hotkey = None
+
+        names.add(name)
+        presets.append({"name": name, "hotkey": hotkey, "prompt": prompt, "screenshot": screenshot})
+    return presets
+
+
+def _validate_capture(raw: Any, errors: list[str]) -> dict[str, Any]:
+    """Validate the "capture" section.
+
+    Args:
+        raw (Any): The raw section.
+        errors (list[str]): Error list, appended to in place.
+
+    Returns:
+        dict[str, Any]: The capture settings.
+    """
+    capture = copy.deepcopy(DEFAULT_CONFIG["capture"])
+    if not isinstance(raw, dict):
+        errors.append("\"capture\" must be an object")
+        return capture
+
+    target = raw.get("target", capture["target"])
+    if target in CAPTURE_TARGETS:
+        capture["target"] = target
+    else:
+        errors.append(f"capture target must be one of {', '.join(CAPTURE_TARGETS)}")
+
+    region = raw.get("region")
+    if region is not None:
+        if isinstance(region, dict) and all(isinstance(region.get(k), int) for k in REGION_KEYS):
+            capture["region"] = {k: region[k] for k in REGION_KEYS}
+        else:
+            errors.append(f"capture region must be an object with integer {', '.join(REGION_KEYS)}")
+
+    threshold = raw.get("dedup_threshold", capture["dedup_threshold"])
+    if isinstance(threshold, int) and not isinstance(threshold, bool):
+        capture["dedup_threshold"] = threshold  # Negative disables deduplication
+    else:
+        errors.append("capture dedup_threshold must be an integer")
+
+    watch = raw.get("watch", capture["watch"])
+    if isinstance(watch, bool):
+        capture["watch"] = watch
+    else:
+        errors.append("capture watch must be true or false")
+
+    interval = raw.get("watch_interval", capture["watch_interval"])
+    if isinstance(interval, (int, float)) and not isinstance(interval, bool) and interval >= MIN_WATCH_INTERVAL:
+        capture["watch_interval"] = float(interval)
+    else:
+        errors.append(f"capture watch_interval must be a number of seconds of at least {MIN_WATCH_INTERVAL}")
+
+    stitch = raw.get("stitch", capture["stitch"])
+    if isinstance(stitch, bool):
+        capture["stitch"] = stitch
+    else:
+        errors.append("capture stitch must be true or false")
+    return capture
+
+
+def _validate_transcriber(raw: Any, errors: list[str]) -> dict[str, Any]:
+    """Validate the "transcriber" section.
+
+    Args:
+        raw (Any): The raw section.
+        errors (list[str]): Error list, appended to in place.
+
+    Returns:
+        dict[str, Any]: The transcriber settings.
+    """
+    transcriber = copy.deepcopy(DEFAULT_CONFIG["transcriber"])
+    if not isinstance(raw, dict):
+        errors.append("\"transcriber\" must be an object")
+        return transcriber
+
+    model = raw.get("model", transcriber["model"])
+    if isinstance(model, str) and model:
+        transcriber["model"] = model
+    else:
+        errors.append("transcriber model must be a non-empty string")
+    return transcriber
+
+
+def _validate_ai(raw: Any, errors: list[str]) -> dict[str, Any]:
+    """Validate the "ai" section.
+
+    Args:
+        raw (Any): The raw section.
+        errors (list[str]): Error list, appended to in place.
+
+    Returns:
+        dict[str, Any]: The AI settings.
+    """
+    ai = copy.deepcopy(DEFAULT_CONFIG["ai"])
+    if not isinstance(raw, dict):
+        errors.append("\"ai\" must be an object")
+        return ai
+
+    worker_process = raw.get("worker_process", ai["worker_process"])
+    if isinstance(worker_process, bool):
+        ai["worker_process"] = worker_process
+    else:
+        errors.append("ai worker_process must be true or false")
+
+    backend = raw.get("backend", ai["backend"])
+    if backend in AI_BACKENDS:
+        ai["backend"] = backend
+    else:
+        errors.append(f"ai backend must be one of {', '.join(AI_BACKENDS)}")
+
+    model = raw.get("model", ai["model"])
+    if isinstance(model, str):
+        ai["model"] = model.strip()
+    else:
+        errors.append("ai model must be a string")
+
+    base_url = raw.get("base_url", ai["base_url"])
+    if isinstance(base_url, str) and base_url.startswith(("http://", "https://")):
+        ai["base_url"] = base_url
+    else:
+        errors.append("ai base_url must be an http:// or https:// URL")
+    return ai
+
+
+def _validate_metrics(raw: Any, errors: list[str]) -> dict[str, Any]:
+    """Validate the "metrics" section.
+
+    Args:
+        raw (Any): The raw section.
+        errors (list[str]): Error list, appended to in place.
+
+    Returns:
+        dict[str, Any]: The metrics store settings.
+    """
+    metrics = copy.deepcopy(DEFAULT_CONFIG["metrics"])
+    if not isinstance(raw, dict):
+        errors.append("\"metrics\" must be an object")
+        return metrics
+
+    store = raw.get("store", metrics["store"])
+    if isinstance(store, bool):
+        metrics["store"] = store
+    else:
+        errors.append("metrics store must be true or false")
+
+    retention_days = raw.get("retention_days", metrics["retention_days"])
+    if isinstance(retention_days, int) and not isinstance(retention_days, bool) and retention_days >= 1:
+        metrics["retention_days"] = retention_days
+    else:
+        errors.append("metrics retention_days must be a whole number of days of at least 1")
+    return metrics
+
+
+def _claim_hotkey(value: Any, owner: str, bound: dict[tuple[int, int], str], errors: list[str]) -> bool:
+    """Parse a hotkey string and reserve it for one action or preset.
+
+    Args:
+        value (Any): The hotkey string from the config.
+        owner (str): Description of the action or preset, for error messages.
+        bound (dict[tuple[int, int], str]): Hotkeys claimed so far, updated in place.
+        errors (list[str]): Error list, appended to in place.
+
+    Returns:
+        bool: True if the hotkey is valid and not already taken.
+    """
+    if not isinstance(value, str):
+        errors.append(f"{owner}: hotkey must be a string")
+        return False
+    try:
+        key = parse_hotkey(value)
+    except ValueError as e:
+        errors.append(f"{owner}: {str(e)}")
+        return False
+    if key in bound:
+        errors.append(f"{owner}: \"{value}\" is already bound to {bound[key]}")
+        return False
+    bound[key] = owner
+    return True
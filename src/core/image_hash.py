@@ -0,0 +1,52 @@
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QImage
+
+
+HASH_SIZE = 32  # Hash grid is HASH_SIZE x HASH_SIZE bits; fine enough that different pages of text do not collide
+
+
+def dhash(image: QImage, hash_size: int = HASH_SIZE) -> int:
+    """Compute a difference hash (dHash) of an image.
+
+    The image is area-averaged down to (hash_size + 1) x hash_size grayscale
+    pixels in C++, and each bit records whether a pixel is brighter than its
+    right-hand neighbour. Near-identical images (cursor blink, clock tick)
+    produce hashes only a few bits apart.
+
+    Args:
+        image (QImage): The image to hash.
+        hash_size (int): Number of rows and bits per row of the hash.
+
+    Returns:
+        int: The hash as a hash_size * hash_size bit integer.
+    """
+    small = image.scaled(
+        hash_size + 1, hash_size,
+        Qt.AspectRatioMode.IgnoreAspectRatio,
+        Qt.TransformationMode.SmoothTransformation,
+    ).convertToFormat(QImage.Format.Format_Grayscale8)
+
+    ptr = small.constBits()
+    ptr.setsize(small.sizeInBytes())
+    pixels = bytes(ptr)
+    stride = small.bytesPerLine()
+
+    bits = 0
+    for y in range(hash_size):
+        row = pixels[y * stride:y * stride + hash_size + 1]
+        for x in range(hash_size):
+            bits = (bits << 1) | (row[x] > row[x + 1])
+    return bits
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Count the differing bits between two hashes.
+
+    Args:
+        a (int): The first hash.
+        b (int): The second hash.
+
+    Returns:
+        int: The number of differing bits.
+    """
+    return (a ^ b).bit_count()
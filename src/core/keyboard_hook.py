@@ -0,0 +1,352 @@
+import ctypes
+import ctypes.wintypes
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, NamedTuple
+
+from core.metrics import LatencyHistogram
+from core.win32_hook import (
+    HOOKPROC,
+    KBDLLHOOKSTRUCT,
+    MOD_ALT,
+    MOD_CTRL,
+    MOD_SHIFT,
+    MODIFIER_BITS,
+    VK_DOWN,
+    VK_LEFT,
+    VK_RIGHT,
+    VK_UP,
+    WH_KEYBOARD_LL,
+    WM_KEYDOWN,
+    WM_KEYUP,
+    WM_QUIT,
+    WM_SYSKEYDOWN,
+    WM_SYSKEYUP,
+    get_active_modifiers,
+    kernel32,
+    user32,
+)
+
+
+TABLE_SIZE = 8 << 8  # 3 modifier bits x 256 virtual key codes
+STOP_TIMEOUT_S = 1  # How long stop waits for the hook thread to unhook
+DEFAULT_HOOK_TIMEOUT_MS = 300  # Used when LowLevelHooksTimeout is not set in the registry
+SLOW_HOOK_FRACTION = 0.5  # Warn when a hook proc call uses this fraction of the timeout
+KEY_MESSAGES = frozenset({WM_KEYDOWN, WM_SYSKEYDOWN, WM_KEYUP, WM_SYSKEYUP})
+
+MODIFIER_NAMES = {"CTRL": MOD_CTRL, "CONTROL": MOD_CTRL, "ALT": MOD_ALT, "SHIFT": MOD_SHIFT}
+KEY_NAMES = {
+    "BACKSPACE": 0x08, "TAB": 0x09, "ENTER": 0x0D, "ESC": 0x1B, "ESCAPE": 0x1B, "SPACE": 0x20,
+    "PAGEUP": 0x21, "PAGEDOWN": 0x22, "END": 0x23, "HOME": 0x24,
+    "LEFT": VK_LEFT, "UP": VK_UP, "RIGHT": VK_RIGHT, "DOWN": VK_DOWN,
+    "INSERT": 0x2D, "DELETE": 0x2E,
+    **{chr(c): c for c in range(ord("A"), ord("Z") + 1)},
+    **{chr(c): c for c in range(ord("0"), ord("9") + 1)},
+    **{f"F{n}": 0x6F + n for n in range(1, 25)},
+}
+
+
+def parse_hotkey(text: str) -> tuple[int, int]:
+    """Parse a hotkey string such as "Ctrl+Shift+S" into a modifier mask and virtual key code.
+
+    A ValueError is raised unless the string names at least one modifier and
+    exactly one known key.
+
+    Args:
+        text (str): Modifier names and one key name joined by "+" (case-insensitive).
+
+    Returns:
+        tuple[int, int]: The (modifier_mask, vk_code) pair.
+    """
+    parts = [part.strip().upper() for part in text.split("+")]
+    modifiers = 0
+    keys = []
+    for part in parts:
+        if part in MODIFIER_NAMES:
+            modifiers |= MODIFIER_NAMES[part]
+        elif part in KEY_NAMES:
+            keys.append(KEY_NAMES[part])
+        else:
+            raise ValueError(f"unknown key \"{part}\" in hotkey \"{text}\"")
+
+    if len(keys) != 1:
+        raise ValueError(f"hotkey \"{text}\" must contain exactly one non-modifier key")
+    if modifiers == 0:
+        raise ValueError(f"hotkey \"{text}\" needs at least one modifier (it would swallow normal typing)")
+    return modifiers, keys[0]
+
+
+def read_hook_timeout_ms() -> int:
+    """Read the system's LowLevelHooksTimeout, after which Windows skips (and may remove) a hook.
+
+    Returns:
+        int: The timeout in milliseconds.
+    """
+    if sys.platform != "win32":
+        return DEFAULT_HOOK_TIMEOUT_MS
+    try:
+        import winreg
+
+        with winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Control Panel\Desktop") as key:
+            value, _type = winreg.QueryValueEx(key, "LowLevelHooksTimeout")
+        return int(value) or DEFAULT_HOOK_TIMEOUT_MS
+    except (OSError, ValueError):
+        return DEFAULT_HOOK_TIMEOUT_MS
+
+
+class HotkeyEntry(NamedTuple):
+    """A compiled hotkey binding."""
+
+    callback: Callable[[], None]
+    repeat_allowed: bool
+    always_active: bool  # False if the hotkey only works while the main window is visible
+
+
+def compile_hotkey_table(
+    always_active_hotkeys: dict[tuple[int, int], tuple[Callable[[], None], bool]],
+    main_window_hotkeys: dict[tuple[int, int], tuple[Callable[[], None], bool]]
+) -> list[HotkeyEntry | None]:
+    """Compile hotkey dictionaries into a flat table indexed by (modifier_mask << 8) | vk_code.
+
+    Args:
+        always_active_hotkeys (dict): (modifier_mask, vk_code) -> (callback, repeat_allowed) for hotkeys that always work.
+        main_window_hotkeys (dict): (modifier_mask, vk_code) -> (callback, repeat_allowed) for hotkeys that need a visible window.
+
+    Returns:
+        list[HotkeyEntry | None]: The lookup table with TABLE_SIZE slots.
+    """
+    table: list[HotkeyEntry | None] = [None] * TABLE_SIZE
+    for hotkeys, always_active in ((main_window_hotkeys, False), (always_active_hotkeys, True)):
+        for (modifiers, vk_code), (callback, repeat_allowed) in hotkeys.items():
+            table[(modifiers << 8) | vk_code] = HotkeyEntry(callback, repeat_allowed, always_active)
+    return table
+
+
+class KeyboardHook():
+    """Win32 low-level keyboard hook that matches key events against a compiled hotkey table.
+
+    Modifier state is tracked from the hook's own key events, so matching an
+    unmodified keystroke costs one list index and no system calls. A key
+    pressed while a modifier is tracked as held confirms the modifiers with
+    GetAsyncKeyState, which recovers from key-ups the hook never saw (e.g.
+    Ctrl + Alt + Del).
+
+    Hotkey callbacks never run inside the hook proc. Windows silently removes
+    a low-level hook whose proc exceeds LowLevelHooksTimeout, so the proc only
+    classifies the event, appends the callback to a queue and calls notify;
+    the owner drains the queue on its own thread with run_pending. Every proc
+    call is timed into an always-on histogram.
+
+    The user32 / kernel32 layers are injectable so the hook can be driven by a
+    fake Win32 layer off Windows.
+    """
+
+    def __init__(
+        self,
+        table: list[HotkeyEntry | None],
+        notify: Callable[[], None] | None = None,
+        user32_dll: Any = None,
+        kernel32_dll: Any = None
+    ) -> None:
+        self.table = table
+        self.notify = notify or (lambda: None)
+        self.user32 = user32_dll or user32
+        self.kernel32 = kernel32_dll or kernel32
+
+        # Single producer (hook thread) / single consumer (owner thread); deque append and popleft are atomic
+        self.pending_callbacks: deque[Callable[[], None]] = deque()
+
+        # Hook proc timing
+        self.proc_histogram = LatencyHistogram()
+        self.timeout_ms = read_hook_timeout_ms()
+        self.slow_threshold_ns = int(self.timeout_ms * SLOW_HOOK_FRACTION * 1_000_000)
+        self.slow_calls = 0
+        self.slowest_ns = 0
+
+        self.window_visible = threading.Event()  # Set and cleared by the main thread only
+        self.modifier_mask = 0
+        self.held_modifier_vk_codes: set[int] = set()
+        self.held_vk_codes: set[int] = set()  # Tracks physically held non-modifier keys
+        self.suppressed_vk_codes: set[int] = set()
+
+        # Low-level keyboard hook (prevent GC of the callback reference)
+        self.hook_proc_ref = HOOKPROC(self._low_level_keyboard_proc)
+        self.hook_handle = None
+        self.hook_thread = None
+        self.hook_thread_id = None
+
+    def start(self) -> None:
+        """Start the keyboard hook on a dedicated daemon thread."""
+        self.hook_thread = threading.Thread(target=self._hook_thread_entry, daemon=True)
+        self.hook_thread.start()
+
+    def stop(self) -> None:
+        """Stop the keyboard hook and its message loop, waiting briefly for the hook to be removed."""
+        if self.hook_thread_id is not None:
+            self.user32.PostThreadMessageW(self.hook_thread_id, WM_QUIT, 0, 0)
+            self.hook_thread_id = None
+        if self.hook_thread is not None:
+            self.hook_thread.join(STOP_TIMEOUT_S)
+            self.hook_thread = None
+
+    def set_table(self, table: list[HotkeyEntry | None]) -> None:
+        """Swap in a newly compiled hotkey table without restarting the hook thread.
+
+        The hook proc reads the table reference once per event, so replacing it
+        is atomic: every event sees either the old or the new bindings.
+
+        Args:
+            table (list[HotkeyEntry | None]): The compiled hotkey table.
+        """
+        self.table = table
+
+    def run_pending(self) -> int:
+        """Run all queued hotkey callbacks on the calling thread.
+
+        Returns:
+            int: The number of callbacks run.
+        """
+        count = 0
+        while True:
+            try:
+                callback = self.pending_callbacks.popleft()
+            except IndexError:
+                return count
+            callback()
+            count += 1
+
+    def set_window_visible(self, visible: bool) -> None:
+        """Update the main window visibility flag read by the hook thread.
+
+        Args:
+            visible (bool): Whether the main window is visible.
+        """
+        if visible:
+            self.window_visible.set()
+        else:
+            self.window_visible.clear()
+
+    def process_key(self, vk_code: int, message: int) -> bool:
+        """Update key state for one key event and queue its hotkey callback, if any.
+
+        Args:
+            vk_code (int): The virtual key code of the event.
+            message (int): The keyboard message (WM_KEYDOWN, WM_KEYUP, WM_SYSKEYDOWN or WM_SYSKEYUP).
+
+        Returns:
+            bool: True if the key event should be suppressed.
+        """
+        is_key_down = message == WM_KEYDOWN or message == WM_SYSKEYDOWN
+
+        # Modifiers only update the tracked mask and are always passed through
+        if MODIFIER_BITS[vk_code]:
+            if is_key_down:
+                self.held_modifier_vk_codes.add(vk_code)
+            else:
+                self.held_modifier_vk_codes.discard(vk_code)
+            mask = 0
+            for held in self.held_modifier_vk_codes:
+                mask |= MODIFIER_BITS[held]
+            self.modifier_mask = mask
+            return False
+
+        table = self.table  # Single read so a concurrent hot reload cannot mix two tables within one event
+        entry = table[(self.modifier_mask << 8) | vk_code]
+        if is_key_down and (entry is not None or self.modifier_mask != 0):
+            # Confirm the tracked modifiers before acting, and when a held modifier matches nothing, in case a modifier key-up was missed
+            actual_mask = get_active_modifiers(self.user32)
+            if actual_mask != self.modifier_mask:
+                self._resync_modifiers(actual_mask)
+                entry = table[(actual_mask << 8) | vk_code]
+
+        if entry is not None and not entry.always_active and not self.window_visible.is_set():
+            entry = None
+
+        if entry is not None:
+            if is_key_down:
+                # For no-repeat hotkeys, skip if the key is already physically held
+                if not entry.repeat_allowed and vk_code in self.held_vk_codes:
+                    return True  # Suppress repeat without calling callback
+                self.held_vk_codes.add(vk_code)
+                self.suppressed_vk_codes.add(vk_code)
+                self.pending_callbacks.append(entry.callback)
+                self.notify()
+                return True  # Suppress the key event
+
+            self.held_vk_codes.discard(vk_code)
+            if vk_code in self.suppressed_vk_codes:
+                self.suppressed_vk_codes.discard(vk_code)
+                return True  # Suppress the matching key-up
+
+        elif not is_key_down:
+            # Key was held but hotkey no longer matches (e.g. modifier released early) - clean up
+            self.held_vk_codes.discard(vk_code)
+            if vk_code in self.suppressed_vk_codes:
+                self.suppressed_vk_codes.discard(vk_code)
+                return True  # Suppress key-up even though modifiers changed
+
+        return False
+
+    def _resync_modifiers(self, actual_mask: int) -> None:
+        """Replace the tracked modifier state with the actual state reported by Windows.
+
+        Args:
+            actual_mask (int): The modifier bitmask from GetAsyncKeyState.
+        """
+        self.held_modifier_vk_codes = {vk for vk in self.held_modifier_vk_codes if MODIFIER_BITS[vk] & actual_mask}
+        self.modifier_mask = actual_mask
+
+    def _low_level_keyboard_proc(self, nCode: int, wParam: int, lParam: int) -> int:
+        """Win32 low-level keyboard hook callback.
+
+        Classifies the event, queues any matched hotkey callback, and records
+        how long the call took.
+
+        Args:
+            nCode (int): Hook code indicating how to process the message.
+            wParam (int): Message type identifier (e.g. WM_KEYDOWN, WM_KEYUP).
+            lParam (int): Pointer to a KBDLLHOOKSTRUCT containing key event data.
+
+        Returns:
+            int: 1 to suppress the key event, or the result of CallNextHookEx.
+        """
+        start = time.perf_counter_ns()
+        if nCode >= 0 and wParam in KEY_MESSAGES and self.process_key(KBDLLHOOKSTRUCT.from_address(lParam).vkCode & 0xFF, wParam):
+            result = 1
+        else:
+            result = self.user32.CallNextHookEx(self.hook_handle, nCode, wParam, lParam)
+
+        duration = time.perf_counter_ns() - start
+        self.proc_histogram.record_ns(duration)
+        if duration >= self.slow_threshold_ns:
+            self.slow_calls += 1
+            self.slowest_ns = max(self.slowest_ns, duration)
+            self.notify()  # Let the owner thread report it; never print from inside the hook proc
+        return result
+
+    def _hook_thread_entry(self) -> None:
+        """Entry point for the keyboard hook thread.
+
+        Installs the low-level keyboard hook, then enters a message loop that
+        keeps the hook alive until a WM_QUIT message is posted.
+        """
+        self.hook_thread_id = self.kernel32.GetCurrentThreadId()
+        h_module = self.kernel32.GetModuleHandleW(None)
+
+        self.hook_handle = self.user32.SetWindowsHookExW(
+            WH_KEYBOARD_LL,
+            self.hook_proc_ref,
+            h_module,
+            0,  # Monitor all threads (required for low-level hooks)
+        )
+
+        # Pump messages to keep the hook alive
+        msg = ctypes.wintypes.MSG()
+        while self.user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+            pass  # No dispatch needed; WM_QUIT causes GetMessageW to return 0
+
+        if self.hook_handle:
+            self.user32.UnhookWindowsHookEx(self.hook_handle)
+            self.hook_handle = None
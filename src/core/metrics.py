@@ -0,0 +1,182 @@
+from typing import Callable
+
+
+SUB_BUCKETS = 4  # Buckets per power of two (~19% relative resolution)
+MAX_EXPONENT = 21  # Largest tracked power of two in microseconds (~2 s); slower samples land in the last bucket
+BUCKET_COUNT = (MAX_EXPONENT + 1) * SUB_BUCKETS
+
+# Metric names shared by writers and the HUD
+CAPTURE_MS = "capture_ms"
+ENCODE_MS = "encode_ms"
+UPLOAD_BYTES = "upload_bytes"
+TTFT_MS = "ttft_ms"
+TOKENS_PER_S = "tokens_per_s"
+FORMAT_MS = "format_ms"  # Series: per streamed chunk
+RENDER_MS = "render_ms"  # Series: per streamed chunk
+HOOK_P99_US = "hook_p99_us"
+WATCH_CPU_PERCENT = "watch_cpu_percent"  # Screen watch sampling cost since it was turned on
+QUEUE_DEPTH = "queue_depth"  # AI requests waiting for the scheduler
+REQUESTS_DROPPED = "requests_dropped"  # AI requests debounced, coalesced, preempted or dropped since startup
+REQUEST_METRICS = (UPLOAD_BYTES, TTFT_MS, TOKENS_PER_S)
+
+
+class LatencyHistogram():
+    """Always-on, allocation-free latency histogram with log-linear microsecond buckets.
+
+    Recording is a couple of integer operations and one list increment, cheap
+    enough for the keyboard hook proc. It is written by a single thread and
+    may be read from any other thread.
+    """
+
+    def __init__(self) -> None:
+        self.counts = [0] * BUCKET_COUNT
+        self.total = 0
+        self.max_us = 0
+
+    def record_ns(self, duration_ns: int) -> None:
+        """Record one sample.
+
+        Args:
+            duration_ns (int): The measured duration in nanoseconds.
+        """
+        value = duration_ns // 1000
+        if value < SUB_BUCKETS:
+            index = max(value, 0)
+        else:
+            exponent = value.bit_length() - 1
+            index = min(exponent * SUB_BUCKETS + ((value >> (exponent - 2)) & 3) - SUB_BUCKETS, BUCKET_COUNT - 1)
+        self.counts[index] += 1
+        self.total += 1
+        if value > self.max_us:
+            self.max_us = value
+
+    def percentile(self, p: float) -> int:
+        """Return an upper bound for the given percentile.
+
+        Args:
+            p (float): Percentile in the range [0, 100].
+
+        Returns:
+            int: The upper edge of the bucket holding the percentile, in microseconds (0 if empty).
+        """
+        counts = list(self.counts)  # Snapshot; the writer may be recording concurrently
+        total = sum(counts)
+        if total == 0:
+            return 0
+        rank = max(1, int(total * p / 100 + 0.5))
+        seen = 0
+        for index, count in enumerate(counts):
+            seen += count
+            if seen >= rank:
+                return min(_bucket_upper_us(index), self.max_us)
+        return self.max_us
+
+    def summary(self) -> str:
+        """Format the count and common percentiles on one line.
+
+        Returns:
+            str: A human-readable summary.
+        """
+        return (
+            f"n={self.total} p50={self.percentile(50)}us p90={self.percentile(90)}us "
+            f"p99={self.percentile(99)}us max={self.max_us}us"
+        )
+
+    def reset(self) -> None:
+        """Clear all samples."""
+        self.counts = [0] * BUCKET_COUNT
+        self.total = 0
+        self.max_us = 0
+
+
+class MetricsRegistry():
+    """Named measurements of the most recent request, written by core modules and read by the perf HUD.
+
+    Writes are plain dict updates with no signals, locks or allocation
+    beyond the first write of a name, so instrumenting hot paths costs next
+    to nothing while nobody reads. Values that are expensive to compute are
+    registered as sources and only evaluated by snapshot().
+    """
+
+    def __init__(self) -> None:
+        self.values: dict[str, float] = {}
+        self.series: dict[str, list[float]] = {}  # name -> [count, total, max]
+        self.sources: dict[str, Callable[[], float]] = {}
+
+    def set(self, name: str, value: float) -> None:
+        """Record the latest value of a measurement.
+
+        Args:
+            name (str): The metric name.
+            value (float): The value.
+        """
+        self.values[name] = value
+
+    def observe(self, name: str, value: float) -> None:
+        """Add one sample to a per-request series (e.g. per-chunk render time).
+
+        Args:
+            name (str): The series name.
+            value (float): The sample.
+        """
+        stats = self.series.get(name)
+        if stats is None:
+            self.series[name] = [1, value, value]
+            return
+        stats[0] += 1
+        stats[1] += value
+        if value > stats[2]:
+            stats[2] = value
+
+    def register_source(self, name: str, source: Callable[[], float]) -> None:
+        """Register a value that is computed only when the metrics are read.
+
+        Args:
+            name (str): The metric name.
+            source (Callable[[], float]): Returns the current value.
+        """
+        self.sources[name] = source
+
+    def begin_request(self) -> None:
+        """Clear request-scoped values so the next reads describe the new request."""
+        for name in REQUEST_METRICS:
+            self.values.pop(name, None)
+        self.series = {}
+
+    def snapshot(self) -> dict[str, float]:
+        """Collect all current values.
+
+        Series are reported as "<name>_avg" and "<name>_max".
+
+        Returns:
+            dict[str, float]: Metric name -> value.
+        """
+        snapshot = dict(self.values)
+        for name, (count, total, maximum) in list(self.series.items()):
+            snapshot[f"{name}_avg"] = total / count
+            snapshot[f"{name}_max"] = maximum
+        for name, source in self.sources.items():
+            try:
+                snapshot[name] = source()
+            except Exception:
+                pass
+        return snapshot
+
+
+metrics = MetricsRegistry()
+
+
+def _bucket_upper_us(index: int) -> int:
+    """Return the largest microsecond value that falls into a bucket.
+
+    Args:
+        index (int): The bucket index.
+
+    Returns:
+        int: The bucket's inclusive upper edge in microseconds.
+    """
+    if index < SUB_BUCKETS:
+        return index
+    exponent = index // SUB_BUCKETS + 1
+    lower = (SUB_BUCKETS + index % SUB_BUCKETS) << (exponent - 2)
+    return lower + (1 << (exponent - 2)) - 1
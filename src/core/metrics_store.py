@@ -0,0 +1,228 @@
+import argparse
+import datetime
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import NamedTuple
+
+
+METRICS_PATH = os.path.join(os.getcwd(), "src", "data", "metrics.db")
+RETENTION_DAYS = 90  # Overridden by config
+MAX_ROWS = 50_000  # Hard cap (a few MB) however many requests are sent within the retention window
+PRUNE_INTERVAL = 100  # Inserts between retention passes
+PERCENTILES = (50, 90, 99)
+REPORT_METRICS = ("ttft_ms", "total_ms", "tokens_per_s", "upload_bytes")
+REPORT_GROUPS = ("model", "preset", "attachments")
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS requests (
+        id INTEGER PRIMARY KEY,
+        created REAL NOT NULL,
+        model TEXT NOT NULL,
+        preset TEXT NOT NULL,
+        attachments INTEGER NOT NULL,
+        outcome TEXT NOT NULL,
+        upload_bytes INTEGER,
+        ttft_ms REAL,
+        total_ms REAL NOT NULL,
+        tokens_per_s REAL
+    );
+    CREATE INDEX IF NOT EXISTS requests_created ON requests (created);
+"""
+
+
+class RequestRecord(NamedTuple):
+    """Latency and size measurements of one AI request."""
+
+    created: float  # Unix time the request was sent
+    model: str
+    preset: str  # Preset name (e.g. "solve" on Ctrl+D, "fix" on Ctrl+G), or "typed"
+    attachments: int
+    outcome: str  # "done", "error" or "interrupted"
+    upload_bytes: int | None
+    ttft_ms: float | None
+    total_ms: float  # Send to last chunk (or error / interruption), as seen by the UI process
+    tokens_per_s: float | None
+
+
+def percentile(values: list[float], p: float) -> float:
+    """Return the nearest-rank percentile of a sorted list.
+
+    Args:
+        values (list[float]): The samples in ascending order (not empty).
+        p (float): Percentile in the range [0, 100].
+
+    Returns:
+        float: The smallest sample with at least p percent of the samples at or below it.
+    """
+    rank = max(1, -(-len(values) * p // 100))
+    return values[int(rank) - 1]
+
+
+def summarize(records: list[RequestRecord], group: str, metric: str) -> list[tuple[str, int, tuple[float, ...]]]:
+    """Compute percentiles of one metric for each value of a grouping column.
+
+    Args:
+        records (list[RequestRecord]): The requests to summarize.
+        group (str): One of REPORT_GROUPS.
+        metric (str): One of REPORT_METRICS.
+
+    Returns:
+        list[tuple[str, int, tuple[float, ...]]]: (group value, sample count, PERCENTILES values), by group value.
+    """
+    samples: dict[str, list[float]] = {}
+    for record in records:
+        value = getattr(record, metric)
+        if value is not None:
+            samples.setdefault(str(getattr(record, group)), []).append(value)
+
+    rows = []
+    for key in sorted(samples, key=lambda key: (len(key), key)):  # Sorts attachment counts numerically
+        values = sorted(samples[key])
+        rows.append((key, len(values), tuple(percentile(values, p) for p in PERCENTILES)))
+    return rows
+
+
+class MetricsStore():
+    """Keeps per-request latency and size metrics in SQLite across sessions.
+
+    The perf HUD only shows the latest request; this store keeps one row per
+    request so regressions show up in percentiles over days or weeks (see the
+    report at the bottom of this module). Rows older than the retention
+    period are deleted, the table never grows past MAX_ROWS, and freed pages
+    are returned to the file system, so the database stays a few MB at most.
+
+    Args:
+        path (str, optional): The database file; created if missing.
+        retention_days (int, optional): Age in days after which rows are deleted.
+    """
+
+    def __init__(self, path: str = METRICS_PATH, retention_days: int = RETENTION_DAYS) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.retention_days = retention_days
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()  # Written from the AI worker threads
+        self.inserts = 0
+        with self.lock:
+            self.connection.execute("PRAGMA auto_vacuum = INCREMENTAL")  # Only takes effect on a new database
+            self.connection.execute("PRAGMA journal_mode = WAL")
+            self.connection.execute("PRAGMA synchronous = NORMAL")
+            self.connection.executescript(SCHEMA)
+        self.prune()
+
+    def record(self, record: RequestRecord) -> None:
+        """Store one request, pruning old rows every PRUNE_INTERVAL inserts.
+
+        Args:
+            record (RequestRecord): The request's measurements.
+        """
+        with self.lock, self.connection:
+            self.connection.execute(
+                f"INSERT INTO requests ({', '.join(RequestRecord._fields)}) VALUES ({', '.join('?' * len(RequestRecord._fields))})",
+                record,
+            )
+            self.inserts += 1
+        if self.inserts % PRUNE_INTERVAL == 0:
+            self.prune()
+
+    def prune(self) -> int:
+        """Delete rows past the retention period or beyond MAX_ROWS and release the freed pages.
+
+        Returns:
+            int: The number of rows deleted.
+        """
+        cutoff = time.time() - self.retention_days * 86400
+        with self.lock:
+            with self.connection:
+                deleted = self.connection.execute("DELETE FROM requests WHERE created < ?", (cutoff,)).rowcount
+                deleted += self.connection.execute(
+                    "DELETE FROM requests WHERE id <= (SELECT MAX(id) FROM requests) - ?", (MAX_ROWS,)
+                ).rowcount
+            if deleted:
+                self.connection.execute("PRAGMA incremental_vacuum")
+        return deleted
+
+    def query(self, since: float, until: float) -> list[RequestRecord]:
+        """Load the requests sent in a time range.
+
+        Args:
+            since (float): Start of the range, Unix time (inclusive).
+            until (float): End of the range, Unix time (exclusive).
+
+        Returns:
+            list[RequestRecord]: The requests, oldest first.
+        """
+        with self.lock:
+            rows = self.connection.execute(
+                f"SELECT {', '.join(RequestRecord._fields)} FROM requests WHERE created >= ? AND created < ? ORDER BY id",
+                (since, until),
+            ).fetchall()
+        return [RequestRecord(*row) for row in rows]
+
+    def close(self) -> None:
+        """Close the database."""
+        with self.lock:
+            self.connection.close()
+
+
+def _parse_day(text: str) -> datetime.date:
+    """Parse a YYYY-MM-DD command-line date.
+
+    Args:
+        text (str): The date.
+
+    Returns:
+        datetime.date: The parsed date.
+    """
+    try:
+        return datetime.date.fromisoformat(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a date like 2026-01-31, got {text}") from None
+
+
+def _print_report(records: list[RequestRecord], groups: list[str], metrics: list[str]) -> None:
+    """Print a percentile table per grouping and metric.
+
+    Args:
+        records (list[RequestRecord]): The requests in the report's range.
+        groups (list[str]): Columns to group by.
+        metrics (list[str]): Metrics to report.
+    """
+    header = " ".join(f"{f'p{p}':>9}" for p in PERCENTILES)
+    for group in groups:
+        for metric in metrics:
+            rows = summarize(records, group, metric)
+            if not rows:
+                continue
+            width = max(len(group), *(len(key) for key, _count, _values in rows))
+            print(f"\n{metric} by {group}")
+            print(f"{group:<{width}} {'n':>6} {header}")
+            for key, count, values in rows:
+                print(f"{key:<{width}} {count:>6} {' '.join(f'{value:>9.0f}' for value in values)}")
+
+
+if __name__ == "__main__":
+    # Report: python src/core/metrics_store.py [--since 2026-01-01] [--until 2026-01-31] [--by model preset] [--metric ttft_ms]
+    today = datetime.date.today()
+    parser = argparse.ArgumentParser(description="Show p50/p90/p99 request latency and size from the local metrics store.")
+    parser.add_argument("--since", type=_parse_day, default=today - datetime.timedelta(days=7), help="First day (YYYY-MM-DD, default a week ago)")
+    parser.add_argument("--until", type=_parse_day, default=today, help="Last day, inclusive (YYYY-MM-DD, default today)")
+    parser.add_argument("--by", nargs="+", choices=REPORT_GROUPS, default=list(REPORT_GROUPS), help="Group by these columns")
+    parser.add_argument("--metric", nargs="+", choices=REPORT_METRICS, default=["ttft_ms", "total_ms"], help="Metrics to report")
+    parser.add_argument("--outcome", default="done", help="Only requests with this outcome (done, error, interrupted or all)")
+    parser.add_argument("--db", default=METRICS_PATH, help="Database file")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"No metrics recorded yet ({args.db} does not exist)")
+        sys.exit(1)
+    store = MetricsStore(args.db, retention_days=36500)  # Reporting never prunes
+    since = time.mktime(args.since.timetuple())
+    until = time.mktime((args.until + datetime.timedelta(days=1)).timetuple())
+    records = [record for record in store.query(since, until) if args.outcome in ("all", record.outcome)]
+    store.close()
+
+    print(f"{len(records)} request(s) from {args.since} to {args.until} (outcome: {args.outcome})")
+    _print_report(records, args.by, args.metric)
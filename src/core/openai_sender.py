@@ -0,0 +1,272 @@
+import base64
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from dotenv import load_dotenv
+
+from .ai_backend import AIBackend
+from .ai_sender import PREWARM_INTERVAL, READY_TIMEOUT, http_client_args, read_attachment
+from .capture_buffer import CaptureBuffer
+from .metrics import TOKENS_PER_S, TTFT_MS, UPLOAD_BYTES, metrics
+from .startup_profiler import startup_profiler
+from .tracing import tracer
+
+
+CONNECT_TIMEOUT = 10  # Seconds to open a connection to the server
+READ_TIMEOUT = 120  # Seconds to wait for the next streamed event (a local server may be loading the model)
+
+
+def content_part(data: bytes, mime_type: str) -> dict[str, Any]:
+    """Convert an attachment into an OpenAI chat message content part.
+
+    Images become base64 data URLs and text files are inlined. Raises
+    ValueError for other types, which the API has no part for.
+
+    Args:
+        data (bytes): The attachment's bytes.
+        mime_type (str): Its MIME type.
+
+    Returns:
+        dict[str, Any]: An "image_url" or "text" content part.
+    """
+    if mime_type.startswith("image/"):
+        encoded = base64.b64encode(data).decode("ascii")
+        return {"type": "image_url", "image_url": {"url": f"data:{mime_type};base64,{encoded}"}}
+    if mime_type.startswith("text/"):
+        return {"type": "text", "text": data.decode("utf-8", errors="replace")}
+    raise ValueError(f"OpenAI-compatible backends cannot attach {mime_type} files")
+
+
+def parse_event(line: str) -> dict[str, Any] | None:
+    """Parse one line of a server-sent event stream.
+
+    Raises RuntimeError if the server streamed an error object.
+
+    Args:
+        line (str): A line of the response body, without its line break.
+
+    Returns:
+        dict[str, Any] | None: The decoded chunk, or None for blank lines, comments, other fields and the final "[DONE]".
+    """
+    if not line.startswith("data:"):
+        return None
+    data = line[5:].strip()
+    if not data or data == "[DONE]":
+        return None
+    event = json.loads(data)
+    if event.get("error"):
+        error = event["error"]
+        raise RuntimeError(error.get("message", str(error)) if isinstance(error, dict) else str(error))
+    return event
+
+
+class OpenAISender(AIBackend):
+    """Streams responses from a server speaking the OpenAI /chat/completions API.
+
+    Works with local servers such as llama.cpp, vLLM or Ollama. The endpoint is
+    stateless, so the conversation is kept here and sent in full with every
+    request; screenshots travel as base64 data URLs in image_url parts.
+    Responses arrive as server-sent events on one keep-alive httpx connection
+    pool shared by all requests (the same limits as the Gemini client), and a
+    cancelled request closes its stream at the next event, which drops that
+    connection rather than draining the rest of the response.
+
+    Set OPENAI_API_KEY in .env for servers that require a key.
+    """
+
+    def __init__(self, base_url: str, model: str = "") -> None:
+        # Load environment variables from the .env file
+        base_dir = Path(__file__).resolve().parent.parent.parent
+        load_dotenv(base_dir / ".env")
+
+        self.base_url = base_url.rstrip("/")
+        self.model = model  # Empty lets the server pick its loaded model
+        self.headers = {"Accept": "text/event-stream"}
+        if os.getenv("OPENAI_API_KEY"):
+            self.headers["Authorization"] = f"Bearer {os.getenv('OPENAI_API_KEY')}"
+
+        # httpx client and conversation, set by the init thread and send_message
+        self.client = None
+        self.history: list[dict[str, Any]] = []  # Completed turns; replaced, not cleared, by reset_chat
+        self.ready = threading.Event()
+        self.init_error: Exception | None = None
+
+        # Connection warm-up state
+        self.last_used = 0.0  # time.monotonic() of the last request on the pool
+        self.warming = False
+
+        self.init_thread = threading.Thread(target=self._initialize_client, name="openai-init", daemon=True)
+        self.init_thread.start()
+
+    def is_ready(self) -> bool:
+        """Check whether client initialization has finished (successfully or not).
+
+        Returns:
+            bool: True once the init thread is done.
+        """
+        return self.ready.is_set()
+
+    def wait_until_ready(self, timeout: float | None = READY_TIMEOUT) -> None:
+        """Block until the client is ready.
+
+        Raises TimeoutError if initialization does not finish in time and
+        RuntimeError if it failed, so the caller's error path reports it.
+
+        Args:
+            timeout (float | None, optional): Maximum seconds to wait; None waits forever.
+        """
+        if not self.ready.wait(timeout):
+            raise TimeoutError("OpenAI-compatible client is still initializing")
+        if self.init_error is not None:
+            raise RuntimeError(f"OpenAI-compatible client failed to initialize: {str(self.init_error)}")
+
+    def prewarm(self) -> None:
+        """Open or refresh the pooled connection in the background if it may have gone idle (see AISender.prewarm)."""
+        if not self.is_ready() or self.init_error is not None or self.warming:
+            return
+        if time.monotonic() - self.last_used < PREWARM_INTERVAL:
+            return
+        self.warming = True
+        threading.Thread(target=self._warm_connection, name="openai-prewarm", daemon=True).start()
+
+    def reset_chat(self) -> None:
+        """Reset the chat session, clearing all conversation history."""
+        self.history = []  # A response still streaming finishes into the old list
+
+    def send_message(
+        self,
+        user_input: str,
+        attachments: list[str | tuple[bytes, str] | CaptureBuffer] | None = None,
+        on_chunk: Callable[[str], None] | None = None,
+        cancel: threading.Event | None = None
+    ) -> str:
+        """Send a message and stream the response from the server.
+
+        Raises RuntimeError if the server answers with an error status or
+        streams an error event.
+
+        Args:
+            user_input (str): The user's input text to send to the model.
+            attachments (list[str | tuple[bytes, str] | CaptureBuffer], optional): File paths, (data, mime_type) tuples or screenshots to attach.
+            on_chunk (callable, optional): Callback invoked with each text chunk as it streams.
+            cancel (threading.Event, optional): When set, the stream is closed at the next event.
+
+        Returns:
+            str: The full generated response text, or the part received before cancellation.
+        """
+        start = time.perf_counter()
+        metrics.begin_request()
+        with tracer.span("wait for client", "ai"):
+            self.wait_until_ready()
+
+        # Build the user turn from attachments
+        content: list[dict[str, Any]] = []
+        upload_bytes = len(user_input.encode("utf-8"))
+        with tracer.span("read attachments", "ai", files=len(attachments or [])) as span:
+            for attachment in attachments or []:
+                data, mime_type = read_attachment(attachment)
+                upload_bytes += len(data)
+                content.append(content_part(data, mime_type))
+            content.append({"type": "text", "text": user_input})
+            span.args["bytes"] = upload_bytes
+        metrics.set(UPLOAD_BYTES, upload_bytes)
+
+        history = self.history
+        user_message = {"role": "user", "content": content}
+        body: dict[str, Any] = {
+            "messages": history + [user_message],
+            "stream": True,
+            "stream_options": {"include_usage": True},  # Token count in the last chunk; servers without it are estimated
+        }
+        if self.model:
+            body["model"] = self.model
+
+        self.last_used = time.monotonic()
+        full_response = ""
+        first_chunk_time = None
+        output_tokens = None
+        cancelled = False
+        request_start = time.perf_counter_ns()
+        try:
+            with self.client.stream("POST", f"{self.base_url}/chat/completions", json=body, headers=self.headers) as response:
+                if response.status_code >= 400:
+                    response.read()
+                    raise RuntimeError(f"{self.base_url} returned {response.status_code}: {response.text[:200]}")
+                for line in response.iter_lines():
+                    if cancel is not None and cancel.is_set():
+                        cancelled = True
+                        break  # Leaving the block closes the stream instead of draining the rest
+                    event = parse_event(line)
+                    if event is None:
+                        continue
+                    if event.get("usage") and event["usage"].get("completion_tokens"):
+                        output_tokens = event["usage"]["completion_tokens"]
+                    for choice in event.get("choices") or []:
+                        text = (choice.get("delta") or {}).get("content")
+                        if not text:
+                            continue
+                        if first_chunk_time is None:
+                            first_chunk_time = time.perf_counter()
+                            metrics.set(TTFT_MS, (first_chunk_time - start) * 1000)
+                            first_chunk_ns = time.perf_counter_ns()
+                            tracer.complete("upload + time to first token", "ai", request_start, first_chunk_ns, bytes=upload_bytes)
+                        full_response += text
+                        if self.echo:
+                            print(text, end="", flush=True)
+                        if on_chunk is not None:
+                            try:
+                                on_chunk(text)
+                            except Exception:
+                                pass
+        finally:
+            self.last_used = time.monotonic()
+            if first_chunk_time is not None:
+                tracer.complete("stream", "ai", first_chunk_ns, chars=len(full_response))
+
+        # A cancelled turn is left out of the conversation
+        if not cancelled:
+            history.extend((user_message, {"role": "assistant", "content": full_response}))
+
+        # Generation speed after the first token; estimate ~4 characters per token if usage is missing
+        if first_chunk_time is not None:
+            elapsed = time.perf_counter() - first_chunk_time
+            tokens = output_tokens or len(full_response) / 4
+            if elapsed > 0:
+                metrics.set(TOKENS_PER_S, tokens / elapsed)
+
+        return full_response
+
+    def _initialize_client(self) -> None:
+        """Import httpx and create the pooled client (runs on the init thread)."""
+        try:
+            startup_profiler.mark("client init started")
+            import httpx
+
+            self.client = httpx.Client(
+                timeout=httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT),
+                **http_client_args(),
+            )
+            startup_profiler.mark("client ready")
+        except Exception as e:
+            self.init_error = e
+            print(f"Error initializing OpenAI-compatible client: {str(e)}")
+            self.ready.set()
+            return
+
+        self.ready.set()
+        self.warming = True
+        self._warm_connection()  # Connect while the user is still looking at the screen
+
+    def _warm_connection(self) -> None:
+        """Make a lightweight request so the pooled connection is open."""
+        try:
+            self.client.get(f"{self.base_url}/models", headers=self.headers)
+        except Exception as e:
+            print(f"Error pre-warming OpenAI-compatible connection: {str(e)}")
+        finally:
+            self.last_used = time.monotonic()
+            self.warming = False
@@ -0,0 +1,226 @@
+import heapq
+import itertools
+import threading
+import time
+from typing import Any, Callable
+
+
+PRIORITY_TYPED = 0  # Lower values run first
+PRIORITY_PRESET = 1
+TYPED = "typed"  # Preset label of typed messages
+MAX_WORKERS = 2  # One live generation plus one cancelled stream still closing
+MAX_QUEUED = 4
+SHUTDOWN_TIMEOUT_S = 5  # How long shutdown waits for cancelled streams to close
+DEBOUNCE_S = 0.4  # The same preset pressed again within this window is dropped (held-down or hammered hotkeys)
+
+
+class GenerationRequest():
+    """One message waiting for or running on the scheduler's worker pool."""
+
+    def __init__(
+        self,
+        message: str,
+        attachments: list[Any],
+        priority: int,
+        request_id: int = 0,
+        preset: str = TYPED,
+        captures: list[tuple[tuple[int, int], int]] | None = None
+    ) -> None:
+        self.message = message
+        self.attachments = attachments
+        self.priority = priority  # PRIORITY_TYPED or PRIORITY_PRESET
+        self.preset = preset  # Name of the preset that sent the message, or TYPED
+        self.request_id = request_id  # Trace request the generation belongs to
+        # Hashes of the screenshots captured for the request, including ones dropped as duplicates (see ScreenshotManager.get_and_clear_pending)
+        self.captures = captures or []
+        self.key = (preset, message, tuple(self.captures))  # Requests for the same prompt and screens share a key
+        self.cancel = threading.Event()
+
+
+class RequestScheduler():
+    """Owns AI generation: a bounded worker pool fed from a priority queue.
+
+    Only one request generates at a time. A new request cancels the live
+    generation and any queued requests of the same or lower priority (newest
+    wins), but waits behind a higher-priority one: a typed message preempts a
+    preset, never the other way round. A request with the same key as one
+    already queued or live (same prompt, same screens) is coalesced into it
+    (single flight). Preset hotkeys are debounced separately, before they
+    capture anything: see debounce.
+
+    Cancelled requests keep their worker until their stream closes, which is
+    why the pool has more than one thread; the pool never grows beyond
+    max_workers, so hammering a hotkey cannot pile up threads. Requests that
+    never run are passed to on_discard so their resources can be released.
+    shutdown stops the pool and waits for the live generations to end.
+    """
+
+    def __init__(
+        self,
+        run: Callable[[GenerationRequest], None],
+        on_discard: Callable[[GenerationRequest, str], None],
+        max_workers: int = MAX_WORKERS,
+        max_queued: int = MAX_QUEUED,
+        debounce_s: float = DEBOUNCE_S,
+        clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.run = run  # Runs one request on a worker thread
+        self.on_discard = on_discard  # Called with a request that will never run and the reason
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.debounce_s = debounce_s
+        self.clock = clock
+
+        self.condition = threading.Condition()
+        self.queue: list[tuple[int, int, GenerationRequest]] = []  # Heap of (priority, sequence, request)
+        self.sequence = itertools.count()
+        self.running: list[GenerationRequest] = []
+        self.workers = 0
+        self.idle_workers = 0
+        self.closed = False  # Set by shutdown; workers exit and new requests are discarded
+        self.last_pressed: dict[tuple, float] = {}
+        self.counts = {"submitted": 0, "debounced": 0, "coalesced": 0, "interrupted": 0, "preempted": 0, "dropped": 0}
+
+    def debounce(self, key: tuple) -> bool:
+        """Note a preset hotkey press and check whether it repeats the previous one too quickly.
+
+        Called before the hotkey captures a screenshot, so a held-down or
+        hammered hotkey does not take screenshots only to throw them away.
+
+        Args:
+            key (tuple): Identifies the preset (e.g. its name and prompt).
+
+        Returns:
+            bool: True if the same key was pressed within debounce_s and this press should be dropped.
+        """
+        with self.condition:
+            now = self.clock()
+            last = self.last_pressed.get(key)
+            self.last_pressed[key] = now
+            if len(self.last_pressed) > 64:
+                self.last_pressed = {other: t for other, t in self.last_pressed.items() if now - t < self.debounce_s}
+            if last is not None and now - last < self.debounce_s:
+                self.counts["debounced"] += 1
+                return True
+            return False
+
+    def submit(self, request: GenerationRequest) -> bool:
+        """Queue a request, applying single-flight and preemption.
+
+        Args:
+            request (GenerationRequest): The request.
+
+        Returns:
+            bool: True if the request was queued; False if it was coalesced or dropped (and discarded).
+        """
+        discarded: list[tuple[GenerationRequest, str]] = []
+        with self.condition:
+            self.counts["submitted"] += 1
+            if self.closed:
+                discarded.append((request, "cancelled"))
+            elif any(other.key == request.key and not other.cancel.is_set() for other in self._pending()):
+                self.counts["coalesced"] += 1
+                discarded.append((request, "coalesced"))
+            else:
+                for other in self.running:
+                    if other.priority >= request.priority and not other.cancel.is_set():
+                        other.cancel.set()
+                        self.counts["interrupted"] += 1
+                for entry in [entry for entry in self.queue if entry[0] >= request.priority]:
+                    self.queue.remove(entry)
+                    self.counts["preempted"] += 1
+                    discarded.append((entry[2], "preempted"))
+                heapq.heapify(self.queue)
+
+                heapq.heappush(self.queue, (request.priority, next(self.sequence), request))
+                if len(self.queue) > self.max_queued:
+                    dropped = max(self.queue)  # Lowest priority, newest
+                    self.queue.remove(dropped)
+                    heapq.heapify(self.queue)
+                    self.counts["dropped"] += 1
+                    discarded.append((dropped[2], "dropped"))
+                if self.idle_workers == 0 and self.workers < self.max_workers:
+                    self.workers += 1
+                    threading.Thread(target=self._worker_loop, name=f"ai-worker-{self.workers}", daemon=True).start()
+                self.condition.notify_all()
+
+        for other, reason in discarded:
+            self.on_discard(other, reason)
+        return all(other is not request for other, _reason in discarded)
+
+    def cancel_all(self) -> None:
+        """Cancel the live generation and discard every queued request."""
+        with self.condition:
+            for request in self.running:
+                request.cancel.set()
+            queued = [entry[2] for entry in self.queue]
+            self.queue.clear()
+            self.condition.notify_all()
+        for request in queued:
+            self.on_discard(request, "cancelled")
+
+    def shutdown(self, timeout: float | None = SHUTDOWN_TIMEOUT_S) -> bool:
+        """Cancel every request, stop the worker threads and wait for the live generations to end.
+
+        Args:
+            timeout (float | None, optional): Maximum seconds to wait; None waits until they end.
+
+        Returns:
+            bool: True if no generation is still running.
+        """
+        self.cancel_all()
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+            return self.condition.wait_for(lambda: not self.running, timeout)
+
+    def depth(self) -> int:
+        """Return the number of requests waiting to run.
+
+        Returns:
+            int: The queue depth.
+        """
+        return len(self.queue)
+
+    def stats(self) -> dict[str, int]:
+        """Return the queue depth, busy workers and how many requests were debounced, coalesced, interrupted, preempted or dropped.
+
+        Interrupted requests were cancelled while generating; preempted ones
+        were discarded from the queue by a newer request and never ran.
+
+        Returns:
+            dict[str, int]: Counter name -> value.
+        """
+        with self.condition:
+            return {**self.counts, "queued": len(self.queue), "running": len(self.running), "workers": self.workers}
+
+    def _pending(self) -> list[GenerationRequest]:
+        """Return the live and queued requests (call with the condition held).
+
+        Returns:
+            list[GenerationRequest]: The requests.
+        """
+        return [request for request in self.running if not request.cancel.is_set()] + [entry[2] for entry in self.queue]
+
+    def _worker_loop(self) -> None:
+        """Run queued requests one at a time, each once no other generation is live (runs on a pool thread)."""
+        while True:
+            with self.condition:
+                self.idle_workers += 1
+                while not self.closed and (not self.queue or any(not request.cancel.is_set() for request in self.running)):
+                    self.condition.wait()
+                self.idle_workers -= 1
+                if self.closed:
+                    self.workers -= 1
+                    return
+                _priority, _sequence, request = heapq.heappop(self.queue)
+                self.running.append(request)
+
+            try:
+                self.run(request)
+            except Exception as e:
+                print(f"Error running AI request: {str(e)}")
+            finally:
+                with self.condition:
+                    self.running.remove(request)
+                    self.condition.notify_all()
@@ -0,0 +1,318 @@
+import ctypes
+import queue
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Callable
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from PyQt6.QtGui import QImage
+
+from .image_hash import dhash, hamming_distance
+from .metrics import WATCH_CPU_PERCENT, metrics
+from .tracing import tracer
+from .win32_hook import BI_RGB, BITMAPINFOHEADER, DIB_RGB_COLORS, HALFTONE, SRCCOPY, gdi32, user32
+
+
+WATCH_INTERVAL_S = 2.0  # Seconds between samples; overridden by config
+SAMPLE_WIDTH = 160  # Columns of the downsampled grid (rows follow the capture area's aspect ratio)
+QUANTIZE_SHIFT = 5  # Brightness is compared in 8 levels, so noise and anti-aliasing shimmer do not count as change
+CHANGE_FRACTION = 0.04  # Fraction of grid cells that must differ from the last capture to queue a new one
+SETTLE_FRACTION = 0.002  # Consecutive samples closer than this count as settled (caret blink, clock tick)
+FINGERPRINT_THRESHOLD = 24  # Max differing hash bits (out of 1024) for a settled screen to count as already captured
+RECENT_FINGERPRINTS = 8  # Screens remembered so flipping back to one does not capture it again
+
+QUANTIZE_TABLE = bytes((value >> QUANTIZE_SHIFT) for value in range(256))
+
+
+def changed_fraction(a: bytes, b: bytes) -> float:
+    """Return the fraction of grid cells whose quantized brightness differs between two samples.
+
+    Both samples are quantized with bytes.translate, packed into one big
+    integer each and compared with a handful of whole-integer operations, so
+    the cost does not grow with per-cell Python work.
+
+    Args:
+        a (bytes): One brightness sample (one byte per cell).
+        b (bytes): Another sample of the same length.
+
+    Returns:
+        float: The changed fraction in [0, 1].
+    """
+    if not a:
+        return 0.0
+    diff = int.from_bytes(a.translate(QUANTIZE_TABLE), "little") ^ int.from_bytes(b.translate(QUANTIZE_TABLE), "little")
+    # Quantized levels use the low 3 bits of each byte; fold them into bit 0 and count one bit per changed cell
+    diff |= diff >> 1
+    diff |= diff >> 1
+    low_bits = ((1 << (8 * len(a))) - 1) // 0xFF  # 0x0101...01: bit 0 of every byte
+    return (diff & low_bits).bit_count() / len(a)
+
+
+class ScreenSampler(ABC):
+    """Platform interface used by ScreenWatcher.
+
+    Implementations grab a small, downsampled brightness grid of a screen
+    area. A fake implementation can drive the watcher without a window system.
+    """
+
+    @abstractmethod
+    def sample(self, area: dict[str, int], width: int) -> bytes:
+        """Grab a downsampled brightness grid of a screen area.
+
+        Args:
+            area (dict[str, int]): The area in physical pixels (mss monitor format).
+            width (int): Columns of the grid; rows follow the area's aspect ratio.
+
+        Returns:
+            bytes: One brightness byte per cell, row by row.
+        """
+
+    def close(self) -> None:
+        """Free any resources held by the sampler; by default does nothing, for samplers that hold none."""
+
+
+class Win32ScreenSampler(ScreenSampler):
+    """ScreenSampler backed by a GDI StretchBlt into a small DIB section.
+
+    GDI averages the screen down to the grid while copying (HALFTONE), so the
+    full-resolution frame is never copied into this process. Must be used
+    from a single thread.
+    """
+
+    def __init__(self, user32_dll: Any = None, gdi32_dll: Any = None) -> None:
+        self.user32 = user32_dll or user32
+        self.gdi32 = gdi32_dll or gdi32
+        self.memory_dc = self.gdi32.CreateCompatibleDC(None)
+        self.gdi32.SetStretchBltMode(self.memory_dc, HALFTONE)
+        self.gdi32.SetBrushOrgEx(self.memory_dc, 0, 0, None)  # Required after selecting HALFTONE
+        self.bitmap = None
+        self.previous_bitmap = None
+        self.bits = ctypes.c_void_p()
+        self.size = (0, 0)
+
+    def sample(self, area: dict[str, int], width: int) -> bytes:
+        """Grab a downsampled brightness grid of a screen area.
+
+        Args:
+            area (dict[str, int]): The area in physical pixels (mss monitor format).
+            width (int): Columns of the grid; rows follow the area's aspect ratio.
+
+        Returns:
+            bytes: One brightness byte per cell (the green channel), row by row.
+        """
+        width = min(width, area["width"])
+        height = max(1, round(width * area["height"] / area["width"]))
+        if (width, height) != self.size:
+            self._create_bitmap(width, height)
+
+        screen_dc = self.user32.GetDC(None)
+        try:
+            self.gdi32.StretchBlt(
+                self.memory_dc, 0, 0, width, height,
+                screen_dc, area["left"], area["top"], area["width"], area["height"],
+                SRCCOPY,
+            )
+            self.gdi32.GdiFlush()
+        finally:
+            self.user32.ReleaseDC(None, screen_dc)
+        return ctypes.string_at(self.bits, width * height * 4)[1::4]
+
+    def close(self) -> None:
+        """Delete the DIB section and the memory DC."""
+        if self.bitmap is not None:
+            self.gdi32.SelectObject(self.memory_dc, self.previous_bitmap)
+            self.gdi32.DeleteObject(self.bitmap)
+            self.bitmap = None
+        self.gdi32.DeleteDC(self.memory_dc)
+
+    def _create_bitmap(self, width: int, height: int) -> None:
+        """Replace the DIB section with a top-down 32-bit one of the given size.
+
+        Args:
+            width (int): Width in pixels.
+            height (int): Height in pixels.
+        """
+        header = BITMAPINFOHEADER()
+        header.biSize = ctypes.sizeof(BITMAPINFOHEADER)
+        header.biWidth = width
+        header.biHeight = -height  # Negative height makes rows run top to bottom
+        header.biPlanes = 1
+        header.biBitCount = 32
+        header.biCompression = BI_RGB
+
+        bitmap = self.gdi32.CreateDIBSection(self.memory_dc, ctypes.byref(header), DIB_RGB_COLORS, ctypes.byref(self.bits), None, 0)
+        if not bitmap:
+            raise OSError("CreateDIBSection failed")
+        previous = self.gdi32.SelectObject(self.memory_dc, bitmap)
+        if self.bitmap is not None:
+            self.gdi32.DeleteObject(self.bitmap)
+        else:
+            self.previous_bitmap = previous
+        self.bitmap = bitmap
+        self.size = (width, height)
+
+
+class ScreenWatcher(QObject):
+    """Opt-in watch mode that captures a screenshot when the screen content changes significantly.
+
+    A timer on the UI thread resolves the capture area every interval and
+    hands it to a sampler thread; that is the only work the UI thread does.
+    The sampler grabs a small brightness grid (see ScreenSampler) and compares
+    it with the previous sample and with the screen at the last capture. Once
+    enough of the grid has changed and the screen has settled (so a page that
+    is still loading or scrolling is captured when it is done), change_detected
+    asks the ScreenshotManager to take a full screenshot, which lands in the
+    pending attachments like a hotkey capture. A fingerprint of each captured
+    screen stops a screen that is switched back to from being captured again.
+    """
+
+    # Using threading instead of QThread due to compilation issues with Nuitka
+    change_detected = pyqtSignal()
+    active_changed = pyqtSignal(bool)
+
+    def __init__(self, screenshot_manager, sampler_factory: Callable[[], ScreenSampler] = Win32ScreenSampler) -> None:
+        super().__init__()
+        self.screenshot_manager = screenshot_manager
+        self.sampler_factory = sampler_factory  # Called on the sampler thread, which owns the sampler
+        self.active = False
+        self.configured = False  # Last "watch" value from the config; only changes to it start or stop watching
+        self.areas: queue.Queue | None = None  # Hand-off to the running sampler thread (at most one area in flight)
+        self.tick_ns = 0  # UI thread time spent in ticks, for the CPU metric
+        self.captures = 0
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(int(WATCH_INTERVAL_S * 1000))
+        self.timer.timeout.connect(self._tick)
+        self.change_detected.connect(self._on_change_detected)
+
+    def apply_config(self, config: dict[str, Any]) -> None:
+        """Apply the watch settings from the "capture" section of a validated config.
+
+        Args:
+            config (dict[str, Any]): The validated configuration from core.config.
+        """
+        capture = config["capture"]
+        self.timer.setInterval(int(capture["watch_interval"] * 1000))
+        if capture["watch"] != self.configured:
+            self.configured = capture["watch"]
+            self.set_active(capture["watch"])
+
+    def toggle(self) -> None:
+        """Start or stop watching."""
+        self.set_active(not self.active)
+
+    def set_active(self, active: bool) -> None:
+        """Start or stop watching the capture target.
+
+        Args:
+            active (bool): Whether to watch.
+        """
+        if active == self.active:
+            return
+        self.active = active
+        if active:
+            self.areas = queue.Queue(maxsize=1)
+            self.tick_ns = 0
+            threading.Thread(target=self._sample_loop, args=(self.areas,), name="screen-watch", daemon=True).start()
+            self.timer.start()
+            self._tick()  # Take the baseline now rather than one interval later
+        else:
+            self.timer.stop()
+            self._hand_off(self.areas, None)
+            self.areas = None
+        print(f"Screen watch {'on' if active else 'off'}")
+        self.active_changed.emit(active)
+
+    def _on_change_detected(self) -> None:
+        """Capture the changed screen, unless watching stopped after the sampler thread reported the change."""
+        if self.active:
+            self.screenshot_manager.take_screenshot()
+
+    def _tick(self) -> None:
+        """Resolve the capture area and hand it to the sampler thread (runs on the UI thread)."""
+        start = time.perf_counter_ns()
+        try:
+            self._hand_off(self.areas, self.screenshot_manager.capture_area())
+        except Exception as e:
+            print(f"Error resolving the screen watch area: {str(e)}")
+        self.tick_ns += time.perf_counter_ns() - start
+
+    def _hand_off(self, areas: queue.Queue | None, area: dict[str, int] | None) -> None:
+        """Give the sampler thread its next area, replacing one it has not picked up yet.
+
+        Args:
+            areas (queue.Queue | None): The sampler thread's queue.
+            area (dict[str, int] | None): The area to sample, or None to stop the thread.
+        """
+        if areas is None:
+            return
+        try:
+            areas.get_nowait()  # The sampler is behind; only the latest area matters
+        except queue.Empty:
+            pass
+        areas.put_nowait(area)
+
+    def _sample_loop(self, areas: queue.Queue) -> None:
+        """Sample the screen for each area handed over until told to stop (runs on the sampler thread).
+
+        Args:
+            areas (queue.Queue): Areas from the UI thread; None stops the loop.
+        """
+        sampler = None
+        baseline = previous = None
+        fingerprints: deque[int] = deque(maxlen=RECENT_FINGERPRINTS)
+        cpu_start = time.thread_time()
+        wall_start = time.perf_counter()
+        try:
+            sampler = self.sampler_factory()
+            while True:
+                area = areas.get()
+                if area is None:
+                    break
+                with tracer.span("screen watch sample", "capture"):
+                    try:
+                        current = sampler.sample(area, SAMPLE_WIDTH)
+                    except Exception as e:
+                        print(f"Error sampling the screen: {str(e)}")
+                        continue
+                    width = min(SAMPLE_WIDTH, area["width"])
+
+                    if previous is None or len(current) != len(previous):
+                        # First sample, or the area changed size: start over from this screen without capturing it
+                        baseline = previous = current
+                        fingerprints.append(self._fingerprint(current, width))
+                        continue
+                    settled = changed_fraction(previous, current) <= SETTLE_FRACTION
+                    previous = current
+                    if settled and changed_fraction(baseline, current) >= CHANGE_FRACTION:
+                        baseline = current
+                        fingerprint = self._fingerprint(current, width)
+                        if all(hamming_distance(fingerprint, seen) > FINGERPRINT_THRESHOLD for seen in fingerprints):
+                            fingerprints.append(fingerprint)
+                            self.captures += 1
+                            self.change_detected.emit()
+
+                elapsed = time.perf_counter() - wall_start
+                busy = time.thread_time() - cpu_start + self.tick_ns / 1_000_000_000
+                metrics.set(WATCH_CPU_PERCENT, 100 * busy / elapsed)
+
+        except Exception as e:
+            print(f"Error watching the screen: {str(e)}")
+        finally:
+            if sampler is not None:
+                sampler.close()
+
+    def _fingerprint(self, sample: bytes, width: int) -> int:
+        """Compute a perceptual hash of a brightness grid.
+
+        Args:
+            sample (bytes): The grid, one byte per cell.
+            width (int): Columns of the grid.
+
+        Returns:
+            int: The dhash of the grid.
+        """
+        image = QImage(sample, width, len(sample) // width, width, QImage.Format.Format_Grayscale8)
+        return dhash(image)
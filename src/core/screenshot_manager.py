@@ -1,77 +1,467 @@
-import glob
+import json
 import os
+import threading
+import time
+from collections import deque
+from typing import Any
 
 import mss
-from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtCore import QBuffer, QByteArray, QIODevice, QObject, QPoint, QRect, pyqtSignal
+from PyQt6.QtGui import QCursor, QGuiApplication, QImage
+
+from core.capture_buffer import CaptureBuffer
+from core.capture_target import (
+    CAPTURE_TARGETS,
+    CURSOR_MONITOR,
+    FIXED_REGION,
+    PICKED_REGION,
+    resolve_capture_area,
+)
+from core.config import load_config
+from core.image_hash import dhash, hamming_distance
+from core.metrics import CAPTURE_MS, ENCODE_MS, metrics
+from core.screen_watcher import ScreenWatcher
+from core.scroll_stitcher import join_rows, plan_stitches, row_hashes
+from core.tracing import tracer
+
+
+DEDUP_THRESHOLD = 6  # Max differing hash bits (out of 1024) for two screenshots to count as duplicates; overridden by config
+DEDUP_HISTORY_SIZE = 16  # Number of recently sent screenshot hashes kept for deduplication
+
+
+def encode_png(buffer: CaptureBuffer) -> QImage:
+    """Encode a buffer's pixels as PNG and store the result in the buffer.
+
+    Raises RuntimeError if encoding fails.
+
+    Args:
+        buffer (CaptureBuffer): The captured frame.
+
+    Returns:
+        QImage: The image wrapping the buffer's pixels (no copy).
+    """
+    # mss returns BGRA rows, which is Format_RGB32 on little-endian machines (wrapped without copying)
+    image = QImage(buffer.pixels, buffer.width, buffer.height, buffer.width * 4, QImage.Format.Format_RGB32)
+    encoded = QByteArray()
+    device = QBuffer(encoded)
+    device.open(QIODevice.OpenModeFlag.WriteOnly)
+    saved = image.save(device, "PNG")
+    device.close()
+    if not saved:
+        raise RuntimeError("PNG encoding failed")
+    buffer.set_png(encoded.data())
+    return image
+
+
+def stitch_screenshots(buffers: list[CaptureBuffer]) -> list[CaptureBuffer]:
+    """Merge consecutive screenshots of a scrolled page into one image and release the originals.
+
+    Two captures of the same size are merged when the scrolling part of the
+    later one starts with the end of the earlier one; fixed headers and
+    footers are kept once and the repeated rows are left out (see
+    core.scroll_stitcher). Anything else is passed through unchanged, as is
+    everything if stitching fails.
+
+    Args:
+        buffers (list[CaptureBuffer]): Screenshots in capture order; the caller's references are taken over.
+
+    Returns:
+        list[CaptureBuffer]: The screenshots to send, in capture order.
+    """
+    stitched: list[CaptureBuffer] = []
+    try:
+        with tracer.span("stitch", "capture", screenshots=len(buffers)):
+            frames = [(buffer.width, buffer.height, row_hashes(buffer.pixels, buffer.width, buffer.height)) for buffer in buffers]
+            groups = plan_stitches(frames)
+            if len(groups) == len(buffers):
+                return buffers
+
+            for group in groups:
+                if len(group) == 1:
+                    stitched.append(buffers[group[0][0]])
+                    continue
+                first = buffers[group[0][0]]
+                pixels, height = join_rows([buffer.pixels for buffer in buffers], first.width, group)
+                merged = CaptureBuffer(f"{first.name}-stitched", pixels, first.width, height)
+                stitched.append(merged)
+                encode_png(merged)
+    except Exception as e:
+        print(f"Error stitching screenshots: {str(e)}")
+        originals = {id(buffer) for buffer in buffers}
+        for buffer in stitched:
+            if id(buffer) not in originals:
+                buffer.release()
+        return buffers
+
+    kept = {id(buffer) for buffer in stitched}
+    for buffer in buffers:
+        if id(buffer) not in kept:
+            buffer.release()
+    print(f"Stitched {len(buffers)} screenshot(s) into {len(stitched)}")
+    return stitched
 
 
 class ScreenshotManager(QObject):
-    """Handles capturing screenshots of the primary screen."""
+    """Handles capturing screenshots of the configured capture target."""
 
-    screenshot_added = pyqtSignal(str)
+    screenshot_added = pyqtSignal(object)  # CaptureBuffer; the pending list owns it, so slots retain() it to keep it
 
     def __init__(self) -> None:
         super().__init__()
         base_dir = os.getcwd()
-        self.screenshots_dir = os.path.join(base_dir, "src", "data", "cache", "screenshots")
-        os.makedirs(self.screenshots_dir, exist_ok=True)  # Ensure the folder exists
+        self.picked_region_path = os.path.join(base_dir, "src", "data", "cache", "picked_region.json")
         self.screenshot_count = 0
-        self.pending_paths: list[str] = []
+        self.pending: list[CaptureBuffer] = []  # Each holds one reference, handed to the caller of get_and_clear_pending
+
+        # Capture target settings (all regions are in physical pixels, mss monitor format)
+        self.capture_target = CURSOR_MONITOR
+        self.fixed_region: dict[str, int] | None = None
+        self.picked_region = self._load_picked_region()
+        self.overlay_rect: QRect | None = None  # Logical geometry of the overlay, kept up to date by the main window
+
+        # Perceptual-hash deduplication of pending screenshots: name -> ((width, height), hash)
+        self.dedup_threshold = DEDUP_THRESHOLD
+        self.hashes: dict[str, tuple[tuple[int, int], int]] = {}
+        self.sent_hashes: deque[tuple[tuple[int, int], int]] = deque(maxlen=DEDUP_HISTORY_SIZE)  # Received by the model
+        self.unsent_hashes: list[tuple[tuple[int, int], int]] = []  # Handed to requests that have not completed yet
+        self.hash_lock = threading.Lock()  # Requests mark their hashes sent or unsent from AI worker threads
+        self.dedup_checked = 0
+        self.dedup_hits = 0
+
+        self.stitch = False  # Merge overlapping scroll captures into one image at send time
+        self.stitched = 0  # Captures merged into another image this session
+
+        self.screen_watcher = ScreenWatcher(self)  # Opt-in: captures on its own when the screen content changes
+        self.apply_config(load_config())
 
-    def take_screenshot(self) -> str:
-        """Take a screenshot of the primary screen and save it to the screenshots directory.
+    def take_screenshot(self) -> CaptureBuffer | None:
+        """Take a screenshot of the capture target and add it to the pending screenshots.
+
+        The grabbed pixels are never copied: the PNG encoder, the dedup hash
+        and the tray thumbnail all wrap the same CaptureBuffer.
 
         Returns:
-            str: The filepath of the saved screenshot, or an empty string on failure.
+            CaptureBuffer | None: The captured screenshot (owned by the pending list), or None on failure.
         """
+        buffer = None
         try:
-            filename = f"screenshot{self.screenshot_count}.png"
-            filepath = os.path.join(self.screenshots_dir, filename)
-
             # Create a new mss instance for each call (thread-safe)
             with mss.mss() as sct:
-                # Screenshot the primary monitor
-                monitor = sct.monitors[1]  # 0 is all monitors, 1 is primary
-                screenshot = sct.grab(monitor)
-                mss.tools.to_png(screenshot.rgb, screenshot.size, output=str(filepath))
+                area = self._resolve_capture_area(sct.monitors)
+                start = time.perf_counter_ns()
+                screenshot = sct.grab(area)
+                grabbed = time.perf_counter_ns()
+            buffer = CaptureBuffer(f"screenshot{self.screenshot_count}", screenshot.raw, screenshot.width, screenshot.height)
+            del screenshot  # The buffer now owns the pixels
+
+            image = encode_png(buffer)
+            encoded_at = time.perf_counter_ns()
+            metrics.set(CAPTURE_MS, (grabbed - start) / 1_000_000)
+            metrics.set(ENCODE_MS, (encoded_at - grabbed) / 1_000_000)
+            tracer.complete("grab", "capture", start, grabbed, width=buffer.width, height=buffer.height)
+            tracer.complete("png encode", "capture", grabbed, encoded_at)
+
+            with tracer.span("dhash", "capture"):
+                self.hashes[buffer.name] = ((buffer.width, buffer.height), dhash(image))
 
             self.screenshot_count += 1
-            self.pending_paths.append(filepath)
-            self.screenshot_added.emit(filepath)
-            return filepath
+            self.pending.append(buffer)
+            self.screenshot_added.emit(buffer)
+            return buffer
 
         except Exception as e:
             print(f"Error taking screenshot: {str(e)}")
-            return ""
+            if buffer is not None:
+                buffer.release()
+            return None
+
+    def set_capture_target(self, target: str) -> None:
+        """Select which part of the screen future screenshots capture.
+
+        Args:
+            target (str): One of the capture targets defined in core.capture_target.
+        """
+        if target not in CAPTURE_TARGETS:
+            print(f"Unknown capture target: {target}")
+            return
+        self.capture_target = target
+
+    def set_picked_region(self, left: int, top: int, width: int, height: int) -> None:
+        """Save an interactively picked region and make it the capture target.
+
+        The region is persisted so it is reused across sessions until a new one is picked.
+
+        Args:
+            left (int): Left edge of the region in physical pixels.
+            top (int): Top edge of the region in physical pixels.
+            width (int): Width of the region in physical pixels.
+            height (int): Height of the region in physical pixels.
+        """
+        self.picked_region = {"left": left, "top": top, "width": width, "height": height}
+        self.capture_target = PICKED_REGION
+
+        try:
+            with open(self.picked_region_path, "w", encoding="utf-8") as f:
+                json.dump(self.picked_region, f)
+        except Exception as e:
+            print(f"Error saving picked region: {str(e)}")
+
+    def set_overlay_rect(self, rect: QRect) -> None:
+        """Record the overlay's current geometry for the overlay-monitor capture target.
+
+        Args:
+            rect (QRect): The overlay frame geometry in logical coordinates.
+        """
+        self.overlay_rect = QRect(rect)
+
+    def apply_config(self, config: dict[str, Any]) -> None:
+        """Apply the "capture" section of a validated config.
+
+        Args:
+            config (dict[str, Any]): The validated configuration from core.config.
+        """
+        capture = config["capture"]
+        self.fixed_region = capture["region"]
+        self.dedup_threshold = capture["dedup_threshold"]  # Negative disables deduplication
+        self.stitch = capture["stitch"]
+        self.set_capture_target(capture["target"])
+        self.screen_watcher.apply_config(config)
+
+    def capture_area(self) -> dict[str, int]:
+        """Resolve the area the next screenshot would capture.
+
+        Returns:
+            dict[str, int]: The area in physical pixels (mss monitor format).
+        """
+        with mss.mss() as sct:
+            return self._resolve_capture_area(sct.monitors)
+
+    def get_and_clear_pending(self) -> tuple[list[CaptureBuffer], list[tuple[tuple[int, int], int]]]:
+        """Return all pending screenshots and their hashes, and clear the pending list.
+
+        Screenshots that are near-duplicates of an earlier pending screenshot,
+        or of one the model has already received in this chat, are collapsed
+        so each image is only uploaded once; the dropped ones are released
+        here. The caller takes over the pending list's reference to each
+        returned buffer and must release it once the upload is done.
+
+        The hashes identify every screenshot taken for the request, dropped
+        ones included, each as the hash of the earlier image it duplicates, so
+        two requests for the same screen carry the same hashes. They only count
+        as sent once the caller passes them to mark_sent after the model has
+        received the request; a request that is dropped, interrupted or fails
+        must pass them to mark_unsent instead.
 
-    def get_and_clear_pending(self) -> list[str]:
-        """Return all pending screenshot paths and clear the pending list.
+        If stitching is enabled, consecutive captures of a page scrolled
+        between them are merged into one image as well (see _stitch).
 
         Returns:
-            list[str]: The list of pending screenshot file paths.
+            tuple[list[CaptureBuffer], list[tuple[tuple[int, int], int]]]: The pending screenshots, and the (size, hash) of each capture.
         """
-        paths = self.pending_paths.copy()
-        self.pending_paths.clear()
-        return paths
+        buffers, captures = self._deduplicate(self.pending)
+        self.pending.clear()
+        if self.stitch and len(buffers) > 1:
+            buffers = self._stitch(buffers)
+        return buffers, captures
 
-    def remove_pending(self, path: str) -> None:
-        """Remove a specific screenshot from the pending list.
+    def mark_sent(self, captures: list[tuple[tuple[int, int], int]]) -> None:
+        """Record that the model has received a request's screenshots, so later captures of the same screens are dropped.
 
         Args:
-            path (str): The file path of the screenshot to remove.
+            captures (list[tuple[tuple[int, int], int]]): The hashes returned with the request's screenshots by get_and_clear_pending.
         """
-        if path in self.pending_paths:
-            self.pending_paths.remove(path)
+        with self.hash_lock:
+            for entry in captures:
+                if entry in self.unsent_hashes:
+                    self.unsent_hashes.remove(entry)
+                if entry not in self.sent_hashes:
+                    self.sent_hashes.append(entry)
+
+    def mark_unsent(self, captures: list[tuple[tuple[int, int], int]]) -> None:
+        """Forget a request that never reached the model, so its screens are attached again next time.
+
+        Args:
+            captures (list[tuple[tuple[int, int], int]]): The hashes returned with the request's screenshots by get_and_clear_pending.
+        """
+        with self.hash_lock:
+            for entry in captures:
+                if entry in self.unsent_hashes:
+                    self.unsent_hashes.remove(entry)
+
+    def dedup_stats(self) -> dict[str, float]:
+        """Return screenshot deduplication statistics for this session.
+
+        Returns:
+            dict[str, float]: Screenshots checked, duplicates dropped, and the hit rate.
+        """
+        hit_rate = self.dedup_hits / self.dedup_checked if self.dedup_checked else 0.0
+        return {"checked": self.dedup_checked, "dropped": self.dedup_hits, "hit_rate": hit_rate}
+
+    def remove_pending(self, name: str) -> None:
+        """Remove a specific screenshot from the pending list and release it.
+
+        Args:
+            name (str): The name of the screenshot to remove.
+        """
+        for buffer in self.pending:
+            if buffer.name == name:
+                self.pending.remove(buffer)
+                self.hashes.pop(name, None)
+                buffer.release()
+                return
 
     def clear_screenshots(self) -> None:
-        """Delete all screenshots from the screenshots directory and reset the counter."""
-        self.pending_paths.clear()
+        """Release all pending screenshots and reset the counter."""
+        for buffer in self.pending:
+            buffer.release()
+        self.pending.clear()
+        self.hashes.clear()
+        with self.hash_lock:
+            self.sent_hashes.clear()
+            self.unsent_hashes.clear()
+        self.screenshot_count = 0
+
+    def _deduplicate(self, buffers: list[CaptureBuffer]) -> tuple[list[CaptureBuffer], list[tuple[tuple[int, int], int]]]:
+        """Drop and release screenshots that are near-duplicates of earlier pending or already sent ones.
+
+        A screenshot matching one that an unfinished request carries is kept,
+        since that request may still be dropped or interrupted, but takes on
+        its hash so the two requests compare equal.
+
+        Args:
+            buffers (list[CaptureBuffer]): Pending screenshots in capture order.
+
+        Returns:
+            tuple[list[CaptureBuffer], list[tuple[tuple[int, int], int]]]: The screenshots that survived deduplication, in capture order, and the hashes of all of them (see get_and_clear_pending).
+        """
+        kept: list[CaptureBuffer] = []
+        captures: list[tuple[tuple[int, int], int]] = []
+        dropped = 0
+        with self.hash_lock:
+            for buffer in buffers:
+                entry = self.hashes.pop(buffer.name, None)
+                self.dedup_checked += 1
+                if entry is None:
+                    kept.append(buffer)
+                    continue
+                if self.dedup_threshold >= 0:
+                    match = self._find_duplicate(entry, list(self.sent_hashes) + captures)
+                    if match is not None:
+                        buffer.release()
+                        dropped += 1
+                        if match not in captures:
+                            captures.append(match)
+                        continue
+                    entry = self._find_duplicate(entry, self.unsent_hashes) or entry
+                kept.append(buffer)
+                captures.append(entry)
+                self.unsent_hashes.append(entry)
+
+        if dropped:
+            self.dedup_hits += dropped
+            stats = self.dedup_stats()
+            print(
+                f"Dropped {dropped} duplicate screenshot(s) "
+                f"(session: {stats['dropped']}/{stats['checked']} = {stats['hit_rate']:.0%})"
+            )
+        return kept, captures
+
+    def _stitch(self, buffers: list[CaptureBuffer]) -> list[CaptureBuffer]:
+        """Merge consecutive screenshots of a scrolled page and count the merged ones.
+
+        Args:
+            buffers (list[CaptureBuffer]): Deduplicated screenshots in capture order.
+
+        Returns:
+            list[CaptureBuffer]: The screenshots to send, in capture order.
+        """
+        stitched = stitch_screenshots(buffers)
+        self.stitched += len(buffers) - len(stitched)
+        return stitched
 
+    def _find_duplicate(
+        self,
+        entry: tuple[tuple[int, int], int],
+        candidates: list[tuple[tuple[int, int], int]]
+    ) -> tuple[tuple[int, int], int] | None:
+        """Find an earlier screenshot hash that a new one is a near-duplicate of.
+
+        Args:
+            entry (tuple[tuple[int, int], int]): The screenshot size and perceptual hash.
+            candidates (list[tuple[tuple[int, int], int]]): The hashes to compare with, oldest first.
+
+        Returns:
+            tuple[tuple[int, int], int] | None: The first near-identical hash of the same size, or None.
+        """
+        size, bits = entry
+        for other in candidates:
+            other_size, other_bits = other
+            if other_size == size and hamming_distance(bits, other_bits) <= self.dedup_threshold:
+                return other
+        return None
+
+    def _load_picked_region(self) -> dict[str, int] | None:
+        """Load the last interactively picked region from the cache.
+
+        Returns:
+            dict[str, int] | None: The saved region, or None if no region has been picked yet.
+        """
         try:
-            pattern = os.path.join(self.screenshots_dir, "screenshot*.png")
-            for filepath in glob.glob(pattern):
-                os.remove(filepath)
+            with open(self.picked_region_path, "r", encoding="utf-8") as f:
+                region = json.load(f)
+            return {k: int(region[k]) for k in ("left", "top", "width", "height")}
+        except FileNotFoundError:
+            return None
         except Exception as e:
-            print(f"Error clearing screenshots: {str(e)}")
+            print(f"Error loading picked region: {str(e)}")
+            return None
+
+    def _resolve_capture_area(self, monitors: list[dict[str, int]]) -> dict[str, int]:
+        """Resolve the current capture target against the live monitor layout.
 
-        self.screenshot_count = 0
\ No newline at end of file
+        Args:
+            monitors (list[dict[str, int]]): Monitor list reported by mss.
+
+        Returns:
+            dict[str, int]: The area to grab in physical pixels.
+        """
+        cursor_pos = None
+        overlay_rect = None
+        region = None
+
+        if self.capture_target == CURSOR_MONITOR:
+            pos = QCursor.pos()
+            cursor_pos = self._to_physical(pos.x(), pos.y())
+        elif self.capture_target == FIXED_REGION:
+            region = self.fixed_region
+        elif self.capture_target == PICKED_REGION:
+            region = self.picked_region
+        elif self.overlay_rect is not None:
+            left, top = self._to_physical(self.overlay_rect.left(), self.overlay_rect.top())
+            right, bottom = self._to_physical(self.overlay_rect.right() + 1, self.overlay_rect.bottom() + 1)
+            overlay_rect = {"left": left, "top": top, "width": right - left, "height": bottom - top}
+
+        return resolve_capture_area(self.capture_target, monitors, cursor_pos, overlay_rect, region)
+
+    def _to_physical(self, x: int, y: int) -> tuple[int, int]:
+        """Convert a logical Qt screen coordinate to physical pixels as used by mss.
+
+        Qt keeps each screen's origin in device pixels but scales distances
+        within the screen by its device pixel ratio.
+
+        Args:
+            x (int): Logical x-coordinate.
+            y (int): Logical y-coordinate.
+
+        Returns:
+            tuple[int, int]: The coordinate in physical pixels.
+        """
+        screen = QGuiApplication.screenAt(QPoint(x, y)) or QGuiApplication.primaryScreen()
+        if screen is None:
+            return x, y
+        origin = screen.geometry().topLeft()
+        scale = screen.devicePixelRatio()
+        return (
+            int(origin.x() + (x - origin.x()) * scale),
+            int(origin.y() + (y - origin.y()) * scale),
+        )
@@ -0,0 +1,130 @@
+SCROLLBAR_MARGIN = 24  # Right-hand columns ignored when comparing rows; the scrollbar thumb moves with the page
+MIN_OVERLAP = 48  # Rows two captures must share to count as one scrolled page
+MIN_DISTINCT_ROWS = 12  # Distinct rows the overlap must contain, so matching blank space does not count
+MAX_STITCHED_HEIGHT = 4096  # Taller pages are split; APIs downscale very tall images until text is unreadable
+
+
+def row_hashes(pixels: bytes | bytearray, width: int, height: int) -> list[int]:
+    """Hash every row of a 32-bit frame, ignoring the scrollbar columns.
+
+    Args:
+        pixels (bytes | bytearray): The frame, 4 bytes per pixel, rows top to bottom.
+        width (int): Width in pixels.
+        height (int): Height in pixels.
+
+    Returns:
+        list[int]: One hash per row.
+    """
+    stride = width * 4
+    compared = max(1, width - SCROLLBAR_MARGIN) * 4
+    view = memoryview(pixels)
+    return [hash(view[y * stride:y * stride + compared].tobytes()) for y in range(height)]
+
+
+def find_overlap(previous: list[int], current: list[int]) -> tuple[int, int, int] | None:
+    """Find how a capture continues the previous one after scrolling down.
+
+    Rows that are identical at the same position in both captures at the top
+    and bottom are treated as fixed (title bar, sticky header, status bar).
+    Between them, the current capture's band must start with the end of the
+    previous capture's band.
+
+    Args:
+        previous (list[int]): Row hashes of the earlier capture.
+        current (list[int]): Row hashes of the later capture (same size).
+
+    Returns:
+        tuple[int, int, int] | None: (header rows, footer rows, overlapping band rows), or None if the captures do not overlap.
+    """
+    height = len(previous)
+    if len(current) != height:
+        return None
+    header = 0
+    while header < height and previous[header] == current[header]:
+        header += 1
+    if header == height:
+        return None  # Identical captures; deduplication handles those
+    footer = 0
+    while footer < height - header and previous[height - 1 - footer] == current[height - 1 - footer]:
+        footer += 1
+
+    band_a = previous[header:height - footer]
+    band_b = current[header:height - footer]
+    band = len(band_a)
+
+    # Anchor on the first row of the new band that is not repeated right below it (skips blank margins)
+    anchor = next((i for i in range(band - 1) if band_b[i] != band_b[i + 1]), None)
+    if anchor is None:
+        return None
+    for index, row in enumerate(band_a):
+        shift = index - anchor
+        if shift <= 0 or row != band_b[anchor]:
+            continue
+        overlap = band - shift
+        if overlap < MIN_OVERLAP:
+            break  # Later candidates only overlap less
+        if band_a[shift:] == band_b[:overlap] and len(set(band_b[:overlap])) >= MIN_DISTINCT_ROWS:
+            return header, footer, overlap
+    return None
+
+
+def plan_stitches(frames: list[tuple[int, int, list[int]]]) -> list[list[tuple[int, int, int]]]:
+    """Group consecutive captures that continue each other and work out which rows to keep.
+
+    Each capture added to a group contributes only the rows the previous one
+    did not show; the previous capture's fixed footer is dropped so the
+    footer appears once, at the bottom of the merged image.
+
+    Args:
+        frames (list[tuple[int, int, list[int]]]): (width, height, row hashes) of each capture, in capture order.
+
+    Returns:
+        list[list[tuple[int, int, int]]]: Groups in capture order; each lists (frame index, first row, end row)
+        ranges to join top to bottom. A group of one capture keeps it whole.
+    """
+    groups: list[list[tuple[int, int, int]]] = []
+    group: list[tuple[int, int, int]] = []
+    group_height = 0
+    for index, (width, height, hashes) in enumerate(frames):
+        if group:
+            previous, start, _end = group[-1]
+            previous_width, previous_height, previous_hashes = frames[previous]
+            match = find_overlap(previous_hashes, hashes) if (width, height) == (previous_width, previous_height) else None
+            if match is not None:
+                header, footer, overlap = match
+                added = height - header - footer - overlap
+                if group_height + added <= MAX_STITCHED_HEIGHT:
+                    group[-1] = (previous, start, height - footer)
+                    group.append((index, header + overlap, height))
+                    group_height += added
+                    continue
+            groups.append(group)
+        group = [(index, 0, height)]
+        group_height = height
+    if group:
+        groups.append(group)
+    return groups
+
+
+def join_rows(frames: list[bytes | bytearray], width: int, ranges: list[tuple[int, int, int]]) -> tuple[bytearray, int]:
+    """Copy the planned row ranges of one group into a single frame.
+
+    Args:
+        frames (list[bytes | bytearray]): Pixels of every capture, 4 bytes per pixel.
+        width (int): Width shared by the captures in the group.
+        ranges (list[tuple[int, int, int]]): (frame index, first row, end row) ranges from plan_stitches.
+
+    Returns:
+        tuple[bytearray, int]: The merged pixels and their height in rows.
+    """
+    stride = width * 4
+    height = sum(max(0, end - start) for _index, start, end in ranges)
+    merged = bytearray(height * stride)
+    offset = 0
+    for index, start, end in ranges:
+        if end <= start:
+            continue
+        size = (end - start) * stride
+        merged[offset:offset + size] = memoryview(frames[index])[start * stride:end * stride]
+        offset += size
+    return merged, height
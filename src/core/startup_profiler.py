@@ -0,0 +1,71 @@
+import threading
+import time
+
+
+class StartupProfiler():
+    """Records named startup phases from any thread and prints a timeline once the expected phases are reached.
+
+    Times are measured from when this module is first imported, so the entry
+    point imports it before anything else.
+    """
+
+    def __init__(self) -> None:
+        self.start = time.perf_counter()
+        self.marks: list[tuple[str, float, str]] = []  # (phase, seconds since start, thread name)
+        self.lock = threading.Lock()
+        self.pending_phases: set[str] | None = None  # None until report_when is called
+        self.reported = False
+
+    def mark(self, phase: str) -> None:
+        """Record that a phase has finished on the calling thread.
+
+        Args:
+            phase (str): The phase name.
+        """
+        elapsed = time.perf_counter() - self.start
+        with self.lock:
+            self.marks.append((phase, elapsed, threading.current_thread().name))
+            if self.pending_phases is not None:
+                self.pending_phases.discard(phase)
+            report = self.pending_phases == set() and not self.reported
+            if report:
+                self.reported = True
+        if report:
+            print(self.format_timeline())
+
+    def report_when(self, *phases: str) -> None:
+        """Print the timeline as soon as all given phases have been marked.
+
+        Args:
+            *phases (str): The phases to wait for.
+        """
+        with self.lock:
+            self.pending_phases = set(phases) - {phase for phase, _, _ in self.marks}
+            report = not self.pending_phases and not self.reported
+            if report:
+                self.reported = True
+        if report:
+            print(self.format_timeline())
+
+    def format_timeline(self) -> str:
+        """Format all recorded phases in order.
+
+        Each line shows the offset from process start and the time since the
+        previous phase on the same thread, i.e. how long that phase took.
+
+        Returns:
+            str: The multi-line timeline.
+        """
+        with self.lock:
+            marks = sorted(self.marks, key=lambda mark: mark[1])
+
+        lines = ["Startup timeline:"]
+        previous: dict[str, float] = {}
+        for phase, elapsed, thread_name in marks:
+            duration = elapsed - previous.get(thread_name, 0.0)
+            previous[thread_name] = elapsed
+            lines.append(f"  {elapsed * 1000:8.1f} ms  (+{duration * 1000:7.1f} ms)  {phase}  [{thread_name}]")
+        return "\n".join(lines)
+
+
+startup_profiler = StartupProfiler()
@@ -0,0 +1,242 @@
+import ctypes
+import ctypes.wintypes
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Callable
+
+from core.win32_hook import (
+    CHILDID_SELF,
+    EVENT_OBJECT_LOCATIONCHANGE,
+    EVENT_SYSTEM_FOREGROUND,
+    GA_ROOT,
+    GWL_EXSTYLE,
+    HWND_TOPMOST,
+    OBJID_WINDOW,
+    SWP_NOACTIVATE,
+    SWP_NOMOVE,
+    SWP_NOSIZE,
+    WINEVENT_OUTOFCONTEXT,
+    WINEVENT_SKIPOWNPROCESS,
+    WINEVENTPROC,
+    WS_EX_TOPMOST,
+    user32,
+)
+
+DEBOUNCE_MS = 50  # Quiet period after the last event before checking
+MAX_DEBOUNCE_S = 0.5  # Continuous event streams (ex. a window being dragged) still get checked this often
+VERIFY_MS = 250  # Re-check shortly after a raise in case another window immediately takes the top again
+MAX_RAISES = 5  # Raises allowed per RAISE_WINDOW_S before backing off
+RAISE_WINDOW_S = 2.0
+BACKOFF_MS = 2000  # Delay before re-checking while another topmost window keeps covering the overlay
+
+
+class TopmostPlatform(ABC):
+    """Platform interface used by TopmostTracker.
+
+    Implementations report z-order related window events and answer whether
+    the overlay is still on top. A fake implementation can drive the tracker
+    without a window system.
+    """
+
+    @abstractmethod
+    def start_events(self, on_event: Callable[[int], None]) -> None:
+        """Begin reporting z-order related events.
+
+        Args:
+            on_event (Callable[[int], None]): Called with the event id for each relevant event.
+        """
+
+    @abstractmethod
+    def stop_events(self) -> None:
+        """Stop reporting events."""
+
+    @abstractmethod
+    def is_topmost(self) -> bool:
+        """Check whether the overlay is the top window over its whole area.
+
+        Returns:
+            bool: True if no other window covers the overlay.
+        """
+
+    @abstractmethod
+    def raise_window(self) -> None:
+        """Bring the overlay back to the top of the z-order without activating it."""
+
+
+class TopmostTracker():
+    """Keeps the overlay on top by reacting to window events instead of polling.
+
+    Events are debounced into a single check. Raises are rate limited so a
+    second always-on-top window cannot pull the overlay into a raise loop;
+    while rate limited the tracker re-checks after a back-off delay instead.
+    Nothing runs while the overlay is hidden.
+
+    The tracker owns no timers or threads: the owner supplies schedule_check
+    and calls check() when it fires, so the logic can run against a fake
+    platform and clock.
+    """
+
+    def __init__(
+        self,
+        platform: TopmostPlatform,
+        schedule_check: Callable[[int], None],
+        clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.platform = platform
+        self.schedule_check = schedule_check  # Asks the owner to call check() after a delay in ms, replacing any earlier request
+        self.clock = clock
+        self.active = False
+        self.check_pending = False
+        self.debounce_until = 0.0  # Events before this time push a pending check back; later ones leave it alone
+        self.raise_times: deque[float] = deque(maxlen=MAX_RAISES)
+
+        # Counters for diagnostics and the simulation bench
+        self.events = 0
+        self.checks = 0
+        self.raises = 0
+        self.backoffs = 0
+
+    def set_active(self, active: bool) -> None:
+        """Start tracking while the overlay is visible and stop while it is hidden.
+
+        Args:
+            active (bool): Whether the overlay is visible.
+        """
+        if active == self.active:
+            return
+        self.active = active
+        if active:
+            self.platform.start_events(self.on_event)
+            self.check_pending = True
+            self.debounce_until = 0.0
+            self.schedule_check(0)  # Windows may have covered the overlay while it was hidden
+        else:
+            self.platform.stop_events()
+            self.check_pending = False
+
+    def on_event(self, _event: int) -> None:
+        """Schedule a debounced check for a z-order related event.
+
+        Args:
+            _event (int): The event id.
+        """
+        self.events += 1
+        if not self.active:
+            return
+        now = self.clock()
+        if not self.check_pending:
+            self.check_pending = True
+            self.debounce_until = now + MAX_DEBOUNCE_S
+            self.schedule_check(DEBOUNCE_MS)
+        elif now < self.debounce_until:
+            self.schedule_check(DEBOUNCE_MS)  # Restart the quiet period
+
+    def check(self) -> None:
+        """Raise the overlay if it is covered, unless raises are currently rate limited."""
+        self.check_pending = False
+        if not self.active:
+            return
+        self.checks += 1
+        if self.platform.is_topmost():
+            return
+
+        now = self.clock()
+        if len(self.raise_times) == MAX_RAISES and now - self.raise_times[0] < RAISE_WINDOW_S:
+            self.backoffs += 1
+            self.check_pending = True
+            self.debounce_until = 0.0  # Events must not cut the back-off short
+            self.schedule_check(BACKOFF_MS)
+            return
+
+        self.raise_times.append(now)
+        self.raises += 1
+        self.platform.raise_window()
+        self.check_pending = True
+        self.debounce_until = 0.0
+        self.schedule_check(VERIFY_MS)
+
+
+class Win32TopmostPlatform(TopmostPlatform):
+    """TopmostPlatform backed by SetWinEventHook, WindowFromPoint and SetWindowPos.
+
+    WinEvent callbacks are delivered out of context on the thread that
+    installed the hook, which must pump messages (the Qt main thread does).
+    """
+
+    EVENT_RANGES = (
+        (EVENT_SYSTEM_FOREGROUND, EVENT_SYSTEM_FOREGROUND),
+        (EVENT_OBJECT_LOCATIONCHANGE, EVENT_OBJECT_LOCATIONCHANGE),
+    )
+
+    def __init__(self, hwnd: int, sample_points: Callable[[], list[tuple[int, int]]], user32_dll: Any = None) -> None:
+        self.user32 = user32_dll or user32
+        self.hwnd = hwnd
+        self.root = int(self.user32.GetAncestor(hwnd, GA_ROOT) or hwnd)
+        self.sample_points = sample_points  # Physical screen points inside the overlay to test for coverage
+        self.on_event = None
+        self.hook_handles = []
+        self.win_event_proc_ref = WINEVENTPROC(self._win_event_proc)  # Prevent garbage collection of the callback
+
+    def start_events(self, on_event: Callable[[int], None]) -> None:
+        """Install the WinEvent hooks.
+
+        Args:
+            on_event (Callable[[int], None]): Called with the event id for each relevant event.
+        """
+        self.on_event = on_event
+        for event_min, event_max in self.EVENT_RANGES:
+            handle = self.user32.SetWinEventHook(
+                event_min, event_max, None, self.win_event_proc_ref, 0, 0,
+                WINEVENT_OUTOFCONTEXT | WINEVENT_SKIPOWNPROCESS,
+            )
+            if handle:
+                self.hook_handles.append(handle)
+            else:
+                print(f"Warning: SetWinEventHook failed for event 0x{event_min:04X}")
+
+    def stop_events(self) -> None:
+        """Remove the WinEvent hooks."""
+        for handle in self.hook_handles:
+            self.user32.UnhookWinEvent(handle)
+        self.hook_handles = []
+        self.on_event = None
+
+    def is_topmost(self) -> bool:
+        """Check that the overlay's root window is hit at every sample point.
+
+        Returns:
+            bool: True if the overlay is topmost at all sample points.
+        """
+        try:
+            for x, y in self.sample_points():
+                hwnd_at_pt = self.user32.WindowFromPoint(ctypes.wintypes.POINT(x, y))
+                if hwnd_at_pt and int(self.user32.GetAncestor(hwnd_at_pt, GA_ROOT) or 0) != self.root:
+                    return False
+            return True
+        except Exception:
+            return True
+
+    def raise_window(self) -> None:
+        """Re-assert topmost z-order without moving, resizing or activating the overlay."""
+        self.user32.SetWindowPos(self.hwnd, HWND_TOPMOST, 0, 0, 0, 0, SWP_NOMOVE | SWP_NOSIZE | SWP_NOACTIVATE)
+
+    def _win_event_proc(
+        self,
+        _hook: int,
+        event: int,
+        hwnd: int,
+        id_object: int,
+        id_child: int,
+        _thread_id: int,
+        _time: int
+    ) -> None:
+        """WinEvent callback; forwards foreground changes and moves of other always-on-top windows."""
+        if event == EVENT_OBJECT_LOCATIONCHANGE:
+            # Cursor, caret and child objects never affect z-order, and a normal window cannot move above a topmost one
+            if id_object != OBJID_WINDOW or id_child != CHILDID_SELF or not hwnd:
+                return
+            if not self.user32.GetWindowLongW(hwnd, GWL_EXSTYLE) & WS_EX_TOPMOST:
+                return
+        if self.on_event is not None:
+            self.on_event(event)
@@ -0,0 +1,256 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any
+
+
+MAX_EVENTS = 50_000  # Ring buffer size; older events are dropped
+TRACE_DIR = os.path.join(os.getcwd(), "src", "data", "cache")
+
+
+class Tracer():
+    """Records spans across threads and exports them in Chrome trace-event format (viewable in Perfetto).
+
+    Spans carry the native thread ID and the request they belong to. Each
+    request also gets an async slice from the hotkey or send that started it
+    to its final render, so one request can be followed across the hook
+    dispatch, capture, AI worker and UI threads.
+
+    Recording is always on into a bounded ring buffer; a span costs two
+    perf_counter_ns calls and one deque append.
+    """
+
+    def __init__(self) -> None:
+        self.events: deque[dict[str, Any]] = deque(maxlen=MAX_EVENTS)
+        self.thread_names: dict[int, str] = {}
+        self.merged_processes: dict[int, str] = {}  # pid -> name of other processes whose events were merged
+        self.merged_threads: dict[tuple[int, int], str] = {}  # (pid, tid) -> thread name for those events
+        self.local = threading.local()  # Per-thread request binding for worker threads
+        self.lock = threading.Lock()  # Guards request ids
+        self.request_count = 0
+        self.current_request = 0  # Most recently started request; used by threads without a binding
+        self.pending_request: int | None = None  # Started by a hotkey, not yet handed to the AI
+        self.pid = os.getpid()
+
+    def span(self, name: str, category: str, request: int | None = None, **args: Any) -> "Span":
+        """Create a context manager that records a complete event around its body.
+
+        Args:
+            name (str): The span name.
+            category (str): The component (e.g. "capture", "ai", "ui").
+            request (int | None, optional): The request ID; defaults to the thread's bound or current request.
+            **args (Any): Extra values shown in the trace viewer.
+
+        Returns:
+            Span: The span context manager.
+        """
+        return Span(self, name, category, request if request is not None else self.request_id(), args)
+
+    def complete(self, name: str, category: str, start_ns: int, end_ns: int | None = None, **args: Any) -> None:
+        """Record a span from timestamps the caller already measured.
+
+        Args:
+            name (str): The span name.
+            category (str): The component.
+            start_ns (int): time.perf_counter_ns() at the start.
+            end_ns (int | None, optional): time.perf_counter_ns() at the end; defaults to now.
+            **args (Any): Extra values shown in the trace viewer.
+        """
+        end_ns = end_ns if end_ns is not None else time.perf_counter_ns()
+        args["request"] = self.request_id()
+        self._record({
+            "name": name, "cat": category, "ph": "X", "ts": start_ns / 1000, "dur": (end_ns - start_ns) / 1000, "args": args,
+        })
+
+    def instant(self, name: str, category: str, **args: Any) -> None:
+        """Record a zero-duration event.
+
+        Args:
+            name (str): The event name.
+            category (str): The component.
+            **args (Any): Extra values shown in the trace viewer.
+        """
+        self._record({
+            "name": name, "cat": category, "ph": "i", "s": "t", "ts": time.perf_counter_ns() / 1000,
+            "args": {"request": self.request_id(), **args},
+        })
+
+    def begin_request(self, trigger: str, pending: bool = True) -> int:
+        """Start a new request and make it current.
+
+        A pending request waits for the AI receiver to pick it up with
+        start_or_join_request, so a hotkey's capture spans and the send that
+        follows share one ID.
+
+        Args:
+            trigger (str): What started the request (e.g. "preset solve").
+            pending (bool, optional): Whether the next start_or_join_request should join this request.
+
+        Returns:
+            int: The request ID.
+        """
+        with self.lock:
+            self.request_count += 1
+            request_id = self.request_count
+            self.current_request = request_id
+            self.pending_request = request_id if pending else None
+        self._record({
+            "name": "request", "cat": "request", "ph": "b", "id": request_id, "ts": time.perf_counter_ns() / 1000,
+            "args": {"request": request_id, "trigger": trigger},
+        })
+        return request_id
+
+    def start_or_join_request(self, trigger: str) -> int:
+        """Return the pending request started by a hotkey, or begin a new one.
+
+        Args:
+            trigger (str): What started the request, if a new one is begun.
+
+        Returns:
+            int: The request ID.
+        """
+        with self.lock:
+            request_id = self.pending_request
+            self.pending_request = None
+        if request_id is not None:
+            return request_id
+        return self.begin_request(trigger, pending=False)
+
+    def end_request(self, request_id: int, outcome: str) -> None:
+        """Close a request's async slice.
+
+        Args:
+            request_id (int): The request ID.
+            outcome (str): How it ended (e.g. "done", "error", "interrupted").
+        """
+        self._record({
+            "name": "request", "cat": "request", "ph": "e", "id": request_id, "ts": time.perf_counter_ns() / 1000,
+            "args": {"request": request_id, "outcome": outcome},
+        })
+
+    def bind_request(self, request_id: int) -> None:
+        """Attribute spans on the calling thread to a request (for worker threads).
+
+        Args:
+            request_id (int): The request ID.
+        """
+        self.local.request = request_id
+
+    def request_id(self) -> int:
+        """Return the request the calling thread is working on.
+
+        Returns:
+            int: The bound request ID, or the current one (0 before any request).
+        """
+        return getattr(self.local, "request", None) or self.current_request
+
+    def request_events(self, request_id: int) -> tuple[list[dict[str, Any]], dict[int, str]]:
+        """Collect the recorded events of one request, for handing to another process's tracer.
+
+        Args:
+            request_id (int): The request ID.
+
+        Returns:
+            tuple[list[dict[str, Any]], dict[int, str]]: The events, and the names of the threads that recorded them.
+        """
+        events = [event for event in list(self.events) if event["args"].get("request") == request_id]
+        return events, {event["tid"]: self.thread_names.get(event["tid"], "") for event in events}
+
+    def merge(self, events: list[dict[str, Any]], thread_names: dict[int, str], process_name: str) -> None:
+        """Add events recorded by another process's tracer (e.g. the AI worker's) to this one.
+
+        perf_counter_ns reads a system-wide monotonic clock (QueryPerformanceCounter
+        on Windows, CLOCK_MONOTONIC on Linux), so the other process's timestamps
+        already share this tracer's clock base and need no adjustment. The events
+        keep their own pid and show up as a separate process in the trace viewer.
+
+        Args:
+            events (list[dict[str, Any]]): The events, as returned by request_events.
+            thread_names (dict[int, str]): Names of the threads that recorded them.
+            process_name (str): Name shown for the other process.
+        """
+        for event in events:
+            self.merged_processes[event["pid"]] = process_name
+            self.merged_threads[(event["pid"], event["tid"])] = thread_names.get(event["tid"], "")
+        self.events.extend(events)
+
+    def export(self, path: str | None = None) -> str:
+        """Write the recorded events as a Chrome trace JSON file.
+
+        Args:
+            path (str | None, optional): Output path; defaults to a timestamped file in src/data/cache.
+
+        Returns:
+            str: The path written.
+        """
+        if path is None:
+            os.makedirs(TRACE_DIR, exist_ok=True)
+            path = os.path.join(TRACE_DIR, f"trace-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+
+        events = list(self.events)
+        metadata = [
+            {"name": "process_name", "ph": "M", "pid": self.pid, "tid": 0, "args": {"name": "whispr"}},
+        ] + [
+            {"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": name}}
+            for tid, name in list(self.thread_names.items())
+        ] + [
+            {"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": name}}
+            for pid, name in list(self.merged_processes.items())
+        ] + [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for (pid, tid), name in list(self.merged_threads.items())
+        ]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, f)
+        return path
+
+    def _record(self, event: dict[str, Any]) -> None:
+        """Stamp an event with process and thread IDs and append it to the ring buffer.
+
+        Args:
+            event (dict[str, Any]): The partial trace event.
+        """
+        tid = threading.get_native_id()
+        if tid not in self.thread_names:
+            self.thread_names[tid] = threading.current_thread().name
+        event["pid"] = self.pid
+        event["tid"] = tid
+        self.events.append(event)
+
+
+class Span():
+    """Context manager recording one complete ("X") trace event."""
+
+    __slots__ = ("tracer", "name", "category", "request", "args", "start")
+
+    def __init__(self, tracer: Tracer, name: str, category: str, request: int, args: dict[str, Any]) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.request = request
+        self.args = args
+        self.start = 0
+
+    def __enter__(self) -> "Span":
+        """Start timing.
+
+        Returns:
+            Span: This span, so values can be added to args inside the block.
+        """
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *_exc_info: Any) -> None:
+        """Stop timing and record the event."""
+        end = time.perf_counter_ns()
+        self.args["request"] = self.request
+        self.tracer._record({
+            "name": self.name, "cat": self.category, "ph": "X",
+            "ts": self.start / 1000, "dur": (end - self.start) / 1000, "args": self.args,
+        })
+
+
+tracer = Tracer()
@@ -0,0 +1,767 @@
+import functools
+import itertools
+import math
+import multiprocessing
+import queue
+import sys
+import threading
+import time
+import wave
+from array import array
+from collections import deque
+from typing import Any, Callable
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+
+SAMPLE_RATE = 16000  # Hz, mono, signed 16-bit little-endian PCM throughout the pipeline
+SAMPLE_WIDTH = 2
+FRAME_MS = 30  # VAD frame length
+FRAME_BYTES = SAMPLE_RATE * FRAME_MS // 1000 * SAMPLE_WIDTH
+RING_SECONDS = 30  # Capture ring buffer length; older audio is overwritten if the chunker falls behind
+DEFAULT_MODEL = "base.en"
+WORKER_CLOSE_TIMEOUT_S = 5  # How long close waits for the worker process to exit before terminating it
+
+
+class AudioRingBuffer():
+    """Fixed-size byte ring buffer between the audio capture thread and the chunker.
+
+    The writer never blocks: if the reader falls behind, the oldest audio is
+    overwritten and counted in dropped_bytes.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.buffer = bytearray(capacity)
+        self.read_pos = 0
+        self.size = 0
+        self.dropped_bytes = 0
+        self.closed = False
+        self.condition = threading.Condition()
+
+    def write(self, data: bytes) -> None:
+        """Append audio to the buffer, overwriting the oldest audio on overflow.
+
+        Args:
+            data (bytes): PCM bytes to append.
+        """
+        with self.condition:
+            if len(data) > self.capacity:
+                self.dropped_bytes += len(data) - self.capacity
+                data = data[-self.capacity:]
+
+            overflow = self.size + len(data) - self.capacity
+            if overflow > 0:
+                self.read_pos = (self.read_pos + overflow) % self.capacity
+                self.size -= overflow
+                self.dropped_bytes += overflow
+
+            write_pos = (self.read_pos + self.size) % self.capacity
+            first = min(len(data), self.capacity - write_pos)
+            self.buffer[write_pos:write_pos + first] = data[:first]
+            self.buffer[:len(data) - first] = data[first:]
+            self.size += len(data)
+            self.condition.notify()
+
+    def read(self, n: int, timeout: float | None = None) -> bytes | None:
+        """Read exactly n bytes, waiting until enough audio is available.
+
+        Args:
+            n (int): Number of bytes to read.
+            timeout (float, optional): Maximum seconds to wait.
+
+        Returns:
+            bytes | None: The audio, or None if the wait timed out or the buffer was closed and drained.
+        """
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.size >= n or self.closed, timeout):
+                return None
+            if self.size < n:
+                return None
+
+            first = min(n, self.capacity - self.read_pos)
+            data = bytes(self.buffer[self.read_pos:self.read_pos + first]) + bytes(self.buffer[:n - first])
+            self.read_pos = (self.read_pos + n) % self.capacity
+            self.size -= n
+            return data
+
+    def close(self) -> None:
+        """Wake any waiting reader; remaining whole reads are still served."""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+
+class VoiceActivityChunker():
+    """Splits a stream of fixed-size PCM frames into speech chunks using an energy-based VAD.
+
+    While speech is ongoing a partial chunk (the utterance so far) is emitted
+    every partial_interval_ms. A final chunk is emitted once silence exceeds
+    hangover_ms, or when the utterance exceeds max_chunk_ms; in the latter
+    case the next chunk starts with overlap_ms of the previous audio so words
+    on the boundary are not cut in half.
+    """
+
+    def __init__(
+        self,
+        on_chunk: Callable[[int, bytes, bool], None],
+        preroll_ms: int = 300,
+        hangover_ms: int = 600,
+        partial_interval_ms: int = 1000,
+        max_chunk_ms: int = 15000,
+        overlap_ms: int = 500,
+        min_rms: float = 300.0,
+        noise_ratio: float = 3.0
+    ) -> None:
+        self.on_chunk = on_chunk
+        self.preroll_frames = preroll_ms // FRAME_MS
+        self.hangover_frames = hangover_ms // FRAME_MS
+        self.partial_interval_frames = partial_interval_ms // FRAME_MS
+        self.max_chunk_frames = max_chunk_ms // FRAME_MS
+        self.overlap_frames = overlap_ms // FRAME_MS
+        self.min_rms = min_rms
+        self.noise_ratio = noise_ratio
+
+        self.noise_floor = min_rms / noise_ratio
+        self.preroll: deque[bytes] = deque(maxlen=self.preroll_frames)
+        self.frames: list[bytes] = []
+        self.in_speech = False
+        self.silent_frames = 0
+        self.frames_since_partial = 0
+        self.chunk_id = 0
+
+    def feed(self, frame: bytes) -> None:
+        """Process one FRAME_MS frame of audio.
+
+        Args:
+            frame (bytes): Exactly FRAME_BYTES of PCM audio.
+        """
+        is_speech = self._is_speech(frame)
+
+        if not self.in_speech:
+            self.preroll.append(frame)
+            if is_speech:
+                self.in_speech = True
+                self.frames = list(self.preroll)
+                self.preroll.clear()
+                self.silent_frames = 0
+                self.frames_since_partial = 0
+            return
+
+        self.frames.append(frame)
+        self.frames_since_partial += 1
+        self.silent_frames = 0 if is_speech else self.silent_frames + 1
+
+        if self.silent_frames >= self.hangover_frames:
+            # Trim most of the trailing silence, keeping a short tail for natural word endings
+            keep = len(self.frames) - self.silent_frames + self.preroll_frames
+            self.frames = self.frames[:max(1, keep)]
+            self._emit(final=True)
+            self.in_speech = False
+        elif len(self.frames) >= self.max_chunk_frames:
+            overlap = self.frames[-self.overlap_frames:] if self.overlap_frames else []
+            self._emit(final=True)
+            self.frames = list(overlap)
+            self.frames_since_partial = 0
+        elif self.frames_since_partial >= self.partial_interval_frames:
+            self._emit(final=False)
+
+    def flush(self) -> None:
+        """Emit any in-progress utterance as final (e.g. at end of input)."""
+        if self.in_speech and self.frames:
+            self._emit(final=True)
+        self.in_speech = False
+
+    def _emit(self, final: bool) -> None:
+        """Hand the current utterance audio to the consumer.
+
+        Args:
+            final (bool): Whether the chunk is complete (False for a partial).
+        """
+        self.on_chunk(self.chunk_id, b"".join(self.frames), final)
+        self.frames_since_partial = 0
+        if final:
+            self.chunk_id += 1
+            self.frames = []
+
+    def _is_speech(self, frame: bytes) -> bool:
+        """Classify a frame as speech by comparing its energy to the adaptive noise floor.
+
+        Args:
+            frame (bytes): The PCM frame.
+
+        Returns:
+            bool: True if the frame likely contains speech.
+        """
+        samples = array("h", frame)
+        if sys.byteorder == "big":
+            samples.byteswap()
+        rms = math.sqrt(sum(s * s for s in samples) / len(samples)) if samples else 0.0
+        threshold = max(self.min_rms, self.noise_floor * self.noise_ratio)
+        is_speech = rms > threshold
+
+        if not is_speech:
+            # Track background noise slowly so a loud room raises the threshold
+            self.noise_floor = 0.95 * self.noise_floor + 0.05 * rms
+        return is_speech
+
+
+class MicrophoneSource():
+    """Captures 16 kHz mono audio from the default input device (requires sounddevice)."""
+
+    def __init__(self) -> None:
+        self.stream = None
+
+    def start(self, on_audio: Callable[[bytes], None], on_end: Callable[[], None]) -> None:
+        """Start capturing audio.
+
+        Args:
+            on_audio (Callable[[bytes], None]): Called from the audio thread with each block of PCM bytes.
+            on_end (Callable[[], None]): Called when the source stops producing audio.
+        """
+        import sounddevice  # Optional dependency, only needed for live dictation
+
+        self.on_end = on_end
+        self.stream = sounddevice.RawInputStream(
+            samplerate=SAMPLE_RATE,
+            channels=1,
+            dtype="int16",
+            blocksize=FRAME_BYTES // SAMPLE_WIDTH,
+            callback=lambda data, _frames, _time, _status: on_audio(bytes(data)),
+        )
+        self.stream.start()
+
+    def stop(self) -> None:
+        """Stop capturing audio."""
+        if self.stream is not None:
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
+            self.on_end()
+
+
+class WavFileSource():
+    """Feeds a WAV file through the pipeline in place of a microphone.
+
+    The file is converted to 16 kHz mono 16-bit PCM. With realtime=True the
+    audio is paced like a live microphone; otherwise it is fed as fast as the
+    pipeline accepts it.
+    """
+
+    def __init__(self, path: str, realtime: bool = False) -> None:
+        self.path = path
+        self.realtime = realtime
+        self.stop_flag = threading.Event()
+
+    def start(self, on_audio: Callable[[bytes], None], on_end: Callable[[], None]) -> None:
+        """Start feeding the file on a background thread.
+
+        Args:
+            on_audio (Callable[[bytes], None]): Called with each block of PCM bytes.
+            on_end (Callable[[], None]): Called once the whole file has been fed.
+        """
+        pcm = read_wav_pcm(self.path)
+        thread = threading.Thread(target=self._feed, args=(pcm, on_audio, on_end), daemon=True)
+        thread.start()
+
+    def stop(self) -> None:
+        """Stop feeding audio."""
+        self.stop_flag.set()
+
+    def _feed(self, pcm: bytes, on_audio: Callable[[bytes], None], on_end: Callable[[], None]) -> None:
+        """Feed the file in frame-sized blocks.
+
+        Args:
+            pcm (bytes): The converted PCM audio.
+            on_audio (Callable[[bytes], None]): Called with each block of PCM bytes.
+            on_end (Callable[[], None]): Called once the whole file has been fed.
+        """
+        for i in range(0, len(pcm), FRAME_BYTES):
+            if self.stop_flag.is_set():
+                break
+            on_audio(pcm[i:i + FRAME_BYTES])
+            if self.realtime:
+                time.sleep(FRAME_MS / 1000)
+        on_end()
+
+
+class TranscriptionWorker():
+    """Decoding worker process shared by successive pipelines, so the model is loaded only once.
+
+    Decoding runs in a separate process so it never holds the GIL that the UI
+    and keyboard hook threads need. The process is spawned when the first
+    session opens and kept, with its loaded model, until close. Chunks and
+    results carry their session ID, so a pipeline still draining after
+    dictation stopped never receives the results of the next one. If the
+    process exits (e.g. the model failed to load), its open sessions are
+    ended and the next session spawns a new process.
+    """
+
+    def __init__(self, model: str = DEFAULT_MODEL) -> None:
+        self.model = model
+        self.process = None
+        self.input_queue = None
+        self.sessions: dict[int, Callable[[tuple], None]] = {}  # Session ID -> result handler, for the current process
+        self.session_ids = itertools.count(1)
+        self.lock = threading.Lock()
+
+    def open_session(self, on_result: Callable[[tuple], None]) -> int:
+        """Register a pipeline's result handler, starting the worker process if it is not running.
+
+        Args:
+            on_result (Callable[[tuple], None]): Called on the result thread with each ("text", session, chunk_id, text, final)
+                or ("error", session, message) result, then with ("end", session) once the session has been decoded.
+
+        Returns:
+            int: The session ID to submit chunks with.
+        """
+        with self.lock:
+            if self.process is None or not self.process.is_alive():
+                self._spawn()
+            session = next(self.session_ids)
+            self.sessions[session] = on_result
+            return session
+
+    def submit(self, session: int, chunk_id: int, pcm: bytes, final: bool) -> None:
+        """Queue a chunk for decoding.
+
+        Args:
+            session (int): The session the chunk belongs to.
+            chunk_id (int): Identifier of the utterance chunk.
+            pcm (bytes): The chunk audio.
+            final (bool): Whether the chunk is complete.
+        """
+        self.input_queue.put((session, chunk_id, pcm, final))
+
+    def end_session(self, session: int) -> None:
+        """Mark the end of a session's chunks; its handler receives ("end", session) after the last result.
+
+        Args:
+            session (int): The session.
+        """
+        self.input_queue.put((session, None, b"", True))
+
+    def close(self) -> None:
+        """Stop the worker process once it has decoded the chunks already queued."""
+        with self.lock:
+            process, self.process = self.process, None
+            if process is not None and process.is_alive():
+                self.input_queue.put(None)
+        if process is not None:
+            process.join(WORKER_CLOSE_TIMEOUT_S)
+            if process.is_alive():
+                process.terminate()
+
+    def _spawn(self) -> None:
+        """Start a worker process and the thread that routes its results (call with the lock held)."""
+        context = multiprocessing.get_context("spawn")
+        self.input_queue = context.Queue()
+        output_queue = context.Queue()
+        self.process = context.Process(target=_worker_main, args=(self.model, self.input_queue, output_queue), daemon=True)
+        self.process.start()
+        self.sessions = {}
+        threading.Thread(target=self._result_loop, args=(self.process, output_queue, self.sessions), daemon=True).start()
+
+    def _result_loop(self, process: Any, output_queue: Any, sessions: dict[int, Callable[[tuple], None]]) -> None:
+        """Hand each result of one worker process to its session's handler, and end the open sessions when the process exits.
+
+        Args:
+            process (Any): The worker process.
+            output_queue (Any): Its result queue.
+            sessions (dict[int, Callable[[tuple], None]]): Its sessions' handlers.
+        """
+        while True:
+            try:
+                message = output_queue.get(timeout=0.5)
+            except queue.Empty:
+                if process.is_alive():
+                    continue
+                break
+
+            if message is None:
+                break
+
+            session = message[1]
+            with self.lock:
+                # An error without a session (e.g. the model failed to load) concerns every open session
+                handlers = [sessions.get(session)] if session is not None else list(sessions.values())
+                if message[0] == "end":
+                    sessions.pop(session, None)
+            for handler in handlers:
+                if handler is not None:
+                    handler(message)
+
+        with self.lock:
+            unfinished = list(sessions.items())
+            sessions.clear()
+        for session, handler in unfinished:
+            handler(("end", session))
+
+
+class TranscriptionPipeline():
+    """Streaming speech-to-text: capture -> ring buffer -> VAD chunker -> worker process.
+
+    The pipeline itself is Qt-free; results are delivered through
+    on_transcript(committed_text, partial_text), and on_done is called once
+    all captured audio has been transcribed. Without a shared worker, the
+    pipeline starts its own and closes it when it is done.
+    """
+
+    def __init__(
+        self,
+        on_transcript: Callable[[str, str], None],
+        on_error: Callable[[str], None] | None = None,
+        model: str = DEFAULT_MODEL,
+        worker: TranscriptionWorker | None = None,
+        on_done: Callable[[], None] | None = None
+    ) -> None:
+        self.on_transcript = on_transcript
+        self.on_error = on_error
+        self.on_done = on_done
+        self.worker = worker or TranscriptionWorker(model)
+        self.owns_worker = worker is None
+        self.session = None
+        self.source = None
+        self.ring = None
+        self.committed = ""
+        self.partial = ""
+        self.done = threading.Event()
+
+    def start(self, source: Any) -> None:
+        """Begin consuming audio from a source, starting the worker process if it is not running.
+
+        The source is started first, so a missing microphone fails before any
+        worker process is spawned or model loaded.
+
+        Args:
+            source (Any): A MicrophoneSource, WavFileSource, or any object with the same start/stop interface.
+        """
+        self.ring = AudioRingBuffer(SAMPLE_RATE * SAMPLE_WIDTH * RING_SECONDS)
+        self.committed = ""
+        self.partial = ""
+        self.done.clear()
+
+        source.start(self.ring.write, self.ring.close)
+        self.source = source
+        try:
+            self.session = self.worker.open_session(self._on_result)
+        except Exception:
+            self.stop()
+            raise
+
+        threading.Thread(target=self._chunk_loop, daemon=True).start()
+
+    def stop(self) -> None:
+        """Stop capturing; audio already captured is still transcribed and delivered."""
+        if self.source is not None:
+            self.source.stop()
+            self.source = None
+        if self.ring is not None:
+            self.ring.close()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Wait until all captured audio has been transcribed.
+
+        Args:
+            timeout (float, optional): Maximum seconds to wait.
+
+        Returns:
+            bool: True if the pipeline finished within the timeout.
+        """
+        return self.done.wait(timeout)
+
+    def _chunk_loop(self) -> None:
+        """Read frames from the ring buffer, chunk them by voice activity, and queue them for decoding."""
+        chunker = VoiceActivityChunker(self._submit_chunk)
+        while True:
+            frame = self.ring.read(FRAME_BYTES, timeout=0.5)
+            if frame is None:
+                if self.ring.closed:
+                    break
+                continue
+            chunker.feed(frame)
+
+        chunker.flush()
+        self.worker.end_session(self.session)
+
+    def _submit_chunk(self, chunk_id: int, pcm: bytes, final: bool) -> None:
+        """Send a chunk to the worker process.
+
+        Args:
+            chunk_id (int): Identifier of the utterance chunk.
+            pcm (bytes): The chunk audio.
+            final (bool): Whether the chunk is complete.
+        """
+        self.worker.submit(self.session, chunk_id, pcm, final)
+
+    def _on_result(self, message: tuple) -> None:
+        """Merge a transcription result into the running transcript and report it (runs on the worker's result thread).
+
+        Args:
+            message (tuple): A result from the worker (see TranscriptionWorker.open_session).
+        """
+        kind = message[0]
+        if kind == "error":
+            if self.on_error is not None:
+                self.on_error(message[2])
+        elif kind == "text":
+            _, _session, _chunk_id, text, final = message
+            if final:
+                self.committed = merge_overlap(self.committed, text)
+                self.partial = ""
+            else:
+                self.partial = text
+            self.on_transcript(self.committed, self.partial)
+        else:
+            if self.owns_worker:
+                self.worker.close()
+            self.done.set()
+            if self.on_done is not None:
+                self.on_done()
+
+
+def read_wav_pcm(path: str) -> bytes:
+    """Read a 16-bit PCM WAV file and convert it to 16 kHz mono.
+
+    Args:
+        path (str): Path to the WAV file.
+
+    Returns:
+        bytes: 16 kHz mono signed 16-bit little-endian PCM.
+    """
+    with wave.open(path, "rb") as wav:
+        if wav.getsampwidth() != SAMPLE_WIDTH:
+            raise ValueError(f"Unsupported WAV sample width {wav.getsampwidth() * 8} bits; expected 16")
+        channels = wav.getnchannels()
+        rate = wav.getframerate()
+        samples = array("h", wav.readframes(wav.getnframes()))
+
+    if sys.byteorder == "big":
+        samples.byteswap()
+
+    if channels > 1:
+        # Downmix by averaging interleaved channels
+        mono = array("h", bytes(len(samples) // channels * SAMPLE_WIDTH))
+        for c in range(channels):
+            channel = samples[c::channels]
+            for i in range(len(mono)):
+                mono[i] += channel[i] // channels
+        samples = mono
+
+    if rate != SAMPLE_RATE:
+        # Nearest-neighbour resample; adequate for speech recognition input
+        step = rate / SAMPLE_RATE
+        samples = array("h", (samples[int(i * step)] for i in range(int(len(samples) / step))))
+
+    if sys.byteorder == "big":
+        samples.byteswap()
+    return samples.tobytes()
+
+
+def merge_overlap(committed: str, text: str) -> str:
+    """Append a chunk transcript, removing words repeated from the overlapping audio.
+
+    Args:
+        committed (str): The transcript so far.
+        text (str): The transcript of the next chunk.
+
+    Returns:
+        str: The combined transcript.
+    """
+    text = text.strip()
+    if not committed:
+        return text
+    if not text:
+        return committed
+
+    previous = committed.split()
+    incoming = text.split()
+    for n in range(min(len(previous), len(incoming), 8), 0, -1):
+        if [_normalize_word(w) for w in previous[-n:]] == [_normalize_word(w) for w in incoming[:n]]:
+            incoming = incoming[n:]
+            break
+    return " ".join(previous + incoming)
+
+
+def _normalize_word(word: str) -> str:
+    """Normalize a word for overlap matching, ignoring case and trailing punctuation.
+
+    Args:
+        word (str): The word.
+
+    Returns:
+        str: The normalized word.
+    """
+    return word.strip(".,!?;:").lower()
+
+
+def _worker_main(model: str, input_queue: Any, output_queue: Any) -> None:
+    """Transcription worker process entry point.
+
+    Partial chunks that have been superseded by newer audio of the same
+    chunk are skipped so the worker never falls behind the speaker.
+
+    Args:
+        model (str): The faster-whisper model name or path.
+        input_queue (Any): Queue of (session, chunk_id, pcm, final) tuples; a chunk_id of None ends the session, and None stops the worker.
+        output_queue (Any): Queue receiving ("text", session, chunk_id, text, final), ("error", session, message) and ("end", session), then None when the worker stops.
+    """
+    try:
+        import numpy
+        from faster_whisper import WhisperModel  # Optional dependency, only loaded in the worker process
+
+        whisper = WhisperModel(model, device="cpu", compute_type="int8")
+    except Exception as e:
+        output_queue.put(("error", None, f"Could not load transcription model: {str(e)}"))
+        output_queue.put(None)
+        return
+
+    finished = False
+    while not finished:
+        batch = [input_queue.get()]
+        while True:
+            try:
+                batch.append(input_queue.get_nowait())
+            except queue.Empty:
+                break
+
+        if None in batch:
+            batch = batch[:batch.index(None)]
+            finished = True
+
+        # Keep every final chunk, but only the newest partial of a chunk that has not been finalized
+        finals = {item[:2] for item in batch if item[3]}
+        latest_partial = {item[:2]: i for i, item in enumerate(batch) if not item[3]}
+        for i, (session, chunk_id, pcm, final) in enumerate(batch):
+            if chunk_id is None:
+                output_queue.put(("end", session))
+                continue
+            if not final and ((session, chunk_id) in finals or latest_partial[(session, chunk_id)] != i):
+                continue
+            try:
+                audio = numpy.frombuffer(pcm, dtype="<i2").astype(numpy.float32) / 32768.0
+                segments, _info = whisper.transcribe(audio, beam_size=1 if not final else 5, vad_filter=False)
+                text = "".join(segment.text for segment in segments).strip()
+                output_queue.put(("text", session, chunk_id, text, final))
+            except Exception as e:
+                output_queue.put(("error", session, f"Transcription failed: {str(e)}"))
+
+    output_queue.put(None)
+
+
+class Transcriber(QObject):
+    """Qt bridge that streams live dictation into the UI through signals.
+
+    Every start creates a new pipeline with the next generation number, and
+    each signal carries the generation it came from. Stopping dictation only
+    stops capturing: the audio already captured is still transcribed, and
+    finished is emitted after its last transcript. Cancelling, or starting
+    again, moves on to the next generation, so results from the old pipeline
+    are dropped and two pipelines never interleave.
+
+    All pipelines share one TranscriptionWorker, so the model is loaded once
+    and kept until close.
+    """
+
+    # Signals for cross-thread communication
+    transcript_changed = pyqtSignal(int, str, str)  # pipeline generation, committed text, partial text
+    finished = pyqtSignal(int)  # pipeline generation; all its captured audio has been transcribed
+    error = pyqtSignal(str)
+
+    def __init__(self, model: str = DEFAULT_MODEL, worker: TranscriptionWorker | None = None) -> None:
+        super().__init__()
+        self.worker = worker or TranscriptionWorker(model)
+        self.pipeline = None
+        self.generation = 0  # Generation of the current pipeline; bumped on every start and cancel
+
+    def is_running(self) -> bool:
+        """Check whether dictation is active.
+
+        Returns:
+            bool: True if audio is being captured.
+        """
+        return self.pipeline is not None and self.pipeline.source is not None
+
+    def start(self, source: Any = None) -> None:
+        """Start dictation from the microphone, or from another audio source.
+
+        Args:
+            source (Any, optional): Audio source; defaults to the microphone.
+        """
+        if self.is_running():
+            return
+        self.generation += 1
+        self.pipeline = TranscriptionPipeline(
+            functools.partial(self._on_transcript, self.generation),
+            functools.partial(self._on_error, self.generation),
+            worker=self.worker,
+            on_done=functools.partial(self._on_done, self.generation),
+        )
+        try:
+            self.pipeline.start(source or MicrophoneSource())
+        except Exception as e:
+            self.pipeline = None
+            self.error.emit(f"Could not start dictation: {str(e)}")
+
+    def stop(self) -> None:
+        """Stop capturing; the audio already captured is still transcribed and delivered, then finished is emitted."""
+        if self.pipeline is not None:
+            self.pipeline.stop()
+
+    def cancel(self) -> None:
+        """Stop dictation and drop the transcripts of audio still being decoded."""
+        self.generation += 1
+        self.stop()
+
+    def close(self) -> None:
+        """Cancel dictation and stop the worker process (when the app quits)."""
+        self.cancel()
+        self.worker.close()
+
+    def _on_transcript(self, generation: int, committed: str, partial: str) -> None:
+        """Forward a transcript from a pipeline unless that pipeline is stale (runs on the worker's result thread).
+
+        Args:
+            generation (int): Generation of the pipeline that produced the transcript.
+            committed (str): The finalized transcript.
+            partial (str): The in-progress partial transcript.
+        """
+        if generation == self.generation:
+            self.transcript_changed.emit(generation, committed, partial)
+
+    def _on_error(self, generation: int, message: str) -> None:
+        """Forward an error from a pipeline unless that pipeline is stale.
+
+        Args:
+            generation (int): Generation of the pipeline that failed.
+            message (str): The error message.
+        """
+        if generation == self.generation:
+            self.error.emit(message)
+
+    def _on_done(self, generation: int) -> None:
+        """Report that a pipeline has delivered its last transcript, unless that pipeline is stale.
+
+        Args:
+            generation (int): Generation of the pipeline that finished.
+        """
+        if generation == self.generation:
+            self.finished.emit(generation)
+
+
+if __name__ == "__main__":
+    # Transcribe WAV files from the command line: python src/core/transcriber.py speech.wav [model]
+    def print_transcript(committed: str, partial: str) -> None:
+        """Print the running transcript on a single updating line.
+
+        Args:
+            committed (str): The finalized transcript.
+            partial (str): The in-progress partial transcript.
+        """
+        print(f"\r{committed} [{partial}]", end="", flush=True)
+
+    start_time = time.perf_counter()
+    pipeline = TranscriptionPipeline(print_transcript, print, sys.argv[2] if len(sys.argv) > 2 else DEFAULT_MODEL)
+    pipeline.start(WavFileSource(sys.argv[1]))
+    pipeline.wait()
+    print(f"\n\nFinal: {pipeline.committed}\nElapsed: {time.perf_counter() - start_time:.2f}s")
@@ -1,5 +1,7 @@
 import ctypes
 import ctypes.wintypes
+import sys
+from typing import Any
 
 # Hook & message constants
 WH_KEYBOARD_LL = 13
@@ -9,10 +11,37 @@ WM_SYSKEYDOWN = 0x0104
 WM_SYSKEYUP = 0x0105
 WM_QUIT = 0x0012
 
+# WinEvent hook constants (z-order tracking)
+EVENT_SYSTEM_FOREGROUND = 0x0003
+EVENT_OBJECT_LOCATIONCHANGE = 0x800B
+WINEVENT_OUTOFCONTEXT = 0x0000
+WINEVENT_SKIPOWNPROCESS = 0x0002
+OBJID_WINDOW = 0
+CHILDID_SELF = 0
+GA_ROOT = 2
+GWL_EXSTYLE = -20
+WS_EX_TOPMOST = 0x00000008
+HWND_TOPMOST = -1
+SWP_NOSIZE = 0x0001
+SWP_NOMOVE = 0x0002
+SWP_NOACTIVATE = 0x0010
+
+# GDI constants (screen sampling)
+SRCCOPY = 0x00CC0020
+HALFTONE = 4  # StretchBlt mode that averages the source pixels under each destination pixel
+BI_RGB = 0
+DIB_RGB_COLORS = 0
+
 # Virtual key codes
 VK_SHIFT = 0x10
 VK_CONTROL = 0x11
 VK_MENU = 0x12  # Alt
+VK_LSHIFT = 0xA0
+VK_RSHIFT = 0xA1
+VK_LCONTROL = 0xA2
+VK_RCONTROL = 0xA3
+VK_LMENU = 0xA4
+VK_RMENU = 0xA5
 VK_LEFT = 0x25
 VK_UP = 0x26
 VK_RIGHT = 0x27
@@ -26,11 +55,20 @@ MOD_SHIFT = 0x04
 # All modifier virtual key codes (generic + left/right variants)
 MODIFIER_VK_CODES = frozenset({
     VK_SHIFT, VK_CONTROL, VK_MENU,
-    0xA0, 0xA1, # VK_LSHIFT, VK_RSHIFT
-    0xA2, 0xA3, # VK_LCONTROL, VK_RCONTROL
-    0xA4, 0xA5, # VK_LMENU, VK_RMENU
+    VK_LSHIFT, VK_RSHIFT,
+    VK_LCONTROL, VK_RCONTROL,
+    VK_LMENU, VK_RMENU,
 })
 
+# Modifier bit for every virtual key code (0 for non-modifiers), indexed directly by vk code
+MODIFIER_BITS = [
+    MOD_CTRL if vk in (VK_CONTROL, VK_LCONTROL, VK_RCONTROL) else
+    MOD_ALT if vk in (VK_MENU, VK_LMENU, VK_RMENU) else
+    MOD_SHIFT if vk in (VK_SHIFT, VK_LSHIFT, VK_RSHIFT) else
+    0
+    for vk in range(256)
+]
+
 # Win32 structure for low-level keyboard hook data
 class KBDLLHOOKSTRUCT(ctypes.Structure):
     _fields_ = [
@@ -41,6 +79,22 @@ class KBDLLHOOKSTRUCT(ctypes.Structure):
         ("dwExtraInfo", ctypes.POINTER(ctypes.c_ulong)),
     ]
 
+# Win32 structure describing a device-independent bitmap (colour table omitted; only 32-bit BI_RGB is used)
+class BITMAPINFOHEADER(ctypes.Structure):
+    _fields_ = [
+        ("biSize", ctypes.wintypes.DWORD),
+        ("biWidth", ctypes.wintypes.LONG),
+        ("biHeight", ctypes.wintypes.LONG),
+        ("biPlanes", ctypes.wintypes.WORD),
+        ("biBitCount", ctypes.wintypes.WORD),
+        ("biCompression", ctypes.wintypes.DWORD),
+        ("biSizeImage", ctypes.wintypes.DWORD),
+        ("biXPelsPerMeter", ctypes.wintypes.LONG),
+        ("biYPelsPerMeter", ctypes.wintypes.LONG),
+        ("biClrUsed", ctypes.wintypes.DWORD),
+        ("biClrImportant", ctypes.wintypes.DWORD),
+    ]
+
 # Callback type for the low-level keyboard hook (LRESULT(nCode, wParam, lParam))
 HOOKPROC = ctypes.CFUNCTYPE(
     ctypes.wintypes.LPARAM, # LRESULT return
@@ -49,37 +103,105 @@ HOOKPROC = ctypes.CFUNCTYPE(
     ctypes.wintypes.LPARAM, # lParam (pointer to KBDLLHOOKSTRUCT)
 )
 
-user32 = ctypes.windll.user32
-kernel32 = ctypes.windll.kernel32
-
-# Configure Win32 function signatures for type safety
-user32.SetWindowsHookExW.argtypes = [ctypes.c_int, HOOKPROC, ctypes.wintypes.HINSTANCE, ctypes.wintypes.DWORD]
-user32.SetWindowsHookExW.restype = ctypes.c_void_p
-user32.UnhookWindowsHookEx.argtypes = [ctypes.c_void_p]
-user32.UnhookWindowsHookEx.restype = ctypes.wintypes.BOOL
-user32.CallNextHookEx.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.wintypes.WPARAM, ctypes.wintypes.LPARAM]
-user32.CallNextHookEx.restype = ctypes.wintypes.LPARAM
-user32.GetMessageW.argtypes = [ctypes.POINTER(ctypes.wintypes.MSG), ctypes.wintypes.HWND, ctypes.wintypes.UINT, ctypes.wintypes.UINT]
-user32.GetMessageW.restype = ctypes.wintypes.BOOL
-user32.PostThreadMessageW.argtypes = [ctypes.wintypes.DWORD, ctypes.wintypes.UINT, ctypes.wintypes.WPARAM, ctypes.wintypes.LPARAM]
-user32.PostThreadMessageW.restype = ctypes.wintypes.BOOL
-user32.GetAsyncKeyState.argtypes = [ctypes.c_int]
-user32.GetAsyncKeyState.restype = ctypes.c_short
-kernel32.GetModuleHandleW.argtypes = [ctypes.wintypes.LPCWSTR]
-kernel32.GetModuleHandleW.restype = ctypes.wintypes.HMODULE
-
-
-def get_active_modifiers() -> int:
+# Callback type for WinEvent hooks (void(hWinEventHook, event, hwnd, idObject, idChild, idEventThread, dwmsEventTime))
+WINEVENTPROC = ctypes.CFUNCTYPE(
+    None,
+    ctypes.wintypes.HANDLE,  # hWinEventHook
+    ctypes.wintypes.DWORD,   # event
+    ctypes.wintypes.HWND,    # hwnd
+    ctypes.wintypes.LONG,    # idObject
+    ctypes.wintypes.LONG,    # idChild
+    ctypes.wintypes.DWORD,   # idEventThread
+    ctypes.wintypes.DWORD,   # dwmsEventTime
+)
+
+if sys.platform == "win32":
+    user32 = ctypes.windll.user32
+    kernel32 = ctypes.windll.kernel32
+    gdi32 = ctypes.windll.gdi32
+
+    # Configure Win32 function signatures for type safety
+    user32.SetWindowsHookExW.argtypes = [ctypes.c_int, HOOKPROC, ctypes.wintypes.HINSTANCE, ctypes.wintypes.DWORD]
+    user32.SetWindowsHookExW.restype = ctypes.c_void_p
+    user32.UnhookWindowsHookEx.argtypes = [ctypes.c_void_p]
+    user32.UnhookWindowsHookEx.restype = ctypes.wintypes.BOOL
+    user32.CallNextHookEx.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.wintypes.WPARAM, ctypes.wintypes.LPARAM]
+    user32.CallNextHookEx.restype = ctypes.wintypes.LPARAM
+    user32.GetMessageW.argtypes = [ctypes.POINTER(ctypes.wintypes.MSG), ctypes.wintypes.HWND, ctypes.wintypes.UINT, ctypes.wintypes.UINT]
+    user32.GetMessageW.restype = ctypes.wintypes.BOOL
+    user32.PostThreadMessageW.argtypes = [ctypes.wintypes.DWORD, ctypes.wintypes.UINT, ctypes.wintypes.WPARAM, ctypes.wintypes.LPARAM]
+    user32.PostThreadMessageW.restype = ctypes.wintypes.BOOL
+    user32.GetAsyncKeyState.argtypes = [ctypes.c_int]
+    user32.GetAsyncKeyState.restype = ctypes.c_short
+    user32.SetWinEventHook.argtypes = [
+        ctypes.wintypes.DWORD, ctypes.wintypes.DWORD, ctypes.wintypes.HMODULE, WINEVENTPROC,
+        ctypes.wintypes.DWORD, ctypes.wintypes.DWORD, ctypes.wintypes.DWORD,
+    ]
+    user32.SetWinEventHook.restype = ctypes.wintypes.HANDLE
+    user32.UnhookWinEvent.argtypes = [ctypes.wintypes.HANDLE]
+    user32.UnhookWinEvent.restype = ctypes.wintypes.BOOL
+    user32.WindowFromPoint.argtypes = [ctypes.wintypes.POINT]
+    user32.WindowFromPoint.restype = ctypes.wintypes.HWND
+    user32.GetAncestor.argtypes = [ctypes.wintypes.HWND, ctypes.wintypes.UINT]
+    user32.GetAncestor.restype = ctypes.wintypes.HWND
+    user32.GetWindowLongW.argtypes = [ctypes.wintypes.HWND, ctypes.c_int]
+    user32.GetWindowLongW.restype = ctypes.wintypes.LONG
+    user32.SetWindowPos.argtypes = [
+        ctypes.wintypes.HWND, ctypes.wintypes.HWND, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.wintypes.UINT,
+    ]
+    user32.SetWindowPos.restype = ctypes.wintypes.BOOL
+    kernel32.GetModuleHandleW.argtypes = [ctypes.wintypes.LPCWSTR]
+    kernel32.GetModuleHandleW.restype = ctypes.wintypes.HMODULE
+    user32.GetDC.argtypes = [ctypes.wintypes.HWND]
+    user32.GetDC.restype = ctypes.wintypes.HDC
+    user32.ReleaseDC.argtypes = [ctypes.wintypes.HWND, ctypes.wintypes.HDC]
+    user32.ReleaseDC.restype = ctypes.c_int
+    gdi32.CreateCompatibleDC.argtypes = [ctypes.wintypes.HDC]
+    gdi32.CreateCompatibleDC.restype = ctypes.wintypes.HDC
+    gdi32.CreateDIBSection.argtypes = [
+        ctypes.wintypes.HDC, ctypes.POINTER(BITMAPINFOHEADER), ctypes.wintypes.UINT,
+        ctypes.POINTER(ctypes.c_void_p), ctypes.wintypes.HANDLE, ctypes.wintypes.DWORD,
+    ]
+    gdi32.CreateDIBSection.restype = ctypes.wintypes.HBITMAP
+    gdi32.SelectObject.argtypes = [ctypes.wintypes.HDC, ctypes.wintypes.HGDIOBJ]
+    gdi32.SelectObject.restype = ctypes.wintypes.HGDIOBJ
+    gdi32.DeleteObject.argtypes = [ctypes.wintypes.HGDIOBJ]
+    gdi32.DeleteObject.restype = ctypes.wintypes.BOOL
+    gdi32.DeleteDC.argtypes = [ctypes.wintypes.HDC]
+    gdi32.DeleteDC.restype = ctypes.wintypes.BOOL
+    gdi32.SetStretchBltMode.argtypes = [ctypes.wintypes.HDC, ctypes.c_int]
+    gdi32.SetStretchBltMode.restype = ctypes.c_int
+    gdi32.SetBrushOrgEx.argtypes = [ctypes.wintypes.HDC, ctypes.c_int, ctypes.c_int, ctypes.c_void_p]
+    gdi32.SetBrushOrgEx.restype = ctypes.wintypes.BOOL
+    gdi32.StretchBlt.argtypes = [
+        ctypes.wintypes.HDC, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+        ctypes.wintypes.HDC, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.wintypes.DWORD,
+    ]
+    gdi32.StretchBlt.restype = ctypes.wintypes.BOOL
+    gdi32.GdiFlush.argtypes = []
+    gdi32.GdiFlush.restype = ctypes.wintypes.BOOL
+else:
+    # No Win32 layer off Windows; benchmarks inject a fake user32 / kernel32 instead
+    user32 = None
+    kernel32 = None
+    gdi32 = None
+
+
+def get_active_modifiers(user32_dll: Any = None) -> int:
     """Return a bitmask representing the currently held modifier keys.
 
+    Args:
+        user32_dll (Any, optional): The user32 implementation to query; defaults to the real user32.
+
     Returns:
         int: Bitmask of active modifier keys (MOD_CTRL, MOD_ALT, MOD_SHIFT).
     """
+    user32_dll = user32_dll or user32
     mods = 0
-    if user32.GetAsyncKeyState(VK_CONTROL) & 0x8000:
+    if user32_dll.GetAsyncKeyState(VK_CONTROL) & 0x8000:
         mods |= MOD_CTRL
-    if user32.GetAsyncKeyState(VK_MENU) & 0x8000:
+    if user32_dll.GetAsyncKeyState(VK_MENU) & 0x8000:
         mods |= MOD_ALT
-    if user32.GetAsyncKeyState(VK_SHIFT) & 0x8000:
+    if user32_dll.GetAsyncKeyState(VK_SHIFT) & 0x8000:
         mods |= MOD_SHIFT
     return mods
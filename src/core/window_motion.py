@@ -0,0 +1,97 @@
+SMOOTH_TIME = 0.035  # Seconds; a single step covers ~95% of the distance in 100 ms
+MAX_FRAME_DT = 0.05  # Larger gaps (ex. a stalled event loop) are integrated as one 50 ms step
+SETTLE_DISTANCE = 0.5  # Pixels
+SETTLE_SPEED = 20.0  # Pixels per second
+
+
+class WindowMotion():
+    """Critically damped spring that moves a point towards a target that can change mid-flight.
+
+    Position and velocity carry over when the target changes, so rapid
+    repeats and reversals bend the current path instead of restarting it.
+    Pure Python with no Qt dependency so the motion can be tested headless.
+    """
+
+    def __init__(self, x: float, y: float, smooth_time: float = SMOOTH_TIME) -> None:
+        self.x = float(x)
+        self.y = float(y)
+        self.velocity_x = 0.0
+        self.velocity_y = 0.0
+        self.target_x = float(x)
+        self.target_y = float(y)
+        self.smooth_time = smooth_time
+
+    @property
+    def is_settled(self) -> bool:
+        """Whether the point has reached its target and stopped."""
+        return (
+            abs(self.target_x - self.x) <= SETTLE_DISTANCE and abs(self.target_y - self.y) <= SETTLE_DISTANCE
+            and abs(self.velocity_x) <= SETTLE_SPEED and abs(self.velocity_y) <= SETTLE_SPEED
+        )
+
+    def jump_to(self, x: float, y: float) -> None:
+        """Place the point at a position without animating, discarding any motion.
+
+        Args:
+            x (float): New x-coordinate.
+            y (float): New y-coordinate.
+        """
+        self.x = self.target_x = float(x)
+        self.y = self.target_y = float(y)
+        self.velocity_x = self.velocity_y = 0.0
+
+    def retarget(self, x: float, y: float) -> None:
+        """Change the target while keeping the current position and velocity.
+
+        Args:
+            x (float): New target x-coordinate.
+            y (float): New target y-coordinate.
+        """
+        self.target_x = float(x)
+        self.target_y = float(y)
+
+    def step(self, dt: float) -> tuple[int, int]:
+        """Advance the motion by one frame.
+
+        Args:
+            dt (float): Seconds since the previous frame.
+
+        Returns:
+            tuple[int, int]: The rounded position to show for this frame (exactly the target once settled).
+        """
+        dt = min(max(dt, 0.0), MAX_FRAME_DT)
+        self.x, self.velocity_x = _smooth_damp(self.x, self.target_x, self.velocity_x, self.smooth_time, dt)
+        self.y, self.velocity_y = _smooth_damp(self.y, self.target_y, self.velocity_y, self.smooth_time, dt)
+        if self.is_settled:
+            self.jump_to(self.target_x, self.target_y)
+        return round(self.x), round(self.y)
+
+
+def _smooth_damp(current: float, target: float, velocity: float, smooth_time: float, dt: float) -> tuple[float, float]:
+    """Integrate one axis of a critically damped spring.
+
+    Uses the closed-form approximation from Game Programming Gems 4 (ch. 1.10),
+    which is stable for any frame time and never overshoots the target.
+
+    Args:
+        current (float): Current position.
+        target (float): Target position.
+        velocity (float): Current velocity in units per second.
+        smooth_time (float): Approximate time to reach the target in seconds.
+        dt (float): Frame time in seconds.
+
+    Returns:
+        tuple[float, float]: The new position and velocity.
+    """
+    omega = 2.0 / smooth_time
+    x = omega * dt
+    decay = 1.0 / (1.0 + x + 0.48 * x * x + 0.235 * x * x * x)
+    change = current - target
+    temp = (velocity + omega * change) * dt
+    velocity = (velocity - omega * temp) * decay
+    position = target + (change + temp) * decay
+
+    # Clamp overshoot: if we crossed the target this frame, stop on it
+    if (target - current > 0.0) == (position > target):
+        return target, 0.0
+    return position, velocity
@@ -1,7 +1,28 @@
-from PyQt6.QtCore import QAbstractAnimation, QEasingCurve, QPropertyAnimation, Qt, QTimer
+from PyQt6.QtCore import QAbstractAnimation, QEasingCurve, QPropertyAnimation, QRect, Qt, QTimer
 from PyQt6.QtWidgets import QScrollArea, QVBoxLayout, QWidget
 
+from core.chat_history import StoredMessage
+from core.tracing import tracer
+
 from .chat_bubble import ChatBubble
+from .document_worker import document_worker
+
+
+class ChatLayout(QVBoxLayout):
+    """Vertical message layout that records each geometry pass in the trace.
+
+    Qt lays out lazily, after the code that changed a bubble has returned, so
+    this is the only place the cost of re-laying out the chat shows up.
+    """
+
+    def setGeometry(self, rect: QRect) -> None:
+        """Lay out the messages and record how long it took.
+
+        Args:
+            rect (QRect): The area to lay out in.
+        """
+        with tracer.span("chat layout", "ui", items=self.count()):
+            super().setGeometry(rect)
 
 
 class ChatArea(QScrollArea):
@@ -23,7 +44,7 @@ class ChatArea(QScrollArea):
         # Create container widget for messages
         self.chat_container = QWidget()
         self.chat_container.setStyleSheet("background-color: transparent;")
-        self.chat_layout = QVBoxLayout(self.chat_container)
+        self.chat_layout = ChatLayout(self.chat_container)
         self.chat_layout.setContentsMargins(3, 3, 3, 3)
         self.chat_layout.addStretch()
         
@@ -66,29 +87,31 @@ class ChatArea(QScrollArea):
         self.scroll_animation = QPropertyAnimation(self.verticalScrollBar(), b"value", self)
         self.scroll_animation.setEasingCurve(QEasingCurve.Type.OutQuad)
     
-    def add_message(self, message: str, is_user: bool) -> None:
+    def add_message(self, message: str, is_user: bool, message_id: int | None = None) -> None:
         """Add a new message to the chat area.
 
         Args:
             message (str): The message text to display.
             is_user (bool): Whether the message is from the user.
+            message_id (int | None, optional): The message's chat history ID.
         """
-        # Remove the stretch before adding new message
-        self.chat_layout.takeAt(self.chat_layout.count() - 1)
-        
-        # Create and add the chat bubble
-        bubble = ChatBubble(message, is_user)
-        self.chat_layout.addWidget(bubble)
-        
-        # Pre-create the assistant loading bubble so it is visible when the chat scrolls down
-        if is_user:
-            self.streaming_bubble = ChatBubble("", is_user=False)
-            self.streaming_text = ""
-            self.chat_layout.addWidget(self.streaming_bubble)
-            self.streaming_bubble.start_loading_animation()
+        with tracer.span("add message", "ui", user=is_user):
+            # Remove the stretch before adding new message
+            self.chat_layout.takeAt(self.chat_layout.count() - 1)
 
-        # Add stretch back at the end
-        self.chat_layout.addStretch()
+            # Create and add the chat bubble
+            bubble = ChatBubble(message, is_user, message_id)
+            self.chat_layout.addWidget(bubble)
+
+            # Pre-create the assistant loading bubble so it is visible when the chat scrolls down
+            if is_user:
+                self.streaming_bubble = ChatBubble("", is_user=False)
+                self.streaming_text = ""
+                self.chat_layout.addWidget(self.streaming_bubble)
+                self.streaming_bubble.start_loading_animation()
+
+            # Add stretch back at the end
+            self.chat_layout.addStretch()
         
         # Force scroll to bottom after a delay
         if is_user:
@@ -118,11 +141,16 @@ class ChatArea(QScrollArea):
         self.streaming_text += chunk_text
         self.streaming_bubble.set_bot_message(self.streaming_text)
     
-    def finalize_assistant_stream(self) -> None:
-        """Finalize the streamed assistant message and clear streaming state."""
+    def finalize_assistant_stream(self, message_id: int | None = None) -> None:
+        """Finalize the streamed assistant message and clear streaming state.
+
+        Args:
+            message_id (int | None, optional): The saved message's chat history ID.
+        """
         if self.streaming_bubble is None:
             return
         self.streaming_bubble.stop_loading_animation()
+        self.streaming_bubble.message_id = message_id
         self._reset_stream()
 
     def show_stream_error(self, error_msg: str) -> None:
@@ -148,6 +176,58 @@ class ChatArea(QScrollArea):
             if item.widget():
                 item.widget().deleteLater()
     
+    def show_conversation(self, messages: list[StoredMessage]) -> None:
+        """Replace the chat with messages loaded from the chat history.
+
+        Args:
+            messages (list[StoredMessage]): The conversation, oldest first.
+        """
+        self.clear_chat()
+        self._reset_stream()
+        self.chat_layout.takeAt(self.chat_layout.count() - 1)
+        for message in messages:
+            if message.role == "user":
+                bubble = ChatBubble(message.content, True, message.id)
+            else:
+                bubble = ChatBubble("", False, message.id)
+                bubble.set_bot_message(message.content)
+            self.chat_layout.addWidget(bubble)
+        self.chat_layout.addStretch()
+
+    def find_bubble(self, message_id: int) -> ChatBubble | None:
+        """Find the bubble showing a chat history message.
+
+        Args:
+            message_id (int): The message's chat history ID.
+
+        Returns:
+            ChatBubble | None: The bubble, or None if the message is not in the chat.
+        """
+        for index in range(self.chat_layout.count()):
+            widget = self.chat_layout.itemAt(index).widget()
+            if isinstance(widget, ChatBubble) and widget.message_id == message_id:
+                return widget
+        return None
+
+    def reveal_bubble(self, bubble: ChatBubble) -> None:
+        """Scroll a bubble to the top of the chat area and highlight it.
+
+        Waits for pending documents and the next layout pass, so it also works for bubbles that were just added.
+
+        Args:
+            bubble (ChatBubble): The bubble to show.
+        """
+        def reveal() -> None:
+            """Scroll to the laid-out bubble once the documents above it have arrived."""
+            if document_worker.pending():
+                QTimer.singleShot(10, reveal)
+                return
+            self.chat_layout.activate()
+            self._animate_to(bubble.y() - self.chat_layout.contentsMargins().top(), 200)
+            bubble.highlight()
+
+        QTimer.singleShot(0, reveal)
+
     def shortcut_scroll(self, amount: int) -> None:
         """Scroll the chat area by a specified amount.
 
@@ -1,19 +1,32 @@
 import math
+import time
 
 from PyQt6.QtCore import Qt, QTimer
-from PyQt6.QtGui import QFont
+from PyQt6.QtGui import QTextDocument
 from PyQt6.QtWidgets import QHBoxLayout, QLabel, QWidget
 
-from ui.ai_formatter import format_message
+from core.metrics import FORMAT_MS, RENDER_MS, metrics
+from core.tracing import tracer
+
+from . import resources
+from .document_view import DocumentView
+from .document_worker import document_worker
+
+
+HIGHLIGHT_MS = 1500  # How long a search hit stays highlighted
+BOT_WIDTH = 515
 
 
 class ChatBubble(QWidget):
     """A chat bubble widget for displaying messages"""
     
-    def __init__(self, message: str, is_user: bool = False) -> None:
+    def __init__(self, message: str, is_user: bool = False, message_id: int | None = None) -> None:
         super().__init__()
         self.message = message
         self.is_user = is_user
+        self.message_id = message_id  # Chat history ID, once the message is saved
+        self.sequence = 0  # Incremented for every text sent to the document worker
+        self.shown_sequence = 0  # Sequence of the document on screen
         self._initUI()
     
     def _initUI(self) -> None:
@@ -21,29 +34,18 @@ class ChatBubble(QWidget):
         layout = QHBoxLayout(self)
         layout.setContentsMargins(10, 5, 10, 5)
         
-        # Create message label with HTML formatting
-        # Default formatting for user message only (bot message uses formatting in set_bot_message)
-        html_message = f'<div style="line-height: 1.4; white-space: pre-wrap;">{self.message}</div>'
-        self.message_label = QLabel(html_message)
-        self.message_label.setTextFormat(Qt.TextFormat.RichText)
-        self.message_label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
-        
-        # Set font
-        font = QFont("Helvetica", 11)
-        self.message_label.setFont(font)
-        
-        # Style the bubble based on sender
+        # Style the bubble based on sender via the application style sheet
         if self.is_user:
+            # Create message label with HTML formatting
+            html_message = f'<div style="line-height: 1.4; white-space: pre-wrap;">{self.message}</div>'
+            self.message_label = QLabel(html_message)
+            self.message_label.setTextFormat(Qt.TextFormat.RichText)
+            self.message_label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+            self.message_label.setFont(resources.font("Helvetica", 11))  # Shared instance; see ui.resources
+
             # User messages: light gray, aligned right
-            self.message_label.setStyleSheet("""
-                QLabel {
-                    color: rgba(255, 255, 255, 1.0);
-                    background-color: transparent;
-                    border: 1px solid rgba(255, 255, 255, 1.0);
-                    border-radius: 8px;
-                    padding: 5px 4px -3px 5px;  /* top, right, bottom, left */
-                }
-            """)  # padding adjusted to visually center text within the bubble
+            self.message_label.setObjectName(resources.USER_BUBBLE)
+            self.message_label.ensurePolished()  # Apply the style's border and padding before measuring
 
             # Let Qt estimate the natural width of the message, then word wrap if necessary
             natural_width = self.message_label.sizeHint().width()
@@ -58,29 +60,62 @@ class ChatBubble(QWidget):
             layout.addStretch()
             layout.addWidget(self.message_label)
         else:
-            # Bot messages: transparent, aligned left
-            self.message_label.setStyleSheet("""
-                QLabel {
-                    color: rgba(255, 255, 255, 1.0);
-                    background-color: transparent;
-                    padding: 0px 0px 0px 1px;  /* top, right, bottom, left */
-                }
-            """)
-            self.message_label.setWordWrap(True)
-            self.message_label.setFixedWidth(515)
+            # Bot messages: transparent, aligned left; formatted and laid out off the UI thread (see set_bot_message)
+            self.message_label = DocumentView(BOT_WIDTH)
+            self.message_label.setObjectName(resources.BOT_BUBBLE)
             layout.addWidget(self.message_label)
             layout.addStretch()
+            if self.message:
+                self.set_bot_message(self.message)
         
         layout.setSpacing(0)
 
     def set_bot_message(self, message: str) -> None:
-        """Format the bot message and set the text as the label.
+        """Queue the bot message to be formatted and laid out on the document worker thread.
+
+        The bubble keeps showing its current content until the document
+        arrives in show_document.
 
         Args:
             message (str): The raw bot message text to format and display.
         """
         self.message = message
-        self.message_label.setText(format_message(message))
+        self.sequence += 1
+        document_worker.request(self, self.sequence, message, self.message_label.font(), self.message_label.text_width())
+
+    def show_document(self, sequence: int, document: QTextDocument, format_ms: float) -> None:
+        """Swap in a document from the document worker, unless a newer one is already shown.
+
+        Args:
+            sequence (int): The sequence number the document was requested with.
+            document (QTextDocument): The formatted and laid-out message.
+            format_ms (float): Time the worker spent formatting and laying it out.
+        """
+        if sequence <= self.shown_sequence:
+            return  # Arrived after a newer document
+        self.shown_sequence = sequence
+        start = time.perf_counter_ns()
+        self.message_label.set_document(document)
+        rendered = time.perf_counter_ns()
+        metrics.observe(FORMAT_MS, format_ms)
+        metrics.observe(RENDER_MS, (rendered - start) / 1_000_000)
+        tracer.complete("set document", "ui", start, rendered, sequence=sequence)
+
+    def highlight(self) -> None:
+        """Briefly highlight the bubble (e.g. when jumped to from search)."""
+        self._set_highlighted(True)
+        QTimer.singleShot(HIGHLIGHT_MS, lambda: self._set_highlighted(False))
+
+    def _set_highlighted(self, highlighted: bool) -> None:
+        """Toggle the search hit style from the application style sheet.
+
+        Args:
+            highlighted (bool): Whether to show the highlight.
+        """
+        self.message_label.setProperty(resources.SEARCH_HIT_PROPERTY, highlighted)
+        self.message_label.style().unpolish(self.message_label)
+        self.message_label.style().polish(self.message_label)
+        self.message_label.update()
 
     def start_loading_animation(self) -> None:
         """Start the animated three-dot loading indicator."""
@@ -116,7 +151,7 @@ class ChatBubble(QWidget):
             f'&nbsp;'
             f'<span style="color: rgba(255, 255, 255, {o3:.2f}); font-size: 16px;">&#9679;</span>'
         )
-        self.message_label.setText(html)
+        self.message_label.set_html(html)
         self._loading_frame = (self._loading_frame + 1) % 20
 
     def stop_loading_animation(self) -> None:
@@ -1,9 +1,9 @@
-import os
-
 from PyQt6.QtCore import QEvent, QSize
-from PyQt6.QtGui import QEnterEvent, QIcon
+from PyQt6.QtGui import QEnterEvent
 from PyQt6.QtWidgets import QPushButton
 
+from . import resources
+
 
 class ClearChatButton(QPushButton):
     """Button in the title bar to clear the chat history."""
@@ -14,11 +14,10 @@ class ClearChatButton(QPushButton):
         self.setFixedSize(36, 32)
         self.clicked.connect(on_click)
         
-        base_dir = os.getcwd()
-        assets_dir = os.path.join(base_dir, "src", "assets")
-        self.light_icon_path = os.path.join(assets_dir, "clear_chat_button_light.png")
-        self.dark_icon_path = os.path.join(assets_dir, "clear_chat_button_dark.png")
-        self.setIcon(QIcon(self.light_icon_path))
+        # Both variants are decoded once and shared; hovering only swaps them
+        self.light_icon = resources.icon("clear_chat_button_light.png")
+        self.dark_icon = resources.icon("clear_chat_button_dark.png")
+        self.setIcon(self.light_icon)
         self.setIconSize(QSize(14, 14))
         self.setStyleSheet("""
             QPushButton {
@@ -40,7 +39,7 @@ class ClearChatButton(QPushButton):
         Args:
             event (QEnterEvent): The mouse enter event.
         """
-        self.setIcon(QIcon(self.dark_icon_path))
+        self.setIcon(self.dark_icon)
         super().enterEvent(event)
 
     # Override to change icon when not on hover
@@ -50,5 +49,5 @@ class ClearChatButton(QPushButton):
         Args:
             event (QEvent): The mouse leave event.
         """
-        self.setIcon(QIcon(self.light_icon_path))
+        self.setIcon(self.light_icon)
         super().leaveEvent(event)
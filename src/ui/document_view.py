@@ -0,0 +1,207 @@
+import math
+
+from PyQt6.QtCore import QPointF, QSize, Qt
+from PyQt6.QtGui import (
+    QAbstractTextDocumentLayout,
+    QColor,
+    QContextMenuEvent,
+    QGuiApplication,
+    QKeyEvent,
+    QKeySequence,
+    QMouseEvent,
+    QPainter,
+    QPaintEvent,
+    QPalette,
+    QTextCursor,
+    QTextDocument,
+)
+from PyQt6.QtWidgets import QMenu, QWidget
+
+from . import resources
+
+
+TEXT_COLOR = QColor(255, 255, 255)
+SELECTION_COLOR = QColor(255, 255, 255, 70)
+HIGHLIGHT_COLOR = QColor(255, 255, 255, 38)  # Search hit; matches the bubble style sheet
+LEFT_PADDING = 1
+
+
+class DocumentView(QWidget):
+    """Fixed-width widget that paints a QTextDocument laid out elsewhere.
+
+    Unlike a rich-text QLabel, which parses and lays out its HTML on the UI
+    thread whenever the text changes, this view takes a finished document
+    (see DocumentWorker) and only repaints. Its height follows the document.
+    Text can be selected with the mouse and copied with Ctrl+C or the
+    context menu, as in the QLabel it replaces.
+    """
+
+    def __init__(self, width: int, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        self.document = QTextDocument()  # Unparented: the view holds the only reference, so a replaced document is freed
+        self.anchor = -1  # Selection anchor position, or -1 without a selection
+        self.position = -1
+        self.setFixedWidth(width)
+        self.setFont(resources.font("Helvetica", 11))
+        self.setCursor(Qt.CursorShape.IBeamCursor)
+        self.setFocusPolicy(Qt.FocusPolicy.ClickFocus)
+
+    def text_width(self) -> float:
+        """Return the width documents for this view must be laid out at.
+
+        Returns:
+            float: The width in pixels.
+        """
+        return self.width() - LEFT_PADDING
+
+    def set_document(self, document: QTextDocument) -> None:
+        """Show a document already laid out at text_width(); the previous one is freed once nothing else references it.
+
+        Args:
+            document (QTextDocument): The document, owned by the UI thread.
+        """
+        self.document = document
+        self.anchor = self.position = -1
+        height = math.ceil(document.size().height())
+        if height != self.height():
+            self.setFixedHeight(height)
+        self.update()
+
+    def set_html(self, html: str) -> None:
+        """Lay out and show a short HTML snippet on the calling (UI) thread.
+
+        Args:
+            html (str): The HTML, e.g. the loading indicator.
+        """
+        document = QTextDocument()
+        document.setDocumentMargin(0)
+        document.setDefaultFont(self.font())
+        document.setTextWidth(self.text_width())
+        document.setHtml(html)
+        self.set_document(document)
+
+    def selected_text(self) -> str:
+        """Return the selected text.
+
+        Returns:
+            str: The selection as plain text, or "" if nothing is selected.
+        """
+        if self.anchor < 0 or self.anchor == self.position:
+            return ""
+        return self._selection().selectedText().replace(" ", "\n")
+
+    def sizeHint(self) -> QSize:
+        """Return the size of the document.
+
+        Returns:
+            QSize: The fixed width and the document's height.
+        """
+        return QSize(self.width(), math.ceil(self.document.size().height()))
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        """Paint the document, the selection and the search hit highlight.
+
+        Args:
+            event (QPaintEvent): The paint event.
+        """
+        painter = QPainter(self)
+        if self.property(resources.SEARCH_HIT_PROPERTY):
+            painter.fillRect(self.rect(), HIGHLIGHT_COLOR)
+        painter.translate(LEFT_PADDING, 0)
+
+        context = QAbstractTextDocumentLayout.PaintContext()
+        palette = QPalette(self.palette())
+        palette.setColor(QPalette.ColorRole.Text, TEXT_COLOR)
+        context.palette = palette
+        context.clip = event.rect().toRectF().translated(-LEFT_PADDING, 0)
+        if self.selected_text():
+            selection = QAbstractTextDocumentLayout.Selection()
+            selection.cursor = self._selection()
+            selection.format.setBackground(SELECTION_COLOR)
+            context.selections = [selection]
+        self.document.documentLayout().draw(painter, context)
+
+    def mousePressEvent(self, event: QMouseEvent) -> None:
+        """Start a selection.
+
+        Args:
+            event (QMouseEvent): The mouse event.
+        """
+        if event.button() == Qt.MouseButton.LeftButton:
+            self.anchor = self.position = self._hit_test(event.position())
+            self.update()
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event: QMouseEvent) -> None:
+        """Extend the selection while dragging.
+
+        Args:
+            event (QMouseEvent): The mouse event.
+        """
+        if event.buttons() & Qt.MouseButton.LeftButton and self.anchor >= 0:
+            self.position = self._hit_test(event.position())
+            self.update()
+
+    def mouseDoubleClickEvent(self, event: QMouseEvent) -> None:
+        """Select the word under the cursor.
+
+        Args:
+            event (QMouseEvent): The mouse event.
+        """
+        cursor = QTextCursor(self.document)
+        cursor.setPosition(self._hit_test(event.position()))
+        cursor.select(QTextCursor.SelectionType.WordUnderCursor)
+        self.anchor, self.position = cursor.anchor(), cursor.position()
+        self.update()
+
+    def keyPressEvent(self, event: QKeyEvent) -> None:
+        """Copy the selection on Ctrl+C.
+
+        Args:
+            event (QKeyEvent): The key event.
+        """
+        if event.matches(QKeySequence.StandardKey.Copy):
+            self._copy()
+            return
+        super().keyPressEvent(event)
+
+    def contextMenuEvent(self, event: QContextMenuEvent) -> None:
+        """Offer to copy the selection.
+
+        Args:
+            event (QContextMenuEvent): The context menu event.
+        """
+        menu = QMenu(self)
+        copy = menu.addAction("Copy")
+        copy.setEnabled(bool(self.selected_text()))
+        copy.triggered.connect(self._copy)
+        menu.exec(event.globalPos())
+
+    def _copy(self) -> None:
+        """Put the selected text on the clipboard."""
+        text = self.selected_text()
+        if text:
+            QGuiApplication.clipboard().setText(text)
+
+    def _selection(self) -> QTextCursor:
+        """Build a cursor spanning the selection.
+
+        Returns:
+            QTextCursor: The cursor.
+        """
+        cursor = QTextCursor(self.document)
+        cursor.setPosition(self.anchor)
+        cursor.setPosition(self.position, QTextCursor.MoveMode.KeepAnchor)
+        return cursor
+
+    def _hit_test(self, point: QPointF) -> int:
+        """Find the document position under a point.
+
+        Args:
+            point (QPointF): The point in widget coordinates.
+
+        Returns:
+            int: The nearest cursor position.
+        """
+        position = self.document.documentLayout().hitTest(point - QPointF(LEFT_PADDING, 0), Qt.HitTestAccuracy.FuzzyHit)
+        return max(0, position)
@@ -0,0 +1,107 @@
+import threading
+import time
+
+from PyQt6 import sip
+from PyQt6.QtCore import QEventLoop, QObject, pyqtSignal
+from PyQt6.QtGui import QFont, QTextDocument
+
+from core.tracing import tracer
+
+from .ai_formatter import format_message
+
+
+class DocumentWorker(QObject):
+    """Formats bot messages and lays them out as QTextDocuments off the UI thread.
+
+    Each request carries the bubble's sequence number. Only the newest pending
+    text per bubble is kept, so a fast stream is formatted at the rate the
+    worker can keep up with rather than once per chunk. The finished document
+    is moved to the UI thread and delivered to the bubble, which only swaps it
+    in (see ChatBubble.show_document); a result older than the one already
+    shown is discarded there by its sequence number.
+
+    The thread is started once and never exits: glyphs are shaped with fonts
+    from a per-thread cache, and the documents it lays out keep using them
+    after they are handed over.
+    """
+
+    # Using threading instead of QThread due to compilation issues with Nuitka
+    document_ready = pyqtSignal(object, int, object, float)  # (bubble, sequence, QTextDocument, format + layout ms)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.condition = threading.Condition()
+        self.jobs: dict[int, tuple] = {}  # id(bubble) -> (bubble, sequence, message, font, width) of its newest pending text
+        self.busy = False
+        self.worker_thread: threading.Thread | None = None
+        self.document_ready.connect(self._deliver)
+
+    def request(self, bubble, sequence: int, message: str, font: QFont, width: float) -> None:
+        """Queue a message to be formatted and laid out for a bubble, replacing its pending one.
+
+        Args:
+            bubble (ChatBubble): The bubble to deliver the document to.
+            sequence (int): The bubble's sequence number for this text.
+            message (str): The raw bot message text.
+            font (QFont): The default font of the document.
+            width (float): The text width to lay out at, in pixels.
+        """
+        with self.condition:
+            self.jobs[id(bubble)] = (bubble, sequence, message, QFont(font), width)
+            if self.worker_thread is None:
+                self.worker_thread = threading.Thread(target=self._run, name="document-layout", daemon=True)
+                self.worker_thread.start()
+            self.condition.notify()
+
+    def pending(self) -> bool:
+        """Check whether any document is queued or being laid out.
+
+        Returns:
+            bool: True until every requested document has been delivered.
+        """
+        return self.busy or bool(self.jobs)
+
+    def _run(self) -> None:
+        """Build documents for queued requests, oldest bubble first (runs on the layout thread)."""
+        event_loop = QEventLoop()  # Gives the thread an event dispatcher, so the document layout's timers can start
+        ui_thread = self.thread()
+        while True:
+            with self.condition:
+                while not self.jobs:
+                    self.condition.wait()
+                bubble, sequence, message, font, width = self.jobs.pop(next(iter(self.jobs)))
+                self.busy = True
+
+            try:
+                start = time.perf_counter_ns()
+                document = QTextDocument()
+                document.setDocumentMargin(0)
+                document.setDefaultFont(font)
+                document.setTextWidth(width)
+                document.setHtml(format_message(message))
+                document.size()  # Lay out the whole document here rather than on first paint
+                end = time.perf_counter_ns()
+                tracer.complete("format + layout", "ui", start, end, chars=len(message))
+                event_loop.processEvents()  # Flush the layout's deferred notifications before handing it over
+                document.moveToThread(ui_thread)
+                self.document_ready.emit(bubble, sequence, document, (end - start) / 1_000_000)
+            except Exception as e:
+                print(f"Error formatting message: {str(e)}")
+            finally:
+                self.busy = False
+
+    def _deliver(self, bubble, sequence: int, document: QTextDocument, format_ms: float) -> None:
+        """Hand a finished document to its bubble unless the bubble was deleted meanwhile.
+
+        Args:
+            bubble (ChatBubble): The bubble.
+            sequence (int): The sequence number the document was requested with.
+            document (QTextDocument): The laid-out document.
+            format_ms (float): Time spent formatting and laying it out.
+        """
+        if sip.isdeleted(bubble):
+            return
+        bubble.show_document(sequence, document, format_ms)
+
+
+document_worker = DocumentWorker()
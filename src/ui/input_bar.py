@@ -9,8 +9,13 @@ class InputBar(QWidget):
     # Signal emitted when a message is sent
     message_sent = pyqtSignal(str)
 
+    PLACEHOLDER_TEXT = "How can I help you?"
+    DICTATION_PLACEHOLDER_TEXT = "Listening..."
+
     def __init__(self, main_window) -> None:
         super().__init__(main_window)
+        self.dictation_prefix = ""  # Text typed before dictation started; transcripts are appended to it
+        self.dictation_generation = None  # Transcriber generation being shown; None once its last transcript arrived or it was cancelled
         self._initUI()
 
     def _initUI(self) -> None:
@@ -26,7 +31,7 @@ class InputBar(QWidget):
 
         # Create text input field
         self.input_field = QLineEdit()
-        self.input_field.setPlaceholderText("How can I help you?")
+        self.input_field.setPlaceholderText(self.PLACEHOLDER_TEXT)
         self.input_field.returnPressed.connect(self._send_message)
 
         # Set font
@@ -51,6 +56,48 @@ class InputBar(QWidget):
         input_row.addWidget(self.input_field)
         outer_layout.addLayout(input_row)
 
+    def start_dictation(self, generation: int) -> None:
+        """Prepare the input field to receive a live transcript after any already typed text.
+
+        Args:
+            generation (int): Generation of the transcriber pipeline whose transcripts are shown.
+        """
+        self.dictation_prefix = self.input_field.text().rstrip()
+        self.dictation_generation = generation
+        self.input_field.setPlaceholderText(self.DICTATION_PLACEHOLDER_TEXT)
+
+    def stop_dictation(self) -> None:
+        """Restore the input field placeholder once capture stops; transcripts of the audio already captured are still shown."""
+        self.input_field.setPlaceholderText(self.PLACEHOLDER_TEXT)
+
+    def finish_dictation(self, generation: int | None = None) -> None:
+        """Stop accepting transcripts.
+
+        Args:
+            generation (int | None, optional): Generation of the transcriber pipeline that delivered its last transcript; None stops accepting any.
+        """
+        if generation is None or generation == self.dictation_generation:
+            self.dictation_generation = None
+            self.input_field.setPlaceholderText(self.PLACEHOLDER_TEXT)
+
+    def show_transcript(self, generation: int, committed: str, partial: str) -> None:
+        """Display the live transcript in the input field.
+
+        Transcripts are ignored unless they come from the pipeline started with
+        the current dictation. After a stop they keep arriving until the words
+        already spoken are transcribed, but never after the message is sent.
+
+        Args:
+            generation (int): Generation of the transcriber pipeline that produced the transcript.
+            committed (str): Transcript text that will no longer change.
+            partial (str): In-progress transcript of the current utterance.
+        """
+        if generation != self.dictation_generation:
+            return
+        text = " ".join(part for part in (self.dictation_prefix, committed, partial) if part)
+        self.input_field.setText(text)
+        self.input_field.end(False)
+
     def _send_message(self) -> None:
         """Send the current message and clear the input field."""
         message = self.input_field.text().strip()
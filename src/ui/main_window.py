@@ -1,15 +1,23 @@
 import ctypes
-from ctypes import wintypes
 
-from PyQt6.QtCore import QPoint, Qt, QTimer
-from PyQt6.QtGui import QColor, QMouseEvent, QPainter, QPen
+from PyQt6.QtCore import QPoint, Qt, QTimer, pyqtSignal
+from PyQt6.QtGui import QColor, QHideEvent, QMouseEvent, QPainter, QPen, QShowEvent
 from PyQt6.QtWidgets import QApplication, QHBoxLayout, QPushButton, QVBoxLayout, QWidget
 
 from .chat_area import ChatArea
 from .clear_chat_button import ClearChatButton
 from .input_bar import InputBar
+from .perf_hud import PerfHud
+from .region_picker import RegionPicker
 from .screenshot_tray import ScreenshotTray
+from .search_bar import SearchBar
+from .window_animator import WindowAnimator
 from core.ai_receiver import AIReceiver
+from core.chat_history import StoredMessage
+from core.config import load_config
+from core.request_scheduler import PRIORITY_PRESET, PRIORITY_TYPED, TYPED
+from core.topmost_tracker import TopmostTracker, Win32TopmostPlatform
+from core.transcriber import Transcriber
 
 
 class MainWindow(QWidget):
@@ -17,12 +25,18 @@ class MainWindow(QWidget):
 
     BG_COLOR = QColor(20, 20, 20, 153)
 
-    def __init__(self, ai_sender, screenshot_manager) -> None:
+    visibility_changed = pyqtSignal(bool)
+
+    def __init__(self, ai_sender, screenshot_manager, chat_history, metrics_store=None) -> None:
         super().__init__()
         self.ai_sender = ai_sender
         self.screenshot_manager = screenshot_manager
+        self.chat_history = chat_history
+        self.metrics_store = metrics_store
         self._initUI()
-        self.worker = AIReceiver(ai_sender, self.chat_area)
+        self.worker = AIReceiver(ai_sender, self.chat_area, chat_history, metrics_store, screenshot_manager)
+        self.screenshot_manager.screenshot_added.connect(lambda _buffer: self.ai_sender.prewarm())  # A request usually follows
+        self.transcriber = None  # Created on first use; dictation is optional
         
     def _initUI(self) -> None:
         """Initialize the main window UI layout and components."""
@@ -69,6 +83,7 @@ class MainWindow(QWidget):
             lambda: (
                 self.chat_area.clear_chat(),
                 self.ai_sender.reset_chat(),
+                self.chat_history.start_conversation(),
                 self.screenshot_manager.clear_screenshots(),
                 self.screenshot_tray.clear(),
             ),
@@ -121,6 +136,15 @@ class MainWindow(QWidget):
         header_layout.addWidget(self.close_btn)
         main_layout.addLayout(header_layout)
 
+        # Optional performance HUD strip under the title bar (hidden until toggled)
+        self.perf_hud = PerfHud(self)
+        main_layout.addWidget(self.perf_hud)
+
+        # Chat history search (hidden until opened with its hotkey)
+        self.search_bar = SearchBar(self.chat_history, self)
+        self.search_bar.message_selected.connect(self.show_history_message)
+        main_layout.addWidget(self.search_bar)
+
         # Add chat area
         main_layout.addWidget(self.chat_area, stretch=1)
 
@@ -134,6 +158,9 @@ class MainWindow(QWidget):
 
         # Unset cursor for all child widgets to preserve system cursor
         self._unset_cursor_recursive(self)
+
+        # Animates hotkey moves; rapid repeats accumulate into one smooth move
+        self.window_animator = WindowAnimator(self)
         
         self.show()
         
@@ -144,16 +171,47 @@ class MainWindow(QWidget):
         if result == 0:
             print("Warning: SetWindowDisplayAffinity failed. May appear in screenshots.")
         
-        # Setup timer to raise main window so it is always visible (certain Windows operations override the stay on top hint)
-        self.visibility_timer = QTimer(self)
-        self.visibility_timer.setInterval(1000)
-        self.visibility_timer.timeout.connect(self._ensure_window_visible)
-        self.visibility_timer.start()
+        # Re-raise the main window when other windows cover it (certain Windows operations override the stay on top hint)
+        # Driven by foreground / location change events while visible instead of polling
+        self.topmost_check_timer = QTimer(self)
+        self.topmost_check_timer.setSingleShot(True)
+        self.topmost_tracker = TopmostTracker(
+            Win32TopmostPlatform(hwnd, self._topmost_sample_points),
+            self.topmost_check_timer.start,
+        )
+        self.topmost_check_timer.timeout.connect(self.topmost_tracker.check)
+        self.visibility_changed.connect(self.topmost_tracker.set_active)
+        self.topmost_tracker.set_active(self.isVisible())
 
     def resizeEvent(self, event) -> None:
         """Reposition the floating screenshot tray when the window is resized."""
         super().resizeEvent(event)
         self._position_screenshot_tray()
+        self.screenshot_manager.set_overlay_rect(self.frameGeometry())
+
+    def showEvent(self, event: QShowEvent) -> None:
+        """Notify listeners (e.g. the keyboard hook) that the window became visible.
+
+        Args:
+            event (QShowEvent): The show event.
+        """
+        super().showEvent(event)
+        self.visibility_changed.emit(True)
+        self.ai_sender.prewarm()  # Showing the overlay (Ctrl+E) usually precedes a request
+
+    def hideEvent(self, event: QHideEvent) -> None:
+        """Notify listeners (e.g. the keyboard hook) that the window was hidden.
+
+        Args:
+            event (QHideEvent): The hide event.
+        """
+        super().hideEvent(event)
+        self.visibility_changed.emit(False)
+
+    def moveEvent(self, event) -> None:
+        """Keep the screenshot manager informed of the overlay position for overlay-monitor captures."""
+        super().moveEvent(event)
+        self.screenshot_manager.set_overlay_rect(self.frameGeometry())
 
     def _position_screenshot_tray(self) -> None:
         """Place the screenshot tray above the input bar, floating over the chat area."""
@@ -179,44 +237,22 @@ class MainWindow(QWidget):
             child.setAttribute(Qt.WidgetAttribute.WA_SetCursor, False)
             child.unsetCursor()
 
-    def _ensure_window_visible(self) -> None:
-        """Raise the main window if it is no longer the topmost window."""
-        try:
-            if not self._is_topmost_window():
-                self.raise_()
-        except Exception:
-            pass
-
-    def _is_topmost_window(self) -> bool:
-        """Check if the main window is the topmost window at its corner positions.
+    def _topmost_sample_points(self) -> list[tuple[int, int]]:
+        """Return physical screen points just inside each corner of the main window for coverage checks.
 
         Returns:
-            bool: True if the main window is topmost at all sampled points.
+            list[tuple[int, int]]: (x, y) points in physical pixels.
         """
-        try:
-            screen = QApplication.primaryScreen()
-            rect = self.frameGeometry()
-            scale = screen.devicePixelRatio()
-            ga_root = 2
-            self_hwnd = int(self.winId())
-            self_root = ctypes.windll.user32.GetAncestor(wintypes.HWND(self_hwnd), ga_root)
-            padding = 15
-            corners = [
-                rect.topLeft() + QPoint(padding, padding),
-                rect.topRight() + QPoint(-padding, padding),
-                rect.bottomLeft() + QPoint(padding, -padding),
-                rect.bottomRight() + QPoint(-padding, -padding)
-            ]
-            for corner in corners:
-                pt = wintypes.POINT(int(corner.x() * scale), int(corner.y() * scale))
-                hwnd_at_pt = ctypes.windll.user32.WindowFromPoint(pt)
-                if hwnd_at_pt:
-                    target_root = ctypes.windll.user32.GetAncestor(wintypes.HWND(hwnd_at_pt), ga_root)
-                    if int(self_root) != int(target_root):
-                        return False
-            return True
-        except Exception:
-            return True
+        rect = self.frameGeometry()
+        scale = self.screen().devicePixelRatio()
+        padding = 15
+        corners = [
+            rect.topLeft() + QPoint(padding, padding),
+            rect.topRight() + QPoint(-padding, padding),
+            rect.bottomLeft() + QPoint(padding, -padding),
+            rect.bottomRight() + QPoint(-padding, -padding)
+        ]
+        return [(int(corner.x() * scale), int(corner.y() * scale)) for corner in corners]
 
     def toggle_window_visibility(self) -> None:
         """Toggle the main window between visible and hidden states."""
@@ -226,29 +262,111 @@ class MainWindow(QWidget):
             self.show()
             self.raise_()  # Bring to front
 
-    def send_message(self, message: str) -> None:
+    def pick_capture_region(self) -> None:
+        """Open the region picker and make the picked region the capture target."""
+        self.region_picker = RegionPicker()
+        self.region_picker.region_selected.connect(self.screenshot_manager.set_picked_region)
+        self.region_picker.start()
+
+    def toggle_dictation(self) -> None:
+        """Start or stop streaming speech-to-text into the input bar."""
+        if self.transcriber is None:
+            self.transcriber = Transcriber(load_config()["transcriber"]["model"])
+            self.transcriber.transcript_changed.connect(self.input_bar.show_transcript)
+            self.transcriber.finished.connect(self.input_bar.finish_dictation)
+            self.transcriber.error.connect(self._on_dictation_error)
+            self.input_bar.message_sent.connect(self._cancel_dictation)  # Sending the dictated text ends dictation
+
+        if self.transcriber.is_running():
+            self.transcriber.stop()  # The words already spoken are still transcribed into the input bar
+            self.input_bar.stop_dictation()
+        else:
+            self.transcriber.start()
+            if self.transcriber.is_running():
+                self.input_bar.start_dictation(self.transcriber.generation)
+
+    def open_search(self) -> None:
+        """Show the chat history search box and give it keyboard focus."""
+        self.activateWindow()  # The overlay is a tool window; take focus so typing goes to the search field
+        self.search_bar.open()
+
+    def show_history_message(self, message: StoredMessage) -> None:
+        """Scroll to a message from the chat history, loading its conversation if it is not on screen.
+
+        Loading an older conversation replaces the current chat; the conversation
+        itself stays in the history. The AI chat session is reset and new messages
+        start a new conversation.
+
+        Args:
+            message (StoredMessage): The message to show.
+        """
+        bubble = self.chat_area.find_bubble(message.id)
+        if bubble is None:
+            self.worker.interrupt()
+            self.chat_area.show_conversation(self.chat_history.get_conversation(message.conversation))
+            self.ai_sender.reset_chat()
+            self.chat_history.start_conversation()
+            bubble = self.chat_area.find_bubble(message.id)
+        if bubble is not None:
+            self.chat_area.reveal_bubble(bubble)
+
+    def send_message(self, message: str, priority: int = PRIORITY_TYPED, preset: str = TYPED) -> None:
         """Send a user message with any pending screenshot attachments.
 
         Args:
             message (str): The user's message text.
+            priority (int, optional): PRIORITY_TYPED for typed messages, PRIORITY_PRESET for preset prompts.
+            preset (str, optional): Name of the preset sending the message, or TYPED (recorded with its metrics).
         """
-        attachments = self.screenshot_manager.get_and_clear_pending()
+        attachments, captures = self.screenshot_manager.get_and_clear_pending()
         self.screenshot_tray.clear()
-        self.worker.handle_message(message, attachments or None)
+        self.worker.handle_message(message, attachments or None, priority, preset, captures)
+
+    def send_preset(self, prompt: str, name: str) -> None:
+        """Send a preset's prompt, which never interrupts a typed message.
+
+        Args:
+            prompt (str): The preset's prompt.
+            name (str): The preset's name.
+        """
+        self.send_message(prompt, PRIORITY_PRESET, name)
 
     def quit_app(self) -> None:
         """Quit the application, stopping any active worker and clearing chat."""
-        # Stop any active worker
+        # Stop any active worker; this waits for the generation threads, which write to both databases
         if self.worker is not None:
             self.worker.stop()
+        self.window_animator.stop()
+        if self.transcriber is not None:
+            self.transcriber.close()
 
         self.chat_area.clear_chat()
         self.ai_sender.reset_chat()
+        self.ai_sender.close()
+        self.screenshot_manager.screen_watcher.set_active(False)  # Before clearing, so no capture lands after it
         self.screenshot_manager.clear_screenshots()
+        self.chat_history.close()
+        if self.metrics_store is not None:
+            self.metrics_store.close()
         app = QApplication.instance()
         if app is not None:
             app.quit()
 
+    def _on_dictation_error(self, error: str) -> None:
+        """Report a dictation error and reset the input bar.
+
+        Args:
+            error (str): The error message from the transcriber.
+        """
+        print(f"Dictation error: {error}")
+        self._cancel_dictation()
+
+    def _cancel_dictation(self) -> None:
+        """Stop the transcriber, dropping transcripts still being decoded, and stop showing transcripts in the input bar."""
+        if self.transcriber is not None:
+            self.transcriber.cancel()
+        self.input_bar.finish_dictation()
+
     # Override mousePressEvent to automatically set focus to input field
     def mousePressEvent(self, event: QMouseEvent) -> None:
         """Handle mouse press events by setting focus to the input field.
@@ -0,0 +1,107 @@
+from PyQt6.QtCore import QTimer
+from PyQt6.QtGui import QHideEvent, QShowEvent
+from PyQt6.QtWidgets import QLabel, QWidget
+
+from core.metrics import (
+    CAPTURE_MS,
+    ENCODE_MS,
+    FORMAT_MS,
+    HOOK_P99_US,
+    QUEUE_DEPTH,
+    RENDER_MS,
+    REQUESTS_DROPPED,
+    TOKENS_PER_S,
+    TTFT_MS,
+    UPLOAD_BYTES,
+    WATCH_CPU_PERCENT,
+    metrics,
+)
+
+
+REFRESH_MS = 250
+
+
+class PerfHud(QLabel):
+    """One-line strip showing where the time went in the last request.
+
+    Hidden by default. It reads the shared metrics registry on a timer that
+    only runs while the strip is visible, so a hidden HUD costs nothing.
+    """
+
+    def __init__(self, parent: QWidget) -> None:
+        super().__init__(parent)
+        self.setStyleSheet("""
+            QLabel {
+                color: rgba(255, 255, 255, 0.65);
+                background-color: rgba(0, 0, 0, 0.35);
+                font-family: Consolas, monospace;
+                font-size: 10px;
+                padding: 2px 8px;
+            }
+        """)
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(REFRESH_MS)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.hide()
+
+    def toggle(self) -> None:
+        """Show or hide the HUD."""
+        self.setVisible(not self.isVisible())
+
+    def refresh(self) -> None:
+        """Redraw the strip from the current metrics."""
+        values = metrics.snapshot()
+
+        def ms(name: str) -> str:
+            """Format a millisecond value.
+
+            Args:
+                name (str): The metric name.
+
+            Returns:
+                str: The value, or "-" if not measured yet.
+            """
+            return f"{values[name]:.0f} ms" if name in values else "-"
+
+        def per_chunk(name: str) -> str:
+            """Format a per-chunk series as average / max.
+
+            Args:
+                name (str): The series name.
+
+            Returns:
+                str: The average and maximum, or "-" if no chunks were rendered yet.
+            """
+            if f"{name}_avg" not in values:
+                return "-"
+            return f"{values[f'{name}_avg']:.1f}/{values[f'{name}_max']:.1f} ms"
+
+        upload = f"{values[UPLOAD_BYTES] / 1024:.0f} KB" if UPLOAD_BYTES in values else "-"
+        speed = f"{values[TOKENS_PER_S]:.0f} tok/s" if TOKENS_PER_S in values else "-"
+        hook = f"{values[HOOK_P99_US]:.0f} µs" if HOOK_P99_US in values else "-"
+        queue = f"{values[QUEUE_DEPTH]:.0f} ({values.get(REQUESTS_DROPPED, 0):.0f} dropped)" if QUEUE_DEPTH in values else "-"
+        watch = f" · watch {values[WATCH_CPU_PERCENT]:.2f}% CPU" if WATCH_CPU_PERCENT in values else ""
+        self.setText(
+            f"capture {ms(CAPTURE_MS)} · encode {ms(ENCODE_MS)} · up {upload} · "
+            f"TTFT {ms(TTFT_MS)} · {speed} · fmt {per_chunk(FORMAT_MS)} · "
+            f"render {per_chunk(RENDER_MS)} · queue {queue} · hook p99 {hook}{watch}"
+        )
+
+    def showEvent(self, event: QShowEvent) -> None:
+        """Start refreshing while visible.
+
+        Args:
+            event (QShowEvent): The show event.
+        """
+        super().showEvent(event)
+        self.refresh()
+        self.refresh_timer.start()
+
+    def hideEvent(self, event: QHideEvent) -> None:
+        """Stop refreshing while hidden.
+
+        Args:
+            event (QHideEvent): The hide event.
+        """
+        super().hideEvent(event)
+        self.refresh_timer.stop()
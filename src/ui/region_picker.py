@@ -0,0 +1,105 @@
+from PyQt6.QtCore import QPoint, QRect, Qt, pyqtSignal
+from PyQt6.QtGui import QColor, QCursor, QGuiApplication, QKeyEvent, QMouseEvent, QPainter, QPen
+from PyQt6.QtWidgets import QWidget
+
+
+class RegionPicker(QWidget):
+    """Full-screen overlay for dragging out a capture region on the screen under the cursor.
+
+    The picked region is emitted in physical pixels so it can be handed
+    straight to mss. Pressing Escape or right-clicking cancels the pick.
+    """
+
+    region_selected = pyqtSignal(int, int, int, int)
+
+    DIM_COLOR = QColor(0, 0, 0, 90)
+    MIN_SIZE = 8  # Ignore accidental clicks that would produce a near-empty region
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.origin: QPoint | None = None
+        self.selection = QRect()
+
+        self.setWindowFlags(
+            Qt.WindowType.FramelessWindowHint |
+            Qt.WindowType.WindowStaysOnTopHint |
+            Qt.WindowType.Tool
+        )
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        self.setCursor(Qt.CursorShape.CrossCursor)
+
+        self.screen_ref = QGuiApplication.screenAt(QCursor.pos()) or QGuiApplication.primaryScreen()
+        self.setGeometry(self.screen_ref.geometry())
+
+    def start(self) -> None:
+        """Show the picker and grab keyboard focus."""
+        self.show()
+        self.raise_()
+        self.activateWindow()
+        self.setFocus()
+
+    def mousePressEvent(self, event: QMouseEvent) -> None:
+        """Begin a new selection, or cancel on right-click.
+
+        Args:
+            event (QMouseEvent): The mouse press event.
+        """
+        if event.button() == Qt.MouseButton.RightButton:
+            self.close()
+            return
+        self.origin = event.position().toPoint()
+        self.selection = QRect(self.origin, self.origin)
+        self.update()
+
+    def mouseMoveEvent(self, event: QMouseEvent) -> None:
+        """Grow the selection rectangle while dragging.
+
+        Args:
+            event (QMouseEvent): The mouse move event.
+        """
+        if self.origin is None:
+            return
+        self.selection = QRect(self.origin, event.position().toPoint()).normalized()
+        self.update()
+
+    def mouseReleaseEvent(self, _event: QMouseEvent) -> None:
+        """Finish the selection and emit it in physical pixels."""
+        if self.origin is None:
+            return
+        self.origin = None
+
+        if self.selection.width() >= self.MIN_SIZE and self.selection.height() >= self.MIN_SIZE:
+            origin = self.screen_ref.geometry().topLeft()
+            scale = self.screen_ref.devicePixelRatio()
+            self.region_selected.emit(
+                int(origin.x() + self.selection.left() * scale),
+                int(origin.y() + self.selection.top() * scale),
+                int(self.selection.width() * scale),
+                int(self.selection.height() * scale),
+            )
+        self.close()
+
+    def keyPressEvent(self, event: QKeyEvent) -> None:
+        """Cancel the pick on Escape.
+
+        Args:
+            event (QKeyEvent): The key press event.
+        """
+        if event.key() == Qt.Key.Key_Escape:
+            self.close()
+            return
+        super().keyPressEvent(event)
+
+    def paintEvent(self, _event) -> None:
+        """Dim the screen and cut out the current selection."""
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), self.DIM_COLOR)
+
+        if not self.selection.isEmpty():
+            # Nearly (not fully) transparent so the window keeps receiving mouse events over the selection
+            painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Source)
+            painter.fillRect(self.selection, QColor(0, 0, 0, 1))
+            painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceOver)
+            painter.setPen(QPen(QColor(255, 255, 255, 200), 1))
+            painter.drawRect(self.selection.adjusted(0, 0, -1, -1))
@@ -0,0 +1,101 @@
+import functools
+import os
+
+from PyQt6.QtGui import QFont, QIcon, QPixmap
+from PyQt6.QtWidgets import QApplication
+
+
+ASSETS_DIR = os.path.join(os.getcwd(), "src", "assets")
+
+# Object names that select the application-level styles below
+USER_BUBBLE = "user_bubble"
+BOT_BUBBLE = "bot_bubble"
+THUMBNAIL_REMOVE_BUTTON = "thumbnail_remove_button"
+SEARCH_HIT_PROPERTY = "search_hit"  # Dynamic property set on a bubble's label while it is highlighted
+
+# Styles for widgets created many times per session. Parsed once by Qt when installed on the
+# application; widgets opt in by object name instead of carrying their own style sheet
+APP_STYLESHEET = f"""
+    QLabel#{USER_BUBBLE} {{
+        color: rgba(255, 255, 255, 1.0);
+        background-color: transparent;
+        border: 1px solid rgba(255, 255, 255, 1.0);
+        border-radius: 8px;
+        padding: 5px 4px -3px 5px;  /* top, right, bottom, left; adjusted to visually center text within the bubble */
+    }}
+    QLabel#{BOT_BUBBLE} {{
+        color: rgba(255, 255, 255, 1.0);
+        background-color: transparent;
+        padding: 0px 0px 0px 1px;  /* top, right, bottom, left */
+    }}
+    QLabel#{USER_BUBBLE}[{SEARCH_HIT_PROPERTY}="true"], QLabel#{BOT_BUBBLE}[{SEARCH_HIT_PROPERTY}="true"] {{
+        background-color: rgba(255, 255, 255, 0.15);
+    }}
+    QPushButton#{THUMBNAIL_REMOVE_BUTTON} {{
+        background-color: rgba(20, 20, 20, 0.60);
+        color: rgba(255, 255, 255, 0.90);
+        border: none;
+        border-radius: 8px;
+        font-size: 14px;
+        font-weight: bold;
+        padding-bottom: 3px;
+    }}
+    QPushButton#{THUMBNAIL_REMOVE_BUTTON}:hover {{
+        background-color: rgba(255, 255, 255, 0.60);
+        color: rgba(20, 20, 20, 0.90);
+    }}
+"""
+
+
+def install_app_styles(app: QApplication) -> None:
+    """Install the shared application style sheet and preload the icons used on hover.
+
+    Args:
+        app (QApplication): The running application.
+    """
+    app.setStyleSheet(APP_STYLESHEET)
+    for name in ("clear_chat_button_light.png", "clear_chat_button_dark.png"):
+        icon(name)
+
+
+@functools.lru_cache(maxsize=None)
+def font(family: str, point_size: int) -> QFont:
+    """Return a shared font instance.
+
+    QFont is implicitly shared, so widgets calling setFont with the returned
+    font reuse its resolved data instead of each resolving a new font.
+
+    Args:
+        family (str): The font family.
+        point_size (int): The size in points.
+
+    Returns:
+        QFont: The interned font. Do not modify it; copy it first.
+    """
+    return QFont(family, point_size)
+
+
+@functools.lru_cache(maxsize=None)
+def icon(name: str) -> QIcon:
+    """Return an icon from the assets directory, loading it from disk only once.
+
+    Args:
+        name (str): The file name within src/assets.
+
+    Returns:
+        QIcon: The cached icon.
+    """
+    return QIcon(pixmap(name))
+
+
+@functools.lru_cache(maxsize=None)
+def pixmap(name: str) -> QPixmap:
+    """Return a pixmap from the assets directory, decoding it only once.
+
+    Args:
+        name (str): The file name within src/assets.
+
+    Returns:
+        QPixmap: The cached pixmap.
+    """
+    return QPixmap(os.path.join(ASSETS_DIR, name))
@@ -1,12 +1,18 @@
 from PyQt6.QtCore import QRectF, Qt, pyqtSignal
-from PyQt6.QtGui import QColor, QPainter, QPainterPath, QPen, QPixmap
+from PyQt6.QtGui import QColor, QImage, QPainter, QPainterPath, QPen, QPixmap
 from PyQt6.QtWidgets import QHBoxLayout, QPushButton, QWidget
 
+from core.capture_buffer import CaptureBuffer
+
+from . import resources
+from .thumbnail_loader import ThumbnailLoader
+
 
 PREVIEW_WIDTH = 80
 PREVIEW_HEIGHT = 45
 BTN_SIZE = 16
 BTN_OVERHANG = BTN_SIZE // 2  # X button slightly protrudes beyond the edge of the image
+PLACEHOLDER_COLOR = QColor(255, 255, 255, 25)
 
 
 class ScreenshotThumbnail(QWidget):
@@ -14,43 +20,33 @@ class ScreenshotThumbnail(QWidget):
 
     removed = pyqtSignal(str)
 
-    def __init__(self, path: str, screenshot_tray) -> None:
+    def __init__(self, name: str, screenshot_tray) -> None:
         super().__init__(screenshot_tray)
-        self.path = path
+        self.name = name  # Name of the CaptureBuffer shown
         # Extra BTN_OVERHANG pixels on top and right let the X button protrude outside the image
         self.setFixedSize(PREVIEW_WIDTH + BTN_OVERHANG, PREVIEW_HEIGHT + BTN_OVERHANG)
 
-        # Load and scale the image to fill the thumbnail dimensions
-        src = QPixmap(path)
-        self.pixmap = src.scaled(
-            PREVIEW_WIDTH, PREVIEW_HEIGHT,
-            Qt.AspectRatioMode.KeepAspectRatioByExpanding,
-            Qt.TransformationMode.SmoothTransformation,
-        ).copy(0, 0, PREVIEW_WIDTH, PREVIEW_HEIGHT)
+        # Placeholder is drawn until the background-scaled image arrives via set_image
+        self.pixmap: QPixmap | None = None
 
         # Remove attachment button in the top-right corner of the image with some overhang
         self.remove_btn = QPushButton("×", self)
         self.remove_btn.setFixedSize(BTN_SIZE, BTN_SIZE)
         self.remove_btn.move(PREVIEW_WIDTH - BTN_OVERHANG - 3, 3)
-        self.remove_btn.clicked.connect(lambda: self.removed.emit(self.path))
-        self.remove_btn.setStyleSheet("""
-            QPushButton {
-                background-color: rgba(20, 20, 20, 0.60);
-                color: rgba(255, 255, 255, 0.90);
-                border: none;
-                border-radius: 8px;
-                font-size: 14px;
-                font-weight: bold;
-                padding-bottom: 3px;
-            }
-            QPushButton:hover {
-                background-color: rgba(255, 255, 255, 0.60);
-                color: rgba(20, 20, 20, 0.90);
-            }
-        """)
+        self.remove_btn.clicked.connect(lambda: self.removed.emit(self.name))
+        self.remove_btn.setObjectName(resources.THUMBNAIL_REMOVE_BUTTON)  # Styled by the application style sheet
+
+    def set_image(self, image: QImage) -> None:
+        """Replace the placeholder with the finished thumbnail.
+
+        Args:
+            image (QImage): The thumbnail, already scaled to PREVIEW_WIDTH × PREVIEW_HEIGHT.
+        """
+        self.pixmap = QPixmap.fromImage(image)
+        self.update()
 
     def paintEvent(self, _event) -> None:
-        """Draw the thumbnail image clipped to rounded corners with a subtle border."""
+        """Draw the thumbnail image (or a placeholder) clipped to rounded corners with a subtle border."""
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
@@ -58,7 +54,10 @@ class ScreenshotThumbnail(QWidget):
         clip = QPainterPath()
         clip.addRoundedRect(0.0, float(BTN_OVERHANG), float(PREVIEW_WIDTH), float(PREVIEW_HEIGHT), 6.0, 6.0)
         painter.setClipPath(clip)
-        painter.drawPixmap(0, BTN_OVERHANG, self.pixmap)
+        if self.pixmap is not None:
+            painter.drawPixmap(0, BTN_OVERHANG, self.pixmap)
+        else:
+            painter.fillRect(0, BTN_OVERHANG, PREVIEW_WIDTH, PREVIEW_HEIGHT, PLACEHOLDER_COLOR)
 
         painter.setClipping(False)
         painter.setPen(QPen(QColor(255, 255, 255, 60), 1.0))
@@ -86,36 +85,64 @@ class ScreenshotTray(QWidget):
         self.setFixedHeight(PREVIEW_HEIGHT + BTN_OVERHANG + 6)
         self.setVisible(False)
 
+        self.thumbnail_loader = ThumbnailLoader(PREVIEW_WIDTH, PREVIEW_HEIGHT)
+        self.thumbnail_loader.thumbnail_ready.connect(self._on_thumbnail_ready)
         screenshot_manager.screenshot_added.connect(self._add_thumbnail)
 
-    def _add_thumbnail(self, path: str) -> None:
-        """Add a thumbnail for a newly captured screenshot.
+    def _add_thumbnail(self, buffer: CaptureBuffer) -> None:
+        """Add a placeholder thumbnail for a newly captured screenshot and scale its image in the background.
 
         Args:
-            path (str): The file path of the screenshot to display.
+            buffer (CaptureBuffer): The captured screenshot to display.
         """
-        thumb = ScreenshotThumbnail(path, self)
+        thumb = ScreenshotThumbnail(buffer.name, self)
         thumb.removed.connect(self._on_thumbnail_removed)
         self.layout().addWidget(thumb)
         self.setVisible(True)
         self.visibility_changed.emit()
+        self.thumbnail_loader.request(buffer)
 
-    def _on_thumbnail_removed(self, path: str) -> None:
-        """Handle removal of a single thumbnail and detach its path from pending screenshots.
+    def _on_thumbnail_ready(self, name: str, image: QImage) -> None:
+        """Hand a finished thumbnail image to its widget, if it is still in the tray.
 
         Args:
-            path (str): The file path of the screenshot being removed.
+            name (str): The name of the screenshot the image belongs to.
+            image (QImage): The scaled thumbnail image.
         """
-        self.screenshot_manager.remove_pending(path)
+        thumb = self._find_thumbnail(name)
+        if thumb is not None:
+            thumb.set_image(image)
+
+    def _find_thumbnail(self, name: str) -> ScreenshotThumbnail | None:
+        """Find the thumbnail widget for a screenshot.
+
+        Args:
+            name (str): The name of the screenshot.
 
+        Returns:
+            ScreenshotThumbnail | None: The matching thumbnail, or None if it has been removed.
+        """
         layout = self.layout()
         for i in range(layout.count()):
             item = layout.itemAt(i)
             widget = item.widget() if item else None
-            if isinstance(widget, ScreenshotThumbnail) and widget.path == path:
-                layout.removeWidget(widget)
-                widget.deleteLater()
-                break
+            if isinstance(widget, ScreenshotThumbnail) and widget.name == name:
+                return widget
+        return None
+
+    def _on_thumbnail_removed(self, name: str) -> None:
+        """Handle removal of a single thumbnail, releasing its screenshot from the pending list.
+
+        Args:
+            name (str): The name of the screenshot being removed.
+        """
+        self.screenshot_manager.remove_pending(name)
+
+        layout = self.layout()
+        widget = self._find_thumbnail(name)
+        if widget is not None:
+            layout.removeWidget(widget)
+            widget.deleteLater()
 
         if layout.count() == 0:
             self.setVisible(False)
@@ -0,0 +1,167 @@
+import html
+from datetime import datetime
+
+from PyQt6.QtCore import QEvent, QObject, Qt, pyqtSignal
+from PyQt6.QtWidgets import QLabel, QLineEdit, QListWidget, QListWidgetItem, QVBoxLayout, QWidget
+
+from core.chat_history import MATCH_END, MATCH_START, ChatHistory, StoredMessage
+
+from . import resources
+
+
+VISIBLE_RESULTS = 6  # Rows shown before the result list scrolls
+
+
+class SearchBar(QWidget):
+    """Search box over the chat history with a live list of matching messages.
+
+    Searches as you type (the last word is treated as a prefix). Up / Down
+    move through the results, Enter opens the selected one and Escape closes
+    the search.
+    """
+
+    message_selected = pyqtSignal(object)  # StoredMessage
+
+    PLACEHOLDER_TEXT = 'Search chat history ("phrase", prefix*, code:name)'
+
+    def __init__(self, chat_history: ChatHistory, parent: QWidget) -> None:
+        super().__init__(parent)
+        self.chat_history = chat_history
+        self.hits: list[StoredMessage] = []
+        self._initUI()
+        self.hide()
+
+    def _initUI(self) -> None:
+        """Initialize the search field and result list."""
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(12, 0, 12, 6)
+        layout.setSpacing(4)
+
+        self.search_field = QLineEdit()
+        self.search_field.setPlaceholderText(self.PLACEHOLDER_TEXT)
+        self.search_field.setFont(resources.font("Microsoft JhengHei", 10))
+        self.search_field.setMinimumHeight(28)
+        self.search_field.textChanged.connect(self._update_results)
+        self.search_field.installEventFilter(self)
+
+        self.result_list = QListWidget()
+        self.result_list.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+        self.result_list.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.result_list.itemActivated.connect(lambda _item: self._open_selected())
+        self.result_list.itemClicked.connect(lambda _item: self._open_selected())
+        self.result_list.hide()
+
+        self.setStyleSheet("""
+            QLineEdit {
+                background-color: rgba(255, 255, 255, 0.2);
+                color: rgba(255, 255, 255, 1.0);
+                border: 1px solid rgba(255, 255, 255, 0.8);
+                border-radius: 14px;
+                padding: 4px 10px;
+            }
+            QListWidget {
+                background-color: rgba(0, 0, 0, 0.45);
+                border: none;
+                border-radius: 6px;
+                outline: none;
+            }
+            QListWidget::item:selected {
+                background-color: rgba(255, 255, 255, 0.2);
+            }
+            QLabel {
+                color: rgba(255, 255, 255, 0.85);
+                background-color: transparent;
+                padding: 3px 6px;
+            }
+        """)
+
+        layout.addWidget(self.search_field)
+        layout.addWidget(self.result_list)
+
+    def open(self) -> None:
+        """Show the search bar and focus the search field."""
+        self.show()
+        self.search_field.setFocus()
+        self.search_field.selectAll()
+
+    def close_search(self) -> None:
+        """Hide the search bar and its results."""
+        self.hide()
+        self.result_list.hide()
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        """Route navigation keys typed in the search field to the result list.
+
+        Args:
+            watched (QObject): The object receiving the event.
+            event (QEvent): The event.
+
+        Returns:
+            bool: True if the event was handled here.
+        """
+        if watched is self.search_field and event.type() == QEvent.Type.KeyPress:
+            key = event.key()
+            if key == Qt.Key.Key_Escape:
+                self.close_search()
+                return True
+            if key in (Qt.Key.Key_Return, Qt.Key.Key_Enter):
+                self._open_selected()
+                return True
+            if key in (Qt.Key.Key_Down, Qt.Key.Key_Up) and self.hits:
+                step = 1 if key == Qt.Key.Key_Down else -1
+                row = max(0, min(len(self.hits) - 1, self.result_list.currentRow() + step))
+                self.result_list.setCurrentRow(row)
+                return True
+        return super().eventFilter(watched, event)
+
+    def _update_results(self, query: str) -> None:
+        """Run the query and list the hits.
+
+        Args:
+            query (str): The text in the search field.
+        """
+        try:
+            hits = self.chat_history.search(query, prefix_last=True)
+        except Exception as e:
+            print(f"Error searching chat history: {str(e)}")
+            hits = []
+
+        self.result_list.clear()
+        self.hits = [hit.message for hit in hits]
+        for hit in hits:
+            item = QListWidgetItem()
+            label = QLabel(self._format_hit(hit.message, hit.snippet))
+            label.setTextFormat(Qt.TextFormat.RichText)
+            item.setSizeHint(label.sizeHint())
+            self.result_list.addItem(item)
+            self.result_list.setItemWidget(item, label)
+
+        if self.hits:
+            self.result_list.setCurrentRow(0)
+            row_height = self.result_list.sizeHintForRow(0)
+            self.result_list.setFixedHeight(row_height * min(len(self.hits), VISIBLE_RESULTS) + 4)
+        self.result_list.setVisible(bool(self.hits))
+
+    def _format_hit(self, message: StoredMessage, snippet: str) -> str:
+        """Format one result row with the matched words in bold.
+
+        Args:
+            message (StoredMessage): The matching message.
+            snippet (str): The snippet from the index with matches marked.
+
+        Returns:
+            str: Rich text for the row.
+        """
+        sender = "You" if message.role == "user" else "AI"
+        when = datetime.fromtimestamp(message.created).strftime("%a %b %d %H:%M")
+        text = html.escape(" ".join(snippet.split()))  # Snippets from code span lines
+        text = text.replace(MATCH_START, "<b>").replace(MATCH_END, "</b>")
+        return f'<span style="color: rgba(255, 255, 255, 0.5);">{sender} · {when}</span>&nbsp;&nbsp;{text}'
+
+    def _open_selected(self) -> None:
+        """Emit the selected hit (or the first one) and close the search."""
+        if not self.hits:
+            return
+        row = max(0, self.result_list.currentRow())
+        self.message_selected.emit(self.hits[row])
+        self.close_search()
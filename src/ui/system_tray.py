@@ -1,11 +1,28 @@
 import os
 
-from PyQt6.QtGui import QAction, QIcon
+from PyQt6.QtGui import QAction, QActionGroup, QIcon
 from PyQt6.QtWidgets import QMenu, QSystemTrayIcon
 
+from core.capture_target import (
+    CURSOR_MONITOR,
+    FIXED_REGION,
+    OVERLAY_MONITOR,
+    PICKED_REGION,
+    PRIMARY_MONITOR,
+)
+
+
+CAPTURE_TARGET_LABELS = {
+    CURSOR_MONITOR: "Monitor Under Cursor",
+    OVERLAY_MONITOR: "Monitor Holding Overlay",
+    PRIMARY_MONITOR: "Primary Monitor",
+    FIXED_REGION: "Fixed Region (config.json)",
+    PICKED_REGION: "Picked Region",
+}
+
 
 class SystemTray(QSystemTrayIcon):
-    """System tray icon for toggling the main window and quitting the app."""
+    """System tray icon for toggling the main window, choosing the capture target and quitting the app."""
 
     def __init__(self, main_window, shortcut_manager) -> None:
         # Set icon
@@ -24,6 +41,8 @@ class SystemTray(QSystemTrayIcon):
         
         # Add actions to menu
         self.menu = QMenu()
+        self.menu.addMenu(self._build_capture_menu())
+        self.menu.addSeparator()
         self.menu.addAction(quit_action)
         
         # Set the context menu
@@ -33,6 +52,40 @@ class SystemTray(QSystemTrayIcon):
         self.activated.connect(self._on_tray_activated)
 
         self.show()
+
+    def _build_capture_menu(self) -> QMenu:
+        """Build the submenu for choosing what screenshots capture.
+
+        Returns:
+            QMenu: The capture target submenu.
+        """
+        screenshot_manager = self.main_window.screenshot_manager
+        self.capture_menu = QMenu("Capture")
+        self.capture_group = QActionGroup(self)
+        self.capture_group.setExclusive(True)
+
+        for target, label in CAPTURE_TARGET_LABELS.items():
+            action = QAction(label, self)
+            action.setCheckable(True)
+            action.setChecked(screenshot_manager.capture_target == target)
+            action.triggered.connect(lambda _checked, t=target: screenshot_manager.set_capture_target(t))
+            self.capture_group.addAction(action)
+            self.capture_menu.addAction(action)
+
+        self.capture_menu.addSeparator()
+        pick_action = QAction("Pick Region...", self)
+        pick_action.triggered.connect(self.main_window.pick_capture_region)
+        self.capture_menu.addAction(pick_action)
+
+        # Keep the check marks in sync when the target changes elsewhere (e.g. after picking a region)
+        self.capture_menu.aboutToShow.connect(self._sync_capture_menu)
+        return self.capture_menu
+
+    def _sync_capture_menu(self) -> None:
+        """Check the action matching the current capture target."""
+        current = self.main_window.screenshot_manager.capture_target
+        for action, target in zip(self.capture_group.actions(), CAPTURE_TARGET_LABELS):
+            action.setChecked(target == current)
     
     def _on_tray_activated(self, reason: QSystemTrayIcon.ActivationReason) -> None:
         """Handle system tray icon activation events.
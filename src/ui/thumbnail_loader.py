@@ -0,0 +1,55 @@
+import threading
+
+from PyQt6.QtCore import QObject, Qt, pyqtSignal
+from PyQt6.QtGui import QImage
+
+from core.capture_buffer import CaptureBuffer
+
+
+class ThumbnailLoader(QObject):
+    """Downscales captured frames into thumbnails on background threads.
+
+    Only the finished thumbnail crosses back to the UI thread, so capturing a
+    screenshot never decodes or scales a full-resolution image on it.
+    """
+
+    # Using threading instead of QThread due to compilation issues with Nuitka
+    thumbnail_ready = pyqtSignal(str, QImage)
+
+    def __init__(self, width: int, height: int) -> None:
+        super().__init__()
+        self.width = width
+        self.height = height
+
+    def request(self, buffer: CaptureBuffer) -> None:
+        """Start producing a thumbnail for a captured frame.
+
+        The loader holds its own reference to the buffer while scaling, so the
+        screenshot can be removed or sent in the meantime.
+
+        Args:
+            buffer (CaptureBuffer): The captured frame.
+        """
+        thread = threading.Thread(target=self._run, args=(buffer.retain(),), daemon=True)
+        thread.start()
+
+    def _run(self, buffer: CaptureBuffer) -> None:
+        """Scale the frame down to thumbnail size, emit the result and release the buffer.
+
+        Args:
+            buffer (CaptureBuffer): The captured frame, retained for this thread.
+        """
+        try:
+            # Wrap the capture buffer without copying; the scaled result owns its own pixels
+            image = QImage(buffer.pixels, buffer.width, buffer.height, buffer.width * 4, QImage.Format.Format_RGB32)
+            thumbnail = image.scaled(
+                self.width, self.height,
+                Qt.AspectRatioMode.KeepAspectRatioByExpanding,
+                Qt.TransformationMode.SmoothTransformation,
+            ).copy(0, 0, self.width, self.height)
+            self.thumbnail_ready.emit(buffer.name, thumbnail)
+
+        except Exception as e:
+            print(f"Error generating thumbnail: {str(e)}")
+        finally:
+            buffer.release()
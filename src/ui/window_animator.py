@@ -0,0 +1,125 @@
+import time
+
+from PyQt6.QtCore import QObject, QRect, Qt, QTimer, pyqtSignal
+from PyQt6.QtGui import QScreen
+from PyQt6.QtWidgets import QWidget
+
+from core.window_motion import WindowMotion
+
+
+class WindowAnimator(QObject):
+    """Animates a top-level window on the main thread towards an accumulated target position.
+
+    Repeated moves add to the current target instead of being dropped, and a
+    new target mid-flight bends the running motion rather than restarting it.
+    The frame timer runs only while the window is in motion.
+    """
+
+    move_finished = pyqtSignal()
+
+    STEPS_PER_SCREEN = 14  # One move step is 1/14 of the available screen size
+    SCREEN_EDGE_MARGIN = 2  # Always keep 2 pixels to screen edge to prevent setGeometry errors
+
+    def __init__(self, window: QWidget) -> None:
+        super().__init__()
+        self.window = window
+        self.motion = WindowMotion(window.x(), window.y())
+
+        # Screen geometry cache, refreshed when the window changes screens or the screen's work area changes
+        self.screen: QScreen | None = None
+        self.bounds = QRect()
+        self.step_x = 0
+        self.step_y = 0
+        self.frame_interval_ms = 8
+
+        self.frame_timer = QTimer(self)
+        self.frame_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.frame_timer.timeout.connect(self._on_frame)
+        self.last_frame_time = 0.0
+        self.frames = 0  # Frames rendered since construction, for benchmarks
+
+    @property
+    def is_animating(self) -> bool:
+        """Whether a move is in progress."""
+        return self.frame_timer.isActive()
+
+    def move_by_steps(self, steps_x: int, steps_y: int) -> None:
+        """Move the window by whole steps, adding to any move already in progress.
+
+        Args:
+            steps_x (int): Steps to the right (negative for left).
+            steps_y (int): Steps down (negative for up).
+        """
+        self._refresh_screen_cache()
+        if not self.is_animating:
+            self.motion.jump_to(self.window.x(), self.window.y())  # The window may have been moved by other means
+
+        target_x, target_y = self._clamp(
+            round(self.motion.target_x) + steps_x * self.step_x,
+            round(self.motion.target_y) + steps_y * self.step_y,
+        )
+        self.motion.retarget(target_x, target_y)
+        if not self.is_animating and not self.motion.is_settled:
+            self.last_frame_time = time.perf_counter()
+            self.frame_timer.start(self.frame_interval_ms)
+
+    def stop(self) -> None:
+        """Stop at the current position."""
+        self.frame_timer.stop()
+        self.motion.jump_to(self.window.x(), self.window.y())
+
+    def _on_frame(self) -> None:
+        """Advance the motion by the real elapsed time and move the window."""
+        now = time.perf_counter()
+        x, y = self.motion.step(now - self.last_frame_time)
+        self.last_frame_time = now
+        self.frames += 1
+
+        if x != self.window.x() or y != self.window.y():
+            self.window.move(x, y)
+        if self.motion.is_settled:
+            self.frame_timer.stop()
+            self.move_finished.emit()
+
+    def _refresh_screen_cache(self) -> None:
+        """Recompute bounds and step sizes if the window is on a different screen than last time."""
+        screen = self.window.screen()
+        if screen is self.screen:
+            return
+
+        if self.screen is not None:
+            self.screen.availableGeometryChanged.disconnect(self._on_available_geometry_changed)
+        self.screen = screen
+        screen.availableGeometryChanged.connect(self._on_available_geometry_changed)
+        self._on_available_geometry_changed(screen.availableGeometry())
+
+        refresh_rate = screen.refreshRate()
+        self.frame_interval_ms = max(4, round(1000 / refresh_rate)) if refresh_rate > 0 else 8
+
+    def _on_available_geometry_changed(self, geometry: QRect) -> None:
+        """Update the cached work area and step sizes.
+
+        Args:
+            geometry (QRect): The screen's new available geometry.
+        """
+        self.bounds = QRect(geometry)
+        self.step_x = geometry.width() // self.STEPS_PER_SCREEN
+        self.step_y = geometry.height() // self.STEPS_PER_SCREEN
+
+    def _clamp(self, x: int, y: int) -> tuple[int, int]:
+        """Keep a window position inside the cached screen work area.
+
+        Args:
+            x (int): Desired x-coordinate.
+            y (int): Desired y-coordinate.
+
+        Returns:
+            tuple[int, int]: The clamped position.
+        """
+        margin = self.SCREEN_EDGE_MARGIN
+        max_x = self.bounds.x() + self.bounds.width() - self.window.width() - margin
+        max_y = self.bounds.y() + self.bounds.height() - self.window.height() - margin
+        return (
+            max(self.bounds.x() + margin, min(x, max_x)),
+            max(self.bounds.y() + margin, min(y, max_y)),
+        )
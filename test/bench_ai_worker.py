@@ -0,0 +1,139 @@
+"""Measure how SDK-style work on a generation thread delays a hook-like thread, versus the same work in a worker process.
+
+Runs on any platform without Qt or the Gemini SDK. A "hook" thread wakes
+every millisecond and records how late it ran, like the keyboard hook proc
+waiting for the GIL. Meanwhile a simulated response is produced: base64-encoding
+an attachment and parsing SSE-style JSON chunks. This runs once on a thread in
+this process and once in a spawned worker process that streams chunks back over
+a pipe, as AIWorkerClient does, with the attachment handed over in shared
+memory.
+
+Usage:
+    python test/bench_ai_worker.py [attachment_mb]
+"""
+import base64
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from multiprocessing import shared_memory
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from core.ai_worker import _load_attachment  # noqa: E402
+
+CHUNKS = 400
+HOOK_INTERVAL_S = 0.001
+
+
+def simulate_response(attachment: bytes, on_chunk) -> None:
+    """Do the GIL-heavy part of a request: encode the attachment and parse streamed JSON chunks.
+
+    Args:
+        attachment (bytes): The attachment to encode.
+        on_chunk (Callable[[str], None]): Called with each parsed chunk's text.
+    """
+    base64.b64encode(attachment)
+    event = json.dumps({"candidates": [{"content": {"parts": [{"text": "word " * 40}]}}], "usageMetadata": {"x": list(range(200))}})
+    for _ in range(CHUNKS):
+        text = json.loads(event)["candidates"][0]["content"]["parts"][0]["text"]
+        on_chunk(text)
+
+
+def worker_main(connection, attachment_spec: tuple) -> None:
+    """Worker process: load the attachment, simulate the response and stream chunks back.
+
+    Args:
+        connection (Any): The worker's end of the pipe.
+        attachment_spec (tuple): An attachment spec as sent by AIWorkerClient.
+    """
+    data, _mime_type = _load_attachment(attachment_spec)
+    simulate_response(data, lambda text: connection.send(("chunk", text)))
+    connection.send(("done",))
+
+
+def measure_hook_lateness(work) -> list[float]:
+    """Run work while a thread wakes every millisecond, and record how late each wakeup was.
+
+    Args:
+        work (Callable[[], None]): The work to run on the calling thread's behalf.
+
+    Returns:
+        list[float]: Lateness of each wakeup in milliseconds.
+    """
+    lateness = []
+    stop = threading.Event()
+
+    def hook() -> None:
+        """Sleep in 1 ms steps and record the overshoot."""
+        while not stop.is_set():
+            start = time.perf_counter()
+            time.sleep(HOOK_INTERVAL_S)
+            lateness.append((time.perf_counter() - start - HOOK_INTERVAL_S) * 1000)
+
+    hook_thread = threading.Thread(target=hook)
+    hook_thread.start()
+    work()
+    stop.set()
+    hook_thread.join()
+    return sorted(lateness)
+
+
+def summarize(name: str, lateness: list[float], elapsed: float) -> None:
+    """Print lateness percentiles.
+
+    Args:
+        name (str): Scenario name.
+        lateness (list[float]): Sorted lateness samples in ms.
+        elapsed (float): Wall time of the work in seconds.
+    """
+    def p(q: float) -> float:
+        """Return the q-quantile of the lateness samples.
+
+        Args:
+            q (float): The quantile, between 0 and 1.
+
+        Returns:
+            float: The lateness in ms.
+        """
+        return lateness[min(len(lateness) - 1, int(len(lateness) * q))]
+
+    print(f"  {name:<28} wall {elapsed * 1000:7.1f} ms   hook lateness p50 {p(0.5):6.2f}  p99 {p(0.99):6.2f}  max {lateness[-1]:6.2f} ms")
+
+
+def run_in_worker(context, spec: tuple) -> None:
+    """Run the simulated response in a worker process and drain its chunks.
+
+    Args:
+        context (Any): The multiprocessing context.
+        spec (tuple): The attachment spec.
+    """
+    parent, child = context.Pipe()
+    process = context.Process(target=worker_main, args=(child, spec))
+    process.start()
+    child.close()
+    while parent.recv()[0] != "done":
+        pass
+    process.join()
+
+
+if __name__ == "__main__":
+    attachment_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 4.0
+    attachment = os.urandom(int(attachment_mb * 2**20))
+    context = multiprocessing.get_context("spawn")
+    run_in_worker(context, ("bytes", b"", "image/png"))  # Warm the OS file cache for the interpreter start
+
+    print(f"{CHUNKS} chunks, {attachment_mb:.0f} MB attachment")
+    start = time.perf_counter()
+    lateness = measure_hook_lateness(lambda: simulate_response(attachment, lambda _text: None))
+    summarize("generation thread", lateness, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    block = shared_memory.SharedMemory(create=True, size=len(attachment))
+    block.buf[:len(attachment)] = attachment
+    lateness = measure_hook_lateness(lambda: run_in_worker(context, ("shared", block.name, len(attachment), "image/png")))
+    summarize("worker process (incl. spawn)", lateness, time.perf_counter() - start)
+    block.close()
+    block.unlink()
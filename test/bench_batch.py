@@ -0,0 +1,79 @@
+"""Load-test headless batch mode against the local stand-in server.
+
+Writes a set of synthetic screenshots to a temporary directory, then sends
+them through BatchRunner with the OpenAI-compatible backend pointed at
+test/openai_stand_in.py, once per concurrency level. Reports requests per
+minute, p50/p90 time to first token and total time, and how many connections
+the server saw (about one per worker: each worker's backend keeps its
+connection across requests).
+
+Usage:
+    python test/bench_batch.py [--images 16] [--concurrency 1 2 4 8] [--first-token-ms 150] [--chunk-ms 20]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from openai_stand_in import RESPONSE, StandInServer  # noqa: E402
+from PyQt6.QtCore import QCoreApplication  # noqa: E402
+from PyQt6.QtGui import QColor, QImage  # noqa: E402
+
+from core.batch_runner import BatchRunner, find_items  # noqa: E402
+from core.metrics_store import percentile  # noqa: E402
+
+AI_CONFIG = {"worker_process": False, "backend": "openai", "model": "stand-in", "base_url": ""}
+
+
+def write_screenshots(directory: str, count: int) -> None:
+    """Write distinct 1280x800 screenshots with some structure for the PNG encoder.
+
+    Args:
+        directory (str): Where to write them.
+        count (int): Number of images.
+    """
+    for index in range(count):
+        image = QImage(1280, 800, QImage.Format.Format_RGB32)
+        image.fill(QColor(255, 255, 255))
+        for y in range(40, 800, 22):
+            for x in range(24, 24 + (y * 7 + index * 131) % 900, 9):
+                image.setPixelColor(x, y, QColor(40, 40, 40))
+        image.save(os.path.join(directory, f"problem{index:03}.png"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", type=int, default=16, help="Screenshots (one request each)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8], help="Concurrency levels to run")
+    parser.add_argument("--first-token-ms", type=float, default=150, help="Stand-in delay before the first chunk")
+    parser.add_argument("--chunk-ms", type=float, default=20, help="Stand-in delay between chunks")
+    args = parser.parse_args()
+
+    app = QCoreApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as directory:
+        write_screenshots(directory, args.images)
+        items = find_items(directory)
+        print(f"{len(items)} screenshots, stand-in first token {args.first_token_ms:g} ms, {args.chunk_ms:g} ms between chunks\n")
+        print(f"{'workers':>7} {'req/min':>8} {'TTFT p50':>9} {'TTFT p90':>9} {'total p50':>10} {'total p90':>10} {'conns':>6} {'errors':>7}")
+
+        for concurrency in args.concurrency:
+            server = StandInServer(0, args.first_token_ms, args.chunk_ms).start()
+            runner = BatchRunner(dict(AI_CONFIG, base_url=server.base_url), "Solve this.", concurrency)
+            start = time.perf_counter()
+            results = runner.run(items)
+            elapsed = time.perf_counter() - start
+            server.shutdown()
+
+            succeeded = [result for result in results if result.error is None and result.response == RESPONSE]
+            ttft = sorted(result.ttft_ms for result in succeeded)
+            total = sorted(result.total_ms for result in succeeded)
+            print(
+                f"{concurrency:>7} {len(results) / elapsed * 60:>8.0f} "
+                f"{percentile(ttft, 50):>7.0f}ms {percentile(ttft, 90):>7.0f}ms "
+                f"{percentile(total, 50):>8.0f}ms {percentile(total, 90):>8.0f}ms "
+                f"{server.connections:>6} {len(results) - len(succeeded):>7}"
+            )
@@ -0,0 +1,113 @@
+"""Check capture target resolution against synthetic monitor layouts and time it.
+
+Runs on any platform (no Windows, Qt or mss needed). Each case resolves a
+capture target against an mss-style monitor list and compares the result with
+the expected area: the cursor on a secondary monitor, monitors with negative
+origins (left of or above the primary), an overlay straddling two monitors,
+saved regions clamped across a monitor edge, and the primary-monitor
+fallbacks. Exits with status 1 if any case fails.
+
+Usage:
+    python test/bench_capture_target.py [--iterations 100000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from core.capture_target import (  # noqa: E402
+    CURSOR_MONITOR,
+    FIXED_REGION,
+    OVERLAY_MONITOR,
+    PICKED_REGION,
+    PRIMARY_MONITOR,
+    resolve_capture_area,
+)
+
+
+def area(left: int, top: int, width: int, height: int) -> dict[str, int]:
+    """Build an area in mss monitor format.
+
+    Args:
+        left (int): Left edge in physical pixels.
+        top (int): Top edge in physical pixels.
+        width (int): Width in physical pixels.
+        height (int): Height in physical pixels.
+
+    Returns:
+        dict[str, int]: The area.
+    """
+    return {"left": left, "top": top, "width": width, "height": height}
+
+
+def layout(*monitors: dict[str, int]) -> list[dict[str, int]]:
+    """Build an mss monitor list: the virtual screen spanning all monitors, then the monitors (primary first).
+
+    Args:
+        *monitors (dict[str, int]): The physical monitors.
+
+    Returns:
+        list[dict[str, int]]: The monitor list.
+    """
+    left = min(monitor["left"] for monitor in monitors)
+    top = min(monitor["top"] for monitor in monitors)
+    right = max(monitor["left"] + monitor["width"] for monitor in monitors)
+    bottom = max(monitor["top"] + monitor["height"] for monitor in monitors)
+    return [area(left, top, right - left, bottom - top), *monitors]
+
+
+PRIMARY = area(0, 0, 1920, 1080)
+SECONDARY = area(1920, -200, 2560, 1440)  # Right of the primary, top edge above it
+LEFT = area(-1280, 0, 1280, 1024)  # Left of the primary: negative x origin
+ABOVE = area(0, -1080, 1920, 1080)  # Above the primary: negative y origin
+
+THREE_MONITORS = layout(PRIMARY, SECONDARY, LEFT)
+STACKED = layout(PRIMARY, ABOVE)
+
+# (description, target, monitors, cursor_pos, overlay_rect, region, expected area)
+CASES = [
+    ("cursor on secondary", CURSOR_MONITOR, THREE_MONITORS, (3000, 500), None, None, SECONDARY),
+    ("cursor above primary top on secondary", CURSOR_MONITOR, THREE_MONITORS, (2000, -150), None, None, SECONDARY),
+    ("cursor on negative-x monitor", CURSOR_MONITOR, THREE_MONITORS, (-1, 10), None, None, LEFT),
+    ("cursor on negative-y monitor", CURSOR_MONITOR, STACKED, (100, -1), None, None, ABOVE),
+    ("cursor on primary edge", CURSOR_MONITOR, THREE_MONITORS, (1919, 1079), None, None, PRIMARY),
+    ("cursor in dead zone falls back to primary", CURSOR_MONITOR, THREE_MONITORS, (-100, 1050), None, None, PRIMARY),
+    ("cursor unknown falls back to primary", CURSOR_MONITOR, THREE_MONITORS, None, None, None, PRIMARY),
+    ("overlay mostly on secondary", OVERLAY_MONITOR, THREE_MONITORS, None, area(1800, 100, 400, 600), None, SECONDARY),
+    ("overlay mostly on negative-x monitor", OVERLAY_MONITOR, THREE_MONITORS, None, area(-300, 100, 400, 600), None, LEFT),
+    ("overlay off-screen falls back to primary", OVERLAY_MONITOR, THREE_MONITORS, None, area(9000, 9000, 400, 600), None, PRIMARY),
+    ("primary monitor", PRIMARY_MONITOR, THREE_MONITORS, (3000, 500), None, None, PRIMARY),
+    ("region inside secondary", FIXED_REGION, THREE_MONITORS, None, None, area(2000, -100, 800, 600), area(2000, -100, 800, 600)),
+    ("region across right edge is clamped", FIXED_REGION, THREE_MONITORS, None, None, area(4000, 0, 800, 600), area(4000, 0, 480, 600)),
+    ("region across negative-x edge is clamped", PICKED_REGION, THREE_MONITORS, None, None, area(-1500, 100, 600, 400), area(-1280, 100, 380, 400)),
+    ("region across negative-y edge is clamped", PICKED_REGION, STACKED, None, None, area(100, -1200, 500, 400), area(100, -1080, 500, 280)),
+    ("region spanning two monitors is kept whole", FIXED_REGION, THREE_MONITORS, None, None, area(1700, 0, 500, 300), area(1700, 0, 500, 300)),
+    ("region off-screen falls back to primary", FIXED_REGION, THREE_MONITORS, None, None, area(9000, 9000, 100, 100), PRIMARY),
+    ("empty region falls back to primary", FIXED_REGION, THREE_MONITORS, None, None, area(10, 10, 0, 100), PRIMARY),
+    ("no saved region falls back to primary", PICKED_REGION, THREE_MONITORS, None, None, None, PRIMARY),
+    ("virtual screen only", CURSOR_MONITOR, [area(0, 0, 1920, 1080)], (10, 10), None, None, area(0, 0, 1920, 1080)),
+]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=100_000, help="Resolutions per case for the timing")
+    args = parser.parse_args()
+
+    failures = 0
+    width = max(len(case[0]) for case in CASES)
+    for description, target, monitors, cursor_pos, overlay_rect, region, expected in CASES:
+        result = resolve_capture_area(target, monitors, cursor_pos, overlay_rect, region)
+        passed = result == expected
+        failures += not passed
+        print(f"{'ok  ' if passed else 'FAIL'} {description:<{width}}  {result}" + ("" if passed else f" (expected {expected})"))
+
+    start = time.perf_counter()
+    for _ in range(args.iterations):
+        for _description, target, monitors, cursor_pos, overlay_rect, region, _expected in CASES:
+            resolve_capture_area(target, monitors, cursor_pos, overlay_rect, region)
+    elapsed = time.perf_counter() - start
+    print(f"\n{len(CASES) - failures}/{len(CASES)} cases passed; {elapsed / (args.iterations * len(CASES)) * 1e6:.2f} us per resolution")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,130 @@
+"""Measure chat bubble creation cost with shared application styles versus per-bubble style sheets.
+
+Uses the offscreen Qt platform, so it runs without a display. Each round
+creates user and bot bubbles inside a container, lays them out and polishes
+them the way ChatArea does, then deletes them.
+
+Usage:
+    python test/bench_chat_bubble.py [bubble_count]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))  # Asset paths are relative to the repo root
+
+from PyQt6.QtCore import Qt  # noqa: E402
+from PyQt6.QtGui import QFont, QIcon  # noqa: E402
+from PyQt6.QtWidgets import QApplication, QHBoxLayout, QLabel, QVBoxLayout, QWidget  # noqa: E402
+
+from ui import resources  # noqa: E402
+from ui.chat_bubble import ChatBubble  # noqa: E402
+
+USER_SHEET = """
+    QLabel {
+        color: rgba(255, 255, 255, 1.0);
+        background-color: transparent;
+        border: 1px solid rgba(255, 255, 255, 1.0);
+        border-radius: 8px;
+        padding: 5px 4px -3px 5px;
+    }
+"""
+BOT_SHEET = """
+    QLabel {
+        color: rgba(255, 255, 255, 1.0);
+        background-color: transparent;
+        padding: 0px 0px 0px 1px;
+    }
+"""
+
+
+class LegacyChatBubble(QWidget):
+    """The previous bubble construction: a new QFont and a per-instance style sheet for every bubble."""
+
+    def __init__(self, message: str, is_user: bool = False) -> None:
+        super().__init__()
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(10, 5, 10, 5)
+        self.message_label = QLabel(f'<div style="line-height: 1.4; white-space: pre-wrap;">{message}</div>')
+        self.message_label.setTextFormat(Qt.TextFormat.RichText)
+        self.message_label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        self.message_label.setFont(QFont("Helvetica", 11))
+        if is_user:
+            self.message_label.setStyleSheet(USER_SHEET)
+            natural_width = self.message_label.sizeHint().width()
+            if natural_width > 400:
+                self.message_label.setFixedWidth(400)
+                self.message_label.setWordWrap(True)
+            else:
+                self.message_label.setFixedWidth(natural_width)
+            layout.addStretch()
+            layout.addWidget(self.message_label)
+        else:
+            self.message_label.setStyleSheet(BOT_SHEET)
+            self.message_label.setWordWrap(True)
+            self.message_label.setFixedWidth(515)
+            layout.addWidget(self.message_label)
+            layout.addStretch()
+        layout.setSpacing(0)
+
+
+def run_round(app: QApplication, bubble_class: type, count: int) -> float:
+    """Create, lay out and delete a batch of bubbles.
+
+    Args:
+        app (QApplication): The application.
+        bubble_class (type): ChatBubble or LegacyChatBubble.
+        count (int): Number of bubbles (alternating user and bot).
+
+    Returns:
+        float: Microseconds per bubble.
+    """
+    container = QWidget()
+    container.setFixedWidth(550)
+    layout = QVBoxLayout(container)
+    start = time.perf_counter()
+    for i in range(count):
+        layout.addWidget(bubble_class(f"Message {i}: how does the sliding window work here?", is_user=i % 2 == 0))
+    container.show()
+    app.processEvents()  # Polish, lay out and paint like the chat area does
+    elapsed = time.perf_counter() - start
+    container.deleteLater()
+    app.processEvents()
+    return elapsed / count * 1_000_000
+
+
+def hover_cost(count: int) -> tuple[float, float]:
+    """Compare building the hover icon from disk with reusing the preloaded one.
+
+    Args:
+        count (int): Number of simulated hovers.
+
+    Returns:
+        tuple[float, float]: Microseconds per hover from disk and from the cache.
+    """
+    path = os.path.join(resources.ASSETS_DIR, "clear_chat_button_dark.png")
+    start = time.perf_counter()
+    for _ in range(count):
+        QIcon(path).pixmap(14, 14)
+    from_disk = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(count):
+        resources.icon("clear_chat_button_dark.png").pixmap(14, 14)
+    cached = time.perf_counter() - start
+    return from_disk / count * 1_000_000, cached / count * 1_000_000
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    app = QApplication(sys.argv)
+    resources.install_app_styles(app)
+
+    for name, bubble_class in (("per-bubble", LegacyChatBubble), ("shared", ChatBubble)):
+        run_round(app, bubble_class, count)  # Warm up
+        timings = sorted(run_round(app, bubble_class, count) for _ in range(5))
+        print(f"{name:<11} bubbles={count}  median={timings[2]:8.1f} us/bubble  best={timings[0]:8.1f} us/bubble")
+
+    from_disk, cached = hover_cost(500)
+    print(f"hover icon  from disk={from_disk:8.1f} us  preloaded={cached:8.1f} us")
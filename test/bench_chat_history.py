@@ -0,0 +1,100 @@
+"""Measure chat history insert and search latency over a large generated history.
+
+Runs on any platform (no Qt needed). Fills a scratch database with
+conversations of alternating questions and markdown answers with code blocks,
+then times the queries the search box runs: plain words, as-you-type
+prefixes, phrases and code: filters.
+
+Usage:
+    python test/bench_chat_history.py [message_count]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from core.chat_history import ChatHistory  # noqa: E402
+
+TOPICS = [
+    "sliding window", "two pointers", "binary search", "linked list", "priority queue", "dynamic programming",
+    "union find", "topological sort", "prefix sum", "monotonic stack", "trie", "backtracking",
+]
+WORDS = (
+    "the array is scanned once and each element is compared with the current best answer so the total "
+    "time is linear while the extra space stays constant because only a few counters are kept"
+).split()
+IDENTIFIERS = ["left", "right", "window", "count", "seen", "heap", "memo", "parent", "graph", "result"]
+QUERIES = [
+    "sliding window",
+    "slid",
+    "monotonic sta",
+    '"prefix sum"',
+    "code:heapq",
+    "code:max_window",
+    "window code:left",
+    "nonexistentword",
+]
+
+
+def make_message(rng: random.Random, topic: str, is_user: bool) -> str:
+    """Generate a question or a markdown answer about a topic.
+
+    Args:
+        rng (random.Random): The random source.
+        topic (str): The algorithm topic.
+        is_user (bool): Whether to generate a user question.
+
+    Returns:
+        str: The message text.
+    """
+    if is_user:
+        return f"How do I solve this with a {topic}? " + " ".join(rng.choices(WORDS, k=15))
+    name = f"max_{rng.choice(IDENTIFIERS)}"
+    body = "\n".join(f"    {rng.choice(IDENTIFIERS)} = {rng.choice(IDENTIFIERS)} + 1" for _ in range(8))
+    return (
+        f"Use a **{topic}**. " + " ".join(rng.choices(WORDS, k=60)) + "\n\n"
+        f"```python\nimport heapq\n\ndef {name}(nums):\n{body}\n    return result\n```\n\n"
+        f"The `{name}` function runs in O(n) time. " + " ".join(rng.choices(WORDS, k=30))
+    )
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 30_000
+    rng = random.Random(0)
+
+    with tempfile.TemporaryDirectory() as directory:
+        history = ChatHistory(os.path.join(directory, "history.db"))
+        insert_ms = []
+        start = time.perf_counter()
+        for index in range(count):
+            if index % 12 == 0:
+                history.start_conversation()
+                topic = rng.choice(TOPICS)
+            message_start = time.perf_counter()
+            history.add_message("user" if index % 2 == 0 else "assistant", make_message(rng, topic, index % 2 == 0))
+            insert_ms.append((time.perf_counter() - message_start) * 1000)
+        total = time.perf_counter() - start
+        insert_ms.sort()
+        size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+        print(
+            f"{count} messages in {total:.1f} s; insert p50 {insert_ms[len(insert_ms) // 2]:.2f} ms, "
+            f"p99 {insert_ms[int(len(insert_ms) * 0.99)]:.2f} ms; database {size / 2**20:.1f} MB"
+        )
+
+        for query in QUERIES:
+            timings = []
+            for _ in range(20):
+                query_start = time.perf_counter()
+                hits = history.search(query, prefix_last=True)
+                timings.append((time.perf_counter() - query_start) * 1000)
+            timings.sort()
+            print(f"  {query:<22} hits={len(hits):3}  median {timings[len(timings) // 2]:6.2f} ms  max {timings[-1]:6.2f} ms")
+
+        conversation = hits[0].message.conversation if hits else history.conversation - 1
+        load_start = time.perf_counter()
+        messages = history.get_conversation(conversation)
+        print(f"  load conversation ({len(messages)} messages)  {(time.perf_counter() - load_start) * 1000:6.2f} ms")
+        history.close()
@@ -0,0 +1,153 @@
+"""Measure request latency with cold, idle-expired, pooled and pre-warmed connections against a local TLS server.
+
+Starts a stand-in HTTPS server on localhost with a self-signed certificate
+(generated with the openssl CLI) that adds a configurable round-trip delay:
+three RTTs for a new connection (TCP + TLS) and one RTT per request. The
+pooled client uses the same httpx arguments as AISender.
+
+Usage:
+    python test/bench_connection_prewarm.py [rtt_ms] [idle_s]
+"""
+import os
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from core.ai_sender import http_client_args  # noqa: E402
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Answer every GET with a small JSON body after one simulated round trip."""
+
+    protocol_version = "HTTP/1.1"  # Keep-alive
+    disable_nagle_algorithm = True  # Headers and body are written separately; avoid delayed-ACK stalls
+
+    def do_GET(self) -> None:
+        """Send a small JSON response."""
+        time.sleep(self.server.rtt)
+        body = b'{"name": "models/stand-in"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args) -> None:
+        """Keep the benchmark output clean."""
+
+
+class StandInServer(ThreadingHTTPServer):
+    """TLS server that charges three round trips for every new connection."""
+
+    daemon_threads = True
+
+    def __init__(self, context: ssl.SSLContext, rtt: float) -> None:
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.context = context
+        self.rtt = rtt
+        self.connections = 0
+
+    def get_request(self) -> tuple:
+        """Accept a connection, simulate TCP and TLS round trips, and wrap it in TLS.
+
+        Returns:
+            tuple: The TLS socket and client address.
+        """
+        sock, address = self.socket.accept()
+        self.connections += 1
+        time.sleep(3 * self.rtt)
+        return self.context.wrap_socket(sock, server_side=True), address
+
+
+def make_certificate(directory: str) -> tuple[str, str]:
+    """Generate a self-signed certificate for 127.0.0.1.
+
+    Args:
+        directory (str): Where to write the files.
+
+    Returns:
+        tuple[str, str]: Paths of the certificate and private key.
+    """
+    cert = os.path.join(directory, "cert.pem")
+    key = os.path.join(directory, "key.pem")
+    subprocess.run(
+        [
+            "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+            "-keyout", key, "-out", cert, "-subj", "/CN=127.0.0.1", "-addext", "subjectAltName=IP:127.0.0.1",
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return cert, key
+
+
+def timed_get(client: httpx.Client, url: str) -> float:
+    """Time one request.
+
+    Args:
+        client (httpx.Client): The client to use.
+        url (str): The URL to fetch.
+
+    Returns:
+        float: Latency in milliseconds.
+    """
+    start = time.perf_counter()
+    client.get(url).raise_for_status()
+    return (time.perf_counter() - start) * 1000
+
+
+if __name__ == "__main__":
+    rtt_ms = float(sys.argv[1]) if len(sys.argv) > 1 else 40.0
+    idle_s = float(sys.argv[2]) if len(sys.argv) > 2 else 6.0
+
+    with tempfile.TemporaryDirectory() as directory:
+        cert, key = make_certificate(directory)
+        server_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        server_context.load_cert_chain(cert, key)
+        server = StandInServer(server_context, rtt_ms / 1000)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"https://127.0.0.1:{server.server_address[1]}/v1beta/models/stand-in"
+        client_context = ssl.create_default_context(cafile=cert)
+
+        results = {}
+
+        # Cold: a fresh client per request, as on the first request after launch
+        with httpx.Client(verify=client_context) as client:
+            results["cold (new connection)"] = timed_get(client, url)
+
+        # Pooled, back to back
+        with httpx.Client(verify=client_context, **http_client_args()) as client:
+            timed_get(client, url)
+            results["pooled, back to back"] = timed_get(client, url)
+
+        # After an idle gap: httpx defaults (5 s keep-alive) versus AISender's pool
+        with httpx.Client(verify=client_context) as client:
+            timed_get(client, url)
+            time.sleep(idle_s)
+            results[f"httpx defaults, {idle_s:.0f} s idle"] = timed_get(client, url)
+        with httpx.Client(verify=client_context, **http_client_args()) as client:
+            timed_get(client, url)
+            time.sleep(idle_s)
+            results[f"AISender pool, {idle_s:.0f} s idle"] = timed_get(client, url)
+
+        # Pre-warmed: warm-up starts on overlay show, the send follows while the user types
+        with httpx.Client(verify=client_context, **http_client_args()) as client:
+            warm = threading.Thread(target=timed_get, args=(client, url))
+            warm.start()
+            time.sleep(0.3)
+            warm.join()
+            results["pre-warmed on show"] = timed_get(client, url)
+
+        server.shutdown()
+
+    print(f"stand-in TLS server: rtt={rtt_ms:.0f} ms, connections opened={server.connections}")
+    for name, latency in results.items():
+        print(f"  {name:<28} {latency:8.1f} ms")
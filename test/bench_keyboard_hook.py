@@ -0,0 +1,234 @@
+"""Replay synthetic key events through the low-level keyboard hook proc using a fake Win32 layer.
+
+Runs on any platform (no Windows or Qt needed) and compares the compiled-table
+hook against the previous per-keystroke GetAsyncKeyState + dict lookup path.
+Then checks that a hotkey still fires after the hook missed the modifier
+key-ups of Ctrl+Alt+Del, and exits with status 1 if it does not.
+
+Usage:
+    python test/bench_keyboard_hook.py [event_count]
+"""
+import ctypes
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from core.keyboard_hook import KeyboardHook, compile_hotkey_table  # noqa: E402
+from core.win32_hook import (  # noqa: E402
+    HOOKPROC,
+    KBDLLHOOKSTRUCT,
+    MOD_ALT,
+    MOD_CTRL,
+    MOD_SHIFT,
+    MODIFIER_BITS,
+    MODIFIER_VK_CODES,
+    VK_CONTROL,
+    VK_LCONTROL,
+    VK_LEFT,
+    VK_LMENU,
+    VK_LSHIFT,
+    VK_MENU,
+    VK_SHIFT,
+    WM_KEYDOWN,
+    WM_KEYUP,
+    get_active_modifiers,
+)
+
+VK_DELETE = 0x2E
+
+
+class FakeUser32():
+    """Minimal stand-in for user32 that tracks key state from replayed events."""
+
+    def __init__(self) -> None:
+        self.key_state: set[int] = set()
+        self.async_key_state_calls = 0
+
+    def CallNextHookEx(self, _hook: int, _code: int, _wparam: int, _lparam: int) -> int:
+        """Pass the event on (no other hooks installed).
+
+        Returns:
+            int: Always 0.
+        """
+        return 0
+
+    def GetAsyncKeyState(self, vk_code: int) -> int:
+        """Report whether a generic modifier is held.
+
+        Args:
+            vk_code (int): VK_CONTROL, VK_MENU or VK_SHIFT.
+
+        Returns:
+            int: A negative value (high bit set) if the modifier is held, else 0.
+        """
+        self.async_key_state_calls += 1
+        generic = {VK_CONTROL: MOD_CTRL, VK_MENU: MOD_ALT, VK_SHIFT: MOD_SHIFT}[vk_code]
+        return -0x8000 if any(MODIFIER_BITS[vk] == generic for vk in self.key_state) else 0
+
+    def PostThreadMessageW(self, *_args: int) -> int:
+        """Accept thread messages.
+
+        Returns:
+            int: Always 1 (success).
+        """
+        return 1
+
+
+def build_events(count: int) -> list[tuple[int, int]]:
+    """Generate a realistic mix of plain typing, shifted letters and occasional hotkeys.
+
+    Args:
+        count (int): Approximate number of key events.
+
+    Returns:
+        list[tuple[int, int]]: (message, vk_code) pairs.
+    """
+    rng = random.Random(42)
+    events = []
+    while len(events) < count:
+        roll = rng.random()
+        letter = rng.choice(range(ord("A"), ord("Z") + 1))
+        if roll < 0.90:
+            events += [(WM_KEYDOWN, letter), (WM_KEYUP, letter)]
+        elif roll < 0.98:
+            events += [(WM_KEYDOWN, VK_LSHIFT), (WM_KEYDOWN, letter), (WM_KEYUP, letter), (WM_KEYUP, VK_LSHIFT)]
+        else:
+            key = rng.choice([ord("D"), ord("N"), VK_LEFT])
+            events += [(WM_KEYDOWN, VK_LCONTROL), (WM_KEYDOWN, key), (WM_KEYUP, key), (WM_KEYUP, VK_LCONTROL)]
+    return events
+
+
+def make_legacy_proc(fake: FakeUser32, always_active: dict, main_window: dict) -> HOOKPROC:
+    """Recreate the previous hook proc: three GetAsyncKeyState calls and two dict probes per keystroke.
+
+    Args:
+        fake (FakeUser32): The fake Win32 layer.
+        always_active (dict): Always-active hotkeys.
+        main_window (dict): Hotkeys that require a visible window.
+
+    Returns:
+        HOOKPROC: The legacy hook proc as a C callback.
+    """
+    def is_visible() -> bool:
+        """Stand in for main_window.isVisible().
+
+        Returns:
+            bool: Always True.
+        """
+        return True
+
+    def proc(nCode: int, wParam: int, lParam: int) -> int:
+        """Match one key event using the legacy path.
+
+        Args:
+            nCode (int): Hook code.
+            wParam (int): Keyboard message.
+            lParam (int): Address of the KBDLLHOOKSTRUCT.
+
+        Returns:
+            int: 1 to suppress, or the CallNextHookEx result.
+        """
+        if nCode >= 0:
+            kb = ctypes.cast(lParam, ctypes.POINTER(KBDLLHOOKSTRUCT)).contents
+            vk_code = kb.vkCode
+            if vk_code not in MODIFIER_VK_CODES:
+                key = (get_active_modifiers(fake), vk_code)
+                entry = always_active.get(key)
+                if entry is None and is_visible():
+                    entry = main_window.get(key)
+                if entry is not None and wParam == WM_KEYDOWN:
+                    entry[0]()
+                    return 1
+        return fake.CallNextHookEx(None, nCode, wParam, lParam)
+
+    return HOOKPROC(proc)
+
+
+def replay(proc: HOOKPROC, fake: FakeUser32, events: list[tuple[int, int]]) -> tuple[float, list[int]]:
+    """Feed events through a hook proc, timing each call.
+
+    Args:
+        proc (HOOKPROC): The hook proc to drive.
+        fake (FakeUser32): The fake Win32 layer whose key state follows the replay.
+        events (list[tuple[int, int]]): (message, vk_code) pairs.
+
+    Returns:
+        tuple[float, list[int]]: Total seconds, and per-event durations in nanoseconds.
+    """
+    kb = KBDLLHOOKSTRUCT()
+    address = ctypes.addressof(kb)
+    durations = []
+    start = time.perf_counter()
+    for message, vk_code in events:
+        if message == WM_KEYDOWN:
+            fake.key_state.add(vk_code)
+        else:
+            fake.key_state.discard(vk_code)
+        kb.vkCode = vk_code
+        t0 = time.perf_counter_ns()
+        proc(0, message, address)
+        durations.append(time.perf_counter_ns() - t0)
+    return time.perf_counter() - start, durations
+
+
+def report(name: str, total: float, durations: list[int], fake: FakeUser32) -> None:
+    """Print a summary line for one replay.
+
+    Args:
+        name (str): Label of the hook implementation.
+        total (float): Total replay time in seconds.
+        durations (list[int]): Per-event durations in nanoseconds.
+        fake (FakeUser32): The fake Win32 layer (for syscall counts).
+    """
+    ordered = sorted(durations)
+    p50 = ordered[len(ordered) // 2]
+    p99 = ordered[int(len(ordered) * 0.99)]
+    print(
+        f"{name:<10} events={len(durations):>7}  total={total * 1000:8.1f} ms  "
+        f"p50={p50 / 1000:6.2f} us  p99={p99 / 1000:6.2f} us  "
+        f"GetAsyncKeyState calls={fake.async_key_state_calls}"
+    )
+
+
+if __name__ == "__main__":
+    event_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    events = build_events(event_count)
+    hits = []
+    always_active = {(MOD_CTRL, ord("E")): (lambda: hits.append("E"), False)}
+    main_window = {
+        (MOD_CTRL, ord("D")): (lambda: hits.append("D"), False),
+        (MOD_CTRL, ord("N")): (lambda: hits.append("N"), False),
+        (MOD_CTRL | MOD_ALT, VK_LEFT): (lambda: hits.append("L"), True),
+    }
+
+    legacy_fake = FakeUser32()
+    total, durations = replay(make_legacy_proc(legacy_fake, always_active, main_window), legacy_fake, events)
+    legacy_hits = len(hits)
+    report("legacy", total, durations, legacy_fake)
+
+    hits.clear()
+    fake = FakeUser32()
+    hook = KeyboardHook(compile_hotkey_table(always_active, main_window), user32_dll=fake)
+    hook.set_window_visible(True)
+    total, durations = replay(hook.hook_proc_ref, fake, events)
+    hook.run_pending()  # Callbacks are queued by the hook proc and run by the owner thread
+    report("compiled", total, durations, fake)
+    print(f"hook proc histogram: {hook.proc_histogram.summary()}")
+
+    print(f"hotkeys fired: legacy={legacy_hits} compiled={len(hits)}")
+
+    # Ctrl+Alt+Del switches to the secure desktop, so the hook sees the key-downs but never the key-ups
+    hits.clear()
+    fake = FakeUser32()
+    hook = KeyboardHook(compile_hotkey_table(always_active, {}), user32_dll=fake)
+    replay(hook.hook_proc_ref, fake, [(WM_KEYDOWN, VK_LCONTROL), (WM_KEYDOWN, VK_LMENU), (WM_KEYDOWN, VK_DELETE)])
+    fake.key_state.clear()
+    stale_mask = hook.modifier_mask
+    replay(hook.hook_proc_ref, fake, [(WM_KEYDOWN, VK_LCONTROL), (WM_KEYDOWN, ord("E")), (WM_KEYUP, ord("E")), (WM_KEYUP, VK_LCONTROL)])
+    hook.run_pending()
+    recovered = hits == ["E"] and hook.modifier_mask == 0
+    print(f"missed Ctrl+Alt+Del key-ups: stale mask={stale_mask}  Ctrl+E fired={hits == ['E']}  mask after={hook.modifier_mask}")
+    sys.exit(0 if recovered else 1)
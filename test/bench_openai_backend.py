@@ -0,0 +1,87 @@
+"""Exercise the OpenAI-compatible backend against the local stand-in server.
+
+Streams several turns through OpenAISender and reports time to first token,
+total time, how many connections the server saw (warm-up and every request
+should share one), that screenshots arrive as image parts and the
+conversation is resent, and how quickly a cancelled stream returns and is
+dropped by the server.
+
+Usage:
+    python test/bench_openai_backend.py [--first-token-ms 150] [--chunk-ms 20] [--turns 3]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from openai_stand_in import RESPONSE, StandInServer  # noqa: E402
+
+from core.metrics import TOKENS_PER_S, TTFT_MS, metrics  # noqa: E402
+from core.openai_sender import OpenAISender  # noqa: E402
+
+PNG_1X1 = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360f8cfc0f01f0005000201a2"
+    "5dd3e50000000049454e44ae426082"
+)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--first-token-ms", type=float, default=150, help="Stand-in delay before the first chunk")
+    parser.add_argument("--chunk-ms", type=float, default=20, help="Stand-in delay between chunks")
+    parser.add_argument("--turns", type=int, default=3, help="Turns to stream")
+    args = parser.parse_args()
+
+    server = StandInServer(0, args.first_token_ms, args.chunk_ms).start()
+    sender = OpenAISender(server.base_url, "stand-in")
+    sender.wait_until_ready()
+    sender.init_thread.join()  # Includes the warm-up request
+    print(f"stand-in at {server.base_url}, first token {args.first_token_ms:g} ms, {args.chunk_ms:g} ms between chunks\n")
+
+    for turn in range(args.turns):
+        attachments = [(PNG_1X1, "image/png")] if turn == 0 else None
+        start = time.perf_counter()
+        response = sender.send_message(f"Question {turn + 1}", attachments, lambda _text: None)
+        elapsed = (time.perf_counter() - start) * 1000
+        values = metrics.snapshot()
+        assert response == RESPONSE, "response does not match the script"
+        print(
+            f"\nturn {turn + 1}: TTFT {values[TTFT_MS]:.0f} ms, total {elapsed:.0f} ms, "
+            f"{values[TOKENS_PER_S]:.0f} tok/s, {len(server.last_request['messages'])} messages sent"
+        )
+    print(f"\nconnections {server.connections} for warm-up + {server.requests} requests (expected 1), image parts {server.images} (expected 1)")
+
+    # Cancel part way through the stream
+    cancel = threading.Event()
+    chunks = []
+    cancelled_at = 0.0
+
+    def on_chunk(text: str) -> None:
+        """Cancel after the third chunk.
+
+        Args:
+            text (str): The chunk.
+        """
+        global cancelled_at
+        chunks.append(text)
+        if len(chunks) == 3:
+            cancelled_at = time.perf_counter()
+            cancel.set()
+
+    history = len(sender.history)
+    partial = sender.send_message("Question to cancel", None, on_chunk, cancel)
+    returned_ms = (time.perf_counter() - cancelled_at) * 1000
+    time.sleep(0.2 + 3 * args.chunk_ms / 1000)  # Give the server a few writes to notice
+    print(
+        f"\ncancel: returned {returned_ms:.0f} ms after cancelling with {len(partial)}/{len(RESPONSE)} chars, "
+        f"server saw {server.cancelled} dropped stream(s), history {'unchanged' if len(sender.history) == history else 'changed'}"
+    )
+
+    sender.reset_chat()
+    sender.send_message("After reset", None, lambda _text: None)
+    print(f"\nafter reset_chat: {len(server.last_request['messages'])} message(s) sent (expected 1)")
+    server.shutdown()
@@ -0,0 +1,325 @@
+"""Replay repeated preset presses through AIReceiver and check which screenshots reach the model.
+
+Runs on the offscreen Qt platform against a fake sender that streams a
+scripted answer slowly. Each scenario presses a screenshot preset (like
+Ctrl+D) the way ShortcutManager and MainWindow do: debounce, capture, take
+the pending screenshots with their hashes, and hand them to AIReceiver.
+Checks, for each scenario, which requests the sender saw, how many images
+each carried and whether it was interrupted:
+
+- pressed twice within the debounce window: the second press captures nothing;
+- pressed again on an unchanged screen while the answer streams: coalesced
+  into the running request, which keeps its image;
+- pressed again on an unchanged screen after the answer: sent without the
+  image, which the model already has;
+- interrupted by a typed message, then pressed again: the image is sent
+  again, since the interrupted turn never reached the model;
+- pressed again on a changed screen: interrupts and sends the new image;
+- quit while the answer streams: AIReceiver.stop returns only once the
+  generation thread has ended, and later presses send nothing.
+
+Exits with status 1 if any scenario fails.
+
+Usage:
+    python test/bench_request_scheduler.py [--chunk-ms 40]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from typing import Callable
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from PyQt6.QtGui import QColor, QGuiApplication, QImage, QPainter  # noqa: E402
+
+from core.ai_backend import AIBackend  # noqa: E402
+from core.ai_receiver import AIReceiver  # noqa: E402
+from core.capture_buffer import CaptureBuffer  # noqa: E402
+from core.image_hash import dhash  # noqa: E402
+from core.request_scheduler import DEBOUNCE_S, PRIORITY_PRESET  # noqa: E402
+from core.screenshot_manager import ScreenshotManager, encode_png  # noqa: E402
+
+PRESET = "solve"
+PROMPT = "Solve the problem on the screen."
+TYPED_MESSAGE = "Actually, explain the constraints first."
+CHUNKS = 30
+
+
+class FakeSender(AIBackend):
+    """Streams a fixed number of chunks and records what each request carried and how it ended."""
+
+    def __init__(self, chunk_delay_s: float) -> None:
+        self.chunk_delay_s = chunk_delay_s
+        self.sent: list[tuple[str, int, bool]] = []  # (message, images, interrupted) per request, in start order
+        self.lock = threading.Lock()
+
+    def is_ready(self) -> bool:
+        """Report the client as ready.
+
+        Returns:
+            bool: Always True.
+        """
+        return True
+
+    def wait_until_ready(self, timeout: float | None = None) -> None:
+        """Return at once; there is no client to wait for."""
+
+    def reset_chat(self) -> None:
+        """Do nothing; there is no chat history."""
+
+    def send_message(
+        self,
+        user_input: str,
+        attachments: list[CaptureBuffer] | None = None,
+        on_chunk: Callable[[str], None] | None = None,
+        cancel: threading.Event | None = None
+    ) -> str:
+        """Stream the scripted answer unless cancelled.
+
+        Args:
+            user_input (str): The message.
+            attachments (list[CaptureBuffer] | None, optional): The screenshots sent with it.
+            on_chunk (Callable[[str], None] | None, optional): Called with each chunk.
+            cancel (threading.Event | None, optional): Stops the stream when set.
+
+        Returns:
+            str: The part of the answer streamed.
+        """
+        with self.lock:
+            index = len(self.sent)
+            self.sent.append((user_input, len(attachments or []), False))
+        response = ""
+        for _ in range(CHUNKS):
+            if cancel is not None and cancel.is_set():
+                with self.lock:
+                    self.sent[index] = (user_input, len(attachments or []), True)
+                break
+            time.sleep(self.chunk_delay_s)
+            response += "word "
+            if on_chunk is not None:
+                on_chunk("word ")
+        return response
+
+
+class FakeChatArea():
+    """Accepts the chat updates AIReceiver makes without drawing anything."""
+
+    def __init__(self) -> None:
+        self.streaming_bubble = None
+        self.streaming_text = ""
+
+    def add_message(self, _text: str, is_user: bool = False, message_id: int | None = None) -> None:
+        """Ignore a message bubble."""
+
+    def start_assistant_stream(self) -> None:
+        """Start collecting streamed text."""
+        self.streaming_bubble = object()
+        self.streaming_text = ""
+
+    def append_to_stream(self, chunk: str) -> None:
+        """Collect a streamed chunk.
+
+        Args:
+            chunk (str): The chunk.
+        """
+        self.streaming_text += chunk
+
+    def finalize_assistant_stream(self, _message_id: int | None = None) -> None:
+        """End the stream."""
+        self.streaming_bubble = None
+
+    def show_stream_error(self, _error: str) -> None:
+        """End the stream after an error."""
+        self.streaming_bubble = None
+
+
+class FakeHistory():
+    """Hands out message IDs without storing anything."""
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def add_message(self, _role: str, _content: str) -> int:
+        """Return the next message ID.
+
+        Returns:
+            int: The ID.
+        """
+        self.count += 1
+        return self.count
+
+
+def render_screen(seed: int) -> QImage:
+    """Draw a synthetic problem page; different seeds give clearly different screens.
+
+    Args:
+        seed (int): Varies the layout.
+
+    Returns:
+        QImage: A 1280x800 screen.
+    """
+    image = QImage(1280, 800, QImage.Format.Format_RGB32)
+    image.fill(QColor(255, 255, 255))
+    painter = QPainter(image)
+    for row, y in enumerate(range(40, 760, 48)):
+        x = 24 + (row * 37 + seed * 53) % 120  # Words whose positions depend on the seed, so the hash's edges move
+        while x < 1200:
+            width = (x * 7 + row * 13 + seed * 29) % 90 + 30
+            painter.fillRect(x, y, width, 28, QColor(40, 40, 40))
+            x += width + 24
+    painter.end()
+    return image
+
+
+def capture(manager: ScreenshotManager, screen: QImage) -> None:
+    """Add a capture of a screen to the pending screenshots, as take_screenshot does after grabbing it.
+
+    Args:
+        manager (ScreenshotManager): The screenshot manager.
+        screen (QImage): The screen contents.
+    """
+    buffer = CaptureBuffer(f"screenshot{manager.screenshot_count}", bytearray(screen.constBits().asstring(screen.sizeInBytes())), screen.width(), screen.height())
+    image = encode_png(buffer)
+    manager.hashes[buffer.name] = ((buffer.width, buffer.height), dhash(image))
+    manager.screenshot_count += 1
+    manager.pending.append(buffer)
+
+
+def press_preset(receiver: AIReceiver, manager: ScreenshotManager, screen: QImage) -> None:
+    """Press the screenshot preset: debounce, capture, then send, as ShortcutManager and MainWindow.send_message do.
+
+    Args:
+        receiver (AIReceiver): The receiver under test.
+        manager (ScreenshotManager): The screenshot manager.
+        screen (QImage): What is on the screen.
+    """
+    if receiver.debounce(PROMPT, PRESET):
+        return
+    capture(manager, screen)
+    attachments, captures = manager.get_and_clear_pending()
+    receiver.handle_message(PROMPT, attachments or None, PRIORITY_PRESET, PRESET, captures)
+
+
+def run_events(app: QGuiApplication, seconds: float) -> None:
+    """Run the event loop for a while so AIReceiver's signals are delivered.
+
+    Args:
+        app (QGuiApplication): The application.
+        seconds (float): How long.
+    """
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        app.processEvents()
+        time.sleep(0.005)
+
+
+def wait_idle(app: QGuiApplication, receiver: AIReceiver) -> None:
+    """Run the event loop until no request is queued or generating.
+
+    Args:
+        app (QGuiApplication): The application.
+        receiver (AIReceiver): The receiver under test.
+    """
+    deadline = time.perf_counter() + 30
+    while time.perf_counter() < deadline:
+        stats = receiver.scheduler.stats()
+        if stats["queued"] == 0 and stats["running"] == 0:
+            break
+        run_events(app, 0.02)
+    run_events(app, DEBOUNCE_S + 0.1)  # Let the debounce window pass before the next scenario
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunk-ms", type=float, default=40, help="Fake sender delay between chunks")
+    args = parser.parse_args()
+
+    app = QGuiApplication(sys.argv)
+    os.chdir(ROOT)  # ScreenshotManager loads src/data/config.json relative to the working directory
+    manager = ScreenshotManager()
+    sender = FakeSender(args.chunk_ms / 1000)
+    receiver = AIReceiver(sender, FakeChatArea(), FakeHistory(), screenshot_manager=manager)
+    problem, other_problem = render_screen(1), render_screen(2)
+    stream_s = CHUNKS * args.chunk_ms / 1000
+    repeat_s = min(DEBOUNCE_S + 0.2, stream_s / 2)  # Past the debounce window, while the first answer streams
+
+    def twice_within_debounce() -> None:
+        """Press the preset twice in quick succession."""
+        press_preset(receiver, manager, problem)
+        run_events(app, DEBOUNCE_S / 4)
+        press_preset(receiver, manager, problem)
+
+    def again_while_streaming() -> None:
+        """Press the preset again on the same screen while its answer streams."""
+        press_preset(receiver, manager, problem)
+        run_events(app, repeat_s)
+        press_preset(receiver, manager, problem)
+
+    def again_after_answer() -> None:
+        """Press the preset again on the same screen once its answer is complete."""
+        press_preset(receiver, manager, problem)
+        wait_idle(app, receiver)
+        press_preset(receiver, manager, problem)
+
+    def again_after_typed_interrupt() -> None:
+        """Interrupt the preset's answer with a typed message, then press the preset again."""
+        press_preset(receiver, manager, problem)
+        run_events(app, repeat_s)
+        receiver.handle_message(TYPED_MESSAGE)
+        wait_idle(app, receiver)
+        press_preset(receiver, manager, problem)
+
+    def again_on_changed_screen() -> None:
+        """Press the preset again after the screen changed, while the first answer streams."""
+        press_preset(receiver, manager, problem)
+        run_events(app, repeat_s)
+        press_preset(receiver, manager, other_problem)
+
+    scenarios = [
+        ("pressed twice within the debounce window", twice_within_debounce, [(PROMPT, 1, False)]),
+        ("pressed again on the same screen while streaming", again_while_streaming, [(PROMPT, 1, False)]),
+        ("pressed again on the same screen after the answer", again_after_answer, [(PROMPT, 1, False), (PROMPT, 0, False)]),
+        ("typed message interrupts, then pressed again", again_after_typed_interrupt, [(PROMPT, 1, True), (TYPED_MESSAGE, 0, False), (PROMPT, 1, False)]),
+        ("pressed again on a changed screen while streaming", again_on_changed_screen, [(PROMPT, 1, True), (PROMPT, 1, False)]),
+    ]
+
+    failures = 0
+    width = max(len(name) for name, _scenario, _expected in scenarios)
+    print(f"fake answer streams for {stream_s:.1f} s; second press {repeat_s:.1f} s after the first\n")
+    for name, scenario, expected in scenarios:
+        manager.clear_screenshots()  # New chat: nothing sent yet
+        sender.sent.clear()
+        before = receiver.scheduler.stats()
+        scenario()
+        wait_idle(app, receiver)
+        after = receiver.scheduler.stats()
+        counts = ", ".join(f"{key} {after[key] - before[key]}" for key in ("debounced", "coalesced", "interrupted") if after[key] != before[key])
+        sent = [(message, images, interrupted) for message, images, interrupted in sender.sent]
+        passed = sent == expected
+        failures += not passed
+        summary = "; ".join(f"{'typed' if message != PROMPT else PRESET} {images} image(s){' interrupted' if interrupted else ''}" for message, images, interrupted in sent)
+        print(f"{'ok  ' if passed else 'FAIL'} {name:<{width}}  {summary}" + (f" ({counts})" if counts else ""))
+        if not passed:
+            print(f"     expected {expected}")
+
+    # Quitting: the databases are closed right after stop, so no generation thread may still be running
+    manager.clear_screenshots()
+    sender.sent.clear()
+    press_preset(receiver, manager, problem)
+    run_events(app, repeat_s)
+    receiver.stop()
+    stats = receiver.scheduler.stats()
+    run_events(app, DEBOUNCE_S + 0.1)
+    press_preset(receiver, manager, other_problem)
+    run_events(app, 0.2)
+    passed = stats["running"] == 0 and sender.sent == [(PROMPT, 1, True)]
+    failures += not passed
+    print(f"{'ok  ' if passed else 'FAIL'} {'quit while streaming':<{width}}  running {stats['running']} after stop; {len(sender.sent)} request(s) sent")
+
+    print(f"\n{len(scenarios) + 1 - failures}/{len(scenarios) + 1} scenarios passed")
+    manager.clear_screenshots()
+    sys.exit(1 if failures else 0)
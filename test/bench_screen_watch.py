@@ -0,0 +1,159 @@
+"""Measure the CPU cost and change detection of screen watch mode.
+
+On Windows the real GDI sampler watches the primary monitor; keep the screen
+still to measure the static cost (the target is under 1% CPU), or open a new
+page part way through to see it captured once. Elsewhere, or with --fake, a
+scripted sampler replays a static screen, a page that scrolls in and settles,
+a caret blink and a switch back to the first page; exactly one capture is
+expected.
+
+Usage:
+    python test/bench_screen_watch.py [--seconds 30] [--interval 2.0] [--fake]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from PyQt6.QtCore import QCoreApplication, QTimer  # noqa: E402
+
+from core.metrics import WATCH_CPU_PERCENT, metrics  # noqa: E402
+from core.screen_watcher import SAMPLE_WIDTH, ScreenSampler, ScreenWatcher, Win32ScreenSampler  # noqa: E402
+
+FAKE_AREA = {"left": 0, "top": 0, "width": 1920, "height": 1080}
+
+
+class FakeScreenshotManager():
+    """Stands in for ScreenshotManager: resolves a fixed area and counts captures."""
+
+    def __init__(self, area: dict[str, int]) -> None:
+        self.area = area
+        self.captures: list[float] = []
+
+    def capture_area(self) -> dict[str, int]:
+        """Return the watched area.
+
+        Returns:
+            dict[str, int]: The area in physical pixels.
+        """
+        return self.area
+
+    def take_screenshot(self) -> None:
+        """Record the time of a capture."""
+        self.captures.append(time.perf_counter())
+
+
+class ScriptedSampler(ScreenSampler):
+    """Replays synthetic brightness grids: static page, new page scrolling in, caret blink, switch back."""
+
+    def __init__(self) -> None:
+        rng = random.Random(0)
+        height = round(SAMPLE_WIDTH * FAKE_AREA["height"] / FAKE_AREA["width"])
+        cells = SAMPLE_WIDTH * height
+        first = bytes(rng.choice((30, 30, 30, 220)) for _ in range(cells))
+        second = bytes(rng.choice((240, 240, 240, 20)) for _ in range(cells))
+        blink = bytearray(second)
+        blink[cells // 2] = 30
+        self.frames = (
+            [first] * 5 +
+            [second[:cells // 3] + first[cells // 3:], second[:2 * cells // 3] + first[2 * cells // 3:]] +  # Scrolling in
+            [second] * 4 +
+            [bytes(blink), second] * 3 +  # Caret blink
+            [first] * 4  # Switched back to a screen already seen
+        )
+        self.index = 0
+
+    def sample(self, _area: dict[str, int], _width: int) -> bytes:
+        """Return the next scripted frame (the last one repeats).
+
+        Returns:
+            bytes: The brightness grid.
+        """
+        frame = self.frames[min(self.index, len(self.frames) - 1)]
+        self.index += 1
+        return frame
+
+
+class TimedSampler(Win32ScreenSampler):
+    """Win32ScreenSampler that records how long each sample takes."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.sample_ms: list[float] = []
+
+    def sample(self, area: dict[str, int], width: int) -> bytes:
+        """Sample and time it.
+
+        Args:
+            area (dict[str, int]): The area in physical pixels.
+            width (int): Columns of the grid.
+
+        Returns:
+            bytes: The brightness grid.
+        """
+        start = time.perf_counter()
+        grid = super().sample(area, width)
+        self.sample_ms.append((time.perf_counter() - start) * 1000)
+        return grid
+
+
+def primary_area() -> dict[str, int]:
+    """Return the primary monitor's area as reported by mss.
+
+    Returns:
+        dict[str, int]: The area in physical pixels.
+    """
+    import mss
+
+    with mss.mss() as sct:
+        return dict(sct.monitors[1])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=30.0, help="How long to watch")
+    parser.add_argument("--interval", type=float, default=2.0, help="Seconds between samples")
+    parser.add_argument("--fake", action="store_true", help="Use the scripted sampler even on Windows")
+    args = parser.parse_args()
+
+    app = QCoreApplication(sys.argv)
+    fake = args.fake or sys.platform != "win32"
+    samplers = []
+
+    def make_sampler() -> ScreenSampler:
+        """Create the sampler on the watcher thread and keep it for the report.
+
+        Returns:
+            ScreenSampler: The sampler.
+        """
+        sampler = ScriptedSampler() if fake else TimedSampler()
+        samplers.append(sampler)
+        return sampler
+
+    if fake:
+        args.interval = min(args.interval, 0.05)
+        args.seconds = min(args.seconds, 40 * args.interval)
+    manager = FakeScreenshotManager(FAKE_AREA if fake else primary_area())
+    watcher = ScreenWatcher(manager, make_sampler)
+    watcher.timer.setInterval(int(args.interval * 1000))
+
+    start = time.perf_counter()
+    watcher.set_active(True)
+    QTimer.singleShot(int(args.seconds * 1000), app.quit)
+    app.exec()
+    ticks = watcher.tick_ns
+    watcher.set_active(False)
+    elapsed = time.perf_counter() - start
+
+    sampler = samplers[0] if samplers else None
+    sample_ms = sorted(getattr(sampler, "sample_ms", []))
+    print(f"{'scripted' if fake else 'GDI'} sampler, {elapsed:.1f} s at {args.interval:g} s intervals, area {manager.area['width']}x{manager.area['height']}")
+    if sample_ms:
+        print(f"  sample (StretchBlt) p50 {sample_ms[len(sample_ms) // 2]:.2f} ms, max {sample_ms[-1]:.2f} ms")
+    print(f"  UI thread per tick  {ticks / max(1, round(elapsed / args.interval)) / 1_000_000:.3f} ms")
+    print(f"  CPU                 {metrics.snapshot().get(WATCH_CPU_PERCENT, 0.0):.3f}%")
+    print(f"  captures            {len(manager.captures)}" + (" (expected 1)" if fake else ""))
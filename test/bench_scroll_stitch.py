@@ -0,0 +1,188 @@
+"""Compare sending scrolled screenshots separately with stitching them into one image.
+
+Renders a tall synthetic problem page with a fixed title bar, a status bar
+and a scrollbar, takes overlapping viewport captures while "scrolling" it,
+and runs them through ScreenshotManager's stitching as get_and_clear_pending
+does. Reports PNG bytes and estimated image tokens for both ways of sending,
+the time stitching takes, and checks that the stitched image is exactly the
+page between the two bars.
+
+Token estimates follow the providers' published rules: Gemini counts 258
+tokens for an image of at most 384x384 and otherwise 258 per crop tile, the
+tile side being two thirds of the shorter side clamped to 256-768 pixels;
+OpenAI (high detail) fits the image into 2048x2048, scales the shorter side
+to 768 and counts 170 per 512-pixel tile plus 85.
+
+Usage:
+    python test/bench_scroll_stitch.py [--width 1280] [--viewport 800] [--page 2600] [--step 600]
+"""
+import argparse
+import math
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from PyQt6.QtCore import QRect, Qt  # noqa: E402
+from PyQt6.QtGui import QColor, QFont, QGuiApplication, QImage, QPainter  # noqa: E402
+
+from core.capture_buffer import CaptureBuffer  # noqa: E402
+from core.screenshot_manager import ScreenshotManager, encode_png  # noqa: E402
+
+TITLE_HEIGHT = 56
+STATUS_HEIGHT = 28
+SCROLLBAR_WIDTH = 14
+LINE_HEIGHT = 22
+
+
+def gemini_tokens(width: int, height: int) -> int:
+    """Estimate Gemini's token count for one image.
+
+    Args:
+        width (int): Width in pixels.
+        height (int): Height in pixels.
+
+    Returns:
+        int: The estimated tokens.
+    """
+    if width <= 384 and height <= 384:
+        return 258
+    tile = min(768, max(256, math.floor(min(width, height) / 1.5)))
+    return 258 * math.ceil(width / tile) * math.ceil(height / tile)
+
+
+def openai_tokens(width: int, height: int) -> int:
+    """Estimate OpenAI's high-detail token count for one image.
+
+    Args:
+        width (int): Width in pixels.
+        height (int): Height in pixels.
+
+    Returns:
+        int: The estimated tokens.
+    """
+    scale = min(1.0, 2048 / max(width, height))
+    width, height = width * scale, height * scale
+    scale = min(1.0, 768 / min(width, height))
+    width, height = width * scale, height * scale
+    return 85 + 170 * math.ceil(width / 512) * math.ceil(height / 512)
+
+
+def render_page(width: int, height: int) -> QImage:
+    """Draw a long problem statement with code blocks.
+
+    Args:
+        width (int): Width of the scrolling content in pixels.
+        height (int): Height of the whole page in pixels.
+
+    Returns:
+        QImage: The page.
+    """
+    page = QImage(width, height, QImage.Format.Format_RGB32)
+    page.fill(QColor(255, 255, 255))
+    painter = QPainter(page)
+    painter.setFont(QFont("Helvetica", 11))
+    y = 16
+    line = 0
+    while y + LINE_HEIGHT < height:
+        line += 1
+        if line % 17 == 0:
+            painter.setPen(QColor(20, 20, 20))
+            painter.drawText(24, y + 16, f"Example {line // 17}")
+        elif line % 17 > 11:
+            painter.fillRect(24, y, width - 48, LINE_HEIGHT, QColor(246, 246, 246))
+            painter.setPen(QColor(60, 60, 140))
+            painter.drawText(36, y + 16, f"input[{line}] = {line * 7919 % 1000} {line * 104729 % 97}")
+        elif line % 17 == 11:
+            y += LINE_HEIGHT // 2  # Paragraph gap
+            continue
+        else:
+            painter.setPen(QColor(40, 40, 40))
+            words = " ".join(f"word{(line * 31 + i * 7) % 113}" for i in range(12))
+            painter.drawText(24, y + 16, f"{line}. Given the array a, {words}.")
+        y += LINE_HEIGHT
+    painter.end()
+    return page
+
+
+def capture(page: QImage, width: int, viewport: int, offset: int) -> CaptureBuffer:
+    """Compose one window capture: title bar, the page scrolled to an offset, status bar and scrollbar.
+
+    Args:
+        page (QImage): The rendered page.
+        width (int): Window width in pixels.
+        viewport (int): Window height in pixels.
+        offset (int): Scroll offset in page rows.
+
+    Returns:
+        CaptureBuffer: The capture, as take_screenshot would store it before encoding.
+    """
+    window = QImage(width, viewport, QImage.Format.Format_RGB32)
+    window.fill(QColor(255, 255, 255))
+    painter = QPainter(window)
+    content = viewport - TITLE_HEIGHT - STATUS_HEIGHT
+    painter.drawImage(QRect(0, TITLE_HEIGHT, width - SCROLLBAR_WIDTH, content), page, QRect(0, offset, width - SCROLLBAR_WIDTH, content))
+    painter.fillRect(0, 0, width, TITLE_HEIGHT, QColor(36, 41, 47))
+    painter.setPen(QColor(255, 255, 255))
+    painter.setFont(QFont("Helvetica", 13))
+    painter.drawText(QRect(16, 0, width, TITLE_HEIGHT), Qt.AlignmentFlag.AlignVCenter, "Problem 1234 - Range Queries")
+    painter.fillRect(0, viewport - STATUS_HEIGHT, width, STATUS_HEIGHT, QColor(230, 230, 230))
+    painter.fillRect(width - SCROLLBAR_WIDTH, TITLE_HEIGHT, SCROLLBAR_WIDTH, content, QColor(240, 240, 240))
+    thumb = round(content * content / page.height())
+    painter.fillRect(width - SCROLLBAR_WIDTH + 3, TITLE_HEIGHT + round(offset * content / page.height()), SCROLLBAR_WIDTH - 6, thumb, QColor(160, 160, 160))
+    painter.end()
+    pixels = bytearray(window.constBits().asstring(window.sizeInBytes()))
+    return CaptureBuffer(f"screenshot{offset}", pixels, width, viewport)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--width", type=int, default=1280, help="Window width in pixels")
+    parser.add_argument("--viewport", type=int, default=800, help="Window height in pixels")
+    parser.add_argument("--page", type=int, default=2600, help="Page height in pixels")
+    parser.add_argument("--step", type=int, default=600, help="Rows scrolled between captures")
+    args = parser.parse_args()
+
+    app = QGuiApplication(sys.argv)
+    os.chdir(ROOT)  # ScreenshotManager loads src/data/config.json relative to the working directory
+    manager = ScreenshotManager()
+    content = args.viewport - TITLE_HEIGHT - STATUS_HEIGHT
+    page = render_page(args.width - SCROLLBAR_WIDTH, args.page)
+    offsets = list(range(0, args.page - content, args.step)) + [args.page - content]
+
+    buffers = [capture(page, args.width, args.viewport, offset) for offset in offsets]
+    for buffer in buffers:
+        encode_png(buffer)
+    separate_bytes = sum(buffer.png_size for buffer in buffers)
+    separate_gemini = sum(gemini_tokens(buffer.width, buffer.height) for buffer in buffers)
+    separate_openai = sum(openai_tokens(buffer.width, buffer.height) for buffer in buffers)
+
+    start = time.perf_counter()
+    stitched = manager._stitch(buffers)
+    stitch_ms = (time.perf_counter() - start) * 1000
+    stitched_bytes = sum(buffer.png_size for buffer in stitched)
+    stitched_gemini = sum(gemini_tokens(buffer.width, buffer.height) for buffer in stitched)
+    stitched_openai = sum(openai_tokens(buffer.width, buffer.height) for buffer in stitched)
+
+    print(f"{len(buffers)} captures of {args.width}x{args.viewport}, scrolled {args.step} rows apart over a {args.page}-row page")
+    print(f"stitched into {len(stitched)} image(s): {', '.join(f'{buffer.width}x{buffer.height}' for buffer in stitched)} in {stitch_ms:.0f} ms (incl. PNG encode)\n")
+    print(f"{'':>10} {'images':>7} {'PNG KiB':>9} {'Gemini tok':>11} {'OpenAI tok':>11}")
+    print(f"{'separate':>10} {len(buffers):>7} {separate_bytes / 1024:>9.0f} {separate_gemini:>11} {separate_openai:>11}")
+    print(f"{'stitched':>10} {len(stitched):>7} {stitched_bytes / 1024:>9.0f} {stitched_gemini:>11} {stitched_openai:>11}")
+    print(
+        f"{'saved':>10} {'':>7} {1 - stitched_bytes / separate_bytes:>9.0%} "
+        f"{1 - stitched_gemini / separate_gemini:>11.0%} {1 - stitched_openai / separate_openai:>11.0%}"
+    )
+
+    # The stitched image's scrolling part must be the page itself
+    if len(stitched) == 1:
+        image = QImage(stitched[0].pixels, stitched[0].width, stitched[0].height, stitched[0].width * 4, QImage.Format.Format_RGB32)
+        body = image.copy(0, TITLE_HEIGHT, args.width - SCROLLBAR_WIDTH, image.height() - TITLE_HEIGHT - STATUS_HEIGHT)
+        expected = page.copy(0, 0, page.width(), body.height())
+        print(f"\nstitched body matches the page: {body == expected} ({body.height()} of {args.page} rows)")
+    for buffer in stitched:
+        buffer.release()
+    manager.clear_screenshots()
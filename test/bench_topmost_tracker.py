@@ -0,0 +1,184 @@
+"""Drive TopmostTracker with a fake event source and clock, and compare it with the old 1 s polling timer.
+
+Runs on any platform (no Windows or Qt needed). A scripted timeline of window
+events (typing in another app, dragging windows, a competing always-on-top
+window) is replayed and the tracker's wakeups, checks, raises and worst-case
+time spent covered are reported. Every "move" is treated as a move of another
+always-on-top window; the Win32 platform drops moves of normal windows before
+they reach the tracker, so the drag phase is a worst case.
+
+Usage:
+    python test/bench_topmost_tracker.py
+"""
+import heapq
+import os
+import sys
+from typing import Callable
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from core.topmost_tracker import TopmostPlatform, TopmostTracker  # noqa: E402
+from core.win32_hook import EVENT_OBJECT_LOCATIONCHANGE, EVENT_SYSTEM_FOREGROUND  # noqa: E402
+
+
+class FakeClock():
+    """Simulated monotonic clock in seconds."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the simulated time.
+
+        Returns:
+            float: Seconds since the start of the simulation.
+        """
+        return self.now
+
+
+class FakePlatform(TopmostPlatform):
+    """Fake window system: tracks whether the overlay is covered and counts z-order queries."""
+
+    def __init__(self) -> None:
+        self.on_event = None
+        self.covered = False
+        self.competitor = False  # Another always-on-top window that re-covers the overlay after every raise
+        self.queries = 0
+        self.raised = 0
+
+    def start_events(self, on_event: Callable[[int], None]) -> None:
+        """Start delivering scripted events.
+
+        Args:
+            on_event (Callable[[int], None]): The tracker's event handler.
+        """
+        self.on_event = on_event
+
+    def stop_events(self) -> None:
+        """Stop delivering events."""
+        self.on_event = None
+
+    def is_topmost(self) -> bool:
+        """Report whether the overlay is currently uncovered.
+
+        Returns:
+            bool: True if no window covers the overlay.
+        """
+        self.queries += 1
+        return not self.covered
+
+    def raise_window(self) -> None:
+        """Raise the overlay; a competing topmost window immediately covers it again."""
+        self.raised += 1
+        self.covered = self.competitor
+
+    def emit(self, event: int, covers: bool = False) -> None:
+        """Deliver one window event, optionally covering the overlay.
+
+        Args:
+            event (int): The event id.
+            covers (bool, optional): Whether the event's window now covers the overlay.
+        """
+        if covers:
+            self.covered = True
+        if self.on_event is not None:
+            self.on_event(event)
+
+
+def build_timeline() -> list[tuple[float, str]]:
+    """Script 60 s of desktop activity.
+
+    Returns:
+        list[tuple[float, str]]: (time_s, action) pairs sorted by time.
+    """
+    timeline = []
+    # 0-20 s: another window is dragged around (location changes at 60 Hz), never covering the overlay
+    timeline += [(t / 60, "move") for t in range(0, 20 * 60)]
+    # 20-30 s: alt-tabbing every 2 s; every other switch lands on a window that covers the overlay
+    timeline += [(20 + 2 * i, "cover" if i % 2 else "focus") for i in range(5)]
+    # 30-40 s: a competing always-on-top window fights for the top
+    timeline += [(30.0, "compete_on"), (40.0, "compete_off")]
+    # 40-50 s: overlay hidden while the user keeps working
+    timeline += [(40.5, "hide")] + [(41 + i / 10, "focus") for i in range(80)] + [(49.5, "show")]
+    return sorted(timeline)
+
+
+def simulate() -> tuple[TopmostTracker, FakePlatform, float, int]:
+    """Replay the timeline through the tracker.
+
+    Returns:
+        tuple[TopmostTracker, FakePlatform, float, int]: The tracker, the platform,
+            the longest covered stretch in seconds (outside the competing window phase), and the number of timer wakeups.
+    """
+    clock = FakeClock()
+    platform = FakePlatform()
+    queue: list[tuple[float, int, str]] = []
+    sequence = 0
+    wakeups = 0
+    pending_check: list[float | None] = [None]
+
+    def schedule_check(delay_ms: int) -> None:
+        """Stand in for the single-shot QTimer owned by MainWindow.
+
+        Args:
+            delay_ms (int): Delay before the tracker's check runs.
+        """
+        pending_check[0] = clock.now + delay_ms / 1000  # Single-shot timer semantics: restart replaces the earlier request
+
+    tracker = TopmostTracker(platform, schedule_check, clock)
+    for when, action in build_timeline():
+        heapq.heappush(queue, (when, sequence, action))
+        sequence += 1
+    tracker.set_active(True)
+
+    covered_since = None
+    longest_covered = 0.0
+    while queue or pending_check[0] is not None:
+        next_check = pending_check[0]
+        if next_check is not None and (not queue or next_check <= queue[0][0]):
+            clock.now = next_check
+            pending_check[0] = None
+            wakeups += 1
+            tracker.check()
+        else:
+            clock.now, _, action = heapq.heappop(queue)
+            if action == "move":
+                platform.emit(EVENT_OBJECT_LOCATIONCHANGE)
+            elif action == "focus":
+                platform.emit(EVENT_SYSTEM_FOREGROUND)
+            elif action == "cover":
+                platform.emit(EVENT_SYSTEM_FOREGROUND, covers=True)
+            elif action == "compete_on":
+                platform.competitor = True
+                platform.emit(EVENT_SYSTEM_FOREGROUND, covers=True)
+            elif action == "compete_off":
+                platform.competitor = False
+                platform.covered = False
+            elif action == "hide":
+                tracker.set_active(False)
+            elif action == "show":
+                tracker.set_active(True)
+
+        # A competing topmost window is deliberately left alone during back-off, so only time the other cases
+        covered = platform.covered and tracker.active and not platform.competitor
+        if covered and covered_since is None:
+            covered_since = clock.now
+        elif not covered and covered_since is not None:
+            longest_covered = max(longest_covered, clock.now - covered_since)
+            covered_since = None
+    return tracker, platform, longest_covered, wakeups
+
+
+if __name__ == "__main__":
+    tracker, platform, longest_covered, wakeups = simulate()
+    duration = build_timeline()[-1][0]
+    print(
+        f"event-driven  wakeups={wakeups:4d}  events={tracker.events:5d}  checks={tracker.checks:3d}  "
+        f"z-order queries={platform.queries:3d}  raises={tracker.raises:2d}  backoffs={tracker.backoffs:2d}  "
+        f"longest covered={longest_covered * 1000:.0f} ms"
+    )
+    polls = int(duration)  # The old timer fired every second regardless of visibility
+    print(
+        f"1 s polling   wakeups={polls:4d}  checks={polls:3d}  z-order queries={polls:3d}  "
+        f"(4 WindowFromPoint + 5 GetAncestor each)  longest covered=up to 1000 ms"
+    )
@@ -0,0 +1,348 @@
+"""Drive the dictation ring buffer and voice-activity chunker with synthetic audio.
+
+Runs without a microphone or faster-whisper. Synthetic 16 kHz speech (tone
+bursts over low background noise) is written into an AudioRingBuffer in
+capture-sized blocks and read back frame by frame into a
+VoiceActivityChunker, as TranscriptionPipeline does. Checks that:
+
+- the ring buffer returns the audio byte for byte across wraparound, and
+  drops (and counts) only the oldest audio on overflow;
+- each utterance becomes one final chunk, with partials while it lasts;
+- an utterance longer than max_chunk_ms is split with the configured overlap;
+- merge_overlap removes words repeated across the overlap;
+- transcripts from a cancelled or replaced Transcriber pipeline are dropped;
+- stopping dictation still transcribes the words already spoken, and ends
+  with finished; cancelling it drops them;
+- an audio source that fails to start opens no worker session, and
+  successive dictations share one worker.
+
+The Transcriber checks feed a temporary WAV file in real time through a
+fake worker that "decodes" each chunk to its length after a delay.
+
+Also reports how much faster than realtime the chunker runs. Exits with
+status 1 if any check fails.
+
+Usage:
+    python test/bench_transcriber.py [--seconds 120]
+"""
+import argparse
+import math
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
+import wave
+from array import array
+from typing import Callable
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from PyQt6.QtCore import QCoreApplication  # noqa: E402
+
+from core.transcriber import (  # noqa: E402
+    FRAME_BYTES,
+    FRAME_MS,
+    SAMPLE_RATE,
+    SAMPLE_WIDTH,
+    AudioRingBuffer,
+    Transcriber,
+    VoiceActivityChunker,
+    WavFileSource,
+    merge_overlap,
+)
+
+SPEECH_AMPLITUDE = 6000
+NOISE_AMPLITUDE = 60
+CAPTURE_BLOCK = 4096  # Bytes per capture callback; deliberately not a multiple of FRAME_BYTES
+DECODE_S = 0.3  # Fake worker time per chunk
+
+
+class FakeWorker():
+    """Stands in for TranscriptionWorker: "decodes" each chunk to its length after a delay, on its own thread."""
+
+    def __init__(self) -> None:
+        self.chunks: queue.Queue = queue.Queue()
+        self.handlers: dict[int, Callable[[tuple], None]] = {}
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def open_session(self, on_result: Callable[[tuple], None]) -> int:
+        """Register a pipeline's result handler.
+
+        Args:
+            on_result (Callable[[tuple], None]): Called with each result, then with ("end", session).
+
+        Returns:
+            int: The session ID.
+        """
+        session = len(self.handlers) + 1
+        self.handlers[session] = on_result
+        return session
+
+    def submit(self, session: int, chunk_id: int, pcm: bytes, final: bool) -> None:
+        """Queue a chunk for decoding.
+
+        Args:
+            session (int): The session.
+            chunk_id (int): The utterance chunk.
+            pcm (bytes): The chunk audio.
+            final (bool): Whether the chunk is complete.
+        """
+        self.chunks.put((session, chunk_id, pcm, final))
+
+    def end_session(self, session: int) -> None:
+        """Queue the end of a session.
+
+        Args:
+            session (int): The session.
+        """
+        self.chunks.put((session, None, b"", True))
+
+    def close(self) -> None:
+        """Do nothing; there is no process to stop."""
+
+    def _run(self) -> None:
+        """Decode queued chunks one at a time."""
+        while True:
+            session, chunk_id, pcm, final = self.chunks.get()
+            if chunk_id is None:
+                self.handlers[session](("end", session))
+                continue
+            time.sleep(DECODE_S)
+            self.handlers[session](("text", session, chunk_id, f"utterance {chunk_id} of {milliseconds(pcm)} ms", final))
+
+
+class FailingSource():
+    """Audio source whose device cannot be opened."""
+
+    def start(self, _on_audio: Callable[[bytes], None], _on_end: Callable[[], None]) -> None:
+        """Fail to open the device."""
+        raise OSError("no input device")
+
+    def stop(self) -> None:
+        """Do nothing; the device was never opened."""
+
+
+def synthesize(segments: list[tuple[bool, int]]) -> bytes:
+    """Build PCM audio from alternating speech and silence segments.
+
+    Args:
+        segments (list[tuple[bool, int]]): (is_speech, milliseconds) pairs.
+
+    Returns:
+        bytes: 16 kHz mono signed 16-bit little-endian PCM.
+    """
+    samples = array("h")
+    n = 0
+    for is_speech, ms in segments:
+        for _ in range(SAMPLE_RATE * ms // 1000):
+            # Deterministic noise plus, for speech, a warbling tone
+            value = ((n * 7919) % 201 - 100) * NOISE_AMPLITUDE // 100
+            if is_speech:
+                value += int(SPEECH_AMPLITUDE * math.sin(2 * math.pi * (180 + 40 * math.sin(n / 800)) * n / SAMPLE_RATE))
+            samples.append(value)
+            n += 1
+    if sys.byteorder == "big":
+        samples.byteswap()
+    return samples.tobytes()
+
+
+def milliseconds(audio: bytes) -> int:
+    """Get the duration of PCM audio.
+
+    Args:
+        audio (bytes): The audio.
+
+    Returns:
+        int: Its length in milliseconds.
+    """
+    return len(audio) * 1000 // (SAMPLE_RATE * SAMPLE_WIDTH)
+
+
+def run_chunker(pcm: bytes, **options) -> tuple[list[tuple[int, bytes, bool]], bytes, AudioRingBuffer]:
+    """Pass audio through a ring buffer into a chunker the way the pipeline's capture and chunk threads do.
+
+    Args:
+        pcm (bytes): The audio.
+        **options: VoiceActivityChunker settings.
+
+    Returns:
+        tuple[list[tuple[int, bytes, bool]], bytes, AudioRingBuffer]: (chunk id, audio, final) per chunk, the audio read back, and the buffer.
+    """
+    chunks = []
+    read_back = bytearray()
+    chunker = VoiceActivityChunker(lambda chunk_id, audio, final: chunks.append((chunk_id, audio, final)), **options)
+    ring = AudioRingBuffer(SAMPLE_RATE * SAMPLE_WIDTH)  # One second: small enough to wrap many times
+    for i in range(0, len(pcm), CAPTURE_BLOCK):
+        ring.write(pcm[i:i + CAPTURE_BLOCK])
+        while ring.size >= FRAME_BYTES:
+            frame = ring.read(FRAME_BYTES, timeout=0)
+            read_back += frame
+            chunker.feed(frame)
+    ring.close()
+    chunker.flush()
+    return chunks, bytes(read_back), ring
+
+
+def check(description: str, passed: bool, detail: str = "") -> bool:
+    """Print one check's outcome.
+
+    Args:
+        description (str): What was checked.
+        passed (bool): Whether it held.
+        detail (str, optional): Extra information printed after the description.
+
+    Returns:
+        bool: passed.
+    """
+    print(f"{'ok  ' if passed else 'FAIL'} {description}" + (f": {detail}" if detail else ""))
+    return passed
+
+
+def write_wav(pcm: bytes) -> str:
+    """Write audio to a temporary WAV file.
+
+    Args:
+        pcm (bytes): 16 kHz mono signed 16-bit PCM.
+
+    Returns:
+        str: The file path; the caller deletes it.
+    """
+    handle, path = tempfile.mkstemp(suffix=".wav")
+    os.close(handle)
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(SAMPLE_WIDTH)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes(pcm)
+    return path
+
+
+def run_events(app: QCoreApplication, seconds: float) -> None:
+    """Run the event loop for a while so the Transcriber's queued signals are delivered.
+
+    Args:
+        app (QCoreApplication): The application.
+        seconds (float): How long.
+    """
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        app.processEvents()
+        time.sleep(0.005)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=int, default=120, help="Length of the synthetic dictation used for timing")
+    args = parser.parse_args()
+    results = []
+
+    # Ring buffer: lossless while the reader keeps up, drops only the oldest audio on overflow
+    pcm = synthesize([(False, 500), (True, 1500), (False, 1000)])
+    _chunks, read_back, ring = run_chunker(pcm)
+    whole = len(pcm) // FRAME_BYTES * FRAME_BYTES
+    results.append(check("ring buffer round-trips audio across wraparound", read_back == pcm[:whole] and ring.dropped_bytes == 0, f"{len(read_back)} bytes"))
+    ring = AudioRingBuffer(10 * FRAME_BYTES)
+    ring.write(pcm[:25 * FRAME_BYTES])
+    newest = ring.read(10 * FRAME_BYTES, timeout=0)
+    results.append(check("ring buffer overflow keeps the newest audio", newest == pcm[15 * FRAME_BYTES:25 * FRAME_BYTES] and ring.dropped_bytes == 15 * FRAME_BYTES, f"dropped {ring.dropped_bytes} bytes"))
+    ring.close()
+    results.append(check("closed ring buffer returns None when drained", ring.read(FRAME_BYTES, timeout=0) is None))
+
+    # Chunker: three utterances separated by pauses longer than the hangover
+    pcm = synthesize([(False, 800), (True, 2500), (False, 1200), (True, 700), (False, 900), (True, 3200), (False, 1500)])
+    chunks, _read_back, _ring = run_chunker(pcm)
+    finals = [chunk for chunk in chunks if chunk[2]]
+    partials = [chunk for chunk in chunks if not chunk[2]]
+    results.append(check("one final chunk per utterance", [chunk[0] for chunk in finals] == [0, 1, 2], f"finals {[(chunk_id, milliseconds(audio)) for chunk_id, audio, _final in finals]}"))
+    results.append(check(
+        "final chunks cover their utterance plus preroll and a short tail",
+        all(speech <= milliseconds(audio) <= speech + 700 for (_chunk_id, audio, _final), speech in zip(finals, (2500, 700, 3200))),
+    ))
+    results.append(check("partials are emitted during long utterances", {0, 2} <= {chunk[0] for chunk in partials}, f"{len(partials)} partials"))
+
+    # Long utterance: split at max_chunk_ms, the next chunk starting with overlap_ms of audio
+    pcm = synthesize([(False, 300), (True, 5000), (False, 1000)])
+    chunks, _read_back, _ring = run_chunker(pcm, max_chunk_ms=2000, overlap_ms=300, partial_interval_ms=10_000)
+    finals = [audio for _chunk_id, audio, final in chunks if final]
+    overlap = 300 // FRAME_MS * FRAME_BYTES
+    results.append(check(
+        "long utterance is split with overlap",
+        len(finals) > 2
+        and all(milliseconds(audio) == 2000 // FRAME_MS * FRAME_MS for audio in finals[:-1])
+        and all(current.startswith(previous[-overlap:]) for previous, current in zip(finals, finals[1:])),
+        f"finals {[milliseconds(audio) for audio in finals]} ms",
+    ))
+
+    # Overlapping words are merged once
+    merged = merge_overlap("so the array is sorted in", "Sorted in ascending order.")
+    results.append(check("merge_overlap drops repeated words", merged == "so the array is sorted in ascending order.", repr(merged)))
+
+    # Stale pipelines: only the current generation reaches transcript_changed
+    app = QCoreApplication(sys.argv)
+    worker = FakeWorker()
+    transcriber = Transcriber(worker=worker)
+    received = []
+    transcriber.transcript_changed.connect(lambda generation, committed, partial: received.append((generation, committed)))
+    transcriber.generation = 1
+    transcriber._on_transcript(1, "first", "")
+    transcriber.cancel()  # Results still in flight from generation 1 must be dropped
+    transcriber._on_transcript(1, "late", "")
+    transcriber.generation += 1  # As start() does for the next pipeline
+    transcriber._on_transcript(3, "second", "")
+    transcriber._on_transcript(1, "stale", "")
+    results.append(check("transcripts from cancelled pipelines are dropped", received == [(1, "first"), (3, "second")], str(received)))
+
+    # Stopping mid-utterance (the dictation hotkey) keeps the words already spoken; cancelling (sending) drops them
+    transcripts = []
+    finished = []
+    errors = []
+    transcriber.transcript_changed.connect(lambda generation, committed, partial: transcripts.append((generation, committed, partial)))
+    transcriber.finished.connect(finished.append)
+    transcriber.error.connect(errors.append)
+    path = write_wav(synthesize([(False, 300), (True, 3000)]))
+    try:
+        for cancel in (False, True):
+            transcripts.clear()
+            transcriber.start(WavFileSource(path, realtime=True))
+            generation = transcriber.generation
+            run_events(app, 1.5)
+            if cancel:
+                transcriber.cancel()
+            else:
+                transcriber.stop()
+            stopped = len(transcripts)
+            run_events(app, 1.5 + 2 * DECODE_S)
+            if cancel:
+                results.append(check("cancelling dictation drops transcripts still being decoded", len(transcripts) == stopped and generation not in finished, f"{len(transcripts) - stopped} late transcript(s)"))
+            else:
+                last = transcripts[-1] if transcripts else (0, "", "")
+                results.append(check(
+                    "stopping dictation still transcribes the words already spoken",
+                    last[0] == generation and last[1] != "" and last[2] == "" and finished == [generation],
+                    f"{len(transcripts) - stopped} transcript(s) after stop, committed {last[1]!r}",
+                ))
+    finally:
+        os.remove(path)
+
+    transcriber.start(FailingSource())
+    results.append(check(
+        "a failed audio source opens no worker session; dictations share one worker",
+        not transcriber.is_running() and len(errors) == 1 and len(worker.handlers) == 2,
+        f"{len(worker.handlers)} session(s) for 2 dictations and 1 failed start, error {errors[-1] if errors else None!r}",
+    ))
+
+    # Throughput: the chunker must stay far ahead of realtime on the chunk thread
+    pattern = [(True, 2400), (False, 900), (True, 1100), (False, 600)]
+    pcm = synthesize(pattern * (args.seconds * 1000 // sum(ms for _speech, ms in pattern) + 1))
+    start = time.perf_counter()
+    chunks, _read_back, _ring = run_chunker(pcm)
+    elapsed = time.perf_counter() - start
+    audio_seconds = len(pcm) / (SAMPLE_RATE * SAMPLE_WIDTH)
+    print(
+        f"\n{audio_seconds:.0f} s of audio chunked in {elapsed * 1000:.0f} ms ({audio_seconds / elapsed:.0f}x realtime, "
+        f"{elapsed / (len(pcm) / FRAME_BYTES) * 1e6:.0f} us per {FRAME_MS} ms frame), {sum(chunk[2] for chunk in chunks)} final chunks"
+    )
+    print(f"{sum(results)}/{len(results)} checks passed")
+    sys.exit(0 if all(results) else 1)
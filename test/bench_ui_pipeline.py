@@ -0,0 +1,554 @@
+"""End-to-end UI benchmark: MainWindow, ChatArea and AIReceiver on the offscreen Qt platform against a fake sender.
+
+The fake sender streams scripted responses from a worker thread, exactly as
+AISender does, so each chunk goes through AIReceiver's signals, ChatArea and
+ChatBubble on the main thread. Three scenarios are measured:
+
+- stream: main-thread stalls (gaps in a 2 ms heartbeat timer) and per-chunk
+  latency from the worker's emit until a document containing the chunk is
+  swapped in on the main thread.
+- history: process memory as the chat grows.
+- scroll: frame intervals of the chat scroll animation over a long history.
+
+Runs without a display. The overlay's Win32 calls (display affinity and
+z-order tracking) go to a null user32 on every platform while the window is
+built, so they neither fail offscreen nor react to other windows. Results
+can be saved as JSON with the commit they were measured on and compared
+against an earlier run.
+
+Usage:
+    python test/bench_ui_pipeline.py [--json results.json] [--compare baseline.json] [--chunk-delay-ms 15]
+"""
+import argparse
+import ctypes
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+from typing import Callable
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+os.chdir(ROOT)  # Asset and data paths are relative to the repo root
+
+from PyQt6.QtCore import QT_VERSION_STR, QCoreApplication, QEvent, QEventLoop, QObject, Qt, QTimer  # noqa: E402
+from PyQt6.QtGui import QTextDocument  # noqa: E402
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+from core.capture_buffer import CaptureBuffer  # noqa: E402
+from core.chat_history import ChatHistory  # noqa: E402
+from core.screenshot_manager import ScreenshotManager  # noqa: E402
+from core.tracing import tracer  # noqa: E402
+from ui.chat_bubble import ChatBubble  # noqa: E402
+from ui.document_worker import document_worker  # noqa: E402
+from ui.main_window import MainWindow  # noqa: E402
+from ui.resources import install_app_styles  # noqa: E402
+
+HEARTBEAT_MS = 2
+FRAME_BUDGET_MS = 16.7  # A gap longer than one 60 Hz frame counts as a stall
+CHUNK_SIZES = (24, 48, 96)  # Cycled to mimic the uneven chunks Gemini streams
+HISTORY_CHECKPOINTS = (0, 50, 100, 200, 400)  # Bubble counts at which memory is sampled
+SCROLL_PRESSES = 20
+SCROLL_INTERVAL_MS = 150  # Slower than the 100 ms scroll animation, so each press animates fully
+
+RESPONSES = [
+    (
+        "Here is what the code does, step by step:\n\n"
+        "1. It reads the **input** line by line and strips whitespace.\n"
+        "2. Empty lines are skipped, and `#` comments are ignored.\n"
+        "3. Each remaining line is split on `=` into a key and a value.\n\n"
+        "```python\n"
+        "def parse(lines):\n"
+        "    result = {}\n"
+        "    for line in lines:\n"
+        "        line = line.strip()\n"
+        "        if not line or line.startswith(\"#\"):\n"
+        "            continue\n"
+        "        key, _, value = line.partition(\"=\")\n"
+        "        result[key.strip()] = value.strip()\n"
+        "    return result\n"
+        "```\n\n"
+        "The complexity is *O(n)* in the number of lines. "
+    ) * 3,
+    (
+        "The bug is an off-by-one error in the loop bound. `range(len(items) + 1)` visits one index past the end, "
+        "so the last iteration raises `IndexError`. Use `range(len(items))`, or better, iterate over the items directly:\n\n"
+        "```python\n"
+        "for index, item in enumerate(items):\n"
+        "    print(index, item)\n"
+        "```\n\n"
+        "- `enumerate` avoids manual indexing.\n"
+        "- It also works for iterables without `len()`.\n"
+    ) * 4,
+    (
+        "**Answer: B.** The function is called with a mutable default argument, so the same list is shared "
+        "between calls and grows each time. After three calls it contains `[1, 1, 1]`. "
+    ) * 6,
+]
+
+
+class NullUser32():
+    """Stand-in for user32 while the window is built: every call succeeds and returns 1."""
+
+    def __getattr__(self, _name: str) -> Callable[..., int]:
+        """Return a function that accepts any arguments and returns 1.
+
+        Returns:
+            Callable[..., int]: The stub function.
+        """
+        return lambda *_args: 1
+
+
+class FakeSender():
+    """AISender stand-in that streams scripted responses from the calling (worker) thread.
+
+    Records when each chunk is handed to the receiver, so the benchmark can
+    measure how long the main thread takes to render it.
+    """
+
+    def __init__(self, chunk_delay_s: float) -> None:
+        self.chunk_delay_s = chunk_delay_s
+        self.response = ""
+        self.emitted: list[int] = []  # perf_counter_ns() when each chunk was passed to on_chunk
+        self.lock = threading.Lock()
+
+    def is_ready(self) -> bool:
+        """Report the client as ready.
+
+        Returns:
+            bool: Always True.
+        """
+        return True
+
+    def prewarm(self) -> None:
+        """Do nothing; there is no connection to warm."""
+
+    def reset_chat(self) -> None:
+        """Do nothing; there is no chat history."""
+
+    def send_message(
+        self,
+        user_input: str,
+        attachments: list[CaptureBuffer] | None = None,
+        on_chunk: Callable[[str], None] | None = None,
+        cancel: threading.Event | None = None
+    ) -> str:
+        """Stream the current scripted response in chunks.
+
+        Args:
+            user_input (str): Ignored.
+            attachments (list[CaptureBuffer] | None, optional): Ignored.
+            on_chunk (Callable[[str], None] | None, optional): Called with each chunk.
+            cancel (threading.Event | None, optional): Stops the stream when set.
+
+        Returns:
+            str: The full response.
+        """
+        position = 0
+        index = 0
+        while position < len(self.response) and not (cancel is not None and cancel.is_set()):
+            size = CHUNK_SIZES[index % len(CHUNK_SIZES)]
+            chunk = self.response[position:position + size]
+            position += size
+            index += 1
+            if self.chunk_delay_s:
+                time.sleep(self.chunk_delay_s)
+            with self.lock:
+                self.emitted.append(time.perf_counter_ns())
+            if on_chunk is not None:
+                on_chunk(chunk)
+        return self.response[:position]
+
+
+class StallMonitor(QObject):
+    """Heartbeat timer on the main thread; gaps between ticks are time the event loop was blocked."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.setInterval(HEARTBEAT_MS)
+        self.timer.timeout.connect(self._on_tick)
+        self.last = 0
+        self.gaps_ms: list[float] = []
+
+    def start(self) -> None:
+        """Start recording gaps."""
+        self.gaps_ms = []
+        self.last = time.perf_counter_ns()
+        self.timer.start()
+
+    def stop(self) -> list[float]:
+        """Stop recording.
+
+        Returns:
+            list[float]: Gaps between consecutive ticks in milliseconds.
+        """
+        self.timer.stop()
+        return self.gaps_ms
+
+    def _on_tick(self) -> None:
+        """Record the time since the previous tick."""
+        now = time.perf_counter_ns()
+        self.gaps_ms.append((now - self.last) / 1_000_000)
+        self.last = now
+
+
+def percentile(values: list[float], p: float) -> float:
+    """Return the nearest-rank percentile.
+
+    Args:
+        values (list[float]): The samples.
+        p (float): The percentile (0-100).
+
+    Returns:
+        float: The percentile, or 0 for no samples.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))]
+
+
+def rss_bytes() -> int:
+    """Return the process's current resident memory.
+
+    Returns:
+        int: Resident set size (working set on Windows) in bytes.
+    """
+    if sys.platform == "win32":
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [
+                ("cb", ctypes.c_ulong), ("PageFaultCount", ctypes.c_ulong),
+                ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        ctypes.windll.psapi.GetProcessMemoryInfo(ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb)
+        return counters.WorkingSetSize
+    if os.path.exists("/proc/self/statm"):
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # Peak, in bytes on macOS
+
+
+def build_window(sender: FakeSender, history_path: str) -> MainWindow:
+    """Build the main window with the Win32 calls it makes during construction routed to NullUser32.
+
+    Args:
+        sender (FakeSender): The sender the window's AIReceiver will use.
+        history_path (str): A scratch chat history database, so runs do not touch the real one.
+
+    Returns:
+        MainWindow: The shown window.
+    """
+    import core.topmost_tracker
+
+    saved_windll = getattr(ctypes, "windll", None)
+    saved_user32 = core.topmost_tracker.user32
+    ctypes.windll = SimpleNamespace(user32=NullUser32())
+    core.topmost_tracker.user32 = NullUser32()
+    try:
+        return MainWindow(sender, ScreenshotManager(), ChatHistory(history_path))
+    finally:
+        core.topmost_tracker.user32 = saved_user32
+        if saved_windll is None:
+            del ctypes.windll
+        else:
+            ctypes.windll = saved_windll
+
+
+def send_and_wait(window: MainWindow, text: str) -> None:
+    """Send a message through the window and run the event loop until the response is finalized.
+
+    Args:
+        window (MainWindow): The window under test.
+        text (str): The user message.
+    """
+    loop = QEventLoop()
+    window.worker.finished.connect(loop.quit)
+    window.worker.error.connect(loop.quit)
+    QTimer.singleShot(60_000, loop.quit)  # Safety net
+    window.send_message(text)
+    loop.exec()
+    window.worker.finished.disconnect(loop.quit)
+    window.worker.error.disconnect(loop.quit)
+
+
+def run_stream(window: MainWindow, sender: FakeSender) -> dict[str, float]:
+    """Stream each scripted response and measure stalls and per-chunk latency.
+
+    Args:
+        window (MainWindow): The window under test.
+        sender (FakeSender): The fake sender.
+
+    Returns:
+        dict[str, float]: Metric name -> value.
+    """
+    appended: list[tuple[ChatBubble, int]] = []  # (bubble, sequence) of each chunk
+    shown: dict[int, list[tuple[int, int]]] = {}  # id(bubble) -> [(sequence, perf_counter_ns())] of each document swapped in
+    append_to_stream = window.chat_area.append_to_stream
+    show_document = ChatBubble.show_document
+
+    def timed_append(chunk: str) -> None:
+        """Queue a chunk and record which bubble text it belongs to.
+
+        Args:
+            chunk (str): The chunk text.
+        """
+        append_to_stream(chunk)
+        bubble = window.chat_area.streaming_bubble
+        appended.append((bubble, bubble.sequence))
+
+    def timed_show(bubble: ChatBubble, sequence: int, document: QTextDocument, format_ms: float) -> None:
+        """Swap in a document and record when the main thread finished it.
+
+        Args:
+            bubble (ChatBubble): The bubble.
+            sequence (int): The document's sequence number.
+            document (QTextDocument): The document.
+            format_ms (float): Worker time.
+        """
+        show_document(bubble, sequence, document, format_ms)
+        shown.setdefault(id(bubble), []).append((sequence, time.perf_counter_ns()))
+
+    window.chat_area.append_to_stream = timed_append
+    ChatBubble.show_document = timed_show
+    sender.emitted = []
+    tracer.events.clear()
+    monitor = StallMonitor()
+    monitor.start()
+    for index, response in enumerate(RESPONSES):
+        sender.response = response
+        send_and_wait(window, f"Question {index + 1}")
+    while document_worker.pending():
+        QCoreApplication.processEvents(QEventLoop.ProcessEventsFlag.AllEvents, 10)
+    QCoreApplication.processEvents()
+    gaps = monitor.stop()
+    window.chat_area.append_to_stream = append_to_stream
+    ChatBubble.show_document = show_document
+
+    # A chunk is on screen once a document with its sequence number or a later one is swapped in
+    rendered = [
+        next((done for shown_sequence, done in shown.get(id(bubble), []) if shown_sequence >= sequence), None)
+        for bubble, sequence in appended
+    ]
+    latencies = [(done - emitted) / 1_000_000 for emitted, done in zip(sender.emitted, rendered) if done is not None]
+    render_ms = [event["dur"] / 1000 for event in tracer.events if event["name"] == "render chunk"]
+    swap_ms = [event["dur"] / 1000 for event in tracer.events if event["name"] == "set document"]
+    layout_ms = [event["dur"] / 1000 for event in tracer.events if event["name"] == "chat layout"]
+    return {
+        "stream.chunks": len(latencies),
+        "stream.chunk_latency_p50_ms": percentile(latencies, 50),
+        "stream.chunk_latency_p95_ms": percentile(latencies, 95),
+        "stream.chunk_latency_max_ms": max(latencies, default=0.0),
+        "stream.render_p50_ms": percentile(render_ms, 50),
+        "stream.render_max_ms": max(render_ms, default=0.0),
+        "stream.swap_max_ms": max(swap_ms, default=0.0),
+        "stream.layout_total_ms": sum(layout_ms),
+        "stream.stall_total_ms": sum(gap - FRAME_BUDGET_MS for gap in gaps if gap > FRAME_BUDGET_MS),
+        "stream.stall_count": sum(1 for gap in gaps if gap > FRAME_BUDGET_MS),
+        "stream.max_gap_ms": max(gaps, default=0.0),
+    }
+
+
+def run_history(app: QApplication, window: MainWindow, sender: FakeSender) -> dict[str, float]:
+    """Grow the chat to each checkpoint and sample memory, then clear it.
+
+    Args:
+        app (QApplication): The application.
+        window (MainWindow): The window under test.
+        sender (FakeSender): The fake sender.
+
+    Returns:
+        dict[str, float]: Metric name -> value.
+    """
+    def settle() -> int:
+        """Process pending events and deletions, then sample memory.
+
+        Returns:
+            int: Resident memory in bytes.
+        """
+        app.processEvents()
+        QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+        gc.collect()
+        return rss_bytes()
+
+    window.chat_area.clear_chat()
+    sender.response = RESPONSES[0][:600]
+    delay = sender.chunk_delay_s
+    sender.chunk_delay_s = 0
+    results = {}
+    baseline = settle()
+    bubbles = 0
+    send_times = []
+    for checkpoint in HISTORY_CHECKPOINTS:
+        while bubbles < checkpoint:
+            start = time.perf_counter()
+            send_and_wait(window, f"Message {bubbles // 2}")
+            send_times.append((time.perf_counter() - start) * 1000)
+            bubbles += 2  # User bubble and assistant bubble
+        results[f"history.rss_mb@{checkpoint}"] = settle() / 2**20
+    peak = rss_bytes()
+    results["history.kb_per_bubble"] = (peak - baseline) / 1024 / max(bubbles, 1)
+    results["history.send_p50_ms"] = percentile(send_times, 50)
+    results["history.send_last_ms"] = send_times[-1] if send_times else 0.0
+    sender.chunk_delay_s = delay
+    return results
+
+
+def run_scroll(window: MainWindow) -> dict[str, float]:
+    """Scroll up and down through a long chat and measure animation frame intervals.
+
+    Args:
+        window (MainWindow): The window under test (with a long history already loaded).
+
+    Returns:
+        dict[str, float]: Metric name -> value.
+    """
+    chat_area = window.chat_area
+    scrollbar = chat_area.verticalScrollBar()
+    scrollbar.setValue(scrollbar.maximum())
+    frames: list[tuple[int, int]] = []  # (press index, perf_counter_ns) per scroll frame
+    press = [0]
+
+    def on_value_changed(_value: int) -> None:
+        """Record a scroll animation frame.
+
+        Args:
+            _value (int): The new scroll position.
+        """
+        frames.append((press[0], time.perf_counter_ns()))
+
+    def scroll(index: int, amount: int) -> None:
+        """Start one scroll animation, as the scroll hotkeys do.
+
+        Args:
+            index (int): The press number.
+            amount (int): Pixels to scroll.
+        """
+        press[0] = index
+        chat_area.shortcut_scroll(amount)
+
+    scrollbar.valueChanged.connect(on_value_changed)
+    loop = QEventLoop()
+    for index in range(SCROLL_PRESSES * 2):
+        amount = -100 if index < SCROLL_PRESSES else 100
+        QTimer.singleShot(index * SCROLL_INTERVAL_MS, lambda i=index, a=amount: scroll(i, a))
+    QTimer.singleShot(SCROLL_PRESSES * 2 * SCROLL_INTERVAL_MS + 200, loop.quit)
+    monitor = StallMonitor()
+    monitor.start()
+    loop.exec()
+    gaps = monitor.stop()
+    scrollbar.valueChanged.disconnect(on_value_changed)
+
+    intervals = [
+        (later - earlier) / 1_000_000
+        for (press_a, earlier), (press_b, later) in zip(frames, frames[1:])
+        if press_a == press_b
+    ]
+    return {
+        "scroll.frames": len(frames),
+        "scroll.frame_p50_ms": percentile(intervals, 50),
+        "scroll.frame_p95_ms": percentile(intervals, 95),
+        "scroll.frame_max_ms": max(intervals, default=0.0),
+        "scroll.max_gap_ms": max(gaps, default=0.0),
+    }
+
+
+def run_info() -> dict[str, str]:
+    """Describe the commit and environment the results were measured on.
+
+    Returns:
+        dict[str, str]: Commit, dirty flag, Python, Qt and platform versions.
+    """
+    def git(*args: str) -> str:
+        """Run a git command in the repo.
+
+        Args:
+            *args (str): The git arguments.
+
+        Returns:
+            str: Its output, or "unknown" if git is unavailable.
+        """
+        try:
+            return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return "unknown"
+
+    return {
+        "commit": git("rev-parse", "--short", "HEAD"),
+        "dirty": str(bool(git("status", "--porcelain", "--untracked-files=no"))),
+        "python": platform.python_version(),
+        "qt": QT_VERSION_STR,
+        "platform": f"{platform.system()} {platform.release()} ({os.environ['QT_QPA_PLATFORM']})",
+        "cpu": platform.processor() or platform.machine(),
+    }
+
+
+def print_results(results: dict[str, float], baseline: dict | None) -> None:
+    """Print the results, with the change from a baseline run if given.
+
+    Args:
+        results (dict[str, float]): Metric name -> value.
+        baseline (dict | None): A previously saved JSON result, or None.
+    """
+    if baseline is not None:
+        info = baseline["info"]
+        print(f"compared with {info['commit']} (dirty={info['dirty']}, {info['platform']})")
+    for name, value in results.items():
+        line = f"  {name:<32} {value:10.2f}"
+        if baseline is not None and name in baseline["results"]:
+            previous = baseline["results"][name]
+            change = f"{(value - previous) / previous * 100:+.1f}%" if previous else "n/a"
+            line += f"   was {previous:10.2f}  ({change})"
+        print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--json", help="Save the results to this file")
+    parser.add_argument("--compare", help="Show the change from results saved with --json")
+    parser.add_argument("--chunk-delay-ms", type=float, default=15.0, help="Delay between streamed chunks")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    install_app_styles(app)
+    sender = FakeSender(args.chunk_delay_ms / 1000)
+    history_dir = tempfile.TemporaryDirectory()
+    window = build_window(sender, os.path.join(history_dir.name, "history.db"))
+    app.processEvents()
+
+    results: dict[str, float] = {}
+    results.update(run_stream(window, sender))
+    results.update(run_history(app, window, sender))
+    results.update(run_scroll(window))
+
+    info = run_info()
+    print(f"commit {info['commit']} (dirty={info['dirty']}), Qt {info['qt']}, Python {info['python']}, {info['platform']}")
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"info": info, "args": vars(args), "results": results}, f, indent=2)
+        print(f"saved to {args.json}")
+
+    window.worker.stop()
+    window.window_animator.stop()
+    window.chat_history.close()
+    history_dir.cleanup()
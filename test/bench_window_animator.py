@@ -0,0 +1,77 @@
+"""Count frames and CPU time per window move with the offscreen Qt platform.
+
+Drives WindowAnimator the way the hotkeys do: single presses, bursts of rapid
+repeats, and reversals mid-flight. Runs without a display.
+
+Usage:
+    python test/bench_window_animator.py [repeats]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from PyQt6.QtCore import QEventLoop, QTimer  # noqa: E402
+from PyQt6.QtWidgets import QApplication, QWidget  # noqa: E402
+
+from ui.window_animator import WindowAnimator  # noqa: E402
+
+
+def run_scenario(app: QApplication, window: QWidget, animator: WindowAnimator, presses: list[tuple[int, int, int]]) -> tuple[int, float, float]:
+    """Replay timed presses and wait until the window settles.
+
+    Args:
+        app (QApplication): The application (for its event loop).
+        window (QWidget): The animated window.
+        animator (WindowAnimator): The animator under test.
+        presses (list[tuple[int, int, int]]): (delay_ms, steps_x, steps_y) triples, delays relative to the start.
+
+    Returns:
+        tuple[int, float, float]: Frames rendered, wall time in ms, and process CPU time in ms.
+    """
+    window.move(400, 300)
+    animator.stop()
+    loop = QEventLoop()
+    animator.move_finished.connect(loop.quit)
+    for delay_ms, steps_x, steps_y in presses:
+        QTimer.singleShot(delay_ms, lambda x=steps_x, y=steps_y: animator.move_by_steps(x, y))
+    QTimer.singleShot(5000, loop.quit)  # Safety net
+
+    frames = animator.frames
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    loop.exec()
+    # Presses scheduled after the move settled would start another move; let them finish too
+    while animator.is_animating:
+        app.processEvents(QEventLoop.ProcessEventsFlag.WaitForMoreEvents)
+    cpu = time.process_time() - cpu
+    wall = time.perf_counter() - wall
+    animator.move_finished.disconnect(loop.quit)
+    return animator.frames - frames, wall * 1000, cpu * 1000
+
+
+if __name__ == "__main__":
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    app = QApplication(sys.argv)
+    window = QWidget()
+    window.resize(550, 600)
+    window.show()
+    animator = WindowAnimator(window)
+
+    scenarios = {
+        "single": [(0, 1, 0)],
+        "burst x5 @30ms": [(i * 30, 1, 0) for i in range(5)],
+        "reverse @40ms": [(0, 1, 0), (40, -1, 0)],
+        "diagonal": [(0, 1, 0), (10, 0, 1)],
+    }
+    for name, presses in scenarios.items():
+        results = [run_scenario(app, window, animator, presses) for _ in range(repeats)]
+        frames = sum(r[0] for r in results) / repeats
+        wall = sum(r[1] for r in results) / repeats
+        cpu = sum(r[2] for r in results) / repeats
+        print(
+            f"{name:<16} presses={len(presses)}  frames={frames:6.1f}  wall={wall:7.1f} ms  "
+            f"cpu={cpu:6.2f} ms  cpu/frame={cpu / max(frames, 1) * 1000:6.1f} us  final=({window.x()}, {window.y()})"
+        )
@@ -0,0 +1,183 @@
+"""Local stand-in for an OpenAI-compatible server that streams scripted SSE responses.
+
+Answers POST /v1/chat/completions with a scripted response split into
+chunks, one server-sent event per chunk with a configurable delay, followed
+by a usage chunk and "data: [DONE]". GET /v1/models answers immediately, so
+connection warm-up works. The server counts connections, requests, image
+parts and cancelled (disconnected) streams, so benchmarks can check
+connection reuse, image handling and cancellation.
+
+Usage:
+    python test/openai_stand_in.py [--port 8080] [--first-token-ms 150] [--chunk-ms 20]
+
+Then set "backend": "openai" and "base_url": "http://127.0.0.1:8080/v1" in
+the "ai" section of src/data/config.json.
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+RESPONSE = (
+    "Here is the approach:\n\n"
+    "1. Read the input and build a **prefix sum** array.\n"
+    "2. For each query, answer in O(1) with `prefix[r] - prefix[l - 1]`.\n\n"
+    "```python\n"
+    "def solve(values, queries):\n"
+    "    prefix = [0]\n"
+    "    for value in values:\n"
+    "        prefix.append(prefix[-1] + value)\n"
+    "    return [prefix[r] - prefix[l - 1] for l, r in queries]\n"
+    "```\n\n"
+    "This runs in O(n + q) time."
+)
+CHUNK_CHARS = 12
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serve /models and streaming /chat/completions."""
+
+    protocol_version = "HTTP/1.1"  # Keep-alive
+    disable_nagle_algorithm = True  # Each event is its own small write
+
+    def setup(self) -> None:
+        """Count the new connection."""
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self) -> None:
+        """List one model."""
+        if not self.path.rstrip("/").endswith("/models"):
+            self.send_error(404)
+            return
+        self._send_json({"object": "list", "data": [{"id": self.server.model, "object": "model"}]})
+
+    def do_POST(self) -> None:
+        """Stream the scripted response as server-sent events."""
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self.send_error(404)
+            return
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        parts = request["messages"][-1]["content"]
+        images = sum(1 for part in parts if isinstance(part, dict) and part.get("type") == "image_url")
+        with self.server.lock:
+            self.server.requests += 1
+            self.server.images += images
+            self.server.last_request = request
+
+        if not request.get("stream"):
+            self._send_json({
+                "object": "chat.completion", "model": self.server.model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": self.server.response}, "finish_reason": "stop"}],
+            })
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        response = self.server.response
+        chunks = [response[i:i + CHUNK_CHARS] for i in range(0, len(response), CHUNK_CHARS)]
+        try:
+            time.sleep(self.server.first_token_s)
+            for index, text in enumerate(chunks):
+                if index:
+                    time.sleep(self.server.chunk_s)
+                self._send_event({"object": "chat.completion.chunk", "model": self.server.model, "choices": [{"index": 0, "delta": {"content": text}}]})
+            self._send_event({
+                "object": "chat.completion.chunk", "model": self.server.model,
+                "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 85 * (images + 1), "completion_tokens": len(chunks), "total_tokens": 85 * (images + 1) + len(chunks)},
+            })
+            self._write_chunk(b"data: [DONE]\n\n")
+            self._write_chunk(b"")
+        except (BrokenPipeError, ConnectionResetError):
+            with self.server.lock:
+                self.server.cancelled += 1
+            self.close_connection = True
+
+    def log_message(self, *_args) -> None:
+        """Keep the output clean."""
+
+    def _send_json(self, payload: dict) -> None:
+        """Send a JSON response.
+
+        Args:
+            payload (dict): The response body.
+        """
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_event(self, payload: dict) -> None:
+        """Send one server-sent event.
+
+        Args:
+            payload (dict): The event data.
+        """
+        self._write_chunk(f"data: {json.dumps(payload)}\n\n".encode("utf-8"))
+
+    def _write_chunk(self, data: bytes) -> None:
+        """Write one HTTP chunk (an empty one ends the body).
+
+        Args:
+            data (bytes): The chunk data.
+        """
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+
+class StandInServer(ThreadingHTTPServer):
+    """OpenAI-compatible server on localhost with scripted streaming responses."""
+
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, first_token_ms: float = 150, chunk_ms: float = 20, response: str = RESPONSE) -> None:
+        super().__init__(("127.0.0.1", port), StandInHandler)
+        self.first_token_s = first_token_ms / 1000
+        self.chunk_s = chunk_ms / 1000
+        self.response = response
+        self.model = "stand-in"
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+        self.images = 0
+        self.cancelled = 0  # Streams the client closed before the end
+        self.last_request: dict | None = None
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to put in the "ai" config section."""
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+    def start(self) -> "StandInServer":
+        """Serve on a background thread.
+
+        Returns:
+            StandInServer: This server, for chaining.
+        """
+        threading.Thread(target=self.serve_forever, name="stand-in-server", daemon=True).start()
+        return self
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--first-token-ms", type=float, default=150, help="Delay before the first chunk")
+    parser.add_argument("--chunk-ms", type=float, default=20, help="Delay between chunks")
+    args = parser.parse_args()
+
+    server = StandInServer(args.port, args.first_token_ms, args.chunk_ms)
+    print(f"Serving {server.base_url} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass